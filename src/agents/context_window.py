@@ -0,0 +1,126 @@
+"""Token-budgeted context window for Worker conversation history.
+
+Every tool result becomes a message that is resent on each model call, so the
+prompt grows with the number of tool calls. `ContextWindow.fit` estimates the
+tokens in the message list and, once it exceeds the budget, replaces the oldest
+tool results with short stubs (call id, ok, summary, error) until the history is
+back under the low-water mark. The system prompt and goal messages are pinned and
+the most recent tool results are always kept verbatim.
+
+Only the prompt is shortened: full tool results stay in ``tool_call_records`` and
+the replay record.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any
+
+
+_CHARS_PER_TOKEN = 4
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@dataclass(frozen=True)
+class ContextWindowSettings:
+    budget_tokens: int
+    keep_recent: int
+    low_water: float = 0.75
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_tokens > 0
+
+    @staticmethod
+    def from_env(env: dict[str, str] | None = None) -> "ContextWindowSettings":
+        if env is None:
+            env = os.environ  # pragma: no cover
+
+        return ContextWindowSettings(
+            budget_tokens=_parse_int(env.get("TOKIMON_CONTEXT_BUDGET_TOKENS", ""), default=64_000, min_value=0),
+            keep_recent=_parse_int(env.get("TOKIMON_CONTEXT_KEEP_RECENT_TOOL_MESSAGES", ""), default=4, min_value=0),
+        )
+
+
+@dataclass(frozen=True)
+class ContextFit:
+    before_tokens: int
+    after_tokens: int
+    elided_messages: int
+
+    def to_dict(self) -> dict[str, int]:
+        return {
+            "before_tokens": self.before_tokens,
+            "after_tokens": self.after_tokens,
+            "elided_messages": self.elided_messages,
+        }
+
+
+def estimate_tokens(message: dict[str, Any]) -> int:
+    """Rough token estimate (~4 characters per token) for one chat message."""
+
+    content = message.get("content", "")
+    length = len(content) if isinstance(content, str) else len(json.dumps(content, default=str))
+    return _MESSAGE_OVERHEAD_TOKENS + (length + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+class ContextWindow:
+    def __init__(self, settings: ContextWindowSettings, *, pinned: int = 2) -> None:
+        self.settings = settings
+        self.pinned = pinned
+
+    def fit(self, messages: list[dict[str, Any]]) -> ContextFit:
+        """Elide old tool results in ``messages`` (in place) when over budget."""
+
+        sizes = [estimate_tokens(message) for message in messages]
+        before = sum(sizes)
+        if not self.settings.enabled or before <= self.settings.budget_tokens:
+            return ContextFit(before_tokens=before, after_tokens=before, elided_messages=0)
+
+        candidates = [
+            index
+            for index in range(self.pinned, len(messages))
+            if messages[index].get("role") == "tool" and not messages[index].get("elided")
+        ]
+        if self.settings.keep_recent:
+            candidates = candidates[: -self.settings.keep_recent]
+        # Elide down to the low-water mark so the prompt prefix stays stable for several iterations.
+        target = int(self.settings.budget_tokens * self.settings.low_water)
+        total = before
+        elided = 0
+        for index in candidates:
+            if total <= target:
+                break
+            stub = _elided_tool_message(messages[index], original_tokens=sizes[index])
+            total += estimate_tokens(stub) - sizes[index]
+            messages[index] = stub
+            elided += 1
+        return ContextFit(before_tokens=before, after_tokens=total, elided_messages=elided)
+
+
+def _elided_tool_message(message: dict[str, Any], *, original_tokens: int) -> dict[str, Any]:
+    content = message.get("content", "")
+    try:
+        payload = json.loads(content) if isinstance(content, str) else None
+    except json.JSONDecodeError:
+        payload = None
+    stub: dict[str, Any] = {}
+    if isinstance(payload, dict):
+        for key in ("call_id", "ok", "summary", "error"):
+            if key in payload:
+                stub[key] = payload[key]
+    stub["data"] = {"_elided": True, "original_tokens": original_tokens}
+    elided: dict[str, Any] = {"role": "tool", "content": json.dumps(stub, sort_keys=True), "elided": True}
+    if message.get("name"):
+        elided["name"] = message["name"]
+    return elided
+
+
+def _parse_int(raw: str, *, default: int, min_value: int) -> int:
+    try:
+        value = int(str(raw).strip())
+    except ValueError:
+        value = default
+    return max(min_value, value)
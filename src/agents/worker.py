@@ -5,9 +5,12 @@ from __future__ import annotations
 import hashlib
 import inspect
 import json
+import os
 import time
+from concurrent.futures import Executor, ThreadPoolExecutor
 from typing import Any
 
+from agents.context_window import ContextWindow, ContextWindowSettings
 from agents.outputs import WorkerOutput
 from agents.prompts import build_system_prompt
 from flow_types import ToolCallRecord, WorkerStatus
@@ -26,11 +29,31 @@ from workflow.schema import (
 )
 
 
+_DEFAULT_TOOL_PARALLELISM = 4
+# Pure workspace reads. Anything else (pytest runs, web calls) may touch shared
+# state or external services, so it runs alone even when not side-effectful.
+_PARALLEL_SAFE_ACTIONS = frozenset(
+    {("file", "read"), ("file", "head"), ("file", "tail"), ("file", "stat"), ("grep", "search")}
+)
+
+
 class Worker:
     def __init__(self, role: str, llm_client: LLMClient, tools: dict[str, Any]) -> None:
         self.role = role
         self.llm_client = llm_client
         self.tools = tools
+        self._descriptors: list[dict[str, Any]] | None = None
+
+    def tool_descriptors(self) -> list[dict[str, Any]]:
+        """Tool descriptors for the prompt, inspected once per Worker.
+
+        The same list object is passed on every model call so clients can keep a
+        per-session prompt builder keyed on it.
+        """
+
+        if self._descriptors is None:
+            self._descriptors = _tool_descriptors(self.tools)
+        return self._descriptors
 
     def run(
         self,
@@ -71,6 +94,9 @@ class Worker:
         tool_loop_settings = ToolLoopSettings.from_env()
         tool_loop_detector = ToolLoopDetector(tool_loop_settings) if tool_loop_settings.enabled else None
         tool_approval_mode = tool_approval_mode_from_env()
+        tool_parallelism = _tool_parallelism_from_env()
+        context_settings = ContextWindowSettings.from_env()
+        context_window = ContextWindow(context_settings) if context_settings.enabled else None
         approval_env_ids, approval_file_ids = load_approval_allowlist() if tool_approval_mode != "off" else (set(), set())
         trace_base = _trace_base(
             {
@@ -83,385 +109,437 @@ class Worker:
             {"role": "system", "content": build_system_prompt(self.role)},
             {"role": "user", "content": f"Goal: {goal}\nStep: {step_id}\nInputs: {inputs}\nMemory: {memory}"},
         ]
-        for iteration in range(1, max_iterations + 1):
-            _trace_log(
-                trace,
-                "worker_model_call",
-                {
-                    **trace_base,
-                    "iteration": iteration,
-                    "message_count": len(messages),
-                    "tool_count": len(self.tools),
-                },
-            )
-            response = self.llm_client.send(messages, tools=_tool_descriptors(self.tools))
-            model_calls += 1
-            _trace_log(trace, "worker_model_response", {**trace_base, "iteration": iteration, **_response_meta(response)})
-            if replay_recorder is not None:
-                replay_recorder.record_model_response(response)
-
-            try:
-                tool_calls = _parse_tool_calls(response)
-            except Exception as exc:
-                elapsed_ms = (time.perf_counter() - start) * 1000
+        tool_pool = (
+            ThreadPoolExecutor(max_workers=tool_parallelism, thread_name_prefix="tokimon-tool")
+            if tool_parallelism > 1
+            else None
+        )
+        try:
+            for iteration in range(1, max_iterations + 1):
+                context_meta: dict[str, Any] = {}
+                if context_window is not None:
+                    fit = context_window.fit(messages)
+                    context_meta = {"context_tokens": fit.after_tokens}
+                    if fit.elided_messages:
+                        _trace_log(
+                            trace,
+                            "worker_context_elided",
+                            {
+                                **trace_base,
+                                "iteration": iteration,
+                                "budget_tokens": context_settings.budget_tokens,
+                                **fit.to_dict(),
+                            },
+                        )
                 _trace_log(
                     trace,
-                    "worker_invalid_tool_calls",
-                    {**trace_base, "iteration": iteration, "error": str(exc)},
+                    "worker_model_call",
+                    {
+                        **trace_base,
+                        "iteration": iteration,
+                        "message_count": len(messages),
+                        "tool_count": len(self.tools),
+                        **context_meta,
+                    },
                 )
-                return finalize(
-                    WorkerOutput(
-                    status=WorkerStatus.FAILURE,
-                    summary=f"invalid tool_calls: {exc}",
-                    artifacts=[],
-                    metrics={
-                        "elapsed_ms": elapsed_ms,
-                        "model_calls": model_calls,
-                        "tool_calls": len(tool_call_records),
-                        "iteration_count": iteration,
-                        "tool_call_records": [record.__dict__ for record in tool_call_records],
+                tool_descriptors = self.tool_descriptors()
+                response = self.llm_client.send(messages, tools=tool_descriptors)
+                model_calls += 1
+                _trace_log(
+                    trace,
+                    "worker_model_response",
+                    {
+                        **trace_base,
+                        "iteration": iteration,
+                        **_response_meta(response),
+                        **_prompt_prefix_meta(self.llm_client, tool_descriptors),
                     },
-                    next_actions=["Fix tool_calls schema or return a final response."],
-                    failure_signature="worker-invalid-tool-calls",
-                    )
                 )
-            if tool_calls:
-                for call in tool_calls:
-                    tool_name = str(call.get("tool", ""))
-                    action = str(call.get("action", ""))
-                    raw_args = call.get("args", {}) or {}
-                    args = raw_args if isinstance(raw_args, dict) else {}
-                    args_hash = stable_args_hash(args)
-                    call_id = _coerce_tool_call_id(call)
-                    policy_decision = _tool_policy_decision(tool_name, action, args)
-                    cache_key = _tool_call_cache_key(tool_name, action, args) if _is_side_effectful_tool_call(tool_name, action) else None
+                if replay_recorder is not None:
+                    replay_recorder.record_model_response(response)
+
+                try:
+                    tool_calls = _parse_tool_calls(response)
+                except Exception as exc:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
                     _trace_log(
                         trace,
-                        "worker_tool_call",
-                        {
-                            **trace_base,
-                            "iteration": iteration,
-                            "call": _truncate_jsonish(call, max_str=4_000, max_list=50, max_depth=4),
+                        "worker_invalid_tool_calls",
+                        {**trace_base, "iteration": iteration, "error": str(exc)},
+                    )
+                    return finalize(
+                        WorkerOutput(
+                        status=WorkerStatus.FAILURE,
+                        summary=f"invalid tool_calls: {exc}",
+                        artifacts=[],
+                        metrics={
+                            "elapsed_ms": elapsed_ms,
+                            "model_calls": model_calls,
+                            "tool_calls": len(tool_call_records),
+                            "iteration_count": iteration,
+                            "tool_call_records": [record.__dict__ for record in tool_call_records],
                         },
+                        next_actions=["Fix tool_calls schema or return a final response."],
+                        failure_signature="worker-invalid-tool-calls",
+                        )
                     )
-                    if tool_approval_mode != "off" and bool(policy_decision.get("requires_approval")):
-                        approval_request = build_approval_request(
-                            tool=tool_name,
-                            action=action,
-                            args_hash=args_hash,
-                            args_preview=_truncate_jsonish(args, max_str=500, max_list=20, max_depth=3),
-                            reason=str(policy_decision.get("reason") or "approval required"),
+                if tool_calls:
+                    prefetched: dict[int, ToolCallRecord] = {}
+                    for call_index, call in enumerate(tool_calls):
+                        tool_name = str(call.get("tool", ""))
+                        action = str(call.get("action", ""))
+                        raw_args = call.get("args", {}) or {}
+                        args = raw_args if isinstance(raw_args, dict) else {}
+                        args_hash = stable_args_hash(args)
+                        call_id = _coerce_tool_call_id(call)
+                        policy_decision = _tool_policy_decision(tool_name, action, args)
+                        cache_key = _tool_call_cache_key(tool_name, action, args) if _is_side_effectful_tool_call(tool_name, action) else None
+                        _trace_log(
+                            trace,
+                            "worker_tool_call",
+                            {
+                                **trace_base,
+                                "iteration": iteration,
+                                "call": _truncate_jsonish(call, max_str=4_000, max_list=50, max_depth=4),
+                            },
                         )
-                        _aid = approval_request["approval_id"]
-                        _pre_approved, _allowlist_src = check_allowlist(_aid, approval_env_ids, approval_file_ids)
-                        if _pre_approved:
-                            policy_decision = {**policy_decision, "pre_approved": True, "allowlist_source": _allowlist_src}
-                        elif tool_approval_mode == "block":
-                            elapsed_ms = (time.perf_counter() - start) * 1000
-                            _trace_log(
-                                trace,
-                                "worker_tool_approval_blocked",
-                                {
-                                    **trace_base,
-                                    "iteration": iteration,
-                                    "approval_request": approval_request,
-                                },
+                        if tool_approval_mode != "off" and bool(policy_decision.get("requires_approval")):
+                            approval_request = build_approval_request(
+                                tool=tool_name,
+                                action=action,
+                                args_hash=args_hash,
+                                args_preview=_truncate_jsonish(args, max_str=500, max_list=20, max_depth=3),
+                                reason=str(policy_decision.get("reason") or "approval required"),
                             )
-                            return finalize(
-                                WorkerOutput(
-                                status=WorkerStatus.BLOCKED,
-                                summary=f"tool call requires approval: {tool_name}.{action}",
-                                artifacts=[],
-                                metrics={
-                                    "elapsed_ms": elapsed_ms,
-                                    "model_calls": model_calls,
-                                    "tool_calls": len(tool_call_records),
-                                    "iteration_count": iteration,
-                                    "tool_call_records": [record.__dict__ for record in tool_call_records],
-                                    "touched_files": sorted(touched_files),
-                                    "schema_repairs": schema_repairs,
-                                    "approval_request": approval_request,
-                                },
-                                next_actions=[
-                                    "Re-run with TOKIMON_TOOL_APPROVAL_MODE=off to allow tool execution.",
-                                    "Or run in an environment that supports operator approvals (not implemented in this runtime).",
-                                ],
-                                failure_signature="worker-tool-approval-blocked",
+                            _aid = approval_request["approval_id"]
+                            _pre_approved, _allowlist_src = check_allowlist(_aid, approval_env_ids, approval_file_ids)
+                            if _pre_approved:
+                                policy_decision = {**policy_decision, "pre_approved": True, "allowlist_source": _allowlist_src}
+                            elif tool_approval_mode == "block":
+                                elapsed_ms = (time.perf_counter() - start) * 1000
+                                _trace_log(
+                                    trace,
+                                    "worker_tool_approval_blocked",
+                                    {
+                                        **trace_base,
+                                        "iteration": iteration,
+                                        "approval_request": approval_request,
+                                    },
                                 )
-                            )
-                        elif tool_approval_mode == "deny":
+                                return finalize(
+                                    WorkerOutput(
+                                    status=WorkerStatus.BLOCKED,
+                                    summary=f"tool call requires approval: {tool_name}.{action}",
+                                    artifacts=[],
+                                    metrics={
+                                        "elapsed_ms": elapsed_ms,
+                                        "model_calls": model_calls,
+                                        "tool_calls": len(tool_call_records),
+                                        "iteration_count": iteration,
+                                        "tool_call_records": [record.__dict__ for record in tool_call_records],
+                                        "touched_files": sorted(touched_files),
+                                        "schema_repairs": schema_repairs,
+                                        "approval_request": approval_request,
+                                    },
+                                    next_actions=[
+                                        "Re-run with TOKIMON_TOOL_APPROVAL_MODE=off to allow tool execution.",
+                                        "Or run in an environment that supports operator approvals (not implemented in this runtime).",
+                                    ],
+                                    failure_signature="worker-tool-approval-blocked",
+                                    )
+                                )
+                            elif tool_approval_mode == "deny":
+                                record = ToolCallRecord(
+                                    tool_name=tool_name or "<missing>",
+                                    call_id=call_id,
+                                    policy_decision=policy_decision,
+                                    ok=False,
+                                    summary="denied (approval required)",
+                                    data={"action": action, "args_hash": args_hash, "approval_request": approval_request},
+                                    elapsed_ms=0.0,
+                                    cached=False,
+                                    error="approval required",
+                                )
+                                tool_call_records.append(record)
+                                if replay_recorder is not None:
+                                    replay_recorder.record_tool_invocation(call, record)
+                                _trace_log(
+                                    trace,
+                                    "worker_tool_result",
+                                    {
+                                        **trace_base,
+                                        "iteration": iteration,
+                                        "tool_name": record.tool_name,
+                                        "tool_call_id": record.call_id,
+                                        "ok": record.ok,
+                                        "summary": record.summary,
+                                        "elapsed_ms": record.elapsed_ms,
+                                        "error": record.error,
+                                        "cached": record.cached,
+                                    },
+                                )
+                                messages.append(
+                                    {
+                                        "role": "tool",
+                                        "name": record.tool_name,
+                                        "content": _format_tool_message(record),
+                                    }
+                                )
+                                if tool_loop_detector is not None:
+                                    signature = normalize_signature(tool_name, action, args_hash)
+                                    trigger = tool_loop_detector.record(signature, ok=record.ok)
+                                    if trigger is not None:
+                                        elapsed_ms = (time.perf_counter() - start) * 1000
+                                        failure_signature = f"worker-tool-loop-detected:{trigger.reason}"
+                                        _trace_log(
+                                            trace,
+                                            "worker_tool_loop_detected",
+                                            {
+                                                **trace_base,
+                                                "iteration": iteration,
+                                                "failure_signature": failure_signature,
+                                                "evidence": tool_loop_detector.evidence(trigger),
+                                            },
+                                        )
+                                        return finalize(
+                                            WorkerOutput(
+                                            status=WorkerStatus.PARTIAL,
+                                            summary=(
+                                                f"tool loop detected ({trigger.reason}) for "
+                                                f"{trigger.signature.tool}.{trigger.signature.action}"
+                                            ),
+                                            artifacts=[],
+                                            metrics={
+                                                "elapsed_ms": elapsed_ms,
+                                                "model_calls": model_calls,
+                                                "tool_calls": len(tool_call_records),
+                                                "iteration_count": iteration,
+                                                "tool_call_records": [record.__dict__ for record in tool_call_records],
+                                                "touched_files": sorted(touched_files),
+                                                "schema_repairs": schema_repairs,
+                                                "tool_loop_detection": tool_loop_detector.evidence(trigger),
+                                            },
+                                            next_actions=[
+                                                "Change strategy to avoid repeating identical tool calls.",
+                                                "If necessary, disable detection by setting TOKIMON_TOOL_LOOP_DETECTION_ENABLED=false.",
+                                            ],
+                                            failure_signature=failure_signature,
+                                            )
+                                        )
+                                continue
+                        touched_files.update(_touched_files_from_call(call))
+                        if cache_key is not None and cache_key in tool_call_cache:
+                            cached = tool_call_cache[cache_key]
                             record = ToolCallRecord(
-                                tool_name=tool_name or "<missing>",
+                                tool_name=cached.tool_name,
                                 call_id=call_id,
                                 policy_decision=policy_decision,
-                                ok=False,
-                                summary="denied (approval required)",
-                                data={"action": action, "args_hash": args_hash, "approval_request": approval_request},
-                                elapsed_ms=0.0,
-                                cached=False,
-                                error="approval required",
-                            )
-                            tool_call_records.append(record)
-                            if replay_recorder is not None:
-                                replay_recorder.record_tool_invocation(call, record)
-                            _trace_log(
-                                trace,
-                                "worker_tool_result",
-                                {
-                                    **trace_base,
-                                    "iteration": iteration,
-                                    "tool_name": record.tool_name,
-                                    "tool_call_id": record.call_id,
-                                    "ok": record.ok,
-                                    "summary": record.summary,
-                                    "elapsed_ms": record.elapsed_ms,
-                                    "error": record.error,
-                                    "cached": record.cached,
-                                },
+                                cached=True,
+                                ok=cached.ok,
+                                summary=cached.summary,
+                                data=cached.data,
+                                elapsed_ms=cached.elapsed_ms,
+                                error=cached.error,
                             )
-                            messages.append(
-                                {
-                                    "role": "tool",
-                                    "name": record.tool_name,
-                                    "content": _format_tool_message(record),
-                                }
-                            )
-                            if tool_loop_detector is not None:
-                                signature = normalize_signature(tool_name, action, args_hash)
-                                trigger = tool_loop_detector.record(signature, ok=record.ok)
-                                if trigger is not None:
-                                    elapsed_ms = (time.perf_counter() - start) * 1000
-                                    failure_signature = f"worker-tool-loop-detected:{trigger.reason}"
-                                    _trace_log(
-                                        trace,
-                                        "worker_tool_loop_detected",
-                                        {
-                                            **trace_base,
-                                            "iteration": iteration,
-                                            "failure_signature": failure_signature,
-                                            "evidence": tool_loop_detector.evidence(trigger),
-                                        },
-                                    )
-                                    return finalize(
-                                        WorkerOutput(
-                                        status=WorkerStatus.PARTIAL,
-                                        summary=(
-                                            f"tool loop detected ({trigger.reason}) for "
-                                            f"{trigger.signature.tool}.{trigger.signature.action}"
-                                        ),
-                                        artifacts=[],
-                                        metrics={
-                                            "elapsed_ms": elapsed_ms,
-                                            "model_calls": model_calls,
-                                            "tool_calls": len(tool_call_records),
-                                            "iteration_count": iteration,
-                                            "tool_call_records": [record.__dict__ for record in tool_call_records],
-                                            "touched_files": sorted(touched_files),
-                                            "schema_repairs": schema_repairs,
-                                            "tool_loop_detection": tool_loop_detector.evidence(trigger),
-                                        },
-                                        next_actions=[
-                                            "Change strategy to avoid repeating identical tool calls.",
-                                            "If necessary, disable detection by setting TOKIMON_TOOL_LOOP_DETECTION_ENABLED=false.",
-                                        ],
-                                        failure_signature=failure_signature,
-                                        )
-                                    )
-                            continue
-                    touched_files.update(_touched_files_from_call(call))
-                    if cache_key is not None and cache_key in tool_call_cache:
-                        cached = tool_call_cache[cache_key]
-                        record = ToolCallRecord(
-                            tool_name=cached.tool_name,
-                            call_id=call_id,
-                            policy_decision=policy_decision,
-                            cached=True,
-                            ok=cached.ok,
-                            summary=cached.summary,
-                            data=cached.data,
-                            elapsed_ms=cached.elapsed_ms,
-                            error=cached.error,
+                        elif call_index in prefetched:
+                            record = prefetched.pop(call_index)
+                        else:
+                            batch = _read_only_batch(tool_calls, call_index, approval_mode=tool_approval_mode)
+                            if tool_pool is not None and len(batch) > 1:
+                                prefetched = _invoke_tool_calls_parallel(self.tools, tool_calls, batch, pool=tool_pool)
+                                record = prefetched.pop(call_index)
+                            else:
+                                record = _invoke_tool_call(self.tools, call, policy_decision=policy_decision)
+                            if cache_key is not None:
+                                tool_call_cache[cache_key] = record
+                        tool_call_records.append(record)
+                        if replay_recorder is not None:
+                            replay_recorder.record_tool_invocation(call, record)
+                        _trace_log(
+                            trace,
+                            "worker_tool_result",
+                            {
+                                **trace_base,
+                                "iteration": iteration,
+                                "tool_name": record.tool_name,
+                                "tool_call_id": record.call_id,
+                                "ok": record.ok,
+                                "summary": record.summary,
+                                "elapsed_ms": record.elapsed_ms,
+                                "error": record.error,
+                                "cached": record.cached,
+                            },
                         )
-                    else:
-                        record = _invoke_tool_call(self.tools, call, policy_decision=policy_decision)
-                        if cache_key is not None:
-                            tool_call_cache[cache_key] = record
-                    tool_call_records.append(record)
-                    if replay_recorder is not None:
-                        replay_recorder.record_tool_invocation(call, record)
-                    _trace_log(
-                        trace,
-                        "worker_tool_result",
-                        {
-                            **trace_base,
-                            "iteration": iteration,
-                            "tool_name": record.tool_name,
-                            "tool_call_id": record.call_id,
-                            "ok": record.ok,
-                            "summary": record.summary,
-                            "elapsed_ms": record.elapsed_ms,
-                            "error": record.error,
-                            "cached": record.cached,
-                        },
-                    )
-                    messages.append(
-                        {
-                            "role": "tool",
-                            "name": record.tool_name,
-                            "content": _format_tool_message(record),
-                        }
-                    )
-                    if tool_loop_detector is not None:
-                        signature = normalize_signature(tool_name, action, args_hash)
-                        trigger = tool_loop_detector.record(signature, ok=record.ok)
-                        if trigger is not None:
-                            elapsed_ms = (time.perf_counter() - start) * 1000
-                            failure_signature = f"worker-tool-loop-detected:{trigger.reason}"
-                            _trace_log(
-                                trace,
-                                "worker_tool_loop_detected",
-                                {
-                                    **trace_base,
-                                    "iteration": iteration,
-                                    "failure_signature": failure_signature,
-                                    "evidence": tool_loop_detector.evidence(trigger),
-                                },
-                            )
-                            return finalize(
-                                WorkerOutput(
-                                status=WorkerStatus.PARTIAL,
-                                summary=(
-                                    f"tool loop detected ({trigger.reason}) for "
-                                    f"{trigger.signature.tool}.{trigger.signature.action}"
-                                ),
-                                artifacts=[],
-                                metrics={
-                                    "elapsed_ms": elapsed_ms,
-                                    "model_calls": model_calls,
-                                    "tool_calls": len(tool_call_records),
-                                    "iteration_count": iteration,
-                                    "tool_call_records": [record.__dict__ for record in tool_call_records],
-                                    "touched_files": sorted(touched_files),
-                                    "schema_repairs": schema_repairs,
-                                    "tool_loop_detection": tool_loop_detector.evidence(trigger),
-                                },
-                                next_actions=[
-                                    "Change strategy to avoid repeating identical tool calls.",
-                                    "If necessary, disable detection by setting TOKIMON_TOOL_LOOP_DETECTION_ENABLED=false.",
-                                ],
-                                failure_signature=failure_signature,
+                        messages.append(
+                            {
+                                "role": "tool",
+                                "name": record.tool_name,
+                                "content": _format_tool_message(record),
+                            }
+                        )
+                        if tool_loop_detector is not None:
+                            signature = normalize_signature(tool_name, action, args_hash)
+                            trigger = tool_loop_detector.record(signature, ok=record.ok)
+                            if trigger is not None:
+                                elapsed_ms = (time.perf_counter() - start) * 1000
+                                failure_signature = f"worker-tool-loop-detected:{trigger.reason}"
+                                _trace_log(
+                                    trace,
+                                    "worker_tool_loop_detected",
+                                    {
+                                        **trace_base,
+                                        "iteration": iteration,
+                                        "failure_signature": failure_signature,
+                                        "evidence": tool_loop_detector.evidence(trigger),
+                                    },
                                 )
+                                return finalize(
+                                    WorkerOutput(
+                                    status=WorkerStatus.PARTIAL,
+                                    summary=(
+                                        f"tool loop detected ({trigger.reason}) for "
+                                        f"{trigger.signature.tool}.{trigger.signature.action}"
+                                    ),
+                                    artifacts=[],
+                                    metrics={
+                                        "elapsed_ms": elapsed_ms,
+                                        "model_calls": model_calls,
+                                        "tool_calls": len(tool_call_records),
+                                        "iteration_count": iteration,
+                                        "tool_call_records": [record.__dict__ for record in tool_call_records],
+                                        "touched_files": sorted(touched_files),
+                                        "schema_repairs": schema_repairs,
+                                        "tool_loop_detection": tool_loop_detector.evidence(trigger),
+                                    },
+                                    next_actions=[
+                                        "Change strategy to avoid repeating identical tool calls.",
+                                        "If necessary, disable detection by setting TOKIMON_TOOL_LOOP_DETECTION_ENABLED=false.",
+                                    ],
+                                    failure_signature=failure_signature,
+                                    )
+                                )
+                    continue
+
+                try:
+                    _validate_worker_final_response(response)
+                except SchemaValidationError as exc:
+                    if schema_repairs >= 2:
+                        elapsed_ms = (time.perf_counter() - start) * 1000
+                        failure_signature = _schema_failure_signature(exc)
+                        _trace_log(
+                            trace,
+                            "worker_output_schema_invalid",
+                            {
+                                **trace_base,
+                                "iteration": iteration,
+                                "repairs": schema_repairs,
+                                "failure_signature": failure_signature,
+                                "error": str(exc),
+                            },
+                        )
+                        return finalize(
+                            WorkerOutput(
+                            status=WorkerStatus.FAILURE,
+                            summary="worker produced invalid structured output (schema validation failed)",
+                            artifacts=[],
+                            metrics={
+                                "elapsed_ms": elapsed_ms,
+                                "model_calls": model_calls,
+                                "tool_calls": len(tool_call_records),
+                                "iteration_count": iteration,
+                                "tool_call_records": [record.__dict__ for record in tool_call_records],
+                                "schema_repairs": schema_repairs,
+                            },
+                            next_actions=[
+                                "Return a schema-valid final JSON object (status/summary/artifacts/metrics/next_actions/failure_signature).",
+                            ],
+                            failure_signature=failure_signature,
                             )
-                continue
-
-            try:
-                _validate_worker_final_response(response)
-            except SchemaValidationError as exc:
-                if schema_repairs >= 2:
-                    elapsed_ms = (time.perf_counter() - start) * 1000
-                    failure_signature = _schema_failure_signature(exc)
+                        )
+                    schema_repairs += 1
                     _trace_log(
                         trace,
-                        "worker_output_schema_invalid",
+                        "worker_output_schema_repair",
                         {
                             **trace_base,
                             "iteration": iteration,
                             "repairs": schema_repairs,
-                            "failure_signature": failure_signature,
                             "error": str(exc),
                         },
                     )
-                    return finalize(
-                        WorkerOutput(
-                        status=WorkerStatus.FAILURE,
-                        summary="worker produced invalid structured output (schema validation failed)",
-                        artifacts=[],
-                        metrics={
-                            "elapsed_ms": elapsed_ms,
-                            "model_calls": model_calls,
-                            "tool_calls": len(tool_call_records),
-                            "iteration_count": iteration,
-                            "tool_call_records": [record.__dict__ for record in tool_call_records],
-                            "schema_repairs": schema_repairs,
-                        },
-                        next_actions=[
-                            "Return a schema-valid final JSON object (status/summary/artifacts/metrics/next_actions/failure_signature).",
-                        ],
-                        failure_signature=failure_signature,
-                        )
-                    )
-                schema_repairs += 1
+                    messages.extend(_schema_repair_messages(response, exc, remaining=2 - schema_repairs))
+                    continue
+
+                output = _coerce_output(response)
+                if output.status != WorkerStatus.SUCCESS and not output.failure_signature:
+                    # A tool stopped by a resource limit (e.g. "pytest-timeout") explains the failure better than nothing.
+                    limit_signatures = [record.failure_signature for record in tool_call_records if record.failure_signature]
+                    if limit_signatures:
+                        output.failure_signature = limit_signatures[-1]
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                output.metrics = dict(output.metrics)
+                output.metrics.setdefault("elapsed_ms", elapsed_ms)
+                output.metrics.setdefault("model_calls", model_calls)
+                output.metrics.setdefault("tool_calls", len(tool_call_records))
+                output.metrics.setdefault("iteration_count", iteration)
+                output.metrics.setdefault("tool_call_records", [record.__dict__ for record in tool_call_records])
+                output.metrics.setdefault("touched_files", sorted(touched_files))
+                output.metrics.setdefault("schema_repairs", schema_repairs)
+                read_cache_lookups = sum(1 for record in tool_call_records if record.cache_hit is not None)
+                if read_cache_lookups:
+                    output.metrics.setdefault("read_cache_lookups", read_cache_lookups)
+                    output.metrics.setdefault("read_cache_hits", sum(1 for record in tool_call_records if record.cache_hit))
                 _trace_log(
                     trace,
-                    "worker_output_schema_repair",
+                    "worker_final",
                     {
                         **trace_base,
                         "iteration": iteration,
-                        "repairs": schema_repairs,
-                        "error": str(exc),
+                        "status": output.status.value,
+                        "summary": output.summary,
+                        "failure_signature": output.failure_signature,
+                        "model_calls": model_calls,
+                        "tool_calls": len(tool_call_records),
+                        "elapsed_ms": elapsed_ms,
+                        "schema_repairs": schema_repairs,
                     },
                 )
-                messages.extend(_schema_repair_messages(response, exc, remaining=2 - schema_repairs))
-                continue
+                return finalize(output)
 
-            output = _coerce_output(response)
             elapsed_ms = (time.perf_counter() - start) * 1000
-            output.metrics = dict(output.metrics)
-            output.metrics.setdefault("elapsed_ms", elapsed_ms)
-            output.metrics.setdefault("model_calls", model_calls)
-            output.metrics.setdefault("tool_calls", len(tool_call_records))
-            output.metrics.setdefault("iteration_count", iteration)
-            output.metrics.setdefault("tool_call_records", [record.__dict__ for record in tool_call_records])
-            output.metrics.setdefault("touched_files", sorted(touched_files))
-            output.metrics.setdefault("schema_repairs", schema_repairs)
             _trace_log(
                 trace,
-                "worker_final",
+                "worker_max_iterations",
                 {
                     **trace_base,
-                    "iteration": iteration,
-                    "status": output.status.value,
-                    "summary": output.summary,
-                    "failure_signature": output.failure_signature,
+                    "iteration": max_iterations,
+                    "max_iterations": max_iterations,
                     "model_calls": model_calls,
                     "tool_calls": len(tool_call_records),
                     "elapsed_ms": elapsed_ms,
                     "schema_repairs": schema_repairs,
                 },
             )
-            return finalize(output)
-
-        elapsed_ms = (time.perf_counter() - start) * 1000
-        _trace_log(
-            trace,
-            "worker_max_iterations",
-            {
-                **trace_base,
-                "iteration": max_iterations,
-                "max_iterations": max_iterations,
-                "model_calls": model_calls,
-                "tool_calls": len(tool_call_records),
-                "elapsed_ms": elapsed_ms,
-                "schema_repairs": schema_repairs,
-            },
-        )
-        return finalize(
-            WorkerOutput(
-            status=WorkerStatus.FAILURE,
-            summary=f"worker exceeded max_iterations={max_iterations}",
-            artifacts=[],
-            metrics={
-                "elapsed_ms": elapsed_ms,
-                "model_calls": model_calls,
-                "tool_calls": len(tool_call_records),
-                "iteration_count": max_iterations,
-                "tool_call_records": [record.__dict__ for record in tool_call_records],
-                "schema_repairs": schema_repairs,
-            },
-            next_actions=["Reduce tool calls, change strategy, or adjust planning."],
-            failure_signature="worker-max-iterations",
+            return finalize(
+                WorkerOutput(
+                status=WorkerStatus.FAILURE,
+                summary=f"worker exceeded max_iterations={max_iterations}",
+                artifacts=[],
+                metrics={
+                    "elapsed_ms": elapsed_ms,
+                    "model_calls": model_calls,
+                    "tool_calls": len(tool_call_records),
+                    "iteration_count": max_iterations,
+                    "tool_call_records": [record.__dict__ for record in tool_call_records],
+                    "schema_repairs": schema_repairs,
+                },
+                next_actions=["Reduce tool calls, change strategy, or adjust planning."],
+                failure_signature="worker-max-iterations",
+                )
             )
-        )
+        finally:
+            if tool_pool is not None:
+                tool_pool.shutdown(wait=True)
 
 
 def _coerce_output(data: dict[str, Any]) -> WorkerOutput:
@@ -483,6 +561,14 @@ def _coerce_output(data: dict[str, Any]) -> WorkerOutput:
     )
 
 
+def _prompt_prefix_meta(llm_client: Any, tools: list[dict[str, Any]]) -> dict[str, Any]:
+    prefix_hash = getattr(llm_client, "prompt_prefix_hash", None)
+    if not callable(prefix_hash):
+        return {}
+    value = prefix_hash(tools)
+    return {"prompt_prefix_hash": value} if value else {}
+
+
 def _tool_descriptors(tools: dict[str, Any]) -> list[dict[str, Any]]:
     descriptors: list[dict[str, Any]] = []
     for name in sorted(tools):
@@ -537,6 +623,54 @@ def _is_side_effectful_tool_call(tool_name: str, action: str) -> bool:
     return is_side_effectful(tool_name, action)
 
 
+def _tool_parallelism_from_env() -> int:
+    raw = os.environ.get("TOKIMON_WORKER_TOOL_CONCURRENCY", "")
+    try:
+        return max(1, int(raw.strip()))
+    except ValueError:
+        return _DEFAULT_TOOL_PARALLELISM
+
+
+def _read_only_batch(tool_calls: list[dict[str, Any]], start: int, *, approval_mode: str) -> list[int]:
+    """Indices of the contiguous run of parallel-safe calls beginning at ``start``.
+
+    A call is parallel-safe when it is one of the pure reads in
+    ``_PARALLEL_SAFE_ACTIONS`` and needs no approval. Any other call ends the run,
+    so reads never overtake a write requested before them.
+    """
+
+    batch: list[int] = []
+    for index in range(start, len(tool_calls)):
+        call = tool_calls[index]
+        tool_name = str(call.get("tool", ""))
+        action = str(call.get("action", ""))
+        if (tool_name, action) not in _PARALLEL_SAFE_ACTIONS:
+            break
+        risk = tool_risk(tool_name, action)
+        if approval_mode != "off" and risk is not None and risk.requires_approval:
+            break
+        batch.append(index)
+    return batch
+
+
+def _invoke_tool_calls_parallel(
+    tools: dict[str, Any],
+    tool_calls: list[dict[str, Any]],
+    batch: list[int],
+    *,
+    pool: Executor,
+) -> dict[int, ToolCallRecord]:
+    def invoke(index: int) -> ToolCallRecord:
+        call = tool_calls[index]
+        raw_args = call.get("args", {}) or {}
+        args = raw_args if isinstance(raw_args, dict) else {}
+        policy_decision = _tool_policy_decision(str(call.get("tool", "")), str(call.get("action", "")), args)
+        return _invoke_tool_call(tools, call, policy_decision=policy_decision)
+
+    records = list(pool.map(invoke, batch))
+    return dict(zip(batch, records))
+
+
 def _tool_policy_decision(tool_name: str, action: str, args: dict[str, Any]) -> dict[str, Any]:
     _ = args
     risk = tool_risk(tool_name, action)
@@ -616,6 +750,8 @@ def _invoke_tool_call(tools: dict[str, Any], call: dict[str, Any], *, policy_dec
             data=result.data,
             elapsed_ms=result.elapsed_ms,
             error=result.error,
+            cache_hit=result.cache_hit,
+            failure_signature=result.failure_signature,
         )
     except Exception as exc:
         return ToolCallRecord(
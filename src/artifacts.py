@@ -1,19 +1,45 @@
-"""Artifact store for workflow steps."""
+"""Artifact store for workflow steps.
+
+Step files are content-addressed: each payload is serialized once, hashed while
+in memory, and stored as an immutable blob keyed by its SHA-256 digest. The
+per-step files (`step_result.json`, `outputs.json`, `artifacts.json`,
+`replay.json`) are hard links to those blobs, so readers keep opening the same
+paths while identical payloads across attempts and runs share one copy on disk.
+Each step directory also gets a `manifest.json` mapping file names to digests.
+
+A blob whose only remaining link is the blob itself is no longer referenced by
+any step directory; `collect_unreferenced_blobs` deletes those (``tokimon
+memory gc-artifacts`` runs it over the memory store's blobs).
+"""
 
 from __future__ import annotations
 
+import errno
 import hashlib
 import json
+import os
+import time
+import uuid
 from pathlib import Path
 from typing import Any
 
 from memory.store import MemoryStore
 
 
+STEP_FILES: tuple[str, ...] = ("step_result.json", "outputs.json", "artifacts.json", "replay.json")
+MANIFEST_FILE = "manifest.json"
+# Blobs younger than this may be about to be linked by a concurrent write_step.
+BLOB_GC_MIN_AGE_S = 3600.0
+
+
 class ArtifactStore:
-    def __init__(self, base_dir: Path, memory_store: MemoryStore | None = None) -> None:
+    def __init__(self, base_dir: Path, memory_store: MemoryStore | None = None, *, blob_dir: Path | None = None) -> None:
         self.base_dir = base_dir
         self.memory_store = memory_store
+        if blob_dir is None:
+            # Share blobs across runs through the memory store when there is one; otherwise per run.
+            blob_dir = memory_store.artifacts_dir / "blobs" if memory_store else base_dir.parent / "blobs"
+        self.blob_dir = blob_dir
 
     def write_step(
         self,
@@ -27,25 +53,95 @@ class ArtifactStore:
     ) -> str:
         step_dir = self.base_dir / step_id
         step_dir.mkdir(parents=True, exist_ok=True)
-        step_result_path = step_dir / "step_result.json"
-        outputs_path = step_dir / "outputs.json"
-        replay_path = step_dir / "replay.json"
-        step_result_path.write_text(_stable_json_dumps(step_result or {}))
-        outputs_path.write_text(_stable_json_dumps(outputs or {}))
-        artifacts_path = step_dir / "artifacts.json"
-        artifacts_path.write_text(_stable_json_dumps(artifacts))
-        replay_path.write_text(_stable_json_dumps(replay_record or {}))
-        digest = self._hash_files([step_result_path, outputs_path, artifacts_path, replay_path])
+        payloads = {
+            "step_result.json": step_result or {},
+            "outputs.json": outputs or {},
+            "artifacts.json": artifacts,
+            "replay.json": replay_record or {},
+        }
+        hasher = hashlib.sha256()
+        files: dict[str, dict[str, Any]] = {}
+        for name in STEP_FILES:
+            data = _stable_json_dumps(payloads[name]).encode("utf-8")
+            hasher.update(data)
+            blob_digest = hashlib.sha256(data).hexdigest()
+            self._link_blob(self._put_blob(blob_digest, data), step_dir / name, data)
+            files[name] = {"sha256": blob_digest, "size": len(data)}
+        digest = hasher.hexdigest()
+        _atomic_write_bytes(step_dir / MANIFEST_FILE, _stable_json_dumps({"digest": digest, "files": files}).encode("utf-8"))
         if self.memory_store:
             artifact_id = f"{task_id}-{step_id}-{digest[:8]}"
             self.memory_store.index_artifact(artifact_id, step_id, task_id, step_dir, digest, {"count": len(artifacts)})
         return digest
 
-    def _hash_files(self, paths: list[Path]) -> str:
-        hasher = hashlib.sha256()
-        for path in paths:
-            hasher.update(path.read_bytes())
-        return hasher.hexdigest()
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / f"{digest}.json"
+
+    def _put_blob(self, digest: str, data: bytes) -> Path:
+        path = self.blob_path(digest)
+        if path.exists():
+            return path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write_bytes(path, data)
+        try:
+            # Blobs are shared through hard links; make accidental in-place edits fail loudly.
+            os.chmod(path, 0o444)
+        except OSError:
+            pass
+        return path
+
+    def _link_blob(self, blob: Path, dest: Path, data: bytes) -> None:
+        tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            os.link(blob, tmp)
+        except OSError as exc:
+            if exc.errno not in {errno.EXDEV, errno.EMLINK, errno.EPERM, errno.ENOTSUP, errno.EACCES, errno.ENOENT}:
+                raise
+            # Different filesystem, link limit, no hard-link support, or the blob was just
+            # garbage-collected: keep a private copy.
+            _atomic_write_bytes(dest, data)
+            return
+        os.replace(tmp, dest)
+
+
+def collect_unreferenced_blobs(blob_dir: Path, *, min_age_s: float = BLOB_GC_MIN_AGE_S) -> dict[str, int]:
+    """Delete blobs no step file links to any more (``st_nlink == 1``) and older than ``min_age_s``."""
+
+    removed = 0
+    freed = 0
+    kept = 0
+    cutoff = time.time() - min_age_s
+    for blob in sorted(blob_dir.glob("*/*.json")):
+        try:
+            stat = blob.stat()
+        except OSError:
+            continue
+        if stat.st_nlink > 1 or stat.st_mtime > cutoff:
+            kept += 1
+            continue
+        try:
+            blob.unlink()
+        except OSError:
+            kept += 1
+            continue
+        removed += 1
+        freed += stat.st_size
+    for shard in blob_dir.glob("*"):
+        try:
+            shard.rmdir()
+        except OSError:
+            pass
+    return {"removed": removed, "freed_bytes": freed, "kept": kept}
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
 
 
 def _stable_json_dumps(payload: Any) -> str:
@@ -0,0 +1,69 @@
+"""Benchmark the resident grep index against ripgrep.
+
+Usage (from ``src/``)::
+
+    python -m benchmarks.grep_index --root /path/to/large/repo --pattern "def main" --pattern "TODO"
+
+Reports the one-off index build time, then the median per-search time of the
+index, ``rg`` (when installed) and the fallback scan for each pattern.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import statistics
+import time
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+from tools.grep_tool import GrepTool, default_workspace_index
+
+
+_DEFAULT_PATTERNS = ("import os", "def __init__", r"class \w+Tool", "TODO")
+
+
+def run_grep_benchmark(root: Path, patterns: list[str], *, repeats: int = 3) -> dict[str, Any]:
+    index = default_workspace_index(root)
+    indexed_tool = GrepTool(root, index=index)
+    plain_tool = GrepTool(root)
+
+    build_start = time.perf_counter()
+    index.build()
+    build_s = time.perf_counter() - build_start
+
+    results: list[dict[str, Any]] = []
+    for pattern in patterns:
+        row: dict[str, Any] = {"pattern": pattern, "index_s": _median_time(indexed_tool, pattern, repeats)}
+        if shutil.which("rg"):
+            row["rg_s"] = _median_time(plain_tool, pattern, repeats)
+        with mock.patch("tools.grep_tool.shutil.which", return_value=None):
+            row["fallback_s"] = _median_time(plain_tool, pattern, repeats)
+        results.append(row)
+    return {"root": str(root), "build_s": build_s, "index": index.stats(), "searches": results}
+
+
+def _median_time(tool: GrepTool, pattern: str, repeats: int) -> float:
+    samples = []
+    for _ in range(max(1, repeats)):
+        start = time.perf_counter()
+        tool.search(pattern)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", type=Path, default=Path.cwd())
+    parser.add_argument("--pattern", action="append", dest="patterns")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args(argv)
+    report = run_grep_benchmark(args.root, args.patterns or list(_DEFAULT_PATTERNS), repeats=args.repeats)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,6 +15,7 @@ from dataclasses import replace
 from pathlib import Path
 from typing import TextIO
 
+from artifacts import collect_unreferenced_blobs
 from chat_ui.server import ChatUIConfig, run_chat_ui
 from gateway import health_client as gateway_health_client
 from gateway.health_client import call_gateway_rpc, check_gateway_health
@@ -37,6 +38,8 @@ from self_improve.provider_mix import mixed_provider_for_session, validate_mixed
 from skills.builder import SkillBuilder
 from skills.registry import SkillRegistry
 from skills.spec import SkillSpec
+from workflow.engine import WorkflowEngine
+from workflow.journal import journal_path_for
 from replay import ReplayAbort, replay_run
 from policy.tool_approval import approval_allowlist_file_path, load_approval_allowlist, write_allowlist_file
 
@@ -216,7 +219,12 @@ def build_parser(*, exit_on_error: bool = True) -> argparse.ArgumentParser:
     memory_status.add_argument("--deep", action="store_true", help="Include additional index/file reconciliation details.")
     memory_status.add_argument("--index", action="store_true", help="Reindex when the store is dirty.")
 
-    memory_sub.add_parser("index", parents=[memory_common], help="Rebuild the memory store index.")
+    memory_index = memory_sub.add_parser("index", parents=[memory_common], help="Update the memory store index from changed Lesson files.")
+    memory_index.add_argument("--full", action="store_true", help="Re-parse every Lesson file and replace the whole index.")
+
+    memory_sub.add_parser(
+        "gc-artifacts", parents=[memory_common], help="Delete artifact blobs that no run directory links to any more."
+    )
 
     memory_search = memory_sub.add_parser("search", parents=[memory_common], help="Search Lessons by text query.")
     memory_search.add_argument("query", nargs="?", help="Search query text.")
@@ -352,7 +360,11 @@ def _cmd_inspect_run(args: argparse.Namespace) -> int:
     if run_manifest.exists():
         _write_line(sys.stdout, run_manifest.read_text())
     if workflow_state.exists():
-        _write_line(sys.stdout, workflow_state.read_text())
+        journal = journal_path_for(workflow_state)
+        if journal.exists() and journal.stat().st_size:
+            _write_line(sys.stdout, json.dumps(WorkflowEngine.load(workflow_state).to_payload(), indent=2))
+        else:
+            _write_line(sys.stdout, workflow_state.read_text())
     return 0
 
 
@@ -914,8 +926,8 @@ def _cmd_memory(args: argparse.Namespace, workspace_root: Path) -> int:
             emit(
                 {
                     "ok": True,
-                    "usage": "tokimon memory {status,index,search} [--root PATH] [--json] [--verbose]",
-                    "subcommands": ["status", "index", "search"],
+                    "usage": "tokimon memory {status,index,search,gc-artifacts} [--root PATH] [--json] [--verbose]",
+                    "subcommands": ["status", "index", "search", "gc-artifacts"],
                     "examples": [
                         "tokimon memory status",
                         "tokimon memory index",
@@ -928,9 +940,10 @@ def _cmd_memory(args: argparse.Namespace, workspace_root: Path) -> int:
         _write_line(sys.stdout, "tokimon memory")
         _write_line(sys.stdout, "")
         _write_line(sys.stdout, "Subcommands:")
-        _write_line(sys.stdout, "  status   Show memory store status")
-        _write_line(sys.stdout, "  index    Rebuild the memory store index")
-        _write_line(sys.stdout, "  search   Search Lessons by text query")
+        _write_line(sys.stdout, "  status        Show memory store status")
+        _write_line(sys.stdout, "  index         Update the memory store index")
+        _write_line(sys.stdout, "  search        Search Lessons by text query")
+        _write_line(sys.stdout, "  gc-artifacts  Delete artifact blobs no run links to")
         _write_line(sys.stdout, "")
         _write_line(sys.stdout, "Examples:")
         _write_line(sys.stdout, "  tokimon memory status")
@@ -957,9 +970,16 @@ def _cmd_memory(args: argparse.Namespace, workspace_root: Path) -> int:
             emit(payload)
             return 0
         case "index":
-            payload = store.cli_reindex()
+            payload = store.cli_reindex(full=bool(getattr(args, "full", False)))
             emit(payload)
             return 0 if payload.get("ok") else 1
+        case "gc-artifacts":
+            # Run directories are deleted by hand; reclaim the shared blobs they no longer link to.
+            blob_dir = store.artifacts_dir / "blobs"
+            payload = {"ok": True, "root": str(store.root), "blob_dir": str(blob_dir)}
+            payload.update(collect_unreferenced_blobs(blob_dir))
+            emit(payload)
+            return 0
         case "search":
             query_flag = getattr(args, "query_flag", None)
             query_positional = getattr(args, "query", None)
@@ -29,6 +29,11 @@ class AsyncExecutor:
             results.append(result)
         return results
 
+    def submit(self, task: Callable[[], Awaitable[T]]) -> asyncio.Task[T]:
+        """Schedule one task under the concurrency limit without waiting for it."""
+
+        return asyncio.ensure_future(self._wrap(task))
+
     async def _wrap(self, task: Callable[[], Awaitable[T]]) -> T:
         async with self._semaphore:
             if self.config.timeout_seconds:
@@ -55,3 +55,5 @@ class ToolCallRecord:
     elapsed_ms: float
     cached: bool = False
     error: str | None = None
+    cache_hit: bool | None = None
+    failure_signature: str | None = None
@@ -0,0 +1,295 @@
+"""Async-native LLM client protocol and shared helpers.
+
+`AsyncLLMClient` adds ``send_async`` next to the blocking ``send``. The CLI
+adapters implement it with `asyncio.create_subprocess_exec` (see
+`run_cli_async`), so many concurrent steps or chat turns can wait on the model
+from one event loop instead of holding a thread each.
+
+Every CLI call, sync or async, runs inside the provider's `ProviderLimiter`, a
+process-wide counting semaphore that threads and event loops share. The limit
+comes from ``TOKIMON_<PROVIDER>_MAX_CONCURRENCY`` or ``TOKIMON_LLM_MAX_CONCURRENCY``
+(default 8).
+
+`ensure_async_client` lets async callers use sync-only clients (mocks, custom
+adapters) through a worker thread, and `SyncLLMClientAdapter` lets sync callers
+keep using an async-only client through a shared background loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import subprocess
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterator, Protocol
+
+
+_DEFAULT_MAX_CONCURRENCY = 8
+
+
+class AsyncLLMClient(Protocol):
+    async def send_async(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        response_schema: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        ...
+
+
+class _Waiter:
+    __slots__ = ("wake", "granted")
+
+    def __init__(self, wake: Callable[[], None]) -> None:
+        self.wake = wake
+        self.granted = False
+
+
+class ProviderLimiter:
+    """FIFO counting semaphore usable from any thread and any event loop."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = max(1, int(limit))
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters: deque[_Waiter] = deque()
+        self.peak = 0
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        event = threading.Event()
+        waiter = self._enter(event.set)
+        if waiter is not None:
+            event.wait()
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def slot_async(self) -> AsyncIterator[None]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+        waiter = self._enter(lambda: loop.call_soon_threadsafe(_resolve, future))
+        if waiter is not None:
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._lock:
+                    granted = waiter.granted
+                    if not granted:
+                        self._waiters.remove(waiter)
+                if granted:
+                    self._release()
+                raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"limit": self.limit, "active": self._active, "waiting": len(self._waiters), "peak": self.peak}
+
+    def _enter(self, wake: Callable[[], None]) -> _Waiter | None:
+        with self._lock:
+            if self._active < self.limit and not self._waiters:
+                self._active += 1
+                self.peak = max(self.peak, self._active)
+                return None
+            waiter = _Waiter(wake)
+            self._waiters.append(waiter)
+            return waiter
+
+    def _release(self) -> None:
+        with self._lock:
+            if not self._waiters:
+                self._active -= 1
+                return
+            # Hand the slot straight to the next waiter; the active count is unchanged.
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+        waiter.wake()
+
+
+def _resolve(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_LIMITERS: dict[str, ProviderLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def provider_limiter(provider: str) -> ProviderLimiter:
+    """Return the process-wide limiter for ``provider``, creating it from the environment once."""
+
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(provider)
+        if limiter is None:
+            limiter = ProviderLimiter(_max_concurrency_from_env(provider))
+            _LIMITERS[provider] = limiter
+        return limiter
+
+
+def _max_concurrency_from_env(provider: str) -> int:
+    for name in (f"TOKIMON_{provider.upper()}_MAX_CONCURRENCY", "TOKIMON_LLM_MAX_CONCURRENCY"):
+        raw = (os.environ.get(name) or "").strip()
+        if not raw:
+            continue
+        try:
+            return max(1, int(raw))
+        except ValueError:
+            continue
+    return _DEFAULT_MAX_CONCURRENCY
+
+
+async def run_cli_async(
+    cmd: list[str],
+    *,
+    prompt: str,
+    env: dict[str, str],
+    cwd: Path,
+    timeout_s: float | None,
+) -> subprocess.CompletedProcess[str]:
+    """Async counterpart of ``subprocess.run(cmd, input=prompt, capture_output=True, timeout=...)``.
+
+    Raises ``FileNotFoundError`` and ``subprocess.TimeoutExpired`` like the sync call, so
+    adapters can share their error mapping. Timeouts and cancellation kill the process group.
+    """
+
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=env,
+        cwd=str(cwd),
+        start_new_session=True,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(prompt.encode("utf-8")), timeout=timeout_s)
+    except asyncio.TimeoutError:
+        await _kill_process_group(proc)
+        raise subprocess.TimeoutExpired(cmd, timeout_s) from None
+    except asyncio.CancelledError:
+        await _kill_process_group(proc)
+        raise
+    return subprocess.CompletedProcess(
+        cmd,
+        proc.returncode if proc.returncode is not None else -1,
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace"),
+    )
+
+
+async def _kill_process_group(proc: asyncio.subprocess.Process) -> None:
+    if proc.returncode is None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except OSError:
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+    await proc.wait()
+
+
+class _ThreadedAsyncClient:
+    """Async view of a sync-only client; each call runs on a worker thread."""
+
+    def __init__(self, inner: Any) -> None:
+        self.inner = inner
+
+    def send(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        response_schema: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        return self.inner.send(messages, tools=tools, response_schema=response_schema)
+
+    async def send_async(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        response_schema: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        return await asyncio.to_thread(self.inner.send, messages, tools=tools, response_schema=response_schema)
+
+
+def ensure_async_client(client: Any) -> AsyncLLMClient:
+    """Return ``client`` when it implements ``send_async``; otherwise wrap its blocking ``send``."""
+
+    if callable(getattr(client, "send_async", None)):
+        return client
+    return _ThreadedAsyncClient(client)
+
+
+class SyncLLMClientAdapter:
+    """Blocking ``send`` for an async-only client, run on a shared background event loop."""
+
+    def __init__(self, inner: AsyncLLMClient) -> None:
+        self.inner = inner
+
+    def send(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        response_schema: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        loop = _background_loop()
+        if threading.current_thread() is _LOOP_THREAD:
+            raise RuntimeError("SyncLLMClientAdapter.send() cannot be called from its own event loop")
+        coro = self.inner.send_async(messages, tools=tools, response_schema=response_schema)
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    async def send_async(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        response_schema: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        return await self.inner.send_async(messages, tools=tools, response_schema=response_schema)
+
+
+async def send_many(client: Any, requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Send a batch of requests concurrently and return the responses in request order.
+
+    Each request is a dict of ``send`` keyword arguments (``messages`` and optionally
+    ``tools`` / ``response_schema``). CLI clients bound the fan-out with their provider limiter.
+    """
+
+    async_client = ensure_async_client(client)
+    return list(
+        await asyncio.gather(
+            *(
+                async_client.send_async(
+                    request["messages"],
+                    tools=request.get("tools"),
+                    response_schema=request.get("response_schema"),
+                )
+                for request in requests
+            )
+        )
+    )
+
+
+_LOOP: asyncio.AbstractEventLoop | None = None
+_LOOP_THREAD: threading.Thread | None = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _LOOP, _LOOP_THREAD
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="tokimon-llm-loop", daemon=True)
+            thread.start()
+            _LOOP, _LOOP_THREAD = loop, thread
+        return _LOOP
@@ -0,0 +1,289 @@
+"""Opt-in on-disk response cache for LLM clients.
+
+`CachingLLMClient` wraps any `LLMClient` and answers byte-identical requests
+from disk. The key is a SHA-256 over the provider, model, client settings, the
+rendered prompt, the tool descriptors, and the response schema, so a cached
+answer is only reused when the CLI would have received exactly the same input.
+Entries expire after a TTL and the directory is trimmed least-recently-used
+first once it grows past a byte budget.
+
+Calls are not cached when the wrapped client can change the workspace or read
+live data (a writable Codex sandbox, Codex web search, Claude with permissions
+skipped), inside a `bypass()` block, or when the response is an adapter error.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from .async_client import ensure_async_client
+from .client import LLMClient, _parse_env_bool, _parse_env_int, _render_prompt
+
+
+_DEFAULT_TTL_S = 7 * 24 * 3600
+_DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+_STAT_KEYS = ("hits", "misses", "stores", "bypassed", "expired", "evictions")
+
+
+class CachingLLMClient:
+    def __init__(
+        self,
+        inner: LLMClient,
+        cache_dir: Path,
+        *,
+        provider: str | None = None,
+        ttl_s: float = _DEFAULT_TTL_S,
+        max_bytes: int = _DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.inner = inner
+        self.cache_dir = cache_dir
+        self.provider = provider or type(inner).__name__
+        self.ttl_s = float(ttl_s)
+        self.max_bytes = max(1, int(max_bytes))
+        self._cacheable = _is_cacheable_client(inner)
+        # A context variable (not a thread-local) so bypass() also scopes to one asyncio task.
+        self._bypass: contextvars.ContextVar[int] = contextvars.ContextVar(
+            f"tokimon_llm_cache_bypass_{id(self)}",
+            default=0,
+        )
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(_STAT_KEYS, 0)
+        self._size_bytes: int | None = None
+
+    @classmethod
+    def from_env(cls, inner: LLMClient, *, workspace_dir: Path, provider: str | None = None) -> "CachingLLMClient":
+        cache_dir_raw = (os.environ.get("TOKIMON_LLM_CACHE_DIR") or "").strip()
+        cache_dir = Path(cache_dir_raw).expanduser() if cache_dir_raw else workspace_dir / ".tokimon-tmp" / "llm-cache"
+        return cls(
+            inner,
+            cache_dir,
+            provider=provider,
+            ttl_s=_parse_env_int(os.environ.get("TOKIMON_LLM_CACHE_TTL_S"), default=_DEFAULT_TTL_S),
+            max_bytes=_parse_env_int(os.environ.get("TOKIMON_LLM_CACHE_MAX_BYTES"), default=_DEFAULT_MAX_BYTES),
+        )
+
+    def send(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        response_schema: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        if not self._cacheable or self._bypass.get():
+            self._count("bypassed")
+            return self.inner.send(messages, tools=tools, response_schema=response_schema)
+
+        key = self.cache_key(messages, tools=tools, response_schema=response_schema)
+        cached = self._load(key)
+        if cached is not None:
+            self._count("hits")
+            return cached
+        self._count("misses")
+        response = self.inner.send(messages, tools=tools, response_schema=response_schema)
+        if _is_storable(response):
+            self._store(key, response)
+        return response
+
+    async def send_async(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        response_schema: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        inner = ensure_async_client(self.inner)
+        if not self._cacheable or self._bypass.get():
+            self._count("bypassed")
+            return await inner.send_async(messages, tools=tools, response_schema=response_schema)
+
+        key = self.cache_key(messages, tools=tools, response_schema=response_schema)
+        cached = self._load(key)
+        if cached is not None:
+            self._count("hits")
+            return cached
+        self._count("misses")
+        response = await inner.send_async(messages, tools=tools, response_schema=response_schema)
+        if _is_storable(response):
+            self._store(key, response)
+        return response
+
+    def prompt_prefix_hash(self, tools: list[dict[str, Any]] | None) -> str | None:
+        prefix_hash = getattr(self.inner, "prompt_prefix_hash", None)
+        return prefix_hash(tools) if callable(prefix_hash) else None
+
+    @contextmanager
+    def bypass(self) -> Iterator[None]:
+        """Send calls made in this thread or task inside the block straight to the wrapped client."""
+
+        token = self._bypass.set(self._bypass.get() + 1)
+        try:
+            yield
+        finally:
+            self._bypass.reset(token)
+
+    def cache_key(
+        self,
+        messages: list[dict[str, Any]],
+        *,
+        tools: list[dict[str, Any]] | None = None,
+        response_schema: dict[str, Any] | None = None,
+    ) -> str:
+        material = {
+            "provider": self.provider,
+            "model": getattr(getattr(self.inner, "settings", None), "model", None),
+            "client": _client_fingerprint(self.inner),
+            "prompt": _render_prompt(messages, tools=tools),
+            "tools": tools,
+            "response_schema": response_schema,
+        }
+        encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _load(self, key: str) -> dict[str, Any] | None:
+        path = self._entry_path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        created_at = entry.get("created_at") if isinstance(entry, dict) else None
+        response = entry.get("response") if isinstance(entry, dict) else None
+        if not isinstance(created_at, (int, float)) or not isinstance(response, dict):
+            return None
+        if time.time() - created_at > self.ttl_s:
+            self._count("expired")
+            self._remove(path)
+            return None
+        try:
+            # mtime doubles as the LRU access time.
+            os.utime(path)
+        except OSError:
+            pass
+        return response
+
+    def _store(self, key: str, response: dict[str, Any]) -> None:
+        path = self._entry_path(key)
+        data = json.dumps({"created_at": time.time(), "key": key, "response": response}, sort_keys=True).encode("utf-8")
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            previous = path.stat().st_size if path.exists() else 0
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        self._count("stores")
+        with self._lock:
+            if self._size_bytes is not None:
+                self._size_bytes += len(data) - previous
+        if self._current_size() > self.max_bytes:
+            self._evict()
+
+    def _remove(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        with self._lock:
+            if self._size_bytes is not None:
+                self._size_bytes -= size
+
+    def _current_size(self) -> int:
+        with self._lock:
+            if self._size_bytes is not None:
+                return self._size_bytes
+        total = sum(size for _, size, _ in self._scan())
+        with self._lock:
+            self._size_bytes = total
+        return total
+
+    def _scan(self) -> list[tuple[float, int, Path]]:
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self) -> None:
+        entries = sorted(self._scan())
+        total = sum(size for _, size, _ in entries)
+        # Trim to 90% of the budget so a full cache does not rescan on every store.
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            self._count("evictions")
+        with self._lock:
+            self._size_bytes = total
+
+
+def maybe_wrap_with_cache(client: LLMClient, *, workspace_dir: Path, provider: str | None = None) -> LLMClient:
+    """Wrap ``client`` in a `CachingLLMClient` when ``TOKIMON_LLM_CACHE`` is enabled."""
+
+    if not _parse_env_bool(os.environ.get("TOKIMON_LLM_CACHE"), default=False):
+        return client
+    return CachingLLMClient.from_env(client, workspace_dir=workspace_dir, provider=provider)
+
+
+def llm_cache_stats(client: Any, *, since: dict[str, int] | None = None) -> dict[str, int] | None:
+    """Cache counters for ``client`` (minus a previous snapshot), or None when it is not cached."""
+
+    if not isinstance(client, CachingLLMClient):
+        return None
+    current = client.stats()
+    if since:
+        current = {name: value - int(since.get(name, 0)) for name, value in current.items()}
+    return current
+
+
+def _is_cacheable_client(client: Any) -> bool:
+    settings = getattr(client, "settings", None)
+    if settings is None:
+        return True
+    if str(getattr(settings, "sandbox", "read-only") or "read-only") != "read-only":
+        return False
+    if getattr(settings, "search", False):
+        return False
+    if getattr(settings, "dangerously_skip_permissions", False):
+        return False
+    return True
+
+
+def _client_fingerprint(client: Any) -> str:
+    settings = getattr(client, "settings", None)
+    workspace_dir = getattr(client, "workspace_dir", None)
+    return f"{type(client).__name__}|{settings!r}|{workspace_dir}"
+
+
+def _is_storable(response: Any) -> bool:
+    if not isinstance(response, dict):
+        return False
+    # Adapter errors (timeouts, missing CLI, invalid JSON) are transient; retry them next time.
+    return not str(response.get("failure_signature") or "").startswith("llm-")
@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import shlex
+import shutil
 import subprocess
 import tempfile
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any, Protocol
 
+from .async_client import provider_limiter, run_cli_async
+from .process_pool import WarmProcessPool, shared_pool, spawn_cli_process
+
 _DEFAULT_CODEX_MODEL = "gpt-5.4"
 
 
@@ -164,9 +171,18 @@ class ClaudeCLIClient:
     and expects the agent result to decode as a JSON object.
     """
 
-    def __init__(self, workspace_dir: Path, settings: ClaudeCLISettings | None = None) -> None:
+    def __init__(
+        self,
+        workspace_dir: Path,
+        settings: ClaudeCLISettings | None = None,
+        *,
+        pool_size: int | None = None,
+    ) -> None:
         self.workspace_dir = workspace_dir.resolve()
         self.settings = settings or ClaudeCLISettings.from_env()
+        self.pool_size = _pool_size_from_env() if pool_size is None else int(pool_size)
+        self._pooled_env: tuple[dict[str, str], int] | None = None
+        self._prompt_builders = _PromptBuilders()
 
     def send(
         self,
@@ -174,20 +190,66 @@ class ClaudeCLIClient:
         tools: list[dict[str, Any]] | None = None,
         response_schema: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
+        cmd, prompt, env = self._prepare(messages, tools)
+        try:
+            with provider_limiter("claude").slot():
+                pool = self._warm_pool(cmd, env)
+                if pool is not None:
+                    with pool.acquire() as warm:
+                        completed = warm.communicate(prompt, timeout_s=self.settings.timeout_s)
+                else:
+                    completed = subprocess.run(
+                        cmd,
+                        input=prompt,
+                        text=True,
+                        capture_output=True,
+                        env=env,
+                        cwd=str(self.workspace_dir),
+                        timeout=self.settings.timeout_s,
+                        check=False,
+                    )
+        except Exception as exc:
+            return _claude_exec_error(exc, self.settings)
+        return _parse_claude_output(completed)
+
+    async def send_async(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        response_schema: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        cmd, prompt, env = self._prepare(messages, tools)
+        try:
+            async with provider_limiter("claude").slot_async():
+                completed = await run_cli_async(
+                    cmd,
+                    prompt=prompt,
+                    env=env,
+                    cwd=self.workspace_dir,
+                    timeout_s=self.settings.timeout_s,
+                )
+        except Exception as exc:
+            return _claude_exec_error(exc, self.settings)
+        return _parse_claude_output(completed)
+
+    def prompt_prefix_hash(self, tools: list[dict[str, Any]] | None) -> str | None:
+        """SHA-256 of the static prompt prefix last rendered for this tool descriptor list."""
+
+        return self._prompt_builders.prefix_hash(tools)
+
+    def _prepare(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+    ) -> tuple[list[str], str, dict[str, str]]:
         tmp_root = _ensure_tmp_root(self.workspace_dir)
-        env = os.environ.copy()
-        if tmp_root is not None:
-            env.update({"TMPDIR": str(tmp_root), "TEMP": str(tmp_root), "TMP": str(tmp_root)})
-        env, delegation_depth = _mark_tokimon_delegated_env(env)
-        prompt = _render_prompt(
-            messages,
-            tools=tools,
-            preamble=_claude_cli_preamble(
-                self.settings,
-                self.workspace_dir,
-                delegation_depth=delegation_depth,
-            ),
+        env, delegation_depth = self._subprocess_env(tmp_root)
+        preamble = _claude_cli_preamble(
+            self.settings,
+            self.workspace_dir,
+            delegation_depth=delegation_depth,
         )
+        prompt = self._prompt_builders.get(tools, preamble).render(messages)
 
         settings_path = (self.settings.settings_path or "").strip() or None
         if settings_path is None and self.settings.settings_json and tmp_root is not None:
@@ -206,82 +268,32 @@ class ClaudeCLIClient:
             settings_path=settings_path,
             force_json=True,
         )
-        try:
-            completed = subprocess.run(
-                cmd,
-                input=prompt,
-                text=True,
-                capture_output=True,
-                env=env,
-                cwd=str(self.workspace_dir),
-                timeout=self.settings.timeout_s,
-                check=False,
-            )
-        except FileNotFoundError as exc:
-            return _llm_error(
-                "claude cli not found",
-                failure_signature="llm-claude-cli-missing",
-                details=str(exc),
-            )
-        except subprocess.TimeoutExpired:
-            return _llm_error(
-                f"claude cli timed out after {self.settings.timeout_s}s",
-                failure_signature="llm-claude-timeout",
-            )
-        except Exception as exc:  # pragma: no cover
-            return _llm_error(
-                "claude cli error",
-                failure_signature="llm-claude-exception",
-                details=str(exc),
-            )
+        return cmd, prompt, env
 
-        stdout = (completed.stdout or "").strip()
-        if completed.returncode != 0 and not stdout:
-            details = _truncate(completed.stderr or "", 2000)
-            reason = _first_nonempty_line(details)
-            summary = f"claude cli exited {completed.returncode}"
-            if reason:
-                summary = f"{summary}: {reason}"
-            return _llm_error(
-                summary,
-                failure_signature="llm-claude-nonzero-exit",
-                details=details,
-            )
-
-        candidate: Any = stdout
-        try:
-            if stdout:
-                candidate = json.loads(stdout)
-        except json.JSONDecodeError:
-            candidate = stdout
-
-        raw_text = _extract_json_payload(candidate)
-        json_text = _extract_json_text(raw_text)
-        try:
-            payload = json.loads(json_text)
-        except json.JSONDecodeError as exc:
-            embedded = _extract_embedded_json_text(raw_text)
-            if embedded is not None:
-                try:
-                    payload = json.loads(embedded)
-                except json.JSONDecodeError:
-                    payload = None
-            else:
-                payload = None
-            if isinstance(payload, dict):
-                return payload
-            return _llm_error(
-                f"claude returned invalid JSON: {exc}",
-                failure_signature="llm-claude-invalid-json",
-                details=_truncate(stdout, 2000),
-            )
-        if not isinstance(payload, dict):
-            return _llm_error(
-                "claude returned non-object JSON",
-                failure_signature="llm-claude-non-object",
-                details=_truncate(json.dumps(payload), 2000),
-            )
-        return payload
+    def _subprocess_env(self, tmp_root: Path | None) -> tuple[dict[str, str], int]:
+        if self._pooled_env is not None:
+            return self._pooled_env
+        env = os.environ.copy()
+        if tmp_root is not None:
+            env.update({"TMPDIR": str(tmp_root), "TEMP": str(tmp_root), "TMP": str(tmp_root)})
+        prepared = _mark_tokimon_delegated_env(env)
+        if self.pool_size > 0:
+            # Warm processes are started with this env, so pooled clients keep it fixed.
+            self._pooled_env = prepared
+        return prepared
+
+    def _warm_pool(self, cmd: list[str], env: dict[str, str]) -> WarmProcessPool | None:
+        if self.pool_size <= 0:
+            return None
+        workspace_dir = self.workspace_dir
+        return shared_pool(
+            ("claude", tuple(cmd), str(workspace_dir)),
+            lambda: WarmProcessPool(
+                lambda: spawn_cli_process(cmd, cwd=workspace_dir, env=env),
+                size=self.pool_size,
+                max_idle_s=_pool_max_idle_s_from_env(),
+            ),
+        )
 
 
 class CodexCLIClient:
@@ -290,9 +302,18 @@ class CodexCLIClient:
     This adapter shells out to Codex CLI and expects the agent's last message to be a JSON object.
     """
 
-    def __init__(self, workspace_dir: Path, settings: CodexCLISettings | None = None) -> None:
+    def __init__(
+        self,
+        workspace_dir: Path,
+        settings: CodexCLISettings | None = None,
+        *,
+        pool_size: int | None = None,
+    ) -> None:
         self.workspace_dir = workspace_dir.resolve()
         self.settings = settings or CodexCLISettings.from_env()
+        self.pool_size = _pool_size_from_env() if pool_size is None else int(pool_size)
+        self._pooled_env: tuple[dict[str, str], int] | None = None
+        self._prompt_builders = _PromptBuilders()
 
     def send(
         self,
@@ -303,58 +324,29 @@ class CodexCLIClient:
         # Note: Codex CLI supports `--output-schema`, but its accepted JSON Schema subset
         # is stricter than standard Draft-07. For portability, we capture the last agent
         # message and parse JSON ourselves (mirrors the ai-agent-cli approach).
-        tmp_root = _ensure_tmp_root(self.workspace_dir)
-        env = os.environ.copy()
-        if tmp_root is not None:
-            env.update({"TMPDIR": str(tmp_root), "TEMP": str(tmp_root), "TMP": str(tmp_root)})
-        env = _maybe_apply_codex_ripgrep_guard(env, tmp_root=tmp_root)
-        env, delegation_depth = _mark_tokimon_delegated_env(env)
-        prompt = _render_prompt(
-            messages,
-            tools=tools,
-            preamble=_codex_cli_preamble(
-                self.settings,
-                self.workspace_dir,
-                delegation_depth=delegation_depth,
-            ),
-        )
-
-        tmp_kwargs: dict[str, Any] = {"prefix": "tokimon-codex-"}
-        if tmp_root is not None:
-            tmp_kwargs["dir"] = str(tmp_root)
-
-        with tempfile.TemporaryDirectory(**tmp_kwargs) as tmpdir:
+        prompt, env, tmp_root = self._prepare(messages, tools)
+        limiter = provider_limiter("codex")
+        with tempfile.TemporaryDirectory(**_codex_tmp_kwargs(tmp_root)) as tmpdir:
             try:
-                completed, raw_last = _run_codex_exec(
-                    self.settings,
-                    workspace_dir=self.workspace_dir,
-                    prompt=prompt,
-                    env=env,
-                    tmpdir=Path(tmpdir),
-                )
-            except FileNotFoundError as exc:
-                return _llm_error(
-                    "codex cli not found",
-                    failure_signature="llm-codex-cli-missing",
-                    details=str(exc),
-                )
-            except subprocess.TimeoutExpired:
-                return _llm_error(
-                    f"codex cli timed out after {self.settings.timeout_s}s",
-                    failure_signature="llm-codex-timeout",
-                )
-            except Exception as exc:  # pragma: no cover
-                return _llm_error(
-                    "codex cli error",
-                    failure_signature="llm-codex-exception",
-                    details=str(exc),
-                )
+                with limiter.slot():
+                    completed, raw_last = _run_codex_exec(
+                        self.settings,
+                        workspace_dir=self.workspace_dir,
+                        prompt=prompt,
+                        env=env,
+                        tmpdir=Path(tmpdir),
+                        pool=self._warm_pool(env, tmp_root),
+                    )
+            except Exception as exc:
+                return _codex_exec_error(exc, self.settings)
 
             if completed.returncode != 0 and not raw_last:
                 details = _truncate(completed.stderr or completed.stdout, 2000)
-                if _should_retry_codex_with_default(self.settings.model, details):
-                    fallback_settings = replace(self.settings, model=_DEFAULT_CODEX_MODEL)
-                    try:
+                if not _should_retry_codex_with_default(self.settings.model, details):
+                    return _codex_nonzero_error(completed, details)
+                fallback_settings = replace(self.settings, model=_DEFAULT_CODEX_MODEL)
+                try:
+                    with limiter.slot():
                         completed, raw_last = _run_codex_exec(
                             fallback_settings,
                             workspace_dir=self.workspace_dir,
@@ -362,81 +354,111 @@ class CodexCLIClient:
                             env=env,
                             tmpdir=Path(tmpdir),
                         )
-                    except FileNotFoundError as exc:
-                        return _llm_error(
-                            "codex cli not found",
-                            failure_signature="llm-codex-cli-missing",
-                            details=str(exc),
-                        )
-                    except subprocess.TimeoutExpired:
-                        return _llm_error(
-                            f"codex cli timed out after {fallback_settings.timeout_s}s",
-                            failure_signature="llm-codex-timeout",
-                        )
-                    except Exception as exc:  # pragma: no cover
-                        return _llm_error(
-                            "codex cli error",
-                            failure_signature="llm-codex-exception",
-                            details=str(exc),
-                        )
-                    if completed.returncode != 0 and not raw_last:
-                        fallback_details = _truncate(completed.stderr or completed.stdout, 2000)
-                        combined = _truncate(
-                            (
-                                "requested-model failure:\n"
-                                f"{details}\n\n"
-                                "fallback-model failure:\n"
-                                f"{fallback_details}"
-                            ),
-                            2000,
-                        )
-                        reason = _first_nonempty_line(fallback_details) or _first_nonempty_line(details)
-                        summary = f"codex cli exited {completed.returncode}"
-                        if reason:
-                            summary = f"{summary}: {reason}"
-                        return _llm_error(
-                            summary,
-                            failure_signature="llm-codex-nonzero-exit",
-                            details=combined,
-                        )
-                else:
-                    reason = _first_nonempty_line(details)
-                    summary = f"codex cli exited {completed.returncode}"
-                    if reason:
-                        summary = f"{summary}: {reason}"
-                    return _llm_error(
-                        summary,
-                        failure_signature="llm-codex-nonzero-exit",
-                        details=details,
+                except Exception as exc:
+                    return _codex_exec_error(exc, fallback_settings)
+                if completed.returncode != 0 and not raw_last:
+                    return _codex_fallback_error(completed, details)
+
+            return _parse_codex_output(completed, raw_last)
+
+    async def send_async(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        response_schema: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        prompt, env, tmp_root = self._prepare(messages, tools)
+        limiter = provider_limiter("codex")
+        with tempfile.TemporaryDirectory(**_codex_tmp_kwargs(tmp_root)) as tmpdir:
+            try:
+                async with limiter.slot_async():
+                    completed, raw_last = await _run_codex_exec_async(
+                        self.settings,
+                        workspace_dir=self.workspace_dir,
+                        prompt=prompt,
+                        env=env,
+                        tmpdir=Path(tmpdir),
                     )
+            except Exception as exc:
+                return _codex_exec_error(exc, self.settings)
+
+            if completed.returncode != 0 and not raw_last:
+                details = _truncate(completed.stderr or completed.stdout, 2000)
+                if not _should_retry_codex_with_default(self.settings.model, details):
+                    return _codex_nonzero_error(completed, details)
+                fallback_settings = replace(self.settings, model=_DEFAULT_CODEX_MODEL)
+                try:
+                    async with limiter.slot_async():
+                        completed, raw_last = await _run_codex_exec_async(
+                            fallback_settings,
+                            workspace_dir=self.workspace_dir,
+                            prompt=prompt,
+                            env=env,
+                            tmpdir=Path(tmpdir),
+                        )
+                except Exception as exc:
+                    return _codex_exec_error(exc, fallback_settings)
+                if completed.returncode != 0 and not raw_last:
+                    return _codex_fallback_error(completed, details)
+
+            return _parse_codex_output(completed, raw_last)
+
+    def prompt_prefix_hash(self, tools: list[dict[str, Any]] | None) -> str | None:
+        """SHA-256 of the static prompt prefix last rendered for this tool descriptor list."""
+
+        return self._prompt_builders.prefix_hash(tools)
+
+    def _prepare(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+    ) -> tuple[str, dict[str, str], Path | None]:
+        tmp_root = _ensure_tmp_root(self.workspace_dir)
+        env, delegation_depth = self._subprocess_env(tmp_root)
+        preamble = _codex_cli_preamble(
+            self.settings,
+            self.workspace_dir,
+            delegation_depth=delegation_depth,
+        )
+        prompt = self._prompt_builders.get(tools, preamble).render(messages)
+        return prompt, env, tmp_root
 
-            candidate = raw_last or completed.stdout.strip()
-            json_text = _extract_json_text(candidate)
+    def _subprocess_env(self, tmp_root: Path | None) -> tuple[dict[str, str], int]:
+        if self._pooled_env is not None:
+            return self._pooled_env
+        env = os.environ.copy()
+        if tmp_root is not None:
+            env.update({"TMPDIR": str(tmp_root), "TEMP": str(tmp_root), "TMP": str(tmp_root)})
+        env = _maybe_apply_codex_ripgrep_guard(env, tmp_root=tmp_root)
+        prepared = _mark_tokimon_delegated_env(env)
+        if self.pool_size > 0:
+            # Warm processes are started with this env, so pooled clients keep it fixed.
+            self._pooled_env = prepared
+        return prepared
+
+    def _warm_pool(self, env: dict[str, str], tmp_root: Path | None) -> WarmProcessPool | None:
+        if self.pool_size <= 0:
+            return None
+        settings = self.settings
+        workspace_dir = self.workspace_dir
+
+        def spawn():
+            tmpdir = Path(tempfile.mkdtemp(prefix="tokimon-codex-", dir=str(tmp_root) if tmp_root else None))
+            cmd = _build_codex_exec_command(
+                settings,
+                workspace_dir=workspace_dir,
+                last_message_path=tmpdir / "last_message.txt",
+            )
             try:
-                payload = json.loads(json_text)
-            except json.JSONDecodeError as exc:
-                embedded = _extract_embedded_json_text(candidate)
-                if embedded is not None:
-                    try:
-                        payload = json.loads(embedded)
-                    except json.JSONDecodeError:
-                        payload = None
-                else:
-                    payload = None
-                if isinstance(payload, dict):
-                    return payload
-                return _llm_error(
-                    f"codex returned invalid JSON: {exc}",
-                    failure_signature="llm-codex-invalid-json",
-                    details=_truncate(candidate, 2000),
-                )
-            if not isinstance(payload, dict):
-                return _llm_error(
-                    "codex returned non-object JSON",
-                    failure_signature="llm-codex-non-object",
-                    details=_truncate(json.dumps(payload), 2000),
-                )
-            return payload
+                return spawn_cli_process(cmd, cwd=workspace_dir, env=env, tmpdir=tmpdir)
+            except BaseException:
+                shutil.rmtree(tmpdir, ignore_errors=True)
+                raise
+
+        return shared_pool(
+            ("codex", repr(settings), str(workspace_dir)),
+            lambda: WarmProcessPool(spawn, size=self.pool_size, max_idle_s=_pool_max_idle_s_from_env()),
+        )
 
 
 def build_llm_client(provider: str, *, workspace_dir: Path) -> LLMClient:
@@ -446,13 +468,17 @@ def build_llm_client(provider: str, *, workspace_dir: Path) -> LLMClient:
     - codex: Codex CLI-backed client (default)
     - claude: Claude Code CLI-backed client
     - mock: deterministic scripted client (tests only)
+
+    CLI-backed clients are wrapped in `CachingLLMClient` when `TOKIMON_LLM_CACHE` is set.
     """
 
+    from .cache import maybe_wrap_with_cache
+
     normalized = (provider or "").strip().lower()
     if normalized in {"", "codex", "codex-cli"}:
-        return CodexCLIClient(workspace_dir)
+        return maybe_wrap_with_cache(CodexCLIClient(workspace_dir), workspace_dir=workspace_dir, provider="codex")
     if normalized in {"claude", "claude-cli"}:
-        return ClaudeCLIClient(workspace_dir)
+        return maybe_wrap_with_cache(ClaudeCLIClient(workspace_dir), workspace_dir=workspace_dir, provider="claude")
     if normalized == "mock":
         return MockLLMClient(script=[])
     raise ValueError(f"Unknown LLM provider: {provider}")
@@ -516,6 +542,85 @@ def _render_prompt(
     tools: list[dict[str, Any]] | None,
     preamble: str | None = None,
 ) -> str:
+    return PromptBuilder(tools=tools, preamble=preamble).render(messages)
+
+
+class PromptBuilder:
+    """Renders the prompts of one worker session incrementally.
+
+    The static prefix (preamble, output contract, tools block) is rendered and
+    hashed once. Conversation turns are rendered once each and reused while the
+    caller keeps appending to the same message list; a replaced or edited
+    message re-renders from that point on. Output is identical to `_render_prompt`.
+    """
+
+    def __init__(self, *, tools: list[dict[str, Any]] | None, preamble: str | None = None) -> None:
+        self.tools = tools
+        self.preamble = preamble
+        self.prefix = _render_prompt_prefix(tools, preamble)
+        self.prefix_hash = hashlib.sha256(self.prefix.encode("utf-8")).hexdigest()
+        self._turns: list[tuple[dict[str, Any], Any, Any, Any, str]] = []
+        self._lock = threading.Lock()
+
+    def matches(self, tools: list[dict[str, Any]] | None, preamble: str | None) -> bool:
+        return tools is self.tools and preamble == self.preamble
+
+    def render(self, messages: list[dict[str, Any]]) -> str:
+        with self._lock:
+            keep = 0
+            for (message, role, content, name, _), candidate in zip(self._turns, messages):
+                if (
+                    message is not candidate
+                    or candidate.get("role") is not role
+                    or candidate.get("content") is not content
+                    or candidate.get("name") is not name
+                ):
+                    break
+                keep += 1
+            del self._turns[keep:]
+            for message in messages[keep:]:
+                self._turns.append(
+                    (
+                        message,
+                        message.get("role"),
+                        message.get("content"),
+                        message.get("name"),
+                        _render_turn(message),
+                    )
+                )
+            return "".join([self.prefix, "<conversation>\n", *(turn[4] for turn in self._turns), "</conversation>\n"])
+
+
+class _PromptBuilders:
+    """One `PromptBuilder` per session, keyed by the identity of its tool descriptor list."""
+
+    def __init__(self, max_sessions: int = 64) -> None:
+        self.max_sessions = max_sessions
+        self._builders: OrderedDict[int, PromptBuilder] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, tools: list[dict[str, Any]] | None, preamble: str | None) -> PromptBuilder:
+        key = id(tools)
+        with self._lock:
+            builder = self._builders.get(key)
+            # The builder holds a reference to `tools`, so a matching id cannot be a reused one.
+            if builder is None or not builder.matches(tools, preamble):
+                builder = PromptBuilder(tools=tools, preamble=preamble)
+                self._builders[key] = builder
+            self._builders.move_to_end(key)
+            while len(self._builders) > self.max_sessions:
+                self._builders.popitem(last=False)
+            return builder
+
+    def prefix_hash(self, tools: list[dict[str, Any]] | None) -> str | None:
+        with self._lock:
+            builder = self._builders.get(id(tools))
+            if builder is None or builder.tools is not tools:
+                return None
+            return builder.prefix_hash
+
+
+def _render_prompt_prefix(tools: list[dict[str, Any]] | None, preamble: str | None) -> str:
     lines: list[str] = []
     if preamble:
         lines.append(preamble.strip())
@@ -561,18 +666,17 @@ def _render_prompt(
         lines.append("</tools>")
         lines.append("")
 
-    lines.append("<conversation>")
-    for msg in messages:
-        role = str(msg.get("role", ""))
-        content = msg.get("content", "")
-        name = msg.get("name")
-        prefix = role.upper() or "MESSAGE"
-        if name:
-            prefix = f"{prefix}({name})"
-        lines.append(f"{prefix}: {content}")
-    lines.append("</conversation>")
-    lines.append("")
-    return "\n".join(lines)
+    return "\n".join(lines) + "\n"
+
+
+def _render_turn(msg: dict[str, Any]) -> str:
+    role = str(msg.get("role", ""))
+    content = msg.get("content", "")
+    name = msg.get("name")
+    prefix = role.upper() or "MESSAGE"
+    if name:
+        prefix = f"{prefix}({name})"
+    return f"{prefix}: {content}\n"
 
 
 def _codex_cli_preamble(
@@ -695,7 +799,13 @@ def _run_codex_exec(
     prompt: str,
     env: dict[str, str],
     tmpdir: Path,
+    pool: WarmProcessPool | None = None,
 ) -> tuple[subprocess.CompletedProcess[str], str]:
+    if pool is not None:
+        with pool.acquire() as warm:
+            completed = warm.communicate(prompt, timeout_s=settings.timeout_s)
+            raw_last = _read_last_message(warm.tmpdir / "last_message.txt") if warm.tmpdir else ""
+        return completed, raw_last
     last_message_path = tmpdir / "last_message.txt"
     try:
         last_message_path.unlink(missing_ok=True)
@@ -716,13 +826,191 @@ def _run_codex_exec(
         timeout=settings.timeout_s,
         check=False,
     )
-    raw_last = ""
-    if last_message_path.exists():
-        raw_last = last_message_path.read_text(
-            encoding="utf-8",
-            errors="replace",
-        ).strip()
-    return completed, raw_last
+    return completed, _read_last_message(last_message_path)
+
+
+def _read_last_message(path: Path) -> str:
+    if not path.exists():
+        return ""
+    return path.read_text(encoding="utf-8", errors="replace").strip()
+
+
+async def _run_codex_exec_async(
+    settings: CodexCLISettings,
+    *,
+    workspace_dir: Path,
+    prompt: str,
+    env: dict[str, str],
+    tmpdir: Path,
+) -> tuple[subprocess.CompletedProcess[str], str]:
+    last_message_path = tmpdir / "last_message.txt"
+    last_message_path.unlink(missing_ok=True)
+    cmd = _build_codex_exec_command(
+        settings,
+        workspace_dir=workspace_dir,
+        last_message_path=last_message_path,
+    )
+    completed = await run_cli_async(cmd, prompt=prompt, env=env, cwd=workspace_dir, timeout_s=settings.timeout_s)
+    return completed, _read_last_message(last_message_path)
+
+
+def _codex_tmp_kwargs(tmp_root: Path | None) -> dict[str, Any]:
+    tmp_kwargs: dict[str, Any] = {"prefix": "tokimon-codex-"}
+    if tmp_root is not None:
+        tmp_kwargs["dir"] = str(tmp_root)
+    return tmp_kwargs
+
+
+def _codex_exec_error(exc: Exception, settings: CodexCLISettings) -> dict[str, Any]:
+    if isinstance(exc, FileNotFoundError):
+        return _llm_error(
+            "codex cli not found",
+            failure_signature="llm-codex-cli-missing",
+            details=str(exc),
+        )
+    if isinstance(exc, subprocess.TimeoutExpired):
+        return _llm_error(
+            f"codex cli timed out after {settings.timeout_s}s",
+            failure_signature="llm-codex-timeout",
+        )
+    return _llm_error(
+        "codex cli error",
+        failure_signature="llm-codex-exception",
+        details=str(exc),
+    )
+
+
+def _codex_nonzero_error(completed: subprocess.CompletedProcess[str], details: str) -> dict[str, Any]:
+    reason = _first_nonempty_line(details)
+    summary = f"codex cli exited {completed.returncode}"
+    if reason:
+        summary = f"{summary}: {reason}"
+    return _llm_error(
+        summary,
+        failure_signature="llm-codex-nonzero-exit",
+        details=details,
+    )
+
+
+def _codex_fallback_error(completed: subprocess.CompletedProcess[str], details: str) -> dict[str, Any]:
+    fallback_details = _truncate(completed.stderr or completed.stdout, 2000)
+    combined = _truncate(
+        (
+            "requested-model failure:\n"
+            f"{details}\n\n"
+            "fallback-model failure:\n"
+            f"{fallback_details}"
+        ),
+        2000,
+    )
+    reason = _first_nonempty_line(fallback_details) or _first_nonempty_line(details)
+    summary = f"codex cli exited {completed.returncode}"
+    if reason:
+        summary = f"{summary}: {reason}"
+    return _llm_error(
+        summary,
+        failure_signature="llm-codex-nonzero-exit",
+        details=combined,
+    )
+
+
+def _parse_codex_output(completed: subprocess.CompletedProcess[str], raw_last: str) -> dict[str, Any]:
+    candidate = raw_last or completed.stdout.strip()
+    json_text = _extract_json_text(candidate)
+    try:
+        payload = json.loads(json_text)
+    except json.JSONDecodeError as exc:
+        embedded = _extract_embedded_json_text(candidate)
+        if embedded is not None:
+            try:
+                payload = json.loads(embedded)
+            except json.JSONDecodeError:
+                payload = None
+        else:
+            payload = None
+        if isinstance(payload, dict):
+            return payload
+        return _llm_error(
+            f"codex returned invalid JSON: {exc}",
+            failure_signature="llm-codex-invalid-json",
+            details=_truncate(candidate, 2000),
+        )
+    if not isinstance(payload, dict):
+        return _llm_error(
+            "codex returned non-object JSON",
+            failure_signature="llm-codex-non-object",
+            details=_truncate(json.dumps(payload), 2000),
+        )
+    return payload
+
+
+def _claude_exec_error(exc: Exception, settings: ClaudeCLISettings) -> dict[str, Any]:
+    if isinstance(exc, FileNotFoundError):
+        return _llm_error(
+            "claude cli not found",
+            failure_signature="llm-claude-cli-missing",
+            details=str(exc),
+        )
+    if isinstance(exc, subprocess.TimeoutExpired):
+        return _llm_error(
+            f"claude cli timed out after {settings.timeout_s}s",
+            failure_signature="llm-claude-timeout",
+        )
+    return _llm_error(
+        "claude cli error",
+        failure_signature="llm-claude-exception",
+        details=str(exc),
+    )
+
+
+def _parse_claude_output(completed: subprocess.CompletedProcess[str]) -> dict[str, Any]:
+    stdout = (completed.stdout or "").strip()
+    if completed.returncode != 0 and not stdout:
+        details = _truncate(completed.stderr or "", 2000)
+        reason = _first_nonempty_line(details)
+        summary = f"claude cli exited {completed.returncode}"
+        if reason:
+            summary = f"{summary}: {reason}"
+        return _llm_error(
+            summary,
+            failure_signature="llm-claude-nonzero-exit",
+            details=details,
+        )
+
+    candidate: Any = stdout
+    try:
+        if stdout:
+            candidate = json.loads(stdout)
+    except json.JSONDecodeError:
+        candidate = stdout
+
+    raw_text = _extract_json_payload(candidate)
+    json_text = _extract_json_text(raw_text)
+    try:
+        payload = json.loads(json_text)
+    except json.JSONDecodeError as exc:
+        embedded = _extract_embedded_json_text(raw_text)
+        if embedded is not None:
+            try:
+                payload = json.loads(embedded)
+            except json.JSONDecodeError:
+                payload = None
+        else:
+            payload = None
+        if isinstance(payload, dict):
+            return payload
+        return _llm_error(
+            f"claude returned invalid JSON: {exc}",
+            failure_signature="llm-claude-invalid-json",
+            details=_truncate(stdout, 2000),
+        )
+    if not isinstance(payload, dict):
+        return _llm_error(
+            "claude returned non-object JSON",
+            failure_signature="llm-claude-non-object",
+            details=_truncate(json.dumps(payload), 2000),
+        )
+    return payload
 
 
 def _llm_error(
@@ -824,6 +1112,14 @@ def _parse_env_int(raw: str | None, *, default: int) -> int:
         return default
 
 
+def _pool_size_from_env() -> int:
+    return max(0, _parse_env_int(os.environ.get("TOKIMON_LLM_POOL_SIZE"), default=0))
+
+
+def _pool_max_idle_s_from_env() -> float:
+    return float(_parse_env_int(os.environ.get("TOKIMON_LLM_POOL_MAX_IDLE_S"), default=300))
+
+
 def _mark_tokimon_delegated_env(env: dict[str, str]) -> tuple[dict[str, str], int]:
     prior_depth = _parse_env_int(env.get("TOKIMON_DELEGATION_DEPTH"), default=0)
     if prior_depth < 0:
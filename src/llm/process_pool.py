@@ -0,0 +1,186 @@
+"""Pre-started ("warm") agent CLI processes for the Codex/Claude adapters.
+
+`codex exec -` and `claude --print` are one-shot: each process reads a single
+prompt from stdin, answers, and exits. Most of their latency on short turns is
+interpreter/runtime startup, which happens before the prompt is read. A
+`WarmProcessPool` keeps ``size`` processes already started and blocked on
+stdin, hands one out per request, and immediately starts a replacement so the
+next turn finds a warm process too.
+
+Health checks run when a process is handed out: processes that exited on their
+own or have been idle longer than ``max_idle_s`` (stale config or credentials)
+are discarded and replaced. Because the CLIs exit after one answer, every
+process is recycled after exactly one request. Per-call timeouts kill the
+whole process group.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import shutil
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Hashable, Iterator
+
+
+_DEFAULT_MAX_IDLE_S = 300.0
+
+
+class WarmProcess:
+    def __init__(self, proc: subprocess.Popen[str], *, tmpdir: Path | None = None) -> None:
+        self.proc = proc
+        self.tmpdir = tmpdir
+        self.started_at = time.monotonic()
+
+    def healthy(self, *, max_idle_s: float) -> bool:
+        return self.proc.poll() is None and time.monotonic() - self.started_at <= max_idle_s
+
+    def communicate(self, prompt: str, *, timeout_s: float | None) -> subprocess.CompletedProcess[str]:
+        try:
+            stdout, stderr = self.proc.communicate(prompt, timeout=timeout_s)
+        except subprocess.TimeoutExpired:
+            self.kill()
+            raise
+        return subprocess.CompletedProcess(self.proc.args, self.proc.returncode, stdout, stderr)
+
+    def kill(self) -> None:
+        if self.proc.poll() is None:
+            try:
+                os.killpg(self.proc.pid, signal.SIGKILL)
+            except OSError:
+                self.proc.kill()
+        try:
+            self.proc.communicate(timeout=5)
+        except (subprocess.TimeoutExpired, ValueError, OSError):
+            pass
+
+    def discard(self) -> None:
+        self.kill()
+        if self.tmpdir is not None:
+            shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+
+class WarmProcessPool:
+    def __init__(
+        self,
+        spawn: Callable[[], WarmProcess],
+        *,
+        size: int,
+        max_idle_s: float = _DEFAULT_MAX_IDLE_S,
+    ) -> None:
+        self.spawn = spawn
+        self.size = max(1, int(size))
+        self.max_idle_s = float(max_idle_s)
+        self._idle: deque[WarmProcess] = deque()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.warm_hits = 0
+        self.cold_starts = 0
+        self.recycled = 0
+
+    @contextmanager
+    def acquire(self) -> Iterator[WarmProcess]:
+        """Lease a started process for one request; it is discarded afterwards."""
+
+        warm = self._take()
+        try:
+            self._refill()
+        except OSError:
+            # A failing spawn (e.g. CLI removed) surfaces on the next cold start instead.
+            pass
+        try:
+            yield warm
+        finally:
+            warm.discard()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+        for warm in idle:
+            warm.discard()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "warm_hits": self.warm_hits,
+                "cold_starts": self.cold_starts,
+                "recycled": self.recycled,
+            }
+
+    def _take(self) -> WarmProcess:
+        stale: list[WarmProcess] = []
+        warm: WarmProcess | None = None
+        with self._lock:
+            while self._idle:
+                candidate = self._idle.popleft()
+                if candidate.healthy(max_idle_s=self.max_idle_s):
+                    warm = candidate
+                    self.warm_hits += 1
+                    break
+                stale.append(candidate)
+                self.recycled += 1
+            if warm is None:
+                self.cold_starts += 1
+        for candidate in stale:
+            candidate.discard()
+        return warm if warm is not None else self.spawn()
+
+    def _refill(self) -> None:
+        with self._lock:
+            while not self._closed and len(self._idle) < self.size:
+                self._idle.append(self.spawn())
+
+
+_POOLS: dict[Hashable, WarmProcessPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def shared_pool(key: Hashable, factory: Callable[[], WarmProcessPool]) -> WarmProcessPool:
+    """Return the process-wide pool for ``key`` (e.g. provider, settings, workspace), creating it once."""
+
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = factory()
+            _POOLS[key] = pool
+        return pool
+
+
+def close_shared_pools() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+def spawn_cli_process(
+    cmd: list[str],
+    *,
+    cwd: Path,
+    env: dict[str, str],
+    tmpdir: Path | None = None,
+) -> WarmProcess:
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        env=env,
+        cwd=str(cwd),
+        start_new_session=True,
+    )
+    return WarmProcess(proc, tmpdir=tmpdir)
+
+
+atexit.register(close_shared_pools)
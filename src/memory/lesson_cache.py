@@ -0,0 +1,72 @@
+"""Size-bounded LRU cache of parsed Lessons keyed by id and file mtime."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .store import Lesson
+
+
+_DEFAULT_MAX_ENTRIES = 1024
+_DEFAULT_MAX_BYTES = 8_000_000
+
+
+class LessonCache:
+    """Thread-safe LRU of Lessons, evicting by entry count and total body size.
+
+    Entries are stored with the lesson file's ``st_mtime_ns`` at caching time;
+    a lookup with a different mtime is a miss, so edited lesson files are
+    picked up without explicit invalidation.
+    """
+
+    def __init__(self, *, max_entries: int = _DEFAULT_MAX_ENTRIES, max_bytes: int = _DEFAULT_MAX_BYTES) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[int | None, Lesson, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, lesson_id: str, mtime_ns: int | None) -> Lesson | None:
+        with self._lock:
+            entry = self._entries.get(lesson_id)
+            if entry is None or entry[0] != mtime_ns:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(lesson_id)
+            self.hits += 1
+            return entry[1]
+
+    def is_stale(self, lesson_id: str, mtime_ns: int | None) -> bool:
+        """True when the id is cached under a different mtime (file changed since)."""
+
+        with self._lock:
+            entry = self._entries.get(lesson_id)
+            return entry is not None and entry[0] != mtime_ns
+
+    def put(self, lesson_id: str, mtime_ns: int | None, lesson: Lesson) -> None:
+        size = len(lesson.body.encode("utf-8"))
+        with self._lock:
+            previous = self._entries.pop(lesson_id, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            if size > self.max_bytes:
+                return
+            self._entries[lesson_id] = (mtime_ns, lesson, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._bytes}
@@ -0,0 +1,97 @@
+"""Thread-local pooled SQLite connections for the memory index."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+_DEFAULT_BUSY_TIMEOUT_S = 10.0
+_DEFAULT_CACHED_STATEMENTS = 256
+
+
+class SQLitePool:
+    """Hand out one long-lived connection per thread for a single database file.
+
+    Connections run in autocommit mode with WAL journaling, so readers never
+    block the writer; writes go through ``transaction()`` which takes the write
+    lock up front (``BEGIN IMMEDIATE``) and relies on the busy timeout instead
+    of failing fast when another step holds it. Statement reuse comes from the
+    sqlite3 statement cache, so callers should keep SQL text constant and bind
+    parameters.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        busy_timeout_s: float = _DEFAULT_BUSY_TIMEOUT_S,
+        cached_statements: int = _DEFAULT_CACHED_STATEMENTS,
+    ) -> None:
+        self.path = path
+        self.busy_timeout_s = float(busy_timeout_s)
+        self.cached_statements = int(cached_statements)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[sqlite3.Connection] = []
+        self._generation = 0
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "generation", -1) == self._generation:
+            return conn
+        conn = self._connect()
+        with self._lock:
+            self._connections.append(conn)
+            self._local.generation = self._generation
+        self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self.connection()
+        if conn.in_transaction:
+            # Nested use joins the outer transaction.
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def close(self) -> None:
+        """Close every connection handed out so far; threads reconnect lazily."""
+
+        with self._lock:
+            connections = self._connections
+            self._connections = []
+            self._generation += 1
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout_s,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_s * 1000)}")
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        except sqlite3.OperationalError:
+            # Read-only or network filesystems may refuse WAL; keep the default journal.
+            pass
+        return conn
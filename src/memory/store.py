@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import re
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
+
+from .lesson_cache import LessonCache
+from .sqlite_pool import SQLitePool
 
 
 _CHARTER_REQUIRED_FIELDS = (
@@ -73,6 +79,26 @@ class Lesson:
     path: Path
 
 
+@dataclass(frozen=True)
+class _LessonFile:
+    """Manifest entry for one lesson file: what the index was built from."""
+
+    name: str
+    lesson_id: str
+    mtime_ns: int
+    size: int
+    sha256: str
+
+
+@dataclass
+class _ParsedLesson:
+    name: str
+    file: _LessonFile | None = None
+    metadata: dict[str, Any] | None = None
+    body: str = ""
+    error: str | None = None
+
+
 class MemoryStore:
     def __init__(self, root: Path) -> None:
         self.root = root
@@ -81,17 +107,34 @@ class MemoryStore:
         self.index_path = root / "index.sqlite"
         self.lessons_dir.mkdir(parents=True, exist_ok=True)
         self.artifacts_dir.mkdir(parents=True, exist_ok=True)
+        self._pool = SQLitePool(self.index_path)
+        self.lesson_cache = LessonCache()
         self._init_db()
 
     def _init_db(self) -> None:
-        conn = sqlite3.connect(self.index_path)
-        try:
+        with self._pool.transaction() as conn:
             conn.execute(
                 "CREATE TABLE IF NOT EXISTS lessons (id TEXT PRIMARY KEY, metadata TEXT, body TEXT, tags TEXT, component TEXT, failure_signature TEXT)"
             )
             conn.execute(
                 "CREATE TABLE IF NOT EXISTS artifacts (id TEXT PRIMARY KEY, step_id TEXT, task_id TEXT, path TEXT, hash TEXT, metadata TEXT)"
             )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS lesson_tags (lesson_id TEXT NOT NULL, tag TEXT NOT NULL, PRIMARY KEY (lesson_id, tag))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_lesson_tags_tag ON lesson_tags (tag, lesson_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_lessons_component ON lessons (component)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_lessons_failure_signature ON lessons (failure_signature)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS lesson_files (name TEXT PRIMARY KEY, lesson_id TEXT NOT NULL, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, sha256 TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_lesson_files_lesson_id ON lesson_files (lesson_id)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS retry_lesson_signals (lesson_id TEXT NOT NULL, field TEXT NOT NULL, signature TEXT NOT NULL, PRIMARY KEY (lesson_id, field))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS retry_signal_counts (field TEXT NOT NULL, signature TEXT NOT NULL, count INTEGER NOT NULL, PRIMARY KEY (field, signature))"
+            )
             try:
                 conn.execute(
                     "CREATE VIRTUAL TABLE IF NOT EXISTS lessons_fts USING fts5(id, body, tags, component, failure_signature)"
@@ -99,11 +142,37 @@ class MemoryStore:
             except sqlite3.OperationalError:
                 # FTS5 not available; fallback to table-only search.
                 pass
-            conn.commit()
-        finally:
-            conn.close()
+            version = int(conn.execute("PRAGMA user_version").fetchone()[0])
+            if version < 1:
+                _migrate_lesson_index(conn)
+            if version < 2:
+                _rebuild_retry_signals(conn)
+            if version < _SCHEMA_VERSION:
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        """Release pooled index connections (they reopen lazily on next use)."""
+
+        self._pool.close()
 
     def write_lesson(self, metadata: dict[str, Any], body: str) -> Lesson:
+        lesson, lesson_file = self._write_lesson_file(metadata, body)
+        with self._pool.transaction() as conn:
+            _index_lesson_row(conn, lesson_id=lesson_file.lesson_id, metadata=lesson.metadata, body=lesson.body)
+            _record_lesson_file(conn, lesson_file)
+        return lesson
+
+    def write_lessons_bulk(self, lessons: Iterable[tuple[dict[str, Any], str]]) -> list[Lesson]:
+        """Write many Lessons and index them in a single transaction."""
+
+        written = [self._write_lesson_file(metadata, body) for metadata, body in lessons]
+        with self._pool.transaction() as conn:
+            for lesson, lesson_file in written:
+                _index_lesson_row(conn, lesson_id=lesson_file.lesson_id, metadata=lesson.metadata, body=lesson.body)
+                _record_lesson_file(conn, lesson_file)
+        return [lesson for lesson, _ in written]
+
+    def _write_lesson_file(self, metadata: dict[str, Any], body: str) -> tuple[Lesson, _LessonFile]:
         lesson_id = metadata.get("id") or metadata.get("lesson_id")
         if not lesson_id:
             raise ValueError("Lesson metadata must include an 'id'")
@@ -113,139 +182,293 @@ class MemoryStore:
         path = self.lessons_dir / f"lesson-{lesson_id}.md"
         header = json.dumps(metadata, sort_keys=True)
         content = f"{header}\n---\n{body}\n"
-        path.write_text(content)
-        self._index_lesson(lesson_id, metadata, body)
-        return Lesson(metadata=metadata, body=body, path=path)
-
-    def _index_lesson(self, lesson_id: str, metadata: dict[str, Any], body: str) -> None:
-        conn = sqlite3.connect(self.index_path)
-        try:
-            _index_lesson_row(conn, lesson_id=lesson_id, metadata=metadata, body=body)
-            conn.commit()
-        finally:
-            conn.close()
+        data = content.encode("utf-8")
+        path.write_bytes(data)
+        stat = path.stat()
+        lesson_file = _LessonFile(
+            name=path.name,
+            lesson_id=str(lesson_id),
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            sha256=hashlib.sha256(data).hexdigest(),
+        )
+        self.lesson_cache.put(str(lesson_id), stat.st_mtime_ns, Lesson(metadata=metadata, body=body.strip(), path=path))
+        return Lesson(metadata=metadata, body=body, path=path), lesson_file
 
     def load_lesson(self, lesson_id: str) -> Lesson:
         path = self.lessons_dir / f"lesson-{lesson_id}.md"
+        mtime_ns = _mtime_ns(path)
         content = path.read_text()
         header, body = content.split("---", 1)
         metadata = json.loads(header.strip())
-        return Lesson(metadata=metadata, body=body.strip(), path=path)
+        lesson = Lesson(metadata=metadata, body=body.strip(), path=path)
+        self.lesson_cache.put(lesson_id, mtime_ns, lesson)
+        return lesson
 
-    def index_artifact(self, artifact_id: str, step_id: str, task_id: str, path: Path, digest: str, metadata: dict[str, Any]) -> None:
-        conn = sqlite3.connect(self.index_path)
+    def _lesson_from_row(self, lesson_id: str, raw_metadata: str | None, body: str | None) -> Lesson:
+        """Serve a retrieved Lesson from the cache or its index row, not the markdown file.
+
+        The index row is trusted only while the file's (mtime, size) match its
+        manifest entry; a file edited since it was indexed is re-read and its
+        row re-indexed. Once cached, a changed file mtime also forces a re-read.
+        """
+
+        path = self.lessons_dir / f"lesson-{lesson_id}.md"
         try:
-            conn.execute(
-                "REPLACE INTO artifacts (id, step_id, task_id, path, hash, metadata) VALUES (?, ?, ?, ?, ?, ?)",
-                (artifact_id, step_id, task_id, str(path), digest, json.dumps(metadata)),
+            stat = path.stat()
+        except OSError:
+            stat = None
+        mtime_ns = stat.st_mtime_ns if stat is not None else None
+        cached = self.lesson_cache.get(lesson_id, mtime_ns)
+        if cached is not None:
+            return cached
+        if mtime_ns is not None and self.lesson_cache.is_stale(lesson_id, mtime_ns):
+            return self.load_lesson(lesson_id)
+        if stat is not None:
+            entry = (
+                self._pool.connection()
+                .execute("SELECT mtime_ns, size FROM lesson_files WHERE name = ?", (path.name,))
+                .fetchone()
             )
-            conn.commit()
-        finally:
-            conn.close()
+            if entry is None or tuple(entry) != (stat.st_mtime_ns, stat.st_size):
+                if self._reindex_lesson_file(path.name):
+                    return self.load_lesson(lesson_id)
+        metadata = json.loads(raw_metadata) if raw_metadata else {}
+        lesson = Lesson(metadata=metadata if isinstance(metadata, dict) else {}, body=str(body or "").strip(), path=path)
+        self.lesson_cache.put(lesson_id, mtime_ns, lesson)
+        return lesson
+
+    def _reindex_lesson_file(self, name: str) -> bool:
+        """Re-index one lesson file in place; False when it no longer parses."""
+
+        parsed = self._parse_for_index(name)
+        if parsed.file is None or parsed.metadata is None:
+            return False
+        with self._pool.transaction() as conn:
+            _index_lesson_row(conn, lesson_id=parsed.file.lesson_id, metadata=parsed.metadata, body=parsed.body)
+            _record_lesson_file(conn, parsed.file)
+        return True
+
+    def count_retry_lessons(self, field: str, signature: str) -> int:
+        """Number of indexed retry Lessons whose ``field`` equals ``signature``.
+
+        ``field`` is one of ``RETRY_SIGNAL_FIELDS``; the count is read from an
+        aggregate kept up to date as Lessons are indexed.
+        """
+
+        if field not in RETRY_SIGNAL_FIELDS:
+            raise ValueError(f"Unsupported retry signal field: {field}")
+        row = self._pool.connection().execute(
+            "SELECT count FROM retry_signal_counts WHERE field = ? AND signature = ?",
+            (field, str(signature).strip()),
+        ).fetchone()
+        return int(row[0]) if row else 0
+
+    def index_artifact(self, artifact_id: str, step_id: str, task_id: str, path: Path, digest: str, metadata: dict[str, Any]) -> None:
+        self.index_artifacts_bulk([(artifact_id, step_id, task_id, path, digest, metadata)])
+
+    def index_artifacts_bulk(self, artifacts: Iterable[tuple[str, str, str, Path, str, dict[str, Any]]]) -> None:
+        """Index many artifacts in one transaction.
+
+        Each item is ``(artifact_id, step_id, task_id, path, digest, metadata)``,
+        matching the ``index_artifact`` argument order.
+        """
+
+        rows = [
+            (artifact_id, step_id, task_id, str(path), digest, json.dumps(metadata))
+            for artifact_id, step_id, task_id, path, digest, metadata in artifacts
+        ]
+        if not rows:
+            return
+        with self._pool.transaction() as conn:
+            conn.executemany(_REPLACE_ARTIFACT_SQL, rows)
 
     def list_artifacts(self, task_id: str | None = None, step_id: str | None = None) -> list[dict[str, Any]]:
-        conn = sqlite3.connect(self.index_path)
-        try:
-            clauses = []
-            params: list[Any] = []
-            if task_id:
-                clauses.append("task_id = ?")
-                params.append(task_id)
-            if step_id:
-                clauses.append("step_id = ?")
-                params.append(step_id)
-            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
-            cursor = conn.execute(f"SELECT id, step_id, task_id, path, hash, metadata FROM artifacts {where}", params)
-            results = []
-            for row in cursor.fetchall():
-                results.append(
-                    {
-                        "id": row[0],
-                        "step_id": row[1],
-                        "task_id": row[2],
-                        "path": row[3],
-                        "hash": row[4],
-                        "metadata": json.loads(row[5]) if row[5] else {},
-                    }
-                )
-            return results
-        finally:
-            conn.close()
+        conn = self._pool.connection()
+        clauses = []
+        params: list[Any] = []
+        if task_id:
+            clauses.append("task_id = ?")
+            params.append(task_id)
+        if step_id:
+            clauses.append("step_id = ?")
+            params.append(step_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = conn.execute(f"SELECT id, step_id, task_id, path, hash, metadata FROM artifacts {where}", params)
+        results = []
+        for row in cursor.fetchall():
+            results.append(
+                {
+                    "id": row[0],
+                    "step_id": row[1],
+                    "task_id": row[2],
+                    "path": row[3],
+                    "hash": row[4],
+                    "metadata": json.loads(row[5]) if row[5] else {},
+                }
+            )
+        return results
 
     def cli_status(self, *, deep: bool = False) -> dict[str, Any]:
-        lesson_ids_on_disk = self._lesson_ids_on_disk()
-        conn = sqlite3.connect(self.index_path)
-        try:
-            indexed_ids = [row[0] for row in conn.execute("SELECT id FROM lessons ORDER BY id").fetchall() if row and row[0]]
-            fts_available = _fts_available(conn)
-        finally:
-            conn.close()
+        """Compare lesson files on disk against the index manifest (stat only, no parsing)."""
 
-        missing_in_index = sorted(set(lesson_ids_on_disk) - set(indexed_ids))
-        missing_on_disk = sorted(set(indexed_ids) - set(lesson_ids_on_disk))
-        dirty = bool(missing_in_index or missing_on_disk)
+        on_disk = self._scan_lesson_files()
+        conn = self._pool.connection()
+        manifest = _load_manifest(conn)
+        indexed_lessons = int(conn.execute("SELECT COUNT(*) FROM lessons").fetchone()[0])
+        fts_available = _fts_available(conn)
+
+        missing_in_index = sorted(
+            _lesson_id_from_filename(Path(name)) or name for name in on_disk if name not in manifest
+        )
+        missing_on_disk = sorted(entry.lesson_id for name, entry in manifest.items() if name not in on_disk)
+        changed = sorted(
+            entry.lesson_id
+            for name, entry in manifest.items()
+            if name in on_disk and on_disk[name] != (entry.mtime_ns, entry.size)
+        )
+        dirty = bool(missing_in_index or missing_on_disk or changed)
 
         payload: dict[str, Any] = {
             "ok": True,
             "root": str(self.root),
             "index_path": str(self.index_path),
-            "lesson_files": len(lesson_ids_on_disk),
-            "indexed_lessons": len(indexed_ids),
+            "lesson_files": len(on_disk),
+            "indexed_lessons": indexed_lessons,
             "fts_available": fts_available,
             "dirty": dirty,
         }
         if deep:
             payload["missing_in_index"] = missing_in_index
             payload["missing_on_disk"] = missing_on_disk
+            payload["changed"] = changed
         return payload
 
-    def cli_reindex(self) -> dict[str, Any]:
-        lesson_paths = sorted(self.lessons_dir.glob("lesson-*.md"))
-        errors: list[dict[str, str]] = []
+    def cli_reindex(self, *, full: bool = False, workers: int | None = None) -> dict[str, Any]:
+        """Bring the index in line with the lesson files.
+
+        By default only files whose (mtime, size) differ from the manifest are
+        parsed, and a file whose content hash is unchanged only has its
+        manifest entry refreshed. ``full=True`` re-parses every file and
+        replaces the whole index. Parsing happens on a thread pool before the
+        write transaction is opened, and all index changes commit in one
+        transaction, so readers keep seeing the previous index until the swap.
+        """
+
+        on_disk = self._scan_lesson_files()
+        manifest = {} if full else _load_manifest(self._pool.connection())
+        to_parse = sorted(
+            name
+            for name, stat in on_disk.items()
+            if name not in manifest or (manifest[name].mtime_ns, manifest[name].size) != stat
+        )
+        removed = sorted(name for name in manifest if name not in on_disk)
 
-        conn = sqlite3.connect(self.index_path)
-        indexed = 0
-        try:
-            conn.execute("DELETE FROM lessons")
-            try:
-                conn.execute("DELETE FROM lessons_fts")
-            except sqlite3.OperationalError:
-                pass
+        max_workers = max(1, min(len(to_parse), workers or _DEFAULT_REINDEX_WORKERS))
+        if len(to_parse) > 1 and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tokimon-memory-index") as pool:
+                parsed = list(pool.map(self._parse_for_index, to_parse))
+        else:
+            parsed = [self._parse_for_index(name) for name in to_parse]
 
-            for path in lesson_paths:
-                try:
-                    lesson_id, metadata, body = _parse_lesson_file(path)
-                    _deny_secret_metadata(metadata)
-                    _validate_lesson_charter(metadata)
-                    body = _redact_secrets_in_body(body)
-                    _index_lesson_row(conn, lesson_id=lesson_id, metadata=metadata, body=body)
-                    indexed += 1
-                except Exception as exc:  # noqa: BLE001 - surfaced to CLI in a structured payload.
-                    errors.append({"path": str(path), "error": str(exc)})
-
-            conn.commit()
-        finally:
-            conn.close()
+        errors: list[dict[str, str]] = []
+        updated = 0
+        touched = 0
+        with self._pool.transaction() as conn:
+            if full:
+                conn.execute("DELETE FROM lessons")
+                conn.execute("DELETE FROM lesson_tags")
+                conn.execute("DELETE FROM lesson_files")
+                conn.execute("DELETE FROM retry_lesson_signals")
+                conn.execute("DELETE FROM retry_signal_counts")
+                if _fts_available(conn):
+                    conn.execute("DELETE FROM lessons_fts")
+            stale_ids: set[str] = {manifest[name].lesson_id for name in removed}
+            conn.executemany("DELETE FROM lesson_files WHERE name = ?", [(name,) for name in removed])
+            for item in parsed:
+                previous = manifest.get(item.name)
+                if item.error is not None or item.file is None or item.metadata is None:
+                    errors.append({"path": str(self.lessons_dir / item.name), "error": str(item.error)})
+                    if previous is not None:
+                        stale_ids.add(previous.lesson_id)
+                        conn.execute("DELETE FROM lesson_files WHERE name = ?", (item.name,))
+                    continue
+                if previous is not None and previous.lesson_id != item.file.lesson_id:
+                    stale_ids.add(previous.lesson_id)
+                if previous is not None and previous.sha256 == item.file.sha256 and previous.lesson_id == item.file.lesson_id:
+                    touched += 1
+                else:
+                    _index_lesson_row(conn, lesson_id=item.file.lesson_id, metadata=item.metadata, body=item.body)
+                    updated += 1
+                _record_lesson_file(conn, item.file)
+            for lesson_id in sorted(stale_ids):
+                if conn.execute("SELECT 1 FROM lesson_files WHERE lesson_id = ?", (lesson_id,)).fetchone() is None:
+                    _delete_lesson_row(conn, lesson_id)
+            # Rows indexed before the manifest existed (or whose files vanished) have no manifest entry.
+            for (lesson_id,) in conn.execute(
+                "SELECT id FROM lessons WHERE id NOT IN (SELECT lesson_id FROM lesson_files)"
+            ).fetchall():
+                _delete_lesson_row(conn, lesson_id)
+            indexed = int(conn.execute("SELECT COUNT(*) FROM lessons").fetchone()[0])
 
         return {
             "ok": len(errors) == 0,
             "root": str(self.root),
             "index_path": str(self.index_path),
-            "lesson_files": len(lesson_paths),
+            "mode": "full" if full else "incremental",
+            "lesson_files": len(on_disk),
             "indexed_lessons": indexed,
+            "updated": updated,
+            "unchanged": len(on_disk) - len(to_parse) + touched,
+            "removed": len(removed),
             "errors": errors,
         }
 
+    def _scan_lesson_files(self) -> dict[str, tuple[int, int]]:
+        """Map lesson file names to ``(mtime_ns, size)`` using one directory scan."""
+
+        if not self.lessons_dir.exists():
+            return {}
+        files: dict[str, tuple[int, int]] = {}
+        with os.scandir(self.lessons_dir) as entries:
+            for entry in entries:
+                if not (entry.name.startswith("lesson-") and entry.name.endswith(".md")):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def _parse_for_index(self, name: str) -> _ParsedLesson:
+        path = self.lessons_dir / name
+        try:
+            # Stat before reading: if the file changes in between, the next scan sees a newer mtime.
+            stat = path.stat()
+            data = path.read_bytes()
+            lesson_id, metadata, body = _parse_lesson_content(path, data.decode("utf-8"))
+            _deny_secret_metadata(metadata)
+            _validate_lesson_charter(metadata)
+        except Exception as exc:  # noqa: BLE001 - surfaced to CLI in a structured payload.
+            return _ParsedLesson(name=name, error=str(exc))
+        lesson_file = _LessonFile(
+            name=name,
+            lesson_id=lesson_id,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            sha256=hashlib.sha256(data).hexdigest(),
+        )
+        return _ParsedLesson(name=name, file=lesson_file, metadata=metadata, body=_redact_secrets_in_body(body))
+
     def cli_search(self, query: str, *, limit: int = 5) -> dict[str, Any]:
         normalized = str(query or "").strip()
         if not normalized:
             raise ValueError("Query is required")
 
-        conn = sqlite3.connect(self.index_path)
-        try:
-            hits = _search_lesson_ids(conn, normalized, limit=limit)
-        finally:
-            conn.close()
+        hits = _search_lesson_ids(self._pool.connection(), normalized, limit=limit)
 
         return {
             "ok": True,
@@ -255,16 +478,6 @@ class MemoryStore:
             "hits": hits,
         }
 
-    def _lesson_ids_on_disk(self) -> list[str]:
-        if not self.lessons_dir.exists():
-            return []
-        ids: list[str] = []
-        for path in sorted(self.lessons_dir.glob("lesson-*.md")):
-            lesson_id = _lesson_id_from_filename(path)
-            if lesson_id:
-                ids.append(lesson_id)
-        return ids
-
     def retrieve(
         self,
         query: str,
@@ -277,80 +490,89 @@ class MemoryStore:
     ) -> list[Lesson]:
         _require_retrieval_context(component=component, tags=tags, failure_signature=failure_signature)
         tags = tags or []
-        conn = sqlite3.connect(self.index_path)
-        try:
-            if stage == 1:
-                rows = _select_lessons(
-                    conn,
-                    query=query,
-                    tags=tags,
-                    components=[component] if component else None,
-                    failure_signature=failure_signature,
-                    limit=limit,
+        conn = self._pool.connection()
+        if stage == 1:
+            rows = _select_lessons(
+                conn,
+                query=query,
+                tags=tags,
+                components=[component] if component else None,
+                failure_signature=failure_signature,
+                limit=limit,
+            )
+        elif stage == 2:
+            stage2_components: list[str] = []
+            if component:
+                stage2_components.append(component)
+                stage2_components.extend(
+                    _adjacent_components(conn, component=component, current_failure_signature=failure_signature)
                 )
-            elif stage == 2:
-                stage2_components: list[str] = []
-                if component:
-                    stage2_components.append(component)
-                    stage2_components.extend(
-                        _adjacent_components(conn, component=component, current_failure_signature=failure_signature)
-                    )
-                rows = _select_lessons(
-                    conn,
-                    query=None,
-                    tags=tags,
-                    components=stage2_components or None,
-                    failure_signature=failure_signature,
-                    limit=limit,
+            rows = _select_lessons(
+                conn,
+                query=None,
+                rank_query=query,
+                tags=tags,
+                components=stage2_components or None,
+                failure_signature=failure_signature,
+                limit=limit,
+            )
+        else:
+            stage2_components = []
+            if component:
+                stage2_components.append(component)
+                stage2_components.extend(
+                    _adjacent_components(conn, component=component, current_failure_signature=failure_signature)
                 )
-            else:
-                stage2_components = []
-                if component:
-                    stage2_components.append(component)
-                    stage2_components.extend(
-                        _adjacent_components(conn, component=component, current_failure_signature=failure_signature)
-                    )
-                rows = _select_lessons(
+            rows = _select_lessons(
+                conn,
+                query=None,
+                rank_query=query,
+                tags=tags,
+                components=stage2_components or None,
+                failure_signature=failure_signature,
+                limit=limit,
+            )
+            if len(rows) < limit and failure_signature:
+                rows += _select_lessons(
                     conn,
                     query=None,
-                    tags=tags,
-                    components=stage2_components or None,
+                    rank_query=query,
+                    tags=None,
+                    components=None,
                     failure_signature=failure_signature,
-                    limit=limit,
+                    limit=limit - len(rows),
                 )
-                if len(rows) < limit and failure_signature:
+            if len(rows) < limit and failure_signature:
+                similar = _similar_failure_signatures(conn, failure_signature=failure_signature, limit=20)
+                for candidate in similar:
+                    if len(rows) >= limit:
+                        break
                     rows += _select_lessons(
                         conn,
                         query=None,
+                        rank_query=query,
                         tags=None,
                         components=None,
-                        failure_signature=failure_signature,
+                        failure_signature=candidate,
                         limit=limit - len(rows),
                     )
-                if len(rows) < limit and failure_signature:
-                    similar = _similar_failure_signatures(conn, failure_signature=failure_signature, limit=20)
-                    for candidate in similar:
-                        if len(rows) >= limit:
-                            break
-                        rows += _select_lessons(
-                            conn,
-                            query=None,
-                            tags=None,
-                            components=None,
-                            failure_signature=candidate,
-                            limit=limit - len(rows),
-                        )
-            lessons = []
-            seen = set()
-            for row in rows:
-                lesson_id = row[0]
-                if lesson_id in seen:
-                    continue
-                seen.add(lesson_id)
-                lessons.append(self.load_lesson(lesson_id))
-            return lessons
-        finally:
-            conn.close()
+        lessons = []
+        seen = set()
+        for lesson_id, raw_metadata, body in rows:
+            if lesson_id in seen:
+                continue
+            seen.add(lesson_id)
+            lessons.append(self._lesson_from_row(lesson_id, raw_metadata, body))
+        return lessons
+
+
+RETRY_SIGNAL_FIELDS: tuple[str, ...] = ("failure_signature", "subtask_signature", "tool_workflow_signature")
+
+_SCHEMA_VERSION = 2
+_DEFAULT_REINDEX_WORKERS = min(8, os.cpu_count() or 1)
+_FTS_TOKEN_PATTERN = re.compile(r"\w+")
+_INSERT_LESSON_TAG_SQL = "INSERT OR IGNORE INTO lesson_tags (lesson_id, tag) VALUES (?, ?)"
+_REPLACE_ARTIFACT_SQL = "REPLACE INTO artifacts (id, step_id, task_id, path, hash, metadata) VALUES (?, ?, ?, ?, ?, ?)"
 
 
 def _adjacent_components(
@@ -381,9 +603,10 @@ def _similar_failure_signatures(conn: sqlite3.Connection, *, failure_signature:
     family = normalized.split(":", 1)[0].strip()
     if not family:
         return []
+    # Range scan over the failure_signature index: every value starting with "<family>:".
     cursor = conn.execute(
-        "SELECT DISTINCT failure_signature FROM lessons WHERE failure_signature LIKE ? AND failure_signature <> ? LIMIT ?",
-        (family + ":%", normalized, limit),
+        "SELECT DISTINCT failure_signature FROM lessons WHERE failure_signature >= ? AND failure_signature < ? AND failure_signature <> ? LIMIT ?",
+        (family + ":", family + ";", normalized, limit),
     )
     return [row[0] for row in cursor.fetchall() if row[0]]
 
@@ -396,36 +619,84 @@ def _select_lessons(
     components: list[str] | None,
     failure_signature: str | None,
     limit: int,
+    rank_query: str | None = None,
 ) -> list[tuple]:
+    """Select ``(id, metadata, body)`` rows by exact tags, component, and failure signature.
+
+    ``query`` filters on body text (FTS5 phrase match, LIKE without FTS5);
+    ``rank_query`` only orders the matches. Both rank by ``bm25()`` when FTS5
+    is available, otherwise results come back in index order.
+    """
+
+    joins: list[str] = []
     clauses: list[str] = []
     params: list[Any] = []
+    order = "l.rowid"
+
+    if components is not None and not components:
+        return []
+
+    if tags:
+        unique_tags = sorted(set(tags))
+        placeholders = ",".join("?" for _ in unique_tags)
+        joins.append(
+            f"JOIN (SELECT lesson_id FROM lesson_tags WHERE tag IN ({placeholders}) GROUP BY lesson_id HAVING COUNT(*) = ?) AS t "
+            "ON t.lesson_id = l.id"
+        )
+        params.extend([*unique_tags, len(unique_tags)])
+
+    fts = _fts_available(conn)
+    match_expr = _fts_phrase(query, column="body") if query else None
+    if query and fts and match_expr:
+        joins.append(
+            "JOIN (SELECT rowid AS fts_rowid, bm25(lessons_fts) AS score FROM lessons_fts WHERE lessons_fts MATCH ?) AS r "
+            "ON r.fts_rowid = l.rowid"
+        )
+        params.append(match_expr)
+        order = "r.score, l.rowid"
+    elif query:
+        clauses.append("l.body LIKE ?")
+        params.append(f"%{query}%")
+    elif rank_query and fts:
+        rank_expr = _fts_any(rank_query)
+        if rank_expr:
+            joins.append(
+                "LEFT JOIN (SELECT rowid AS fts_rowid, bm25(lessons_fts) AS score FROM lessons_fts WHERE lessons_fts MATCH ?) AS r "
+                "ON r.fts_rowid = l.rowid"
+            )
+            params.append(rank_expr)
+            order = "r.score IS NULL, r.score, l.rowid"
 
     if components is not None:
-        if not components:
-            return []
         placeholders = ",".join("?" for _ in components)
-        clauses.append(f"component IN ({placeholders})")
+        clauses.append(f"l.component IN ({placeholders})")
         params.extend(components)
 
     if failure_signature:
-        clauses.append("failure_signature = ?")
+        clauses.append("l.failure_signature = ?")
         params.append(failure_signature)
 
-    if tags:
-        for tag in tags:
-            clauses.append("tags LIKE ?")
-            params.append(f"%{tag}%")
-
-    if query:
-        clauses.append("body LIKE ?")
-        params.append(f"%{query}%")
-
     where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
-    cursor = conn.execute(f"SELECT id FROM lessons {where} LIMIT ?", [*params, limit])
+    cursor = conn.execute(f"SELECT l.id, l.metadata, l.body FROM lessons AS l {' '.join(joins)} {where} ORDER BY {order} LIMIT ?", [*params, limit])
     return cursor.fetchall()
 
 
-def _index_lesson_row(conn: sqlite3.Connection, *, lesson_id: str, metadata: dict[str, Any], body: str) -> None:
+def _fts_phrase(text: str, *, column: str | None = None) -> str | None:
+    tokens = _FTS_TOKEN_PATTERN.findall(str(text or ""))
+    if not tokens:
+        return None
+    phrase = '"' + " ".join(tokens) + '"'
+    return f"{column} : {phrase}" if column else phrase
+
+
+def _fts_any(text: str) -> str | None:
+    tokens = sorted(set(_FTS_TOKEN_PATTERN.findall(str(text or ""))))
+    if not tokens:
+        return None
+    return " OR ".join(f'"{token}"' for token in tokens)
+
+
+def _lesson_tag_values(metadata: dict[str, Any]) -> list[str]:
     tag_values: list[str] = []
     for field in ("tags", "retrieval_tags"):
         value = metadata.get(field)
@@ -433,24 +704,130 @@ def _index_lesson_row(conn: sqlite3.Connection, *, lesson_id: str, metadata: dic
             tag_values.extend([str(item).strip() for item in value if str(item).strip()])
         elif isinstance(value, str) and value.strip():
             tag_values.append(value.strip())
+    return tag_values
+
+
+def _migrate_lesson_index(conn: sqlite3.Connection) -> None:
+    """Backfill lesson_tags and re-key lessons_fts by lessons.rowid for pre-existing indexes."""
+
+    conn.execute("DELETE FROM lesson_tags")
+    for lesson_id, raw_metadata in conn.execute("SELECT id, metadata FROM lessons").fetchall():
+        try:
+            metadata = json.loads(raw_metadata) if raw_metadata else {}
+        except json.JSONDecodeError:
+            metadata = {}
+        if not isinstance(metadata, dict):
+            metadata = {}
+        conn.executemany(_INSERT_LESSON_TAG_SQL, [(lesson_id, tag) for tag in set(_lesson_tag_values(metadata))])
+    if _fts_available(conn):
+        conn.execute("DELETE FROM lessons_fts")
+        conn.execute(
+            "INSERT INTO lessons_fts (rowid, id, body, tags, component, failure_signature) "
+            "SELECT rowid, id, body, tags, component, failure_signature FROM lessons"
+        )
+
+
+def _index_lesson_row(conn: sqlite3.Connection, *, lesson_id: str, metadata: dict[str, Any], body: str) -> None:
+    tag_values = _lesson_tag_values(metadata)
     tags = ",".join(tag_values)
     component = metadata.get("component", "")
     failure_signature = metadata.get("failure_signature", "")
-    conn.execute(
+    fts = _fts_available(conn)
+    if fts:
+        previous = conn.execute("SELECT rowid FROM lessons WHERE id = ?", (lesson_id,)).fetchone()
+        if previous is not None:
+            conn.execute("DELETE FROM lessons_fts WHERE rowid = ?", (previous[0],))
+    cursor = conn.execute(
         "REPLACE INTO lessons (id, metadata, body, tags, component, failure_signature) VALUES (?, ?, ?, ?, ?, ?)",
         (lesson_id, json.dumps(metadata), body, tags, component, failure_signature),
     )
-    try:
+    conn.execute("DELETE FROM lesson_tags WHERE lesson_id = ?", (lesson_id,))
+    conn.executemany(_INSERT_LESSON_TAG_SQL, [(lesson_id, tag) for tag in set(tag_values)])
+    _update_retry_signals(conn, lesson_id, metadata)
+    if fts:
         conn.execute(
-            "REPLACE INTO lessons_fts (id, body, tags, component, failure_signature) VALUES (?, ?, ?, ?, ?)",
-            (lesson_id, body, tags, component, failure_signature),
+            "INSERT INTO lessons_fts (rowid, id, body, tags, component, failure_signature) VALUES (?, ?, ?, ?, ?, ?)",
+            (cursor.lastrowid, lesson_id, body, tags, component, failure_signature),
         )
-    except sqlite3.OperationalError:
-        pass
 
 
-def _parse_lesson_file(path: Path) -> tuple[str, dict[str, Any], str]:
-    content = path.read_text()
+def _delete_lesson_row(conn: sqlite3.Connection, lesson_id: str) -> None:
+    row = conn.execute("SELECT rowid FROM lessons WHERE id = ?", (lesson_id,)).fetchone()
+    if row is not None and _fts_available(conn):
+        conn.execute("DELETE FROM lessons_fts WHERE rowid = ?", (row[0],))
+    conn.execute("DELETE FROM lessons WHERE id = ?", (lesson_id,))
+    conn.execute("DELETE FROM lesson_tags WHERE lesson_id = ?", (lesson_id,))
+    _update_retry_signals(conn, lesson_id, None)
+
+
+def _is_retry_lesson(metadata: dict[str, Any]) -> bool:
+    if metadata.get("lesson_type") == "retry":
+        return True
+    tags = metadata.get("tags")
+    if isinstance(tags, list):
+        return "retry" in tags
+    if isinstance(tags, str):
+        return "retry" in {t.strip() for t in tags.split(",") if t.strip()}
+    return False
+
+
+def _update_retry_signals(conn: sqlite3.Connection, lesson_id: str, metadata: dict[str, Any] | None) -> None:
+    """Move a Lesson's contribution to ``retry_signal_counts`` from its old metadata to ``metadata``."""
+
+    previous = conn.execute("SELECT field, signature FROM retry_lesson_signals WHERE lesson_id = ?", (lesson_id,)).fetchall()
+    if previous:
+        conn.executemany(
+            "UPDATE retry_signal_counts SET count = count - 1 WHERE field = ? AND signature = ?",
+            previous,
+        )
+        conn.executemany(
+            "DELETE FROM retry_signal_counts WHERE field = ? AND signature = ? AND count <= 0",
+            previous,
+        )
+        conn.execute("DELETE FROM retry_lesson_signals WHERE lesson_id = ?", (lesson_id,))
+    if metadata is None or not _is_retry_lesson(metadata):
+        return
+    signals = [
+        (field, str(metadata.get(field) or "").strip())
+        for field in RETRY_SIGNAL_FIELDS
+        if str(metadata.get(field) or "").strip()
+    ]
+    conn.executemany(
+        "INSERT INTO retry_lesson_signals (lesson_id, field, signature) VALUES (?, ?, ?)",
+        [(lesson_id, field, signature) for field, signature in signals],
+    )
+    conn.executemany(
+        "INSERT INTO retry_signal_counts (field, signature, count) VALUES (?, ?, 1) "
+        "ON CONFLICT (field, signature) DO UPDATE SET count = count + 1",
+        signals,
+    )
+
+
+def _rebuild_retry_signals(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM retry_lesson_signals")
+    conn.execute("DELETE FROM retry_signal_counts")
+    for lesson_id, raw_metadata in conn.execute("SELECT id, metadata FROM lessons").fetchall():
+        try:
+            metadata = json.loads(raw_metadata) if raw_metadata else {}
+        except json.JSONDecodeError:
+            continue
+        if isinstance(metadata, dict):
+            _update_retry_signals(conn, lesson_id, metadata)
+
+
+def _record_lesson_file(conn: sqlite3.Connection, lesson_file: _LessonFile) -> None:
+    conn.execute(
+        "REPLACE INTO lesson_files (name, lesson_id, mtime_ns, size, sha256) VALUES (?, ?, ?, ?, ?)",
+        (lesson_file.name, lesson_file.lesson_id, lesson_file.mtime_ns, lesson_file.size, lesson_file.sha256),
+    )
+
+
+def _load_manifest(conn: sqlite3.Connection) -> dict[str, _LessonFile]:
+    cursor = conn.execute("SELECT name, lesson_id, mtime_ns, size, sha256 FROM lesson_files")
+    return {row[0]: _LessonFile(*row) for row in cursor.fetchall()}
+
+
+def _parse_lesson_content(path: Path, content: str) -> tuple[str, dict[str, Any], str]:
     header, body = content.split("---", 1)
     raw = json.loads(header.strip())
     if not isinstance(raw, dict):
@@ -461,6 +838,13 @@ def _parse_lesson_file(path: Path) -> tuple[str, dict[str, Any], str]:
     return lesson_id.strip(), raw, body.strip()
 
 
+def _mtime_ns(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
 def _lesson_id_from_filename(path: Path) -> str | None:
     stem = path.stem
     if not stem.startswith("lesson-"):
@@ -482,7 +866,7 @@ def _search_lesson_ids(conn: sqlite3.Connection, query: str, *, limit: int) -> l
     if _fts_available(conn):
         try:
             cursor = conn.execute(
-                "SELECT id FROM lessons_fts WHERE lessons_fts MATCH ? ORDER BY id LIMIT ?",
+                "SELECT id FROM lessons_fts WHERE lessons_fts MATCH ? ORDER BY bm25(lessons_fts), id LIMIT ?",
                 (normalized, limit),
             )
             return [row[0] for row in cursor.fetchall() if row and row[0]]
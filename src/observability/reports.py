@@ -61,6 +61,12 @@ def normalize_step_metrics(
         "tool_errors": tool_errors,
         "failure_signature": str(failure_signature or ""),
     }
+    read_cache_lookups = _as_int(raw_metrics.get("read_cache_lookups"))
+    if read_cache_lookups:
+        read_cache_hits = _as_int(raw_metrics.get("read_cache_hits")) or 0
+        step_metrics["read_cache_hits"] = read_cache_hits
+        step_metrics["read_cache_lookups"] = read_cache_lookups
+        step_metrics["read_cache_hit_rate"] = round(read_cache_hits / read_cache_lookups, 3)
     return step_metrics
 
 
@@ -72,6 +78,7 @@ def build_run_metrics_payload(
     steps: list[dict[str, Any]],
     tests_passed: int | None = None,
     tests_failed: int | None = None,
+    llm_cache: dict[str, int] | None = None,
 ) -> dict[str, Any]:
     wall_time_s = round(float(wall_time_s), 3) if wall_time_s is not None else None
     step_statuses = [str(step.get("status") or "") for step in (steps or [])]
@@ -79,7 +86,7 @@ def build_run_metrics_payload(
     model_calls_sum = _sum_int(step.get("model_calls") for step in (steps or []))
     tool_calls_sum = _sum_int(step.get("tool_calls") for step in (steps or []))
     energy_sum = model_calls_sum + tool_calls_sum if model_calls_sum is not None and tool_calls_sum is not None else None
-    return {
+    payload: dict[str, Any] = {
         "schema_version": METRICS_SCHEMA_VERSION,
         "run": {
             "run_id": str(run_id),
@@ -95,6 +102,9 @@ def build_run_metrics_payload(
         },
         "steps": list(steps or []),
     }
+    if llm_cache is not None:
+        payload["run"]["llm_cache"] = {key: int(value) for key, value in sorted(llm_cache.items())}
+    return payload
 
 
 def write_metrics_and_dashboard(reports_dir: Path, metrics_payload: dict[str, Any]) -> tuple[Path, Path]:
@@ -26,6 +26,9 @@ def _normalize(value: str) -> str:
 
 _REGISTRY: dict[tuple[str, str], ToolRisk] = {
     ("file", "read"): ToolRisk(risk_tier="low", requires_approval=False, notes="read-only workspace access"),
+    ("file", "head"): ToolRisk(risk_tier="low", requires_approval=False, notes="read-only workspace access"),
+    ("file", "tail"): ToolRisk(risk_tier="low", requires_approval=False, notes="read-only workspace access"),
+    ("file", "stat"): ToolRisk(risk_tier="low", requires_approval=False, notes="read-only workspace access"),
     ("file", "write"): ToolRisk(risk_tier="high", requires_approval=True, notes="writes to workspace"),
     ("patch", "apply"): ToolRisk(risk_tier="high", requires_approval=True, notes="applies patches to workspace"),
     ("grep", "search"): ToolRisk(risk_tier="low", requires_approval=False, notes="bounded repo search"),
@@ -3,17 +3,20 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import hashlib
 import time
-from dataclasses import dataclass
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, TypeVar
 
 from agents.manager import Manager
 from agents.worker import Worker
 from artifacts import ArtifactStore
 from execution.parallel import AsyncExecutor, ConcurrencyConfig
 from flow_types import ProgressMetrics, StepStatus, WorkerStatus
+from llm.cache import llm_cache_stats
 from logging_utils import log_to_file
 from memory.store import MemoryStore
 from observability.reports import build_run_metrics_payload
@@ -23,14 +26,17 @@ from replay import ReplayRecorder
 from skills.gap_detector import SkillGapDetector
 from runs import RunContext, create_run_context, load_run_context
 from tools.file_tool import FileTool
-from tools.grep_tool import GrepTool
+from tools.grep_tool import GrepTool, workspace_index_from_env
 from tools.patch_tool import PatchTool
 from tools.pytest_tool import PytestTool
+from tools.read_cache import WorkspaceReadCache
 from tools.web_tool import WebTool
 from tracing import TraceLogger
 from workflow.engine import WorkflowEngine
 from workflow.models import StepAttempt
 
+T = TypeVar("T")
+
 
 @dataclass
 class HierarchicalResult:
@@ -42,6 +48,28 @@ class HierarchicalResult:
     best_failed: int | None = None
 
 
+@dataclass
+class _WorkspaceChanges:
+    """Files any step touched since the last test run, for PytestTool's impact selection.
+
+    Steps share one instance per workflow run. It is only used on the event loop
+    thread, so it needs no lock.
+    """
+
+    pending: set[str] = field(default_factory=set)
+    unknown: bool = False
+    # Workers currently running; their edits are on disk but not yet reported.
+    editing: int = 0
+
+    def take(self) -> list[str] | None:
+        """Changed files for the next test run, or None (run everything) while they cannot all be known."""
+
+        changed = None if self.unknown or self.editing else sorted(self.pending)
+        self.pending.clear()
+        self.unknown = False
+        return changed
+
+
 class HierarchicalRunner:
     def __init__(self, repo_root: Path, llm_client, base_dir: Path | None = None) -> None:
         self.repo_root = repo_root
@@ -53,6 +81,7 @@ class HierarchicalRunner:
             task_id: str | None = None, test_args: list[str] | None = None,
             concurrency: int = 4) -> HierarchicalResult:
         run_start = time.perf_counter()
+        llm_cache_start = llm_cache_stats(self.llm_client)
         run_context = create_run_context(self.base_dir)
         run_context.write_manifest({"goal": goal, "task_id": task_id, "runner": "hierarchical"})
         memory_store = MemoryStore(self.repo_root / "memory")
@@ -60,46 +89,30 @@ class HierarchicalRunner:
         gap_detector = SkillGapDetector(self.repo_root, memory_store)
         artifact_store = ArtifactStore(run_context.artifacts_dir, memory_store=memory_store)
         trace = TraceLogger(run_context.trace_path)
-        tools = self._build_tools()
-        if task_steps is None:
-            planned = manager.plan_steps(
-                goal,
-                self.llm_client,
-                tools,
-                trace=trace,
-                trace_context={"task_id": task_id or run_context.run_id, "worker_type": "Planner"},
-            )
-            if planned:
-                task_steps = planned
-        workflow_spec = manager.build_workflow(goal, task_steps)
-        engine = WorkflowEngine(workflow_spec)
-        executor = AsyncExecutor(ConcurrencyConfig(max_concurrency=concurrency))
-
-        manager_log = run_context.logs_dir / "manager.log"
-        log_to_file(manager_log, f"Run start: {goal}")
-
-        async def run_loop() -> None:
-            while not engine.state.is_complete():
-                ready = engine.ready_steps()
-                if not ready:
-                    break
-                tasks = [
-                    lambda step_id=step_id: self._run_step(step_id, engine, manager, tools, trace, run_context,
-                                                           task_id or workflow_spec.workflow_id, test_args, artifact_store, gap_detector)
-                    for step_id in ready
-                ]
-                await executor.run(tasks)
-                termination = engine.state.metadata.pop("terminate_workflow", None)
-                if isinstance(termination, dict):
-                    reason = str(termination.get("reason") or "terminated early").strip()
-                    triggered_by = str(termination.get("step_id") or "<unknown>")
-                    engine.skip_remaining(reason=reason or "terminated early", triggered_by=triggered_by)
-                    engine.save(run_context.workflow_state_path)
-                    break
-                engine.save(run_context.workflow_state_path)
-
-        asyncio.run(run_loop())
-        log_to_file(manager_log, "Run complete")
+        try:
+            tools = self._build_tools()
+            if task_steps is None:
+                planned = manager.plan_steps(
+                    goal,
+                    self.llm_client,
+                    tools,
+                    trace=trace,
+                    trace_context={"task_id": task_id or run_context.run_id, "worker_type": "Planner"},
+                )
+                if planned:
+                    task_steps = planned
+            workflow_spec = manager.build_workflow(goal, task_steps)
+            engine = WorkflowEngine(workflow_spec)
+
+            manager_log = run_context.logs_dir / "manager.log"
+            log_to_file(manager_log, f"Run start: {goal}")
+
+            self._run_workflow(engine, manager, tools, trace, run_context, task_id or workflow_spec.workflow_id,
+                               test_args, artifact_store, gap_detector, concurrency)
+            log_to_file(manager_log, "Run complete")
+        finally:
+            trace.close()
+            memory_store.close()
         model_calls, tool_calls, best_passed, best_failed = _summarize_workflow(engine)
         wall_time_s = time.perf_counter() - run_start
         steps = _collect_step_metrics(engine)
@@ -110,6 +123,7 @@ class HierarchicalRunner:
             steps=steps,
             tests_passed=best_passed,
             tests_failed=best_failed,
+            llm_cache=llm_cache_stats(self.llm_client, since=llm_cache_start),
         )
         write_metrics_and_dashboard(run_context.reports_dir, run_metrics_payload)
         return HierarchicalResult(
@@ -124,6 +138,7 @@ class HierarchicalRunner:
     def resume(self, run_path: Path, test_args: list[str] | None = None,
                concurrency: int = 4) -> HierarchicalResult:
         run_start = time.perf_counter()
+        llm_cache_start = llm_cache_stats(self.llm_client)
         run_context = load_run_context(run_path)
         engine = WorkflowEngine.load(run_context.workflow_state_path)
         memory_store = MemoryStore(self.repo_root / "memory")
@@ -131,33 +146,17 @@ class HierarchicalRunner:
         gap_detector = SkillGapDetector(self.repo_root, memory_store)
         artifact_store = ArtifactStore(run_context.artifacts_dir, memory_store=memory_store)
         trace = TraceLogger(run_context.trace_path)
-        tools = self._build_tools()
-        executor = AsyncExecutor(ConcurrencyConfig(max_concurrency=concurrency))
-        manager_log = run_context.logs_dir / "manager.log"
-        log_to_file(manager_log, "Resume run")
-
-        async def run_loop() -> None:
-            while not engine.state.is_complete():
-                ready = engine.ready_steps()
-                if not ready:
-                    break
-                tasks = [
-                    lambda step_id=step_id: self._run_step(step_id, engine, manager, tools, trace, run_context,
-                                                           engine.spec.workflow_id, test_args, artifact_store, gap_detector)
-                    for step_id in ready
-                ]
-                await executor.run(tasks)
-                termination = engine.state.metadata.pop("terminate_workflow", None)
-                if isinstance(termination, dict):
-                    reason = str(termination.get("reason") or "terminated early").strip()
-                    triggered_by = str(termination.get("step_id") or "<unknown>")
-                    engine.skip_remaining(reason=reason or "terminated early", triggered_by=triggered_by)
-                    engine.save(run_context.workflow_state_path)
-                    break
-                engine.save(run_context.workflow_state_path)
-
-        asyncio.run(run_loop())
-        log_to_file(manager_log, "Resume complete")
+        try:
+            tools = self._build_tools()
+            manager_log = run_context.logs_dir / "manager.log"
+            log_to_file(manager_log, "Resume run")
+
+            self._run_workflow(engine, manager, tools, trace, run_context, engine.spec.workflow_id,
+                               test_args, artifact_store, gap_detector, concurrency)
+            log_to_file(manager_log, "Resume complete")
+        finally:
+            trace.close()
+            memory_store.close()
         model_calls, tool_calls, best_passed, best_failed = _summarize_workflow(engine)
         wall_time_s = time.perf_counter() - run_start
         steps = _collect_step_metrics(engine)
@@ -168,6 +167,7 @@ class HierarchicalRunner:
             steps=steps,
             tests_passed=best_passed,
             tests_failed=best_failed,
+            llm_cache=llm_cache_stats(self.llm_client, since=llm_cache_start),
         )
         write_metrics_and_dashboard(run_context.reports_dir, run_metrics_payload)
         return HierarchicalResult(
@@ -179,18 +179,81 @@ class HierarchicalRunner:
             best_failed=best_failed,
         )
 
+    def _run_workflow(self, engine: WorkflowEngine, manager: Manager, tools: dict[str, Any], trace: TraceLogger,
+                      run_context: RunContext, task_id: str, test_args: list[str] | None,
+                      artifact_store: ArtifactStore, gap_detector: SkillGapDetector | None, concurrency: int) -> None:
+        """Drive ready steps until the workflow completes or stalls.
+
+        Scheduling is event-driven: a step is started as soon as its
+        dependencies are terminal and a concurrency slot is free, instead of
+        waiting for the whole wave of ready steps to finish. Blocking step work
+        (worker loops, test runs, artifact writes) runs on a bounded thread
+        pool; engine, manager, and delegation-graph mutations stay on the event
+        loop thread, so steps only interleave at await points.
+        """
+
+        max_workers = max(1, int(concurrency))
+        executor = AsyncExecutor(ConcurrencyConfig(max_concurrency=max_workers))
+        changes = _WorkspaceChanges()
+
+        async def run_loop(step_pool: Executor) -> None:
+            in_flight: dict[asyncio.Future[None], str] = {}
+            termination: dict[str, Any] | None = None
+            while True:
+                if termination is None:
+                    running = set(in_flight.values())
+                    for step_id in engine.ready_steps():
+                        if len(in_flight) >= max_workers:
+                            break
+                        if step_id in running:
+                            continue
+                        task = executor.submit(
+                            lambda step_id=step_id: self._run_step(step_id, engine, manager, tools, trace, run_context,
+                                                                   task_id, test_args, artifact_store, gap_detector,
+                                                                   step_pool=step_pool, changes=changes)
+                        )
+                        in_flight[task] = step_id
+                if not in_flight:
+                    break
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    in_flight.pop(task)
+                    task.result()
+                requested = engine.state.metadata.pop("terminate_workflow", None)
+                if termination is None and isinstance(requested, dict):
+                    termination = requested
+                if termination is not None and not in_flight:
+                    reason = str(termination.get("reason") or "terminated early").strip()
+                    triggered_by = str(termination.get("step_id") or "<unknown>")
+                    engine.skip_remaining(reason=reason or "terminated early", triggered_by=triggered_by)
+                    break
+                engine.checkpoint()
+
+        engine.attach_journal(run_context.workflow_state_path)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tokimon-step") as step_pool:
+                asyncio.run(run_loop(step_pool))
+            engine.save(run_context.workflow_state_path)
+        finally:
+            engine.close_journal()
+
     def _build_tools(self) -> dict[str, Any]:
+        read_cache = WorkspaceReadCache()
+        index = workspace_index_from_env(self.repo_root)
         return {
-            "file": FileTool(self.repo_root),
-            "grep": GrepTool(self.repo_root),
-            "patch": PatchTool(self.repo_root),
+            "file": FileTool(self.repo_root, read_cache=read_cache, index=index),
+            "grep": GrepTool(self.repo_root, read_cache=read_cache, index=index),
+            "patch": PatchTool(self.repo_root, read_cache=read_cache, index=index),
             "pytest": PytestTool(self.repo_root),
             "web": WebTool(),
         }
 
     async def _run_step(self, step_id: str, engine: WorkflowEngine, manager: Manager, tools: dict[str, Any],
                         trace: TraceLogger, run_context: RunContext, task_id: str, test_args: list[str] | None,
-                        artifact_store: ArtifactStore, gap_detector: SkillGapDetector | None = None) -> None:
+                        artifact_store: ArtifactStore, gap_detector: SkillGapDetector | None = None,
+                        *, step_pool: Executor | None = None,
+                        changes: _WorkspaceChanges | None = None) -> None:
+        changes = changes if changes is not None else _WorkspaceChanges()
         step_state = engine.state.steps[step_id]
         step_spec = engine.spec.step_map()[step_id]
         worker_log = run_context.logs_dir / f"worker-{step_id}.log"
@@ -266,22 +329,33 @@ class HierarchicalRunner:
             inputs=step_state.inputs,
             memory=memory,
         )
-        output = worker.run(
-            engine.spec.goal,
-            step_id,
-            step_state.inputs,
-            memory,
-            trace=trace,
-            trace_context={
-                "task_id": task_id,
-                "call_id": call_id,
-                "call_signature": call_signature,
-                "worker_type": worker_type,
-                "strategy_id": strategy.strategy_id,
-                "retrieval_stage": strategy.retrieval_stage,
-            },
-            replay_recorder=replay,
-        )
+        changes.editing += 1
+        try:
+            output = await _run_blocking(
+                step_pool,
+                worker.run,
+                engine.spec.goal,
+                step_id,
+                step_state.inputs,
+                memory,
+                trace=trace,
+                trace_context={
+                    "task_id": task_id,
+                    "call_id": call_id,
+                    "call_signature": call_signature,
+                    "worker_type": worker_type,
+                    "strategy_id": strategy.strategy_id,
+                    "retrieval_stage": strategy.retrieval_stage,
+                },
+                replay_recorder=replay,
+            )
+        finally:
+            changes.editing -= 1
+        touched_files = output.metrics.get("touched_files") if isinstance(output.metrics, dict) else None
+        if isinstance(touched_files, list):
+            changes.pending.update(str(p) for p in touched_files)
+        else:
+            changes.unknown = True
         log_to_file(worker_log, f"Output status {output.status} summary {output.summary}")
         if output.failure_signature:
             log_to_file(worker_log, f"Failure signature: {output.failure_signature}")
@@ -310,8 +384,22 @@ class HierarchicalRunner:
             outputs_payload["details"] = details.strip()
         engine.mark_outputs(step_id, outputs_payload)
 
-        pytest_metrics = await self._run_tests(test_args, tools.get("pytest")) if test_args else None
-        artifact_hash = artifact_store.write_step(
+        pytest_metrics = (
+            await self._run_tests(
+                test_args,
+                tools.get("pytest"),
+                step_pool=step_pool,
+                changed_files=changes.take(),
+            )
+            if test_args
+            else None
+        )
+        if not output.failure_signature and isinstance(pytest_metrics, dict) and pytest_metrics.get("failure_signature"):
+            # The step's test run was stopped by a limit (e.g. "pytest-timeout"); let the retry gate key on that.
+            output.failure_signature = str(pytest_metrics["failure_signature"])
+        artifact_hash = await _run_blocking(
+            step_pool,
+            artifact_store.write_step,
             task_id,
             step_id,
             output.artifacts,
@@ -320,7 +408,6 @@ class HierarchicalRunner:
             replay_record=replay.build(),
         )
         touched_hash = None
-        touched_files = output.metrics.get("touched_files") if isinstance(output.metrics, dict) else None
         if isinstance(touched_files, list) and touched_files:
             touched_hash = _hash_touched_files(self.repo_root, [str(p) for p in touched_files])
         touched_files_count = len(touched_files) if isinstance(touched_files, list) else None
@@ -328,9 +415,10 @@ class HierarchicalRunner:
         tool_call_records = output.metrics.get("tool_call_records") if isinstance(output.metrics, dict) else None
         if isinstance(tool_call_records, list):
             tool_errors = sum(1 for record in tool_call_records if isinstance(record, dict) and record.get("ok") is False)
+        failing_tests, passed_tests = _suite_test_counts(pytest_metrics)
         progress = ProgressMetrics(
-            failing_tests=pytest_metrics.get("failed") if pytest_metrics else None,
-            passed_tests=pytest_metrics.get("passed") if pytest_metrics else None,
+            failing_tests=failing_tests,
+            passed_tests=passed_tests,
             new_artifacts=len(output.artifacts),
             artifact_delta_hash=touched_hash or artifact_hash,
         )
@@ -358,6 +446,9 @@ class HierarchicalRunner:
                 "artifact_count": len(output.artifacts),
                 "touched_files_count": touched_files_count,
                 "tool_errors": tool_errors,
+                "read_cache_hits": output.metrics.get("read_cache_hits"),
+                "read_cache_lookups": output.metrics.get("read_cache_lookups"),
+                **_test_selection_metrics(pytest_metrics),
             },
             artifacts=output.artifacts,
         )
@@ -383,6 +474,7 @@ class HierarchicalRunner:
             terminate_workflow = False
             terminate_reason = ""
 
+        # PytestTool confirms a passing impact-selected run with a full run, so returncode 0 covers the suite.
         tests_green = True
         if isinstance(pytest_metrics, dict):
             returncode = pytest_metrics.get("returncode")
@@ -450,13 +542,50 @@ class HierarchicalRunner:
             engine.mark_status(step_id, StepStatus.BLOCKED, error="worker blocked")
             trace.log("step_blocked", {"step_id": step_id})
 
-    async def _run_tests(self, test_args: list[str], pytest_tool: PytestTool | None) -> dict[str, Any]:
+    async def _run_tests(self, test_args: list[str], pytest_tool: PytestTool | None,
+                         *, step_pool: Executor | None = None,
+                         changed_files: list[str] | None = None) -> dict[str, Any]:
         if pytest_tool is None:
             return {}
-        result = pytest_tool.run(test_args)
+        result = await _run_blocking(step_pool, pytest_tool.run, test_args, changed_files=changed_files)
         return result.data
 
 
+def _suite_test_counts(pytest_metrics: dict[str, Any] | None) -> tuple[int | None, int | None]:
+    """(failed, passed) for the whole suite, or Nones when the run only covered an impact-selected subset.
+
+    Subset counts shrink and grow with each selection, so comparing them across
+    attempts (retry progress, best_passed/best_failed) would be meaningless.
+    """
+
+    if not pytest_metrics:
+        return None, None
+    selection = pytest_metrics.get("selection")
+    if isinstance(selection, dict) and selection.get("mode") == "impact" and not selection.get("confirmed"):
+        return None, None
+    return pytest_metrics.get("failed"), pytest_metrics.get("passed")
+
+
+def _test_selection_metrics(pytest_metrics: dict[str, Any] | None) -> dict[str, Any]:
+    """Selected vs total test files when PytestTool ran with test-impact selection."""
+
+    selection = pytest_metrics.get("selection") if isinstance(pytest_metrics, dict) else None
+    if not isinstance(selection, dict):
+        return {}
+    return {
+        "test_selection_mode": selection.get("mode"),
+        "test_files_selected": selection.get("selected"),
+        "test_files_total": selection.get("total"),
+    }
+
+
+async def _run_blocking(pool: Executor | None, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable off the event loop (default executor when pool is None)."""
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+
+
 def _hash_touched_files(repo_root: Path, relpaths: list[str], *, max_files: int = 50, max_bytes: int = 2_000_000) -> str:
     repo_root = repo_root.resolve()
     hasher = hashlib.sha256()
@@ -13,7 +13,7 @@ import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any
 
 from memory.store import MemoryStore
 from skills.spec import SkillSpec
@@ -77,22 +77,7 @@ class SkillGapDetector:
         return None
 
     def _count_retry_lessons(self, field_name: str, signature: str) -> int:
-        count = 0
-        for metadata in self._iter_retry_lesson_metadata():
-            if str(metadata.get(field_name) or "").strip() == signature:
-                count += 1
-        return count
-
-    def _iter_retry_lesson_metadata(self) -> Iterable[dict[str, Any]]:
-        lessons_dir = self.memory_store.lessons_dir
-        if not lessons_dir.exists():
-            return
-        for path in sorted(lessons_dir.glob("lesson-*.md")):
-            metadata = _read_lesson_metadata(path)
-            if not metadata:
-                continue
-            if _is_retry_lesson(metadata):
-                yield metadata
+        return self.memory_store.count_retry_lessons(field_name, signature)
 
     def _create_candidate(
         self,
@@ -164,29 +149,6 @@ class SkillGapDetector:
         self.memory_store.write_lesson(metadata, body)
 
 
-def _read_lesson_metadata(path: Path) -> dict[str, Any] | None:
-    try:
-        header = path.read_text().split("\n", 1)[0].strip()
-        if not header:
-            return None
-        parsed = json.loads(header)
-        return parsed if isinstance(parsed, dict) else None
-    except Exception:
-        return None
-
-
-def _is_retry_lesson(metadata: dict[str, Any]) -> bool:
-    lesson_type = metadata.get("lesson_type")
-    if lesson_type == "retry":
-        return True
-    tags = metadata.get("tags")
-    if isinstance(tags, list):
-        return "retry" in tags
-    if isinstance(tags, str):
-        return "retry" in {t.strip() for t in tags.split(",") if t.strip()}
-    return False
-
-
 def _candidate_name(signal_type: str, signature: str) -> str:
     digest = hashlib.sha1(f"{signal_type}:{signature}".encode("utf-8")).hexdigest()[:10]
     return f"gap-{signal_type}-{digest}"
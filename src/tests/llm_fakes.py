@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import sys
+import textwrap
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from llm.client import MockLLMClient
+
+
+FAKE_CLI = textwrap.dedent(
+    """
+    import json, os, sys, time
+    prompt = sys.stdin.read()
+    if "SLEEP" in prompt:
+        time.sleep(30)
+    time.sleep(DELAY_S)
+    payload = {
+        "status": "SUCCESS",
+        "summary": f"pid {os.getpid()}",
+        "prompt_chars": len(prompt),
+        "echo": (prompt.rsplit("MSG:", 1)[-1].split() or [""])[0],
+    }
+    if "--output-last-message" in sys.argv:
+        path = sys.argv[sys.argv.index("--output-last-message") + 1]
+        with open(path, "w") as handle:
+            handle.write(json.dumps(payload))
+    else:
+        print(json.dumps({"type": "result", "result": json.dumps(payload)}))
+    """
+)
+
+
+def fake_cli(tmp_path: Path, delay_s: float = 0.0) -> str:
+    """Write the fake codex/claude CLI into tmp_path and return a command that runs it."""
+    script = tmp_path / "fake_cli.py"
+    script.write_text(f"DELAY_S = {delay_s!r}\n" + FAKE_CLI)
+    return f"{sys.executable} {script}"
+
+
+@dataclass
+class RecordingClient(MockLLMClient):
+    """Scripted client that keeps a copy of every message list, and the tools, it was sent."""
+
+    snapshots: list[list[dict[str, Any]]] = field(default_factory=list)
+    tools_sent: list[Any] = field(default_factory=list)
+
+    def send(self, messages, tools=None, response_schema=None):
+        self.snapshots.append([dict(message) for message in messages])
+        self.tools_sent.append(tools)
+        return super().send(messages, tools=tools, response_schema=response_schema)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import cli
+from artifacts import ArtifactStore, collect_unreferenced_blobs
+from memory.store import MemoryStore
+
+
+def test_identical_payloads_share_blobs_across_runs(tmp_path: Path) -> None:
+    memory_store = MemoryStore(tmp_path / "memory")
+    first = ArtifactStore(tmp_path / "run-1" / "artifacts" / "steps", memory_store=memory_store)
+    second = ArtifactStore(tmp_path / "run-2" / "artifacts" / "steps", memory_store=memory_store)
+    artifacts = [{"path": "a.py", "note": "x" * 1000}]
+
+    digest_one = first.write_step("t", "step-1", artifacts, {"k": 1}, step_result={"status": "SUCCESS"})
+    digest_two = second.write_step("t", "step-1", artifacts, {"k": 1}, step_result={"status": "SUCCESS"})
+    assert digest_one == digest_two
+
+    one = first.base_dir / "step-1" / "artifacts.json"
+    two = second.base_dir / "step-1" / "artifacts.json"
+    assert one.stat().st_ino == two.stat().st_ino
+    assert json.loads(two.read_text()) == artifacts
+    blobs = [path for path in first.blob_dir.rglob("*.json")]
+    assert len(blobs) == 4
+
+
+def test_step_digest_and_manifest(tmp_path: Path) -> None:
+    store = ArtifactStore(tmp_path / "artifacts" / "steps")
+    digest = store.write_step("t", "s", [], None, step_result={"summary": "ok"}, replay_record={"step_id": "s"})
+
+    step_dir = store.base_dir / "s"
+    names = ["step_result.json", "outputs.json", "artifacts.json", "replay.json"]
+    expected = hashlib.sha256(b"".join((step_dir / name).read_bytes() for name in names)).hexdigest()
+    assert digest == expected
+
+    manifest = json.loads((step_dir / "manifest.json").read_text())
+    assert manifest["digest"] == digest
+    for name in names:
+        assert manifest["files"][name]["sha256"] == hashlib.sha256((step_dir / name).read_bytes()).hexdigest()
+        assert store.blob_path(manifest["files"][name]["sha256"]).exists()
+
+
+def test_rewriting_a_step_does_not_touch_shared_blobs(tmp_path: Path) -> None:
+    store = ArtifactStore(tmp_path / "artifacts" / "steps")
+    store.write_step("t", "a", [], {"v": 1})
+    store.write_step("t", "b", [], {"v": 1})
+    store.write_step("t", "a", [], {"v": 2})
+
+    assert json.loads((store.base_dir / "a" / "outputs.json").read_text()) == {"v": 2}
+    assert json.loads((store.base_dir / "b" / "outputs.json").read_text()) == {"v": 1}
+
+
+def test_blobs_no_run_links_to_are_reclaimed(tmp_path: Path, capsys) -> None:
+    memory_store = MemoryStore(tmp_path / "memory")
+    first = ArtifactStore(tmp_path / "run-1" / "artifacts" / "steps", memory_store=memory_store)
+    second = ArtifactStore(tmp_path / "run-2" / "artifacts" / "steps", memory_store=memory_store)
+    first.write_step("t", "step-1", [{"path": "a.py"}], {"k": 1})
+    second.write_step("t", "step-1", [{"path": "a.py"}], {"k": 1})
+    memory_store.close()
+    blobs = sorted(first.blob_dir.rglob("*.json"))
+    old = time.time() - 7200
+    for blob in blobs:
+        os.utime(blob, (old, old))
+
+    shutil.rmtree(tmp_path / "run-1")
+    assert collect_unreferenced_blobs(first.blob_dir)["removed"] == 0
+
+    shutil.rmtree(tmp_path / "run-2")
+    # Freshly written blobs are left alone: a concurrent write_step may be about to link them.
+    fresh = ArtifactStore(tmp_path / "run-3" / "artifacts" / "steps", blob_dir=first.blob_dir)
+    fresh._put_blob("f" * 64, b"{}\n")
+
+    assert cli.main(["memory", "gc-artifacts", "--root", str(tmp_path / "memory"), "--json"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["removed"] == len(blobs)
+    assert report["kept"] == 1
+    assert sorted(first.blob_dir.rglob("*.json")) == [fresh.blob_path("f" * 64)]
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import json
+import subprocess
 from pathlib import Path
 
-from llm.client import CodexCLISettings, _codex_cli_preamble, _render_prompt
+import llm.client as client
+from agents.worker import Worker
+from llm.client import CodexCLISettings, PromptBuilder, _codex_cli_preamble, _render_prompt
+from llm_fakes import RecordingClient
 
 
 def test_codex_cli_preamble_includes_permissions_and_environment(monkeypatch, tmp_path: Path) -> None:
@@ -46,3 +51,70 @@ def test_render_prompt_is_deterministic_and_sorts_tools() -> None:
     assert "</conversation>" in prompt_a
     assert "SYSTEM: sys" in prompt_a
     assert "USER: hi" in prompt_a
+
+
+def test_prompt_builder_matches_full_render_as_turns_are_appended() -> None:
+    tools = [{"name": "file", "actions": ["read"], "signatures": {"read": "read(path)"}}]
+    builder = PromptBuilder(tools=tools, preamble="PRE")
+    messages = [{"role": "system", "content": "sys"}]
+    prefix_hash = builder.prefix_hash
+    for index in range(5):
+        messages.append({"role": "user", "content": f"turn {index}"})
+        assert builder.render(messages) == _render_prompt(messages, tools=tools, preamble="PRE")
+    assert builder.prefix_hash == prefix_hash
+
+    messages[2] = {"role": "tool", "name": "file", "content": "[elided]"}
+    messages[3]["content"] = "edited"
+    assert builder.render(messages) == _render_prompt(messages, tools=tools, preamble="PRE")
+    assert PromptBuilder(tools=tools, preamble="OTHER").prefix_hash != prefix_hash
+
+
+def test_codex_client_reuses_prompt_builder_per_tool_list(monkeypatch, tmp_path: Path) -> None:
+    prompts: list[str] = []
+
+    def fake_run(cmd, **kwargs):
+        prompts.append(kwargs["input"])
+        out_path = Path(cmd[cmd.index("--output-last-message") + 1])
+        out_path.write_text(json.dumps({"status": "SUCCESS", "summary": "ok"}), encoding="utf-8")
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+    monkeypatch.setattr(client.subprocess, "run", fake_run)
+    codex = client.CodexCLIClient(tmp_path, settings=CodexCLISettings(cli_command="codex"))
+    tools = [{"name": "grep", "actions": ["search"]}]
+    messages = [{"role": "user", "content": "one"}]
+    assert codex.prompt_prefix_hash(tools) is None
+    codex.send(messages, tools=tools)
+    prefix_hash = codex.prompt_prefix_hash(tools)
+    messages.append({"role": "user", "content": "two"})
+    codex.send(messages, tools=tools)
+
+    assert codex.prompt_prefix_hash(tools) == prefix_hash
+    assert codex.prompt_prefix_hash([{"name": "grep", "actions": ["search"]}]) is None
+    assert prompts[1].startswith(prompts[0][: prompts[0].index("<conversation>")])
+    assert prompts[1].endswith("USER: one\nUSER: two\n</conversation>\n")
+
+
+def test_worker_inspects_tools_once_per_session() -> None:
+    class CountingTool:
+        def __init__(self) -> None:
+            self.dir_calls = 0
+
+        def __dir__(self):
+            self.dir_calls += 1
+            return ["read"]
+
+        def read(self, path: str) -> None:
+            return None
+
+    tool = CountingTool()
+    llm = RecordingClient(
+        script=[
+            {"tool_calls": [{"tool": "missing", "action": "x", "args": {}}]},
+            {"status": "SUCCESS", "summary": "done"},
+        ]
+    )
+    Worker("Implementer", llm, {"file": tool}).run("goal", "s", {}, [])
+
+    assert len(llm.tools_sent) >= 2
+    assert all(tools is llm.tools_sent[0] for tools in llm.tools_sent)
+    assert tool.dir_calls == 1
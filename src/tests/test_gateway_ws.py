@@ -354,6 +354,13 @@ def test_gateway_ws_handshake_health_and_send(tmp_path: Path) -> None:
             assert catalog["id"] == "3"
             assert catalog["ok"] is True
             assert catalog["payload"]["tools"] == [
+                {
+                    "tool": "file",
+                    "action": "head",
+                    "risk_tier": "low",
+                    "requires_approval": False,
+                    "notes": "read-only workspace access",
+                },
                 {
                     "tool": "file",
                     "action": "read",
@@ -361,6 +368,20 @@ def test_gateway_ws_handshake_health_and_send(tmp_path: Path) -> None:
                     "requires_approval": False,
                     "notes": "read-only workspace access",
                 },
+                {
+                    "tool": "file",
+                    "action": "stat",
+                    "risk_tier": "low",
+                    "requires_approval": False,
+                    "notes": "read-only workspace access",
+                },
+                {
+                    "tool": "file",
+                    "action": "tail",
+                    "risk_tier": "low",
+                    "requires_approval": False,
+                    "notes": "read-only workspace access",
+                },
                 {
                     "tool": "file",
                     "action": "write",
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import re
+import shutil
+from pathlib import Path
+
+import pytest
+
+from tools import grep_scan
+from tools.grep_scan import LineMatcher, scan_files
+from tools.grep_tool import GrepTool
+
+
+@pytest.fixture(autouse=True)
+def _no_ripgrep(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(shutil, "which", lambda _name: None)
+
+
+def _expected(root: Path, pattern: str) -> list[str]:
+    """What the line-by-line ``str`` scan would report."""
+
+    regex = re.compile(pattern)
+    entries = []
+    for file_path in sorted(path for path in root.rglob("*") if path.is_file()):
+        for line_no, line in enumerate(file_path.read_text(errors="ignore").splitlines(), start=1):
+            if regex.search(line):
+                entries.append(f"{file_path}:{line_no}:{line}")
+    return entries
+
+
+@pytest.mark.parametrize(
+    ("pattern", "uses_bytes"),
+    [
+        ("needle", True),
+        ("^def [a-z_]+", True),
+        ("ne+dle|haystack", True),
+        (r"caf.", False),
+        (r"\w+_id", False),
+        ("end$", False),
+        ("(?i)NEEDLE", False),
+        ("café", False),
+    ],
+)
+def test_fallback_matches_line_semantics(tmp_path: Path, pattern: str, uses_bytes: bool) -> None:
+    (tmp_path / "a.py").write_text("def needle_fn():\n    user_id = 1\ncafé end\n")
+    (tmp_path / "b.txt").write_bytes(b"crlf end\r\nNeedle caps\r\nhaystack\r\n")
+    (tmp_path / "c.txt").write_text("no trailing newline needle")
+
+    assert (LineMatcher(pattern).bytes is not None) is uses_bytes
+    result = GrepTool(tmp_path).search(pattern)
+
+    assert result.ok
+    assert result.data["output"].splitlines() == _expected(tmp_path, pattern)
+
+
+def test_fallback_ignores_matches_that_cross_lines(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("foo\nbar\nfoo bar\n")
+
+    result = GrepTool(tmp_path).search("foo\\s*\\nbar|foo[\\n ]bar")
+
+    assert result.data["output"] == f"{tmp_path / 'a.txt'}:3:foo bar"
+
+
+def test_fallback_skips_binary_and_oversized_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "image.png").write_bytes(b"\x89PNG\0needle")
+    (tmp_path / "big.lock").write_text("needle\n" * 100)
+    (tmp_path / "src.py").write_text("needle = 1\n")
+    monkeypatch.setenv("TOKIMON_GREP_MAX_FILE_BYTES", "100")
+
+    result = GrepTool(tmp_path).search("needle")
+
+    assert result.data["output"] == f"{tmp_path / 'src.py'}:1:needle = 1"
+    assert result.data["skipped_binary"] == 1
+    assert result.data["skipped_oversized"] == 1
+
+
+def test_fallback_mmaps_large_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(grep_scan, "_MMAP_MIN_BYTES", 1024)
+    monkeypatch.setattr(grep_scan, "_COUNT_CHUNK_BYTES", 100)
+    (tmp_path / "big.log").write_text("filler line\n" * 5000 + "the needle\n" + "filler line\n" * 10 + "needle again\n")
+
+    result = GrepTool(tmp_path).search("needle")
+
+    assert result.data["output"].splitlines() == [
+        f"{tmp_path / 'big.log'}:5001:the needle",
+        f"{tmp_path / 'big.log'}:5012:needle again",
+    ]
+
+
+def test_parallel_scan_is_ordered_and_stops_at_budget(tmp_path: Path) -> None:
+    paths = []
+    for index in range(40):
+        path = tmp_path / f"f{index:02d}.txt"
+        path.write_text("needle\n" * 20)
+        paths.append(path)
+    matcher = LineMatcher("needle")
+
+    sequential = scan_files(paths, matcher, max_file_bytes=0, max_bytes=0, workers=1)
+    parallel = scan_files(paths, matcher, max_file_bytes=0, max_bytes=0, workers=4)
+    assert parallel.entries == sequential.entries
+    assert len(parallel.entries) == 800
+
+    bounded = scan_files(paths, matcher, max_file_bytes=0, max_bytes=2_000, workers=4)
+    assert bounded.truncated is True
+    assert bounded.entries == sequential.entries[: len(bounded.entries)]
+    assert 0 < len("\n".join(bounded.entries).encode()) <= 2_000
+    assert bounded.files_scanned < len(paths)
+
+
+def test_fallback_accepts_a_file_path(tmp_path: Path) -> None:
+    (tmp_path / "one.txt").write_text("needle\n")
+
+    result = GrepTool(tmp_path).search("needle", "one.txt")
+
+    assert result.data["output"] == f"{tmp_path / 'one.txt'}:1:needle"
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tools import grep_tool
+from tools.file_tool import FileTool
+from tools.grep_tool import GrepTool, default_workspace_index, workspace_index_from_env
+from tools.patch_tool import PatchTool
+
+
+def _seed(root: Path) -> None:
+    (root / "pkg").mkdir()
+    (root / "pkg" / "alpha.py").write_text("import os\n\ndef needle_one():\n    return 1\n")
+    (root / "pkg" / "beta.py").write_text("def other():\n    return 'needle_two'\n")
+    (root / "notes.txt").write_text("Needle in caps\nneedle lower\n")
+    (root / "blob.bin").write_bytes(b"needle\0\x01\x02")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "dep.js").write_text("needle in deps\n")
+    (root / "events.jsonl").write_text('{"needle": 1}\n')
+
+
+@pytest.mark.parametrize("pattern", ["needle", r"needle_\w+", "(?i)needle", "def (needle|other)", "return"])
+def test_indexed_grep_matches_fallback_scan(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, pattern: str) -> None:
+    _seed(tmp_path)
+    monkeypatch.setattr(grep_tool.shutil, "which", lambda _name: None)
+    indexed = GrepTool(tmp_path, index=default_workspace_index(tmp_path)).search(pattern)
+    scanned = GrepTool(tmp_path).search(pattern)
+
+    assert indexed.ok
+    assert indexed.summary == "indexed grep"
+    assert sorted(indexed.data["output"].splitlines()) == sorted(scanned.data["output"].splitlines())
+
+
+def test_index_counts_lines_like_the_fallback_scan(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "odd.py").write_bytes(b"x = 1\rfoo\nbar foo\x0cbaz\nlast foo\r\n")
+    monkeypatch.setattr(grep_tool.shutil, "which", lambda _name: None)
+    indexed = GrepTool(tmp_path, index=default_workspace_index(tmp_path)).search("foo")
+    scanned = GrepTool(tmp_path).search("foo")
+
+    assert indexed.summary == "indexed grep"
+    assert indexed.data["output"] == scanned.data["output"]
+    assert indexed.data["output"].splitlines()[-1] == f"{tmp_path / 'odd.py'}:3:last foo"
+
+
+def test_index_skips_binary_and_excluded_files(tmp_path: Path) -> None:
+    _seed(tmp_path)
+    index = default_workspace_index(tmp_path)
+    output = GrepTool(tmp_path, index=index).search("needle").data["output"]
+
+    assert "blob.bin" not in output
+    assert "node_modules" not in output
+    assert "events.jsonl" not in output
+    assert index.stats()["files"] == 3
+
+
+def test_index_serves_oversized_files_by_scanning(tmp_path: Path) -> None:
+    (tmp_path / "big.log").write_text("filler\n" * 50 + "needle here\n")
+    index = grep_tool.WorkspaceTextIndex(tmp_path, max_file_bytes=64)
+    output = GrepTool(tmp_path, index=index).search("needle").data["output"]
+
+    assert output == f"{tmp_path / 'big.log'}:51:needle here"
+    assert index.stats()["oversized_files"] == 1
+
+
+def test_index_path_scope_and_excluded_paths(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _seed(tmp_path)
+    monkeypatch.setattr(grep_tool.shutil, "which", lambda _name: None)
+    tool = GrepTool(tmp_path, index=default_workspace_index(tmp_path))
+
+    scoped = tool.search("needle", "pkg")
+    assert scoped.summary == "indexed grep"
+    assert scoped.data["output"].splitlines() == [
+        f"{tmp_path / 'pkg' / 'alpha.py'}:3:def needle_one():",
+        f"{tmp_path / 'pkg' / 'beta.py'}:2:    return 'needle_two'",
+    ]
+
+    # Explicit paths skip the default excludes, so they are answered by a real scan.
+    deps = tool.search("needle", "node_modules")
+    assert deps.summary == "fallback grep"
+    assert "dep.js" in deps.data["output"]
+
+
+def test_index_truncates_at_byte_budget(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "many.txt").write_text("".join(f"needle {index}\n" for index in range(100)))
+    monkeypatch.setenv("TOKIMON_GREP_MAX_BYTES", "200")
+    result = GrepTool(tmp_path, index=default_workspace_index(tmp_path)).search("needle")
+
+    assert result.summary == "indexed grep (truncated)"
+    assert result.data["truncated"] is True
+    assert 0 < len(result.data["output"].encode()) <= 200
+
+
+def test_file_tool_write_updates_index(tmp_path: Path) -> None:
+    _seed(tmp_path)
+    index = default_workspace_index(tmp_path)
+    grep = GrepTool(tmp_path, index=index)
+    files = FileTool(tmp_path, index=index)
+    assert "fresh_token" not in grep.search("fresh_token").data["output"]
+
+    files.write("pkg/alpha.py", "def fresh_token():\n    pass\n")
+    files.write("pkg/new.py", "fresh_token = 1\n")
+
+    output = grep.search("fresh_token").data["output"]
+    assert "alpha.py:1:def fresh_token():" in output
+    assert "new.py:1:fresh_token = 1" in output
+    assert "needle_one" not in grep.search("needle_one").data["output"]
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_patch_tool_apply_updates_index(tmp_path: Path) -> None:
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    (tmp_path / "mod.py").write_text("value = 'old_marker'\n")
+    index = default_workspace_index(tmp_path)
+    grep = GrepTool(tmp_path, index=index)
+    assert "old_marker" in grep.search("old_marker").data["output"]
+
+    patch = "--- a/mod.py\n+++ b/mod.py\n@@ -1 +1 @@\n-value = 'old_marker'\n+value = 'new_marker'\n"
+    assert PatchTool(tmp_path, index=index).apply(patch).ok
+
+    assert grep.search("old_marker").data["output"] == ""
+    assert grep.search("new_marker").data["output"] == f"{tmp_path / 'mod.py'}:1:value = 'new_marker'"
+    assert index.stats()["files"] == 1
+
+
+def _seed_git_repo(root: Path) -> None:
+    _seed(root)
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    (root / ".gitignore").write_text("gen/\n*.log\n")
+    (root / ".cache").mkdir()
+    (root / ".cache" / "a.txt").write_text("needle cached\n")
+    (root / "gen").mkdir()
+    (root / "gen" / "b.txt").write_text("needle generated\n")
+    (root / "pkg" / "trace.log").write_text("needle logged\n")
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_index_skips_hidden_and_gitignored_files(tmp_path: Path) -> None:
+    _seed_git_repo(tmp_path)
+    index = default_workspace_index(tmp_path)
+    tool = GrepTool(tmp_path, index=index)
+
+    output = tool.search("needle").data["output"]
+    assert ".cache" not in output
+    assert "gen/b.txt" not in output
+    assert "trace.log" not in output
+    assert index.stats()["files"] == 3
+    # Explicitly scoped to an ignored or hidden directory, the search is not served from the index.
+    assert tool.search("needle", "gen").summary != "indexed grep"
+    assert tool.search("needle", ".cache").summary != "indexed grep"
+
+    FileTool(tmp_path, index=index).write("pkg/fresh.log", "needle fresh\n")
+    FileTool(tmp_path, index=index).write("pkg/fresh.py", "needle fresh\n")
+    output = tool.search("needle fresh").data["output"]
+    assert "fresh.py" in output
+    assert "fresh.log" not in output
+
+
+@pytest.mark.skipif(shutil.which("git") is None or shutil.which("rg") is None, reason="git and rg required")
+@pytest.mark.parametrize("pattern", ["needle", r"needle \w+", "def (needle|other)"])
+def test_indexed_grep_matches_rg(tmp_path: Path, pattern: str) -> None:
+    _seed_git_repo(tmp_path)
+    indexed = GrepTool(tmp_path, index=default_workspace_index(tmp_path)).search(pattern)
+    searched = GrepTool(tmp_path).search(pattern)
+
+    assert (indexed.summary, searched.summary) == ("indexed grep", "rg search")
+    assert sorted(indexed.data["output"].splitlines()) == sorted(searched.data["output"].splitlines())
+
+
+def test_workspace_index_is_opt_in(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("TOKIMON_GREP_INDEX", raising=False)
+    assert workspace_index_from_env(tmp_path) is None
+
+    monkeypatch.setenv("TOKIMON_GREP_INDEX", "1")
+    assert workspace_index_from_env(tmp_path) is not None
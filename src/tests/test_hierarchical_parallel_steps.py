@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import runners.hierarchical as hierarchical
+from runners.hierarchical import HierarchicalRunner
+
+
+class _BarrierLLMClient:
+    """Blocks each send() until `parties` calls are in flight at the same time."""
+
+    def __init__(self, parties: int) -> None:
+        self._barrier = threading.Barrier(parties, timeout=10)
+        self.thread_names: set[str] = set()
+
+    def send(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        response_schema: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        self.thread_names.add(threading.current_thread().name)
+        self._barrier.wait()
+        return {
+            "status": "SUCCESS",
+            "summary": "ok",
+            "artifacts": [],
+            "metrics": {},
+            "next_actions": [],
+            "failure_signature": "",
+        }
+
+
+def test_independent_steps_run_concurrently(tmp_path: Path) -> None:
+    workspace = tmp_path / "workspace"
+    workspace.mkdir(parents=True, exist_ok=True)
+    llm = _BarrierLLMClient(parties=3)
+    runner = HierarchicalRunner(workspace, llm, base_dir=tmp_path / "runs")
+    result = runner.run(
+        "goal",
+        task_steps=[
+            {"id": "a", "worker": "Implementer"},
+            {"id": "b", "worker": "Implementer"},
+            {"id": "c", "worker": "Implementer"},
+        ],
+        task_id="t",
+        test_args=None,
+        concurrency=3,
+    )
+
+    payload = json.loads(result.workflow_state_path.read_text())
+    statuses = {step_id: step["status"] for step_id, step in payload["state"]["steps"].items()}
+    assert statuses == {"a": "SUCCEEDED", "b": "SUCCEEDED", "c": "SUCCEEDED"}
+    assert len(llm.thread_names) == 3
+    assert all(name.startswith("tokimon-step") for name in llm.thread_names)
+
+
+def test_trace_lines_stay_whole_under_parallel_steps(tmp_path: Path) -> None:
+    workspace = tmp_path / "workspace"
+    workspace.mkdir(parents=True, exist_ok=True)
+    llm = _BarrierLLMClient(parties=2)
+    runner = HierarchicalRunner(workspace, llm, base_dir=tmp_path / "runs")
+    result = runner.run(
+        "goal",
+        task_steps=[{"id": "a", "worker": "Implementer"}, {"id": "b", "worker": "Implementer"}],
+        task_id="t",
+        test_args=None,
+        concurrency=2,
+    )
+
+    lines = result.run_context.trace_path.read_text().splitlines()
+    assert lines
+    events = [json.loads(line) for line in lines]
+    finals = {event["payload"]["step_id"] for event in events if event["event_type"] == "worker_final"}
+    assert finals == {"a", "b"}
+
+
+def test_trace_and_memory_store_close_when_planning_fails(tmp_path: Path, monkeypatch) -> None:
+    closed: list[str] = []
+    monkeypatch.setattr(hierarchical.TraceLogger, "close", lambda self: closed.append("trace"))
+    monkeypatch.setattr(hierarchical.MemoryStore, "close", lambda self: closed.append("memory"))
+
+    def failing_plan(self, *args, **kwargs):
+        raise RuntimeError("planner down")
+
+    monkeypatch.setattr(hierarchical.Manager, "plan_steps", failing_plan)
+    workspace = tmp_path / "workspace"
+    workspace.mkdir(parents=True, exist_ok=True)
+    runner = HierarchicalRunner(workspace, _BarrierLLMClient(parties=1), base_dir=tmp_path / "runs")
+
+    with pytest.raises(RuntimeError, match="planner down"):
+        runner.run("goal", task_id="t", test_args=None, concurrency=1)
+    assert sorted(closed) == ["memory", "trace"]
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from llm import async_client
+from llm.async_client import ProviderLimiter, SyncLLMClientAdapter, ensure_async_client, send_many
+from llm.cache import CachingLLMClient
+from llm.client import ClaudeCLIClient, ClaudeCLISettings, CodexCLIClient, CodexCLISettings, MockLLMClient
+from llm_fakes import fake_cli
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiters(monkeypatch):
+    monkeypatch.setattr(async_client, "_LIMITERS", {})
+
+
+def _request(text: str) -> dict[str, Any]:
+    return {"messages": [{"role": "user", "content": f"MSG:{text}"}]}
+
+
+def test_limiter_is_shared_by_threads_and_tasks() -> None:
+    limiter = ProviderLimiter(2)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def enter() -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+
+    def leave() -> None:
+        nonlocal active
+        with lock:
+            active -= 1
+
+    def sync_call() -> None:
+        with limiter.slot():
+            enter()
+            time.sleep(0.05)
+            leave()
+
+    async def async_call() -> None:
+        async with limiter.slot_async():
+            enter()
+            await asyncio.sleep(0.05)
+            leave()
+
+    async def main() -> None:
+        threads = [threading.Thread(target=sync_call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        await asyncio.gather(*(async_call() for _ in range(4)))
+        for thread in threads:
+            thread.join()
+
+    asyncio.run(main())
+    assert peak == 2
+    assert limiter.stats() == {"limit": 2, "active": 0, "waiting": 0, "peak": 2}
+
+
+def test_cancelled_waiter_gives_its_slot_back() -> None:
+    limiter = ProviderLimiter(1)
+
+    async def main() -> None:
+        async with limiter.slot_async():
+            waiter = asyncio.ensure_future(limiter.slot_async().__aenter__())
+            await asyncio.sleep(0.01)
+            assert limiter.stats()["waiting"] == 1
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        async with limiter.slot_async():
+            pass
+
+    asyncio.run(main())
+    assert limiter.stats()["active"] == 0
+
+
+def test_codex_send_async_runs_concurrently_under_the_limit(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("TOKIMON_CODEX_MAX_CONCURRENCY", "3")
+    client = CodexCLIClient(tmp_path, settings=CodexCLISettings(cli_command=fake_cli(tmp_path, delay_s=0.2), timeout_s=30))
+
+    started = time.monotonic()
+    results = asyncio.run(send_many(client, [_request(str(index)) for index in range(6)]))
+    elapsed = time.monotonic() - started
+
+    assert [result["echo"] for result in results] == [str(index) for index in range(6)]
+    assert async_client.provider_limiter("codex").stats()["peak"] == 3
+    assert elapsed < 6 * 0.2 + 2
+
+
+def test_claude_send_async_and_timeout(tmp_path: Path) -> None:
+    settings = ClaudeCLISettings(cli_command=fake_cli(tmp_path, delay_s=0.2), timeout_s=1)
+    client = ClaudeCLIClient(tmp_path, settings=settings)
+
+    result = asyncio.run(client.send_async(**_request("hi")))
+    assert (result["status"], result["echo"]) == ("SUCCESS", "hi")
+
+    timed_out = asyncio.run(client.send_async([{"role": "user", "content": "SLEEP"}]))
+    assert timed_out["failure_signature"] == "llm-claude-timeout"
+
+    missing = ClaudeCLIClient(tmp_path, settings=ClaudeCLISettings(cli_command=str(tmp_path / "missing-cli")))
+    assert asyncio.run(missing.send_async(**_request("x")))["failure_signature"] == "llm-claude-cli-missing"
+
+
+def test_adapters_bridge_sync_and_async_clients(tmp_path: Path) -> None:
+    mock = MockLLMClient(script=[{"status": "SUCCESS", "summary": "a"}, {"status": "SUCCESS", "summary": "b"}])
+    wrapped = ensure_async_client(mock)
+    assert asyncio.run(wrapped.send_async([]))["summary"] == "a"
+
+    class AsyncOnly:
+        async def send_async(self, messages, tools=None, response_schema=None):
+            await asyncio.sleep(0)
+            return {"status": "SUCCESS", "summary": f"{len(messages)} messages"}
+
+    adapter = SyncLLMClientAdapter(AsyncOnly())
+    assert adapter.send([{"role": "user", "content": "x"}])["summary"] == "1 messages"
+    assert ensure_async_client(adapter) is adapter
+
+    cached = CachingLLMClient(mock, tmp_path / "cache")
+    first = asyncio.run(cached.send_async(_request("c")["messages"]))
+    second = asyncio.run(cached.send_async(_request("c")["messages"]))
+    assert first == second == {"status": "SUCCESS", "summary": "b"}
+    assert cached.stats()["hits"] == 1
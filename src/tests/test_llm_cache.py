@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from llm.cache import CachingLLMClient, maybe_wrap_with_cache
+from llm.client import CodexCLIClient, CodexCLISettings, MockLLMClient
+from runners.baseline import BaselineRunner
+
+
+class _CountingClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def send(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        response_schema: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        self.calls += 1
+        return {"status": "SUCCESS", "summary": f"call {self.calls}"}
+
+
+_MESSAGES = [{"role": "system", "content": "sys"}, {"role": "user", "content": "do it"}]
+
+
+def test_identical_requests_hit_the_cache(tmp_path: Path) -> None:
+    inner = _CountingClient()
+    client = CachingLLMClient(inner, tmp_path / "cache")
+    first = client.send(_MESSAGES, tools=[{"name": "file", "actions": ["read"]}])
+    second = client.send(_MESSAGES, tools=[{"name": "file", "actions": ["read"]}])
+    third = client.send(_MESSAGES, tools=[{"name": "grep", "actions": ["search"]}])
+
+    assert first == second == {"status": "SUCCESS", "summary": "call 1"}
+    assert third["summary"] == "call 2"
+    assert inner.calls == 2
+    stats = client.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 2, 2)
+
+    reopened = CachingLLMClient(_CountingClient(), tmp_path / "cache")
+    assert reopened.send(_MESSAGES, tools=[{"name": "file", "actions": ["read"]}])["summary"] == "call 1"
+
+
+def test_ttl_expiry_and_error_responses_are_not_reused(tmp_path: Path) -> None:
+    inner = MockLLMClient(script=[{"status": "FAILURE", "summary": "x", "failure_signature": "llm-codex-timeout"}])
+    client = CachingLLMClient(inner, tmp_path / "cache")
+    client.send(_MESSAGES)
+    assert client.stats()["stores"] == 0
+
+    counting = _CountingClient()
+    client = CachingLLMClient(counting, tmp_path / "cache", ttl_s=60)
+    client.send(_MESSAGES)
+    entry = next((tmp_path / "cache").glob("*/*.json"))
+    payload = json.loads(entry.read_text())
+    payload["created_at"] = time.time() - 120
+    entry.write_text(json.dumps(payload))
+    client.send(_MESSAGES)
+    assert counting.calls == 2
+    assert client.stats()["expired"] == 1
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path: Path) -> None:
+    client = CachingLLMClient(_CountingClient(), tmp_path / "cache", max_bytes=400)
+    keys = []
+    for index in range(3):
+        messages = [{"role": "user", "content": f"prompt {index}"}]
+        client.send(messages)
+        keys.append(client.cache_key(messages))
+        path = client._entry_path(keys[-1])
+        os.utime(path, (1000 + index, 1000 + index))
+    client.send([{"role": "user", "content": "prompt 0"}])
+    client.send([{"role": "user", "content": "prompt 3"}])
+
+    remaining = {path.stem for path in (tmp_path / "cache").glob("*/*.json")}
+    assert keys[0] in remaining
+    assert keys[1] not in remaining
+    assert client.stats()["evictions"] >= 1
+
+
+def test_bypass_for_side_effectful_clients_and_blocks(tmp_path: Path) -> None:
+    writable = CodexCLIClient(tmp_path, settings=CodexCLISettings(sandbox="workspace-write"))
+    assert CachingLLMClient(writable, tmp_path / "cache")._cacheable is False
+
+    inner = _CountingClient()
+    client = CachingLLMClient(inner, tmp_path / "cache")
+    client.send(_MESSAGES)
+    with client.bypass():
+        client.send(_MESSAGES)
+    assert inner.calls == 2
+    assert client.stats()["bypassed"] == 1
+
+
+def test_cache_is_opt_in_and_reported_in_metrics(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv("TOKIMON_LLM_CACHE", raising=False)
+    inner = _CountingClient()
+    assert maybe_wrap_with_cache(inner, workspace_dir=tmp_path) is inner
+
+    monkeypatch.setenv("TOKIMON_LLM_CACHE", "1")
+    monkeypatch.setenv("TOKIMON_LLM_CACHE_DIR", str(tmp_path / "llm-cache"))
+    client = maybe_wrap_with_cache(inner, workspace_dir=tmp_path)
+    assert isinstance(client, CachingLLMClient)
+
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    runner = BaselineRunner(workspace, client, base_dir=tmp_path / "runs")
+    first = runner.run("goal", task_id="t")
+    second = runner.run("goal", task_id="t")
+
+    first_cache = json.loads((first.run_context.reports_dir / "metrics.json").read_text())["run"]["llm_cache"]
+    second_cache = json.loads((second.run_context.reports_dir / "metrics.json").read_text())["run"]["llm_cache"]
+    assert first_cache["misses"] == inner.calls >= 1
+    assert (second_cache["hits"], second_cache["misses"]) == (inner.calls, 0)
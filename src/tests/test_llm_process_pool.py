@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from llm import process_pool
+from llm.client import ClaudeCLIClient, ClaudeCLISettings, CodexCLIClient, CodexCLISettings
+from llm.process_pool import WarmProcessPool, close_shared_pools, spawn_cli_process
+from llm_fakes import fake_cli
+
+
+@pytest.fixture(autouse=True)
+def _close_pools():
+    yield
+    close_shared_pools()
+
+
+def _echo_pool(tmp_path: Path, **kwargs) -> WarmProcessPool:
+    cmd = [sys.executable, "-c", "import sys; print(sys.stdin.read().upper())"]
+    return WarmProcessPool(lambda: spawn_cli_process(cmd, cwd=tmp_path, env={}), **kwargs)
+
+
+def test_pool_hands_out_prestarted_processes(tmp_path: Path) -> None:
+    pool = _echo_pool(tmp_path, size=1)
+    with pool.acquire() as warm:
+        assert warm.communicate("one", timeout_s=30).stdout.strip() == "ONE"
+    with pool.acquire() as warm:
+        assert warm.communicate("two", timeout_s=30).stdout.strip() == "TWO"
+
+    stats = pool.stats()
+    assert (stats["cold_starts"], stats["warm_hits"], stats["idle"]) == (1, 1, 1)
+    pool.close()
+    assert pool.stats()["idle"] == 0
+
+
+def test_dead_and_idle_processes_are_recycled(tmp_path: Path) -> None:
+    pool = _echo_pool(tmp_path, size=1, max_idle_s=0.2)
+    with pool.acquire() as warm:
+        warm.communicate("x", timeout_s=30)
+    time.sleep(0.3)
+    with pool.acquire() as warm:
+        assert warm.communicate("y", timeout_s=30).stdout.strip() == "Y"
+    assert pool.stats()["recycled"] == 1
+
+    pool._idle[0].proc.kill()
+    pool._idle[0].proc.wait()
+    with pool.acquire() as warm:
+        assert warm.communicate("z", timeout_s=30).returncode == 0
+    assert pool.stats()["recycled"] == 2
+    pool.close()
+
+
+def test_timeout_kills_the_process_group(tmp_path: Path) -> None:
+    cmd = [sys.executable, "-c", "import time; time.sleep(60)"]
+    pool = WarmProcessPool(lambda: spawn_cli_process(cmd, cwd=tmp_path, env={}), size=1)
+    with pytest.raises(subprocess.TimeoutExpired):
+        with pool.acquire() as warm:
+            warm.communicate("", timeout_s=0.2)
+    assert warm.proc.poll() is not None
+    pool.close()
+
+
+def test_pooled_codex_client_reuses_warm_processes(tmp_path: Path) -> None:
+    settings = CodexCLISettings(cli_command=fake_cli(tmp_path), timeout_s=30)
+    client = CodexCLIClient(tmp_path, settings=settings, pool_size=1)
+    first = client.send([{"role": "user", "content": "hello"}])
+    second = client.send([{"role": "user", "content": "again"}])
+
+    assert first["status"] == second["status"] == "SUCCESS"
+    assert first["summary"] != second["summary"]
+    pool = next(iter(process_pool._POOLS.values()))
+    assert (pool.stats()["cold_starts"], pool.stats()["warm_hits"]) == (1, 1)
+
+    close_shared_pools()
+    assert not list((tmp_path / ".tokimon-tmp").glob("tokimon-codex-*"))
+
+
+def test_pooled_claude_client_and_env_opt_in(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("TOKIMON_LLM_POOL_SIZE", "2")
+    client = ClaudeCLIClient(tmp_path, settings=ClaudeCLISettings(cli_command=fake_cli(tmp_path), timeout_s=30))
+    assert client.pool_size == 2
+
+    result = client.send([{"role": "user", "content": "hello"}])
+    assert result["status"] == "SUCCESS"
+    pool = next(iter(process_pool._POOLS.values()))
+    assert pool.stats()["idle"] == 2
+
+    monkeypatch.delenv("TOKIMON_LLM_POOL_SIZE")
+    assert ClaudeCLIClient(tmp_path, settings=ClaudeCLISettings()).pool_size == 0
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from memory.store import MemoryStore
+
+
+def _write_lesson_file(root: Path, lesson_id: str, body: str) -> Path:
+    path = root / "lessons" / f"lesson-{lesson_id}.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"{json.dumps({'id': lesson_id})}\n---\n{body}\n")
+    return path
+
+
+def _bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _count_parses(store: MemoryStore, monkeypatch) -> list[str]:
+    parsed: list[str] = []
+    original = store._parse_for_index
+
+    def counting(name: str):
+        parsed.append(name)
+        return original(name)
+
+    monkeypatch.setattr(store, "_parse_for_index", counting)
+    return parsed
+
+
+def test_incremental_reindex_only_parses_changed_files(tmp_path: Path, monkeypatch) -> None:
+    root = tmp_path / "mem"
+    for index in range(5):
+        _write_lesson_file(root, f"l{index}", f"body {index}")
+    store = MemoryStore(root)
+    first = store.cli_reindex(workers=3)
+    assert first["ok"] is True
+    assert first["indexed_lessons"] == 5
+    assert first["updated"] == 5
+    assert store.cli_status()["dirty"] is False
+
+    parsed = _count_parses(store, monkeypatch)
+    _bump_mtime(_write_lesson_file(root, "l1", "rewritten needle"))
+    (root / "lessons" / "lesson-l2.md").unlink()
+    _write_lesson_file(root, "l9", "fresh")
+
+    status = store.cli_status(deep=True)
+    assert status["dirty"] is True
+    assert status["changed"] == ["l1"]
+    assert status["missing_on_disk"] == ["l2"]
+    assert status["missing_in_index"] == ["l9"]
+
+    report = store.cli_reindex()
+    assert sorted(parsed) == ["lesson-l1.md", "lesson-l9.md"]
+    assert (report["updated"], report["removed"], report["unchanged"]) == (2, 1, 3)
+    assert report["indexed_lessons"] == 5
+    assert store.cli_search("needle")["hits"] == ["l1"]
+    assert store.cli_search("body")["hits"].count("l2") == 0
+    assert store.cli_status()["dirty"] is False
+
+
+def test_touched_file_with_same_content_is_not_reindexed(tmp_path: Path, monkeypatch) -> None:
+    root = tmp_path / "mem"
+    path = _write_lesson_file(root, "alpha", "same body")
+    store = MemoryStore(root)
+    store.cli_reindex()
+
+    _bump_mtime(path)
+    monkeypatch.setattr("memory.store._index_lesson_row", lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError))
+    report = store.cli_reindex()
+    assert (report["updated"], report["unchanged"]) == (0, 1)
+    assert store.cli_status()["dirty"] is False
+
+
+def test_written_lessons_are_in_manifest(tmp_path: Path, monkeypatch) -> None:
+    store = MemoryStore(tmp_path / "mem")
+    store.write_lesson({"id": "w1", "tags": ["t"]}, "written")
+    store.write_lessons_bulk([({"id": "w2"}, "bulk")])
+    assert store.cli_status()["dirty"] is False
+
+    parsed = _count_parses(store, monkeypatch)
+    assert store.cli_reindex()["indexed_lessons"] == 2
+    assert parsed == []
+
+
+def test_full_reindex_replaces_index_and_drops_orphans(tmp_path: Path) -> None:
+    root = tmp_path / "mem"
+    store = MemoryStore(root)
+    store.write_lesson({"id": "kept"}, "kept body")
+    store.write_lesson({"id": "gone"}, "gone body")
+    (root / "lessons" / "lesson-gone.md").unlink()
+    (root / "lessons" / "lesson-broken.md").write_text("not json\n---\nbody\n")
+
+    report = store.cli_reindex(full=True)
+    assert report["mode"] == "full"
+    assert report["ok"] is False
+    assert [Path(error["path"]).name for error in report["errors"]] == ["lesson-broken.md"]
+    assert report["indexed_lessons"] == 1
+    assert store.cli_search("body")["hits"] == ["kept"]
+
+
+def test_lesson_edited_before_startup_is_reread_on_retrieval(tmp_path: Path) -> None:
+    root = tmp_path / "mem"
+    metadata = {"id": "e1", "tags": ["t"], "component": "c", "failure_signature": "fs1"}
+    MemoryStore(root).write_lesson(metadata, "original lesson")
+    path = root / "lessons" / "lesson-e1.md"
+    path.write_text(f"{json.dumps(metadata, sort_keys=True)}\n---\nedited lesson\n")
+    _bump_mtime(path)
+
+    store = MemoryStore(root)
+    lessons = store.retrieve("lesson", stage=1, limit=1, component="c", tags=["t"], failure_signature="fs1")
+
+    assert [lesson.body for lesson in lessons] == ["edited lesson"]
+    assert store.cli_status()["dirty"] is False
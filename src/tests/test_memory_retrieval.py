@@ -1,6 +1,10 @@
+import json
+import os
+import sqlite3
 from pathlib import Path
 
-from memory.store import MemoryStore
+from memory.lesson_cache import LessonCache
+from memory.store import Lesson, MemoryStore
 
 
 def _lesson_ids(lessons) -> set[str]:
@@ -96,3 +100,105 @@ def test_stage3_can_expand_by_similar_failure_signature(tmp_path: Path) -> None:
     )
     lessons = store.retrieve("q", stage=3, limit=10, component="core", tags=["beta"], failure_signature="E123:charlie")
     assert {"f1", "f2"} <= _lesson_ids(lessons)
+
+
+def test_tag_filter_uses_exact_tags(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    store.write_lesson({"id": "exact", "tags": ["tag:a"], "component": "core", "failure_signature": "fs1"}, "exact")
+    store.write_lesson({"id": "prefix", "tags": ["tag:ab"], "component": "core", "failure_signature": "fs1"}, "prefix")
+    store.write_lesson(
+        {"id": "both", "tags": ["tag:a"], "retrieval_tags": ["tool:grep"], "component": "core", "failure_signature": "fs1"},
+        "both",
+    )
+
+    lessons = store.retrieve("q", stage=2, limit=10, component="core", tags=["tag:a"], failure_signature="fs1")
+    assert _lesson_ids(lessons) == {"exact", "both"}
+
+    lessons = store.retrieve("q", stage=2, limit=10, component="core", tags=["tag:a", "tool:grep"], failure_signature="fs1")
+    assert _lesson_ids(lessons) == {"both"}
+
+
+def test_retrieval_ranks_by_relevance(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    store.write_lesson({"id": "a", "tags": ["t"], "component": "core", "failure_signature": "fs1"}, "unrelated notes")
+    store.write_lesson(
+        {"id": "b", "tags": ["t"], "component": "core", "failure_signature": "fs1"},
+        "solve step failed: solve timed out",
+    )
+    store.write_lesson({"id": "c", "tags": ["t"], "component": "core", "failure_signature": "fs1"}, "solve")
+
+    lessons = store.retrieve("solve", stage=2, limit=3, component="core", tags=["t"], failure_signature="fs1")
+    assert [lesson.metadata["id"] for lesson in lessons][-1] == "a"
+
+    stage1 = store.retrieve("solve", stage=1, limit=3, component="core", tags=["t"], failure_signature="fs1")
+    assert _lesson_ids(stage1) == {"b", "c"}
+
+
+def test_rewriting_a_lesson_replaces_its_index_rows(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    store.write_lesson({"id": "l1", "tags": ["old"], "component": "core", "failure_signature": "fs1"}, "first body")
+    store.write_lesson({"id": "l1", "tags": ["new"], "component": "core", "failure_signature": "fs1"}, "second body")
+
+    assert store.cli_search("body", limit=10)["hits"] == ["l1"]
+    assert store.retrieve("q", stage=2, limit=5, component="core", tags=["old"], failure_signature="fs1") == []
+    assert _lesson_ids(store.retrieve("q", stage=2, limit=5, component="core", tags=["new"], failure_signature="fs1")) == {"l1"}
+
+
+def test_legacy_index_is_migrated_to_tag_table(tmp_path: Path) -> None:
+    conn = sqlite3.connect(tmp_path / "index.sqlite")
+    conn.execute(
+        "CREATE TABLE lessons (id TEXT PRIMARY KEY, metadata TEXT, body TEXT, tags TEXT, component TEXT, failure_signature TEXT)"
+    )
+    metadata = {"id": "legacy", "tags": ["alpha"], "component": "core", "failure_signature": "fs1"}
+    conn.execute(
+        "INSERT INTO lessons VALUES (?, ?, ?, ?, ?, ?)",
+        ("legacy", json.dumps(metadata), "legacy body", "alpha", "core", "fs1"),
+    )
+    conn.commit()
+    conn.close()
+    (tmp_path / "lessons").mkdir()
+    (tmp_path / "lessons" / "lesson-legacy.md").write_text(f"{json.dumps(metadata)}\n---\nlegacy body\n")
+
+    store = MemoryStore(tmp_path)
+    lessons = store.retrieve("legacy", stage=1, limit=5, component="core", tags=["alpha"], failure_signature="fs1")
+    assert _lesson_ids(lessons) == {"legacy"}
+
+
+def test_retrieve_serves_lessons_without_rereading_files(tmp_path: Path, monkeypatch) -> None:
+    store = MemoryStore(tmp_path)
+    store.write_lesson({"id": "l1", "tags": ["t"], "component": "core", "failure_signature": "fs1"}, "cached body")
+    store.lesson_cache.clear()
+
+    def fail_load(lesson_id: str):
+        raise AssertionError(f"unexpected file read for {lesson_id}")
+
+    monkeypatch.setattr(store, "load_lesson", fail_load)
+    first = store.retrieve("cached", stage=1, limit=1, component="core", tags=["t"], failure_signature="fs1")
+    second = store.retrieve("cached", stage=2, limit=1, component="core", tags=["t"], failure_signature="fs1")
+    assert [lesson.body for lesson in first] == ["cached body"]
+    assert second[0] is first[0]
+    assert store.lesson_cache.stats()["hits"] >= 1
+
+
+def test_lesson_cache_picks_up_edited_files(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    lesson = store.write_lesson({"id": "l1", "tags": ["t"], "component": "core", "failure_signature": "fs1"}, "original")
+    store.retrieve("q", stage=2, limit=1, component="core", tags=["t"], failure_signature="fs1")
+
+    header = lesson.path.read_text().split("---", 1)[0]
+    lesson.path.write_text(f"{header}---\nedited by hand\n")
+    stat = lesson.path.stat()
+    os.utime(lesson.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    lessons = store.retrieve("q", stage=2, limit=1, component="core", tags=["t"], failure_signature="fs1")
+    assert [item.body for item in lessons] == ["edited by hand"]
+
+
+def test_lesson_cache_evicts_by_size() -> None:
+    cache = LessonCache(max_entries=10, max_bytes=10)
+    for lesson_id in ("a", "b", "c"):
+        cache.put(lesson_id, 1, Lesson(metadata={"id": lesson_id}, body="12345", path=Path(lesson_id)))
+    assert cache.get("a", 1) is None
+    assert cache.get("b", 1) is not None
+    assert cache.get("c", 1) is not None
+    assert cache.stats()["bytes"] == 10
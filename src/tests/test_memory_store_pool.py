@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+
+from memory.store import MemoryStore
+
+
+def _lesson(lesson_id: str) -> dict[str, object]:
+    return {"id": lesson_id, "tags": ["bulk"], "component": "core", "failure_signature": "fs1"}
+
+
+def test_connections_are_thread_local_and_reused(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    first = store._pool.connection()
+    store.write_lesson(_lesson("l1"), "body")
+    store.retrieve("body", stage=1, limit=1, component="core", tags=["bulk"], failure_signature="fs1")
+    assert store._pool.connection() is first
+    assert first.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+
+    other: list[sqlite3.Connection] = []
+    thread = threading.Thread(target=lambda: other.append(store._pool.connection()))
+    thread.start()
+    thread.join()
+    assert other and other[0] is not first
+
+    store.close()
+    assert store._pool.connection() is not first
+    assert store.cli_status()["indexed_lessons"] == 1
+
+
+def test_bulk_writes_commit_in_one_transaction(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    lessons = store.write_lessons_bulk([(_lesson(f"l{i}"), f"bulk body {i}") for i in range(25)])
+    assert len(lessons) == 25
+    assert all(lesson.path.exists() for lesson in lessons)
+    assert store.cli_status()["indexed_lessons"] == 25
+
+    store.index_artifacts_bulk(
+        [(f"a{i}", "step", "task", tmp_path / f"a{i}", f"digest{i}", {"count": i}) for i in range(10)]
+    )
+    artifacts = store.list_artifacts(task_id="task")
+    assert sorted(artifact["id"] for artifact in artifacts) == sorted(f"a{i}" for i in range(10))
+
+
+def test_concurrent_writers_do_not_hit_locked_database(tmp_path: Path) -> None:
+    store = MemoryStore(tmp_path)
+    errors: list[BaseException] = []
+
+    def write(offset: int) -> None:
+        try:
+            for i in range(20):
+                store.write_lesson(_lesson(f"t{offset}-{i}"), "concurrent")
+        except BaseException as exc:  # pragma: no cover - surfaced via assertion below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert store.cli_status()["indexed_lessons"] == 80
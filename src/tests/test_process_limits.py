@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from tools import process_limits
+from tools.patch_tool import PatchTool
+from tools.process_limits import LimitedResult, ProcessLimits, run_limited
+from tools.pytest_server import WarmPytestServer
+from tools.pytest_tool import PytestTool
+
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="process groups and rlimits are POSIX-only")
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # A killed grandchild may linger as a zombie until its reaper gets to it.
+    try:
+        return Path(f"/proc/{pid}/stat").read_text().split()[2] != "Z"
+    except OSError:
+        return True
+
+
+@posix_only
+def test_timeout_kills_the_whole_process_group(tmp_path: Path) -> None:
+    pid_file = tmp_path / "grandchild.pid"
+    script = (
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        f"open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+        "print('started', flush=True)\n"
+        "time.sleep(60)\n"
+    )
+    started = time.perf_counter()
+
+    result = run_limited([sys.executable, "-c", script], cwd=tmp_path, limits=ProcessLimits(timeout_s=1.0))
+
+    assert time.perf_counter() - started < 10
+    assert result.timed_out is True
+    assert result.stdout == "started\n"
+    assert result.failure_signature("pytest", ProcessLimits(timeout_s=1.0)) == "pytest-timeout"
+    grandchild = int(pid_file.read_text())
+    deadline = time.monotonic() + 5
+    while _alive(grandchild) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _alive(grandchild)
+
+
+def test_captured_output_keeps_only_the_tail(tmp_path: Path) -> None:
+    script = "import sys\nsys.stdout.write('x' * 100000)\nsys.stdout.write('END')\n"
+
+    result = run_limited([sys.executable, "-c", script], cwd=tmp_path, limits=ProcessLimits(max_output_bytes=1000))
+
+    assert result.returncode == 0
+    assert result.output_truncated is True
+    assert len(result.stdout) == 1000
+    assert result.stdout.endswith("xEND")
+
+
+@posix_only
+def test_cpu_and_memory_rlimits_get_distinct_signatures(tmp_path: Path) -> None:
+    cpu = ProcessLimits(cpu_s=1, timeout_s=30)
+    spin = run_limited([sys.executable, "-c", "while True: pass"], cwd=tmp_path, limits=cpu)
+    assert spin.failure_signature("pytest", cpu) == "pytest-cpu-limit"
+
+    memory = ProcessLimits(memory_bytes=512 * 1024 * 1024, timeout_s=30)
+    hog = run_limited([sys.executable, "-c", "data = bytearray(2 * 1024 ** 3)"], cwd=tmp_path, limits=memory)
+    assert hog.failure_signature("pytest", memory) == "pytest-memory-limit"
+
+
+@posix_only
+def test_rlimits_are_set_without_a_preexec_fn(monkeypatch, tmp_path: Path) -> None:
+    seen: dict[str, object] = {}
+    real_popen = process_limits.subprocess.Popen
+
+    def spy(cmd, **kwargs):
+        seen.update(cmd=cmd, **kwargs)
+        return real_popen(cmd, **kwargs)
+
+    monkeypatch.setattr(process_limits.subprocess, "Popen", spy)
+    script = "import resource; print(resource.getrlimit(resource.RLIMIT_CPU)[0])"
+
+    result = run_limited([sys.executable, "-c", script], cwd=tmp_path, limits=ProcessLimits(cpu_s=7, timeout_s=30))
+
+    assert seen.get("preexec_fn") is None
+    assert result.stdout.strip() == "7"
+    with pytest.raises(FileNotFoundError):
+        run_limited(["no-such-tokimon-binary"], cwd=tmp_path, limits=ProcessLimits(cpu_s=7))
+
+
+def test_limit_signatures_need_the_process_to_die_of_the_limit() -> None:
+    memory = ProcessLimits(memory_bytes=1024 ** 3)
+    mentioned = LimitedResult(returncode=1, stdout="E   AssertionError: 'MemoryError' != ''\n", stderr="")
+    assert mentioned.failure_signature("pytest", memory) is None
+    assert mentioned.failure_signature("pytest", memory, memory_error=True) == "pytest-memory-limit"
+    uncaught = LimitedResult(returncode=1, stdout="", stderr="Traceback (most recent call last):\nMemoryError\n")
+    assert uncaught.failure_signature("pytest", memory) == "pytest-memory-limit"
+    internal = LimitedResult(returncode=3, stdout="INTERNALERROR> MemoryError\n", stderr="")
+    assert internal.failure_signature("pytest", memory) is None
+    assert internal.failure_signature("pytest", memory, crash_returncodes=frozenset({3})) == "pytest-memory-limit"
+
+    # SIGKILL may come from the OOM killer, so it is not taken as the CPU limit.
+    cpu = ProcessLimits(cpu_s=5)
+    assert LimitedResult(returncode=-9, stdout="", stderr="").failure_signature("pytest", cpu) is None
+
+
+@posix_only
+def test_pytest_memory_limit_comes_from_test_results(tmp_path: Path) -> None:
+    (tmp_path / "test_memory.py").write_text(
+        "def test_mentions_it():\n    assert 'MemoryError' == ''\n"
+    )
+    tool = PytestTool(tmp_path, limits=ProcessLimits(timeout_s=60, memory_bytes=4 * 1024 ** 3))
+
+    mentioned = tool.run(["-q", "-p", "no:cacheprovider"])
+    assert (mentioned.ok, mentioned.failure_signature) == (False, None)
+
+    (tmp_path / "test_memory.py").write_text("def test_runs_out():\n    raise MemoryError()\n")
+    exhausted = tool.run(["-q", "-p", "no:cacheprovider"])
+    assert exhausted.failure_signature == "pytest-memory-limit"
+
+
+def test_limits_read_from_env(monkeypatch) -> None:
+    monkeypatch.setenv("TOKIMON_PYTEST_TIMEOUT_S", "12.5")
+    monkeypatch.setenv("TOKIMON_PYTEST_MEMORY_MB", "256")
+    monkeypatch.setenv("TOKIMON_PYTEST_MAX_OUTPUT_BYTES", "0")
+
+    limits = ProcessLimits.from_env("PYTEST", timeout_s=1800, max_output_bytes=4096)
+
+    assert limits == ProcessLimits(timeout_s=12.5, cpu_s=None, memory_bytes=256 * 1024 * 1024, max_output_bytes=None)
+
+
+def _write_hanging_suite(root: Path) -> None:
+    (root / "test_hang.py").write_text(
+        "import time\n\n"
+        "def test_fast():\n    assert True\n\n"
+        "def test_hangs():\n    time.sleep(60)\n"
+    )
+
+
+@posix_only
+def test_pytest_timeout_keeps_partial_results(tmp_path: Path) -> None:
+    _write_hanging_suite(tmp_path)
+    tool = PytestTool(tmp_path, limits=ProcessLimits(timeout_s=3.0))
+
+    result = tool.run(["-q", "-p", "no:cacheprovider"])
+
+    assert result.ok is False
+    assert result.failure_signature == "pytest-timeout"
+    assert result.error == "pytest timed out after 3s"
+    assert result.data["failure_signature"] == "pytest-timeout"
+    assert result.data["passed"] == 1
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="warm pytest server needs os.fork")
+def test_warm_server_enforces_the_timeout(tmp_path: Path) -> None:
+    _write_hanging_suite(tmp_path)
+    server = WarmPytestServer()
+    try:
+        tool = PytestTool(tmp_path, warm_server=server, limits=ProcessLimits(timeout_s=3.0))
+        result = tool.run(["-q", "-p", "no:cacheprovider"])
+    finally:
+        server.close()
+
+    assert result.data["runner"] == "warm-server"
+    assert result.failure_signature == "pytest-timeout"
+    assert result.data["passed"] == 1
+
+
+def test_patch_timeout_is_a_distinct_failure(monkeypatch, tmp_path: Path) -> None:
+    def fake_run(cmd, cwd, input, limits):
+        return LimitedResult(returncode=-9, stdout="", stderr="", timed_out=True)
+
+    monkeypatch.setattr(process_limits, "run_limited", fake_run)
+
+    result = PatchTool(tmp_path, limits=ProcessLimits(timeout_s=5)).apply("--- a/x\n+++ b/x\n")
+
+    assert result.ok is False
+    assert result.failure_signature == "patch-timeout"
+    assert result.error == "git apply --check timed out after 5s"
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from runners.hierarchical import _WorkspaceChanges, _suite_test_counts, _test_selection_metrics
+from tools import process_limits
+from tools.process_limits import LimitedResult
+from tools.pytest_tool import PytestTool
+from tools.test_impact import TestImpactIndex
+
+
+def _workspace(root: Path) -> None:
+    (root / "pkg").mkdir()
+    (root / "pkg" / "__init__.py").write_text("")
+    (root / "pkg" / "core.py").write_text("def add(a, b):\n    return a + b\n")
+    (root / "pkg" / "helpers.py").write_text("from .core import add\n\ndef twice(x):\n    return add(x, x)\n")
+    (root / "pkg" / "unused.py").write_text("VALUE = 1\n")
+    (root / "tests").mkdir()
+    (root / "tests" / "test_core.py").write_text("from pkg.core import add\n\ndef test_add():\n    assert add(1, 2) == 3\n")
+    (root / "tests" / "test_helpers.py").write_text("from pkg import helpers\n\ndef test_twice():\n    assert helpers.twice(2) == 4\n")
+    (root / "tests" / "test_other.py").write_text("def test_other():\n    assert True\n")
+
+
+_TESTS = ["tests/test_core.py", "tests/test_helpers.py", "tests/test_other.py"]
+
+
+def test_impact_index_follows_transitive_imports(tmp_path: Path) -> None:
+    _workspace(tmp_path)
+    index = TestImpactIndex(tmp_path)
+
+    core = index.select(["pkg/core.py"], test_files=_TESTS)
+    assert core.confident is True
+    assert core.tests == ["tests/test_core.py", "tests/test_helpers.py"]
+    assert core.to_dict() == {"mode": "impact", "selected": 2, "total": 3, "reason": "import graph"}
+
+    assert index.select(["pkg/helpers.py"], test_files=_TESTS).tests == ["tests/test_helpers.py"]
+    assert index.select(["tests/test_other.py", "README.md"], test_files=_TESTS).tests == ["tests/test_other.py"]
+
+
+def test_impact_index_selects_tests_reached_through_conftest_fixtures(tmp_path: Path) -> None:
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "db.py").write_text("def connect():\n    return object()\n")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "conftest.py").write_text(
+        "import pytest\nfrom pkg.db import connect\n\n@pytest.fixture\ndef conn():\n    return connect()\n"
+    )
+    (tmp_path / "tests" / "test_direct.py").write_text("from pkg import db\n\ndef test_direct():\n    assert db\n")
+    (tmp_path / "tests" / "test_fixture.py").write_text("def test_fixture(conn):\n    assert conn\n")
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "test_unrelated.py").write_text("def test_unrelated():\n    assert True\n")
+    test_files = ["other/test_unrelated.py", "tests/test_direct.py", "tests/test_fixture.py"]
+
+    selection = TestImpactIndex(tmp_path).select(["pkg/db.py"], test_files=test_files)
+
+    assert selection.confident is True
+    assert selection.tests == ["tests/test_direct.py", "tests/test_fixture.py"]
+
+
+def test_impact_index_falls_back_to_full_run_when_unsure(tmp_path: Path) -> None:
+    _workspace(tmp_path)
+    index = TestImpactIndex(tmp_path)
+
+    for changed, reason in [
+        ([], "no changed files"),
+        (["pkg/unused.py"], "no tests depend on the changed files"),
+        (["tests/conftest.py"], "config changed: tests/conftest.py"),
+        (["pkg/data.json"], "non-python change: pkg/data.json"),
+        (["pkg/gone.py"], "python file removed: pkg/gone.py"),
+    ]:
+        selection = index.select(changed, test_files=_TESTS)
+        assert selection.confident is False
+        assert selection.reason == reason
+        assert selection.to_dict()["selected"] == 3
+
+
+def test_impact_index_caches_imports_and_reparses_changed_files(tmp_path: Path) -> None:
+    _workspace(tmp_path)
+    TestImpactIndex(tmp_path).refresh()
+    cache_path = tmp_path / ".tokimon-tmp" / "test-impact" / "imports.json"
+    cached = json.loads(cache_path.read_text())["files"]
+    assert "pkg.core" in cached["tests/test_core.py"]["imports"]
+
+    (tmp_path / "tests" / "test_other.py").write_text("import pkg.unused\n\ndef test_other():\n    assert True\n")
+    selection = TestImpactIndex(tmp_path).select(["pkg/unused.py"], test_files=_TESTS)
+
+    assert selection.tests == ["tests/test_other.py"]
+    assert "pkg.unused" in json.loads(cache_path.read_text())["files"]["tests/test_other.py"]["imports"]
+
+
+def test_concurrent_steps_share_changes_until_the_next_test_run() -> None:
+    changes = _WorkspaceChanges()
+    changes.pending.update({"pkg/core.py", "pkg/helpers.py"})
+    assert changes.take() == ["pkg/core.py", "pkg/helpers.py"]
+    assert changes.take() == []
+
+    # Another step's worker may have edited files it has not reported yet.
+    changes.pending.add("pkg/core.py")
+    changes.editing = 1
+    assert changes.take() is None
+    changes.editing = 0
+    assert changes.take() == []
+
+    changes.unknown = True
+    assert changes.take() is None
+
+
+def test_pytest_tool_runs_only_affected_tests_and_reports_counts(monkeypatch, tmp_path: Path) -> None:
+    _workspace(tmp_path)
+    commands: list[list[str]] = []
+
+    def fake_run(cmd, cwd, env, limits):
+        commands.append(cmd)
+        return LimitedResult(returncode=0, stdout="2 passed\n", stderr="")
+
+    monkeypatch.setattr(process_limits, "run_limited", fake_run)
+    tool = PytestTool(tmp_path, impact_selection=True)
+
+    result = tool.run(["-q", "tests"], changed_files=["pkg/core.py"])
+
+    assert result.ok is True
+    assert result.summary == "pytest run (impact-selected, confirmed by full run)"
+    assert result.data["selection"]["mode"] == "impact"
+    assert result.data["selection"]["selected"] == 2
+    assert result.data["selection"]["total"] == 3
+    assert result.data["selection"]["confirmed"] is True
+    # The affected tests run first; once they pass, the full target confirms the suite is green.
+    assert len(commands) == 2
+    args = commands[0][3 : commands[0].index("--basetemp")]
+    assert args == ["-q", "tests/test_core.py", "tests/test_helpers.py"]
+    assert commands[1][3 : commands[1].index("--basetemp")] == ["-q", "tests"]
+
+    full = tool.run(["-q", "tests"], changed_files=["setup.cfg"])
+    assert full.data["selection"]["mode"] == "full"
+    assert commands[-1][3 : commands[-1].index("--basetemp")] == ["-q", "tests"]
+
+
+def test_pytest_tool_keeps_rerunning_last_failures(monkeypatch, tmp_path: Path) -> None:
+    _workspace(tmp_path)
+    commands: list[list[str]] = []
+    outputs = iter(
+        [
+            LimitedResult(returncode=1, stdout="FAILED tests/test_other.py::test_other - boom\n1 failed\n", stderr=""),
+            LimitedResult(returncode=1, stdout="FAILED tests/test_other.py::test_other - boom\n1 failed, 1 passed\n", stderr=""),
+        ]
+    )
+
+    def fake_run(cmd, cwd, env, limits):
+        commands.append(cmd)
+        return next(outputs)
+
+    monkeypatch.setattr(process_limits, "run_limited", fake_run)
+    tool = PytestTool(tmp_path, impact_selection=True)
+    tool.run(["tests"])
+
+    result = tool.run(["tests"], changed_files=["pkg/helpers.py"])
+
+    assert result.data["selection"] == {
+        "mode": "impact",
+        "selected": 2,
+        "total": 3,
+        "reason": "import graph",
+        "last_failed": 1,
+    }
+    assert result.summary == "pytest run (impact-selected)"
+    # A failing subset run is not confirmed by a full run.
+    assert len(commands) == 2
+    assert commands[-1][3:5] == ["tests/test_helpers.py", "tests/test_other.py"]
+
+
+def test_pytest_tool_impact_selection_is_opt_in(monkeypatch, tmp_path: Path) -> None:
+    _workspace(tmp_path)
+    monkeypatch.delenv("TOKIMON_PYTEST_IMPACT", raising=False)
+    monkeypatch.setattr(process_limits, "run_limited", lambda *a, **k: LimitedResult(returncode=0, stdout="", stderr=""))
+
+    result = PytestTool(tmp_path).run(["tests"], changed_files=["pkg/core.py"])
+
+    assert "selection" not in result.data
+
+
+def test_step_progress_metrics_carry_selection_counts() -> None:
+    assert _test_selection_metrics({"selection": {"mode": "impact", "selected": 2, "total": 9}}) == {
+        "test_selection_mode": "impact",
+        "test_files_selected": 2,
+        "test_files_total": 9,
+    }
+    assert _test_selection_metrics({"passed": 3}) == {}
+    assert _test_selection_metrics(None) == {}
+
+
+def test_only_full_suite_counts_feed_progress() -> None:
+    subset = {"passed": 2, "failed": 1, "selection": {"mode": "impact"}}
+    assert _suite_test_counts(subset) == (None, None)
+    confirmed = {"passed": 9, "failed": 0, "selection": {"mode": "impact", "confirmed": True}}
+    assert _suite_test_counts(confirmed) == (0, 9)
+    assert _suite_test_counts({"passed": 5, "failed": 2, "selection": {"mode": "full"}}) == (2, 5)
+    assert _suite_test_counts(None) == (None, None)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from tools import process_limits
+from tools.process_limits import LimitedResult
+from tools.pytest_tool import PytestTool, _summarize_report
+
+
+def _write_suite(root: Path) -> None:
+    (root / "test_mixed.py").write_text(
+        "import time\n"
+        "import pytest\n\n"
+        "@pytest.fixture\n"
+        "def broken():\n    raise RuntimeError('fixture exploded')\n\n"
+        "def test_pass():\n    assert True\n\n"
+        "def test_slow():\n    time.sleep(0.05)\n\n"
+        "def test_fail():\n    assert 1 == 2\n\n"
+        "def test_value_error():\n    raise ValueError('bad value')\n\n"
+        "def test_setup_error(broken):\n    pass\n\n"
+        "@pytest.mark.skip(reason='later')\n"
+        "def test_skip():\n    pass\n\n"
+        "@pytest.mark.xfail(reason='known')\n"
+        "def test_xfail():\n    assert False\n\n"
+        "@pytest.mark.xfail(reason='fixed')\n"
+        "def test_xpass():\n    assert True\n"
+    )
+    (root / "test_broken_import.py").write_text("import not_a_real_module\n")
+
+
+def test_report_plugin_gives_structured_outcomes(tmp_path: Path) -> None:
+    _write_suite(tmp_path)
+
+    result = PytestTool(tmp_path).run(["-q", "-p", "no:cacheprovider", "--continue-on-collection-errors"])
+
+    data = result.data
+    assert result.ok is False
+    assert data["report"] == "plugin"
+    assert (data["passed"], data["failed"], data["errors"]) == (2, 2, 2)
+    assert (data["skipped"], data["xfailed"], data["xpassed"]) == (1, 1, 1)
+    assert data["error_categories"] == {
+        "AssertionError": 1,
+        "ValueError": 1,
+        "RuntimeError": 1,
+        "ModuleNotFoundError": 1,
+    }
+    assert "test_mixed.py::test_fail - assert 1 == 2" in data["failing_tests"]
+    assert any(item.startswith("test_broken_import.py - ModuleNotFoundError") for item in data["failing_tests"])
+    assert any(item.startswith("test_mixed.py::test_setup_error - RuntimeError") for item in data["failing_tests"])
+    assert data["slowest"][0]["nodeid"] == "test_mixed.py::test_slow"
+    assert data["slowest"][0]["duration"] >= 0.05
+    assert set(data["durations"]) >= {"test_mixed.py::test_pass", "test_mixed.py::test_xfail"}
+    assert data["durations_truncated"] is False
+    # The side file is removed once it has been read.
+    assert not list((tmp_path / ".tokimon-tmp").glob("pytest-report-*.jsonl"))
+
+
+def test_summarize_report_counts_call_and_teardown_failures_separately() -> None:
+    records = [
+        {"nodeid": "t.py::a", "when": "setup", "outcome": "passed", "duration": 0.1},
+        {"nodeid": "t.py::a", "when": "call", "outcome": "failed", "duration": 0.2, "error_type": "KeyError", "message": "KeyError: 'x'"},
+        {"nodeid": "t.py::a", "when": "teardown", "outcome": "error", "duration": 0.3, "error_type": "OSError", "message": "OSError: gone"},
+        {"event": "session", "exitstatus": 1, "collected": 1},
+    ]
+
+    summary = _summarize_report(records)
+
+    assert (summary["passed"], summary["failed"], summary["errors"]) == (0, 1, 1)
+    assert summary["failing_tests"] == ["t.py::a - KeyError: 'x'", "t.py::a - OSError: gone"]
+    assert summary["durations"] == {"t.py::a": 0.6}
+    assert summary["slowest"] == [{"nodeid": "t.py::a", "duration": 0.6, "outcome": "error"}]
+    assert summary["collected"] == 1
+
+
+def test_output_is_kept_as_a_capped_tail(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("TOKIMON_PYTEST_OUTPUT_TAIL_BYTES", "64")
+    noisy = "x" * 5000 + "\nFAILED t.py::a - boom\n1 failed, 1 error\n"
+
+    def fake_run(cmd, cwd, env, limits):
+        assert cmd[-2:] == ["-p", "tokimon_pytest_report"]
+        assert env["TOKIMON_PYTEST_REPORT"].endswith(".jsonl")
+        return LimitedResult(returncode=1, stdout=noisy, stderr="")
+
+    monkeypatch.setattr(process_limits, "run_limited", fake_run)
+
+    data = PytestTool(tmp_path).run(["-q"]).data
+
+    # Without a report (the fake never ran the plugin) the terminal output is parsed instead.
+    assert data["report"] == "output"
+    assert (data["failed"], data["errors"]) == (1, 1)
+    assert data["failing_tests"] == ["t.py::a - boom"]
+    assert data["output_truncated"] is True
+    assert data["output_bytes"] > 5000
+    assert len(data["output"].encode()) <= 64
+    assert data["output"].endswith("1 failed, 1 error\n\n")
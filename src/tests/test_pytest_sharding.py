@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from tools import process_limits, test_shards
+from tools.process_limits import LimitedResult
+from tools.pytest_tool import PytestTool
+from tools.test_shards import TestDurationHistory, partition_lpt
+
+
+def _write_suite(root: Path) -> None:
+    (root / "test_a.py").write_text(
+        "def test_slow():\n    assert True\n\n"
+        "def test_one():\n    assert True\n\n"
+        "def test_two():\n    assert 1 == 2\n"
+    )
+    (root / "test_b.py").write_text(
+        "import pytest\n\n"
+        "@pytest.mark.parametrize('value', [1, 2, 3])\n"
+        "def test_values(value):\n    assert value\n"
+    )
+
+
+def test_partition_lpt_balances_load_and_keeps_collection_order() -> None:
+    nodeids = ["a", "b", "c", "d", "e"]
+    estimates = {"a": 1.0, "b": 5.0, "c": 3.0, "d": 4.0, "e": 3.0}
+
+    buckets = partition_lpt(nodeids, estimates, 2)
+
+    assert sorted(sum(estimates[nodeid] for nodeid in bucket) for bucket in buckets) == [8.0, 8.0]
+    assert all(bucket == sorted(bucket) for bucket in buckets)
+    assert partition_lpt(["a"], {"a": 1.0}, 4) == [["a"]]
+
+
+def test_duration_history_estimates_unknown_tests_and_limits_shards(tmp_path: Path) -> None:
+    history = TestDurationHistory(tmp_path)
+    assert history.estimate(["x"]) == {"x": 1.0}
+
+    history.record({"x": 2.0, "y": 4.0})
+    history.record({"x": 4.0}, shard_overheads=[1.0, 3.0])
+
+    reloaded = TestDurationHistory(tmp_path)
+    estimates = reloaded.estimate(["x", "y", "z"])
+    assert estimates == {"x": 3.0, "y": 4.0, "z": 3.5}
+    assert reloaded.shard_overhead == 2.0
+    # Never more shards than tests, nor than there are 2s overheads' worth of test time.
+    assert reloaded.shard_count(8, estimates) == 3
+    assert reloaded.shard_count(8, {f"t{index}": 1.0 for index in range(10)}) == 5
+    assert reloaded.shard_count(8, {"x": 0.1}) == 1
+
+
+def test_duration_history_evicts_the_least_recently_measured_tests(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(test_shards, "_MAX_ENTRIES", 2)
+    history = TestDurationHistory(tmp_path)
+    history.record({"a": 1.0, "z": 1.0})
+    history.record({"a": 2.0})
+    history.record({"m": 3.0})
+
+    reloaded = TestDurationHistory(tmp_path)
+    assert sorted(reloaded.durations) == ["a", "m"]
+    assert sorted(reloaded.last_seen) == ["a", "m"]
+
+
+def test_sharded_run_merges_results_and_learns_from_timings(tmp_path: Path) -> None:
+    _write_suite(tmp_path)
+    seeded = TestDurationHistory(tmp_path)
+    seeded.record(
+        {
+            "test_a.py::test_slow": 30.0,
+            "test_a.py::test_one": 0.01,
+            "test_a.py::test_two": 0.01,
+            **{f"test_b.py::test_values[{value}]": 0.01 for value in (1, 2, 3)},
+        }
+    )
+    tool = PytestTool(tmp_path, shards=2)
+
+    result = tool.run(["-q", "-p", "no:cacheprovider"])
+
+    data = result.data
+    assert result.ok is False
+    assert data["returncode"] == 1
+    assert data["sharding"] == {"shards": 2, "requested": 2, "reason": "duration-balanced"}
+    # The known-slow test gets a shard to itself.
+    assert sorted(shard["tests"] for shard in data["shards"]) == [1, 5]
+    assert (data["passed"], data["failed"], data["collected"]) == (5, 1, 6)
+    assert data["failing_tests"] == ["test_a.py::test_two - assert 1 == 2"]
+    assert "=== shard 2/2 ===" in data["output"]
+    history = json.loads((tmp_path / ".tokimon-tmp" / "test-shards" / "durations.json").read_text())
+    assert "test_b.py::test_values[3]" in history["tests"]
+    assert history["shard_overhead"] > 0
+    assert not list((tmp_path / ".tokimon-tmp").glob("pytest-shard-*.txt"))
+
+    # The seeded estimate moves toward the measured duration.
+    assert history["tests"]["test_a.py::test_slow"] < 30.0
+
+
+def test_sharding_stops_once_overhead_outweighs_test_time(tmp_path: Path) -> None:
+    _write_suite(tmp_path)
+    tool = PytestTool(tmp_path, shards=2)
+
+    first = tool.run(["-q", "-p", "no:cacheprovider"]).data
+    assert first["sharding"]["shards"] == 2
+
+    again = tool.run(["-q", "-p", "no:cacheprovider"]).data
+    assert again["sharding"] == {"shards": 1, "requested": 2, "reason": "suite too small to shard"}
+    assert (again["passed"], again["failed"]) == (5, 1)
+
+
+def test_unshardable_arguments_run_in_one_process(monkeypatch, tmp_path: Path) -> None:
+    commands: list[list[str]] = []
+
+    def fake_run(cmd, cwd, env, limits):
+        commands.append(cmd)
+        return LimitedResult(returncode=0, stdout="1 passed\n", stderr="")
+
+    monkeypatch.setattr(process_limits, "run_limited", fake_run)
+
+    result = PytestTool(tmp_path, shards=4).run(["-q", "--basetemp", str(tmp_path / "bt")])
+
+    assert len(commands) == 1
+    assert result.data["sharding"] == {"shards": 1, "requested": 4, "reason": "arguments cannot be sharded"}
+
+
+def test_sharding_is_opt_in(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.delenv("TOKIMON_PYTEST_SHARDS", raising=False)
+    assert PytestTool(tmp_path).shards == 1
+    monkeypatch.setenv("TOKIMON_PYTEST_SHARDS", "3")
+    assert PytestTool(tmp_path).shards == 3
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from tools import process_limits
+from tools.process_limits import LimitedResult
+from tools.pytest_server import WarmPytestServer
+from tools.pytest_tool import PytestTool
+
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="warm pytest server needs os.fork")
+
+
+@pytest.fixture
+def server():
+    server = WarmPytestServer()
+    yield server
+    server.close()
+
+
+def _write_suite(root: Path, expected: int) -> None:
+    (root / "calc.py").write_text(f"VALUE = {expected}\n")
+    (root / "test_calc.py").write_text(
+        "from calc import VALUE\n\n"
+        "def test_value():\n    assert VALUE == 1\n\n"
+        "def test_other():\n    assert True\n"
+    )
+
+
+def test_warm_server_runs_each_request_in_a_fresh_child(tmp_path: Path, server: WarmPytestServer) -> None:
+    _write_suite(tmp_path, expected=2)
+    tool = PytestTool(tmp_path, warm_server=server)
+
+    failing = tool.run(["-q", "-p", "no:cacheprovider"])
+    assert failing.data["runner"] == "warm-server"
+    assert failing.data["report"] == "plugin"
+    assert failing.data["passed"] == 1
+    assert failing.data["failed"] == 1
+    assert failing.data["failing_tests"][0].startswith("test_calc.py::test_value")
+
+    # The edited module is re-imported: nothing from the previous run leaks into the next one.
+    _write_suite(tmp_path, expected=1)
+    passing = tool.run(["-q", "-p", "no:cacheprovider"])
+    assert passing.ok is True
+    assert passing.data["passed"] == 2
+    assert server.runs == 2
+    assert server.restarts == 0
+
+
+def test_warm_server_restarts_after_dying(tmp_path: Path, server: WarmPytestServer) -> None:
+    _write_suite(tmp_path, expected=1)
+    tool = PytestTool(tmp_path, warm_server=server)
+    assert tool.run(["-q", "-p", "no:cacheprovider"]).data["runner"] == "warm-server"
+
+    assert server._proc is not None
+    server._proc.kill()
+    server._proc.wait()
+
+    result = tool.run(["-q", "-p", "no:cacheprovider"])
+    assert result.data["runner"] == "warm-server"
+    assert result.data["passed"] == 2
+    assert server.restarts == 1
+
+
+def test_busy_server_falls_back_to_subprocess(monkeypatch, tmp_path: Path, server: WarmPytestServer) -> None:
+    monkeypatch.setattr(
+        process_limits,
+        "run_limited",
+        lambda cmd, cwd, env, limits: LimitedResult(returncode=0, stdout="3 passed\n", stderr=""),
+    )
+    tool = PytestTool(tmp_path, warm_server=server)
+
+    with server._lock:
+        result = tool.run(["-q"])
+
+    assert result.data["runner"] == "subprocess"
+    assert result.data["passed"] == 3
+
+
+def test_warm_server_is_opt_in(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.delenv("TOKIMON_PYTEST_SERVER", raising=False)
+    assert PytestTool(tmp_path).warm_server is None
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import sqlite3
 from pathlib import Path
 
 from agents.manager import Manager, Strategy
@@ -87,3 +88,58 @@ def test_gap_detector_triggers_only_after_threshold(tmp_path: Path) -> None:
     tags = [_lesson_metadata(path).get("tags") for path in lessons]
     assert any(isinstance(tag, list) and "skill-gap" in tag for tag in tags)
 
+
+def _retry_metadata(lesson_id: str, failure_signature: str) -> dict[str, object]:
+    return {
+        "id": lesson_id,
+        "lesson_type": "retry",
+        "failure_signature": failure_signature,
+        "subtask_signature": "step-1|Debugger|abc",
+        "root_cause_hypothesis": "unknown",
+        "strategy_change": "patch instead",
+        "evidence_of_novelty": "new strategy",
+        "retrieval_tags": ["retry"],
+        "tags": ["retry"],
+    }
+
+
+def test_retry_signal_counts_track_lesson_writes_and_reindex(tmp_path: Path) -> None:
+    root = tmp_path / "memory"
+    store = MemoryStore(root)
+    store.write_lesson(_retry_metadata("a", "sig-1"), "a")
+    store.write_lesson(_retry_metadata("b", "sig-1"), "b")
+    store.write_lesson({"id": "plain", "failure_signature": "sig-1"}, "not a retry lesson")
+    assert store.count_retry_lessons("failure_signature", "sig-1") == 2
+    assert store.count_retry_lessons("subtask_signature", "step-1|Debugger|abc") == 2
+
+    store.write_lesson(_retry_metadata("b", "sig-2"), "b rewritten")
+    assert store.count_retry_lessons("failure_signature", "sig-1") == 1
+    assert store.count_retry_lessons("failure_signature", "sig-2") == 1
+    assert store.count_retry_lessons("subtask_signature", "step-1|Debugger|abc") == 2
+
+    (root / "lessons" / "lesson-a.md").unlink()
+    store.cli_reindex()
+    assert store.count_retry_lessons("failure_signature", "sig-1") == 0
+
+    conn = sqlite3.connect(root / "index.sqlite")
+    conn.execute("DELETE FROM retry_signal_counts")
+    conn.commit()
+    conn.close()
+    store.cli_reindex(full=True)
+    assert store.count_retry_lessons("failure_signature", "sig-2") == 1
+
+
+def test_gap_detector_does_not_read_lesson_files(tmp_path: Path, monkeypatch) -> None:
+    store = MemoryStore(tmp_path / "memory")
+    detector = SkillGapDetector(tmp_path / "repo", store, threshold=2)
+    for lesson_id in ("a", "b"):
+        store.write_lesson(_retry_metadata(lesson_id, "sig"), lesson_id)
+
+    def no_glob(self: Path, pattern: str):
+        raise AssertionError(f"unexpected glob {pattern}")
+
+    monkeypatch.setattr(Path, "glob", no_glob)
+    monkeypatch.setattr(detector, "_candidate_exists", lambda name: False)
+    candidate = detector.observe_retry_lesson(_retry_metadata("b", "sig"))
+    assert candidate is not None
+    assert (candidate.signal_type, candidate.count) == ("retry-failure", 2)
@@ -94,6 +94,7 @@ def test_worker_echoes_tool_call_id_in_records_and_tool_message(tmp_path: Path)
     payload = json.loads(tool_messages[0]["content"])
     assert payload["call_id"] == "call-123"
 
+    trace.close()
     trace_records = _read_trace(trace_path)
     tool_result = [record for record in trace_records if record.get("event_type") == "worker_tool_result"][0]
     assert tool_result["payload"]["call_id"] == "c1"
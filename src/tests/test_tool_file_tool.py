@@ -30,3 +30,92 @@ def test_file_tool_read_missing_file_returns_error(tmp_path: Path) -> None:
     assert result.ok is False
     assert result.summary == "read failed"
     assert result.error
+
+
+def _numbered(count: int) -> str:
+    return "".join(f"line {index}\n" for index in range(count))
+
+
+def test_file_tool_reads_line_ranges_with_paging_metadata(tmp_path: Path) -> None:
+    (tmp_path / "log.txt").write_text(_numbered(10))
+    tool = FileTool(tmp_path)
+
+    page = tool.read("log.txt", offset=2, limit=3)
+    assert page.ok is True
+    assert page.data["content"] == "line 2\nline 3\nline 4\n"
+    assert page.data["returned"] == 3
+    assert page.data["next_offset"] == 5
+    assert page.data["truncated"] is False
+    assert page.data["size"] == len(_numbered(10))
+
+    last = tool.read("log.txt", offset=8, limit=5)
+    assert last.data["content"] == "line 8\nline 9\n"
+    assert last.data["next_offset"] is None
+
+
+def test_file_tool_reads_byte_ranges(tmp_path: Path) -> None:
+    (tmp_path / "data.txt").write_text("0123456789")
+    tool = FileTool(tmp_path)
+
+    result = tool.read("data.txt", offset=3, limit=4, unit="bytes")
+    assert result.data["content"] == "3456"
+    assert result.data["next_offset"] == 7
+    assert result.data["truncated"] is False
+
+    assert tool.read("data.txt", unit="words").ok is False
+
+
+def test_file_tool_caps_large_reads(tmp_path: Path, monkeypatch) -> None:
+    (tmp_path / "big.txt").write_text(_numbered(1000))
+    monkeypatch.setenv("TOKIMON_FILE_READ_MAX_BYTES", "100")
+    tool = FileTool(tmp_path)
+
+    result = tool.read("big.txt")
+    assert result.summary == "read ok (truncated)"
+    assert result.data["truncated"] is True
+    assert len(result.data["content"].encode()) <= 100
+    assert result.data["content"].endswith("\n")
+    assert result.data["next_offset"] == result.data["returned"]
+
+    # A caller may lower the cap but never raise it above the environment limit.
+    assert len(tool.read("big.txt", max_bytes=30).data["content"].encode()) <= 30
+    assert len(tool.read("big.txt", max_bytes=10_000).data["content"].encode()) <= 100
+
+
+def test_file_tool_reports_binary_files_without_decoding(tmp_path: Path) -> None:
+    (tmp_path / "image.png").write_bytes(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR")
+    tool = FileTool(tmp_path)
+
+    result = tool.read("image.png")
+    assert result.ok is True
+    assert result.summary == "binary file"
+    assert result.data["binary"] is True
+    assert result.data["content"] == ""
+
+    stat = tool.stat("image.png")
+    assert stat.data["binary"] is True
+    assert "lines" not in stat.data
+
+
+def test_file_tool_head_tail_and_stat(tmp_path: Path) -> None:
+    (tmp_path / "log.txt").write_text(_numbered(50))
+    tool = FileTool(tmp_path)
+
+    assert tool.head("log.txt", lines=2).data["content"] == "line 0\nline 1\n"
+    assert tool.tail("log.txt", lines=2).data["content"] == "line 48\nline 49\n"
+    assert tool.tail("log.txt", lines=100).data["content"] == _numbered(50)
+
+    (tmp_path / "partial.txt").write_text("a\nb\nc")
+    assert tool.tail("partial.txt", lines=2).data["content"] == "b\nc"
+
+    (tmp_path / "empty.txt").write_text("")
+    empty = tool.tail("empty.txt", lines=3).data
+    assert (empty["content"], empty["returned"]) == ("", 0)
+
+    stat = tool.stat("log.txt")
+    assert stat.ok is True
+    assert stat.data["type"] == "file"
+    assert stat.data["lines"] == 50
+    assert stat.data["size"] == len(_numbered(50))
+    assert "content" not in stat.data
+    assert tool.stat(".").data["type"] == "directory"
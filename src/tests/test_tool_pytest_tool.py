@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import subprocess
 from pathlib import Path
-from types import SimpleNamespace
 
+from tools import process_limits
+from tools.process_limits import LimitedResult
 from tools.pytest_tool import PytestTool, _parse_counts, _parse_failures, _safe_cwd
 
 
@@ -35,16 +35,16 @@ def test_safe_cwd_switches_to_parent_when_types_py_present(tmp_path: Path) -> No
 
 
 def test_pytest_tool_run_parses_counts_and_failures(monkeypatch, tmp_path: Path) -> None:
-    def fake_run(cmd, cwd, env, capture_output, text, check):
+    def fake_run(cmd, cwd, env, limits):
         assert "--basetemp" in cmd
         assert env.get("TMPDIR")
-        return SimpleNamespace(
+        return LimitedResult(
             returncode=1,
             stdout="2 passed, 1 failed\nFAILED tests/test_a.py::test_one - AssertionError: boom\n",
             stderr="",
         )
 
-    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(process_limits, "run_limited", fake_run)
 
     result = PytestTool(tmp_path).run(["-q"])
     assert result.ok is False
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import subprocess
+from pathlib import Path
+
+from llm.client import MockLLMClient
+from runners.hierarchical import HierarchicalRunner
+from tools.file_tool import FileTool
+from tools.grep_tool import GrepTool
+from tools.patch_tool import PatchTool
+from tools.read_cache import WorkspaceReadCache
+
+
+def test_file_reads_are_cached_until_the_file_changes(tmp_path: Path) -> None:
+    cache = WorkspaceReadCache()
+    tool = FileTool(tmp_path, read_cache=cache)
+    target = tmp_path / "a.txt"
+    target.write_text("one")
+
+    first = tool.read("a.txt")
+    second = tool.read("a.txt")
+    assert (first.cache_hit, second.cache_hit) == (False, True)
+    assert second.data["content"] == "one"
+
+    target.write_text("changed outside the tools")
+    assert tool.read("a.txt").data["content"] == "changed outside the tools"
+
+    tool.write("a.txt", "two")
+    third = tool.read("a.txt")
+    assert (third.cache_hit, third.data["content"]) == (False, "two")
+    assert FileTool(tmp_path).read("a.txt").cache_hit is None
+
+
+def test_grep_results_follow_the_tree_generation(tmp_path: Path) -> None:
+    cache = WorkspaceReadCache()
+    grep = GrepTool(tmp_path, read_cache=cache)
+    files = FileTool(tmp_path, read_cache=cache)
+    files.write("src.py", "needle = 1\n")
+
+    assert grep.search("needle").cache_hit is False
+    hit = grep.search("needle")
+    assert hit.cache_hit is True
+    assert "src.py" in hit.data["output"]
+
+    files.write("other.py", "needle = 2\n")
+    refreshed = grep.search("needle")
+    assert refreshed.cache_hit is False
+    assert "other.py" in refreshed.data["output"]
+
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    patch = "--- a/src.py\n+++ b/src.py\n@@ -1 +1 @@\n-needle = 1\n+haystack = 1\n"
+    assert PatchTool(tmp_path, read_cache=cache).apply(patch).ok
+    after_patch = grep.search("needle")
+    assert after_patch.cache_hit is False
+    assert "src.py" not in after_patch.data["output"]
+    assert cache.stats()["invalidations"] == 3
+
+
+def test_lru_budget_evicts_oldest_entries(tmp_path: Path) -> None:
+    cache = WorkspaceReadCache(max_bytes=10)
+    cache.put_file(tmp_path / "a", "12345", mtime_ns=1, size=5)
+    cache.put_file(tmp_path / "b", "12345", mtime_ns=1, size=5)
+    cache.get_file(tmp_path / "a", mtime_ns=1, size=5)
+    cache.put_file(tmp_path / "c", "12345", mtime_ns=1, size=5)
+
+    assert cache.get_file(tmp_path / "a", mtime_ns=1, size=5) == "12345"
+    assert cache.get_file(tmp_path / "b", mtime_ns=1, size=5) is None
+    assert cache.stats()["bytes"] == 10
+
+
+def test_hit_rates_are_reported_in_step_metrics(tmp_path: Path) -> None:
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    (workspace / "notes.txt").write_text("hello")
+    read = {"tool_calls": [{"tool": "file", "action": "read", "args": {"path": "notes.txt"}}]}
+    final = {"status": "SUCCESS", "summary": "ok", "artifacts": [], "metrics": {}, "next_actions": [], "failure_signature": ""}
+    llm = MockLLMClient(script=[read, read, final])
+
+    result = HierarchicalRunner(workspace, llm, base_dir=tmp_path / "runs").run(
+        "goal",
+        task_steps=[{"id": "solve", "name": "Solve", "description": "desc", "worker": "Implementer", "inputs": {}}],
+        task_id="t",
+        concurrency=1,
+    )
+
+    metrics = json.loads((result.run_context.reports_dir / "metrics.json").read_text())
+    step = metrics["steps"][0]
+    assert (step["read_cache_hits"], step["read_cache_lookups"], step["read_cache_hit_rate"]) == (1, 2, 0.5)
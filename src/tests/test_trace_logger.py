@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+from tracing import TraceLogger, read_trace_lines
+
+
+def test_concurrent_events_are_whole_lines_after_close(tmp_path: Path) -> None:
+    path = tmp_path / "trace.jsonl"
+    trace = TraceLogger(path, max_queue=8, flush_bytes=512)
+
+    def emit(worker: int) -> None:
+        for index in range(200):
+            trace.log("event", {"worker": worker, "index": index, "pad": "x" * 50})
+
+    threads = [threading.Thread(target=emit, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    trace.close()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == 800
+    for worker in range(4):
+        indexes = [r["payload"]["index"] for r in records if r["payload"]["worker"] == worker]
+        assert indexes == list(range(200))
+
+
+def test_flush_makes_buffered_events_visible(tmp_path: Path) -> None:
+    path = tmp_path / "trace.jsonl"
+    trace = TraceLogger(path, flush_bytes=1_000_000, flush_interval_s=60)
+    trace.log("first", {})
+    trace.flush()
+    assert [json.loads(line)["event_type"] for line in path.read_text().splitlines()] == ["first"]
+
+    trace.close()
+    trace.log("late", {})
+    assert [json.loads(line)["event_type"] for line in path.read_text().splitlines()] == ["first", "late"]
+
+
+def test_rotation_compresses_segments_in_order(tmp_path: Path) -> None:
+    path = tmp_path / "trace.jsonl"
+    trace = TraceLogger(path, flush_bytes=1, rotate_bytes=300, compress="gzip")
+    for index in range(20):
+        trace.log("event", {"index": index})
+    trace.close()
+
+    assert list(tmp_path.glob("trace.jsonl.*.gz"))
+    indexes = [json.loads(line)["payload"]["index"] for line in read_trace_lines(path)]
+    assert indexes == list(range(20))
@@ -58,6 +58,7 @@ def test_worker_writes_trace_jsonl_unrolled_loop(tmp_path: Path) -> None:
         trace_context={"task_id": "t1", "call_id": "c1"},
     )
     assert output.summary == "done"
+    trace.close()
     assert trace_path.exists()
 
     records = _read_trace(trace_path)
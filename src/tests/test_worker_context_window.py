@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from agents.context_window import ContextWindow, ContextWindowSettings, estimate_tokens
+from agents.worker import Worker
+from flow_types import WorkerStatus
+from llm_fakes import RecordingClient
+from replay import ReplayRecorder
+from tools.base import ToolResult
+from tracing import TraceLogger
+
+
+@dataclass
+class BigTool:
+    calls: list[int] = field(default_factory=list)
+
+    def dump(self, index: int) -> ToolResult:
+        self.calls.append(index)
+        return ToolResult(ok=True, summary=f"dump {index}", data={"text": f"{index}" * 4000}, elapsed_ms=0.1)
+
+
+def _tool_message(index: int, size: int) -> dict[str, Any]:
+    content = json.dumps({"call_id": f"c{index}", "ok": True, "summary": f"s{index}", "data": "x" * size})
+    return {"role": "tool", "name": "big", "content": content}
+
+
+def test_fit_elides_oldest_tool_messages_and_pins_head() -> None:
+    window = ContextWindow(ContextWindowSettings(budget_tokens=2_000, keep_recent=2))
+    messages = [{"role": "system", "content": "s" * 400}, {"role": "user", "content": "goal"}]
+    messages += [_tool_message(index, 2_000) for index in range(6)]
+
+    fit = window.fit(messages)
+
+    assert fit.before_tokens > 2_000
+    assert fit.after_tokens <= 2_000 * 0.75
+    assert fit.after_tokens == sum(estimate_tokens(message) for message in messages)
+    assert messages[0]["content"] == "s" * 400
+    assert [message.get("elided", False) for message in messages[2:]] == [True, True, True, True, False, False]
+    stub = json.loads(messages[2]["content"])
+    assert (stub["call_id"], stub["summary"], stub["data"]["_elided"]) == ("c0", "s0", True)
+
+    assert window.fit(messages).elided_messages == 0
+    disabled = ContextWindow(ContextWindowSettings(budget_tokens=0, keep_recent=0))
+    assert disabled.fit([_tool_message(0, 100_000)]).elided_messages == 0
+
+
+def test_worker_stays_under_budget_and_keeps_full_outputs(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("TOKIMON_CONTEXT_BUDGET_TOKENS", "6000")
+    monkeypatch.setenv("TOKIMON_CONTEXT_KEEP_RECENT_TOOL_MESSAGES", "1")
+    tool = BigTool()
+    script: list[dict[str, Any]] = [
+        {"tool_calls": [{"tool": "big", "action": "dump", "args": {"index": index}}]} for index in range(8)
+    ]
+    script.append({"status": "SUCCESS", "summary": "done", "artifacts": [], "metrics": {}, "next_actions": [], "failure_signature": ""})
+    llm = RecordingClient(script=script)
+    trace = TraceLogger(tmp_path / "trace.jsonl")
+    recorder = ReplayRecorder(step_id="s", worker_role="Implementer", goal="goal", inputs={}, memory=[])
+
+    output = Worker("Implementer", llm, {"big": tool}).run("goal", "s", {}, [], trace=trace, replay_recorder=recorder)
+    trace.close()
+
+    assert output.status == WorkerStatus.SUCCESS
+    assert tool.calls == list(range(8))
+    assert max(sum(estimate_tokens(message) for message in sent) for sent in llm.snapshots) <= 6000
+    assert llm.snapshots[-1][1]["content"].startswith("Goal: goal")
+    assert all(len(entry["result"]["data"]["text"]) == 4000 for entry in recorder.tool_script)
+
+    events = [json.loads(line) for line in (tmp_path / "trace.jsonl").read_text().splitlines()]
+    elided = [event["payload"] for event in events if event["event_type"] == "worker_context_elided"]
+    assert elided and all(event["after_tokens"] < event["before_tokens"] for event in elided)
+    calls = [event["payload"] for event in events if event["event_type"] == "worker_model_call"]
+    assert all("context_tokens" in event for event in calls)
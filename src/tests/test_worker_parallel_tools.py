@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents.worker import Worker
+from flow_types import WorkerStatus
+from llm_fakes import RecordingClient
+from replay import ReplayRecorder
+from tools.base import ToolResult
+
+
+@dataclass
+class SlowReadTool:
+    delay_s: float = 0.2
+    active: int = 0
+    peak: int = 0
+    log: list[str] = field(default_factory=list)
+    threads: set[threading.Thread] = field(default_factory=set)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def _enter(self, label: str) -> None:
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.log.append(f"start {label}")
+            self.threads.add(threading.current_thread())
+        time.sleep(self.delay_s)
+        with self.lock:
+            self.active -= 1
+            self.log.append(f"end {label}")
+
+    def read(self, path: str) -> ToolResult:
+        self._enter(f"read {path}")
+        return ToolResult(ok=True, summary=f"read {path}", data={"path": path}, elapsed_ms=0.1)
+
+    def search(self, pattern: str) -> ToolResult:
+        self._enter(f"search {pattern}")
+        return ToolResult(ok=True, summary=f"search {pattern}", data={"pattern": pattern}, elapsed_ms=0.1)
+
+    def run(self, args: list[str]) -> ToolResult:
+        self._enter(f"run {args}")
+        return ToolResult(ok=True, summary="pytest run", data={"args": args}, elapsed_ms=0.1)
+
+    def write(self, path: str, content: str) -> ToolResult:
+        self._enter(f"write {path}")
+        return ToolResult(ok=True, summary=f"write {path}", data={"path": path}, elapsed_ms=0.1)
+
+
+_FINAL = {"status": "SUCCESS", "summary": "done", "artifacts": [], "metrics": {}, "next_actions": [], "failure_signature": ""}
+
+
+def _run(calls: list[dict[str, Any]], tool: SlowReadTool) -> tuple[Any, RecordingClient, ReplayRecorder]:
+    llm = RecordingClient(script=[{"tool_calls": calls}, dict(_FINAL)])
+    recorder = ReplayRecorder(step_id="s", worker_role="Implementer", goal="goal", inputs={}, memory=[])
+    output = Worker("Implementer", llm, {"file": tool, "grep": tool}).run("goal", "s", {}, [], replay_recorder=recorder)
+    return output, llm, recorder
+
+
+def test_read_only_calls_run_concurrently_in_call_order(monkeypatch) -> None:
+    monkeypatch.setenv("TOKIMON_WORKER_TOOL_CONCURRENCY", "3")
+    tool = SlowReadTool()
+    calls = [
+        {"tool": "file", "action": "read", "args": {"path": f"f{index}"}, "call_id": f"c{index}"} for index in range(3)
+    ] + [{"tool": "grep", "action": "search", "args": {"pattern": "x"}, "call_id": "c3"}]
+
+    started = time.perf_counter()
+    output, llm, recorder = _run(calls, tool)
+    elapsed = time.perf_counter() - started
+
+    assert output.status == WorkerStatus.SUCCESS
+    assert tool.peak == 3
+    assert elapsed < 4 * tool.delay_s
+    assert [record["call_id"] for record in output.metrics["tool_call_records"]] == ["c0", "c1", "c2", "c3"]
+    assert [entry["call_id"] for entry in recorder.tool_script] == ["c0", "c1", "c2", "c3"]
+    tool_messages = [message for message in llm.snapshots[-1] if message["role"] == "tool"]
+    assert ['"call_id": "c%d"' % index in message["content"] for index, message in enumerate(tool_messages)] == [True] * 4
+
+
+def test_writes_are_barriers_and_concurrency_can_be_disabled(monkeypatch) -> None:
+    monkeypatch.setenv("TOKIMON_WORKER_TOOL_CONCURRENCY", "4")
+    tool = SlowReadTool(delay_s=0.05)
+    calls = [
+        {"tool": "file", "action": "read", "args": {"path": "a"}},
+        {"tool": "file", "action": "read", "args": {"path": "b"}},
+        {"tool": "file", "action": "write", "args": {"path": "a", "content": "x"}},
+        {"tool": "file", "action": "read", "args": {"path": "a"}},
+    ]
+    _run(calls, tool)
+    write_start = tool.log.index("start write a")
+    assert {"end read a", "end read b"} <= set(tool.log[:write_start])
+    assert tool.log[write_start + 1 :] == ["end write a", "start read a", "end read a"]
+
+    monkeypatch.setenv("TOKIMON_WORKER_TOOL_CONCURRENCY", "1")
+    serial = SlowReadTool(delay_s=0.01)
+    _run(calls[:2], serial)
+    assert serial.peak == 1
+
+
+def test_one_tool_pool_serves_every_batch_of_a_run(monkeypatch) -> None:
+    monkeypatch.setenv("TOKIMON_WORKER_TOOL_CONCURRENCY", "2")
+    tool = SlowReadTool(delay_s=0.05)
+    calls = [
+        {"tool": "file", "action": "read", "args": {"path": "a"}},
+        {"tool": "file", "action": "read", "args": {"path": "b"}},
+        {"tool": "file", "action": "write", "args": {"path": "c", "content": "x"}},
+        {"tool": "file", "action": "read", "args": {"path": "d"}},
+        {"tool": "file", "action": "read", "args": {"path": "e"}},
+    ]
+
+    _run(calls, tool)
+
+    pool_threads = {thread for thread in tool.threads if thread.name.startswith("tokimon-tool")}
+    assert 1 <= len(pool_threads) <= 2
+    assert not any(thread.is_alive() for thread in pool_threads)
+
+
+def test_test_runs_are_never_batched(monkeypatch) -> None:
+    monkeypatch.setenv("TOKIMON_WORKER_TOOL_CONCURRENCY", "4")
+    tool = SlowReadTool(delay_s=0.05)
+    calls = [{"tool": "pytest", "action": "run", "args": {"args": [f"t{index}.py"]}} for index in range(2)]
+    llm = RecordingClient(script=[{"tool_calls": calls}, dict(_FINAL)])
+
+    output = Worker("Implementer", llm, {"pytest": tool}).run("goal", "s", {}, [])
+
+    assert output.status == WorkerStatus.SUCCESS
+    assert tool.peak == 1
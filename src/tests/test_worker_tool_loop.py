@@ -16,6 +16,9 @@ class DummyTool:
         self.calls.append(text)
         return ToolResult(ok=True, summary="echo", data={"text": text}, elapsed_ms=0.1)
 
+    def hang(self) -> ToolResult:
+        return ToolResult(ok=False, summary="timed out", data={}, elapsed_ms=0.1, failure_signature="pytest-timeout")
+
 
 def test_worker_executes_tool_calls_and_counts() -> None:
     dummy = DummyTool()
@@ -34,6 +37,20 @@ def test_worker_executes_tool_calls_and_counts() -> None:
     assert output.metrics["iteration_count"] == 2
 
 
+def test_worker_failure_falls_back_to_tool_limit_signature() -> None:
+    llm = MockLLMClient(
+        script=[
+            {"tool_calls": [{"tool": "dummy", "action": "hang", "args": {}}]},
+            {"status": "FAILURE", "summary": "tests hung", "artifacts": [], "metrics": {}, "next_actions": [], "failure_signature": ""},
+        ]
+    )
+    worker = Worker("Implementer", llm, tools={"dummy": DummyTool()})
+    output = worker.run("goal", "step", inputs={}, memory=[])
+    assert output.status == WorkerStatus.FAILURE
+    assert output.failure_signature == "pytest-timeout"
+    assert output.metrics["tool_call_records"][0]["failure_signature"] == "pytest-timeout"
+
+
 def test_worker_tool_loop_detection_repeated_signature(monkeypatch) -> None:
     monkeypatch.setenv("TOKIMON_TOOL_LOOP_DETECTION_ENABLED", "true")
     monkeypatch.setenv("TOKIMON_TOOL_LOOP_REPEAT_THRESHOLD", "2")
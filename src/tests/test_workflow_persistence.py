@@ -1,8 +1,10 @@
+import json
 from pathlib import Path
 
 from flow_types import StepStatus
 from workflow.engine import WorkflowEngine
-from workflow.models import StepSpec, WorkflowSpec
+from workflow.journal import journal_path_for
+from workflow.models import StepAttempt, StepSpec, WorkflowSpec
 
 
 def test_workflow_save_load(tmp_path: Path) -> None:
@@ -22,3 +24,98 @@ def test_workflow_save_load(tmp_path: Path) -> None:
     loaded = WorkflowEngine.load(path)
     assert loaded.state.steps["s1"].status == StepStatus.SUCCEEDED
     assert loaded.state.steps["s2"].status in {StepStatus.NEW, StepStatus.READY}
+
+
+def _two_step_spec() -> WorkflowSpec:
+    return WorkflowSpec(
+        workflow_id="wf",
+        goal="goal",
+        steps=[
+            StepSpec(step_id="s1", name="s1", description="", worker="Implementer"),
+            StepSpec(step_id="s2", name="s2", description="", worker="Implementer", depends_on=["s1"]),
+        ],
+    )
+
+
+def test_workflow_journal_replays_mutations_after_crash(tmp_path: Path) -> None:
+    path = tmp_path / "workflow_state.json"
+    engine = WorkflowEngine(_two_step_spec())
+    engine.attach_journal(path)
+    snapshot_before = path.read_text()
+
+    engine.mark_running("s1")
+    engine.mark_outputs("s1", {"summary": "done"})
+    engine.record_attempt(
+        "s1",
+        StepAttempt(
+            attempt_id=1,
+            status=StepStatus.SUCCEEDED,
+            call_signature="sig",
+            worker_type="Implementer",
+            strategy_id="draft",
+            retrieval_stage=1,
+            summary="done",
+        ),
+    )
+    engine.mark_status("s1", StepStatus.SUCCEEDED)
+    engine.checkpoint()
+
+    # Simulated crash: the snapshot was never rewritten, only the journal grew.
+    assert path.read_text() == snapshot_before
+    journal = journal_path_for(path)
+    with journal.open("a") as handle:
+        handle.write('{"seq": 99, "op": "status", "step_')
+
+    loaded = WorkflowEngine.load(path)
+    assert loaded.state.steps["s1"].status == StepStatus.SUCCEEDED
+    assert loaded.state.steps["s1"].outputs == {"summary": "done"}
+    assert [attempt.summary for attempt in loaded.state.steps["s1"].attempts] == ["done"]
+    assert loaded.ready_steps() == ["s2"]
+
+
+def test_workflow_journal_compaction_is_idempotent(tmp_path: Path) -> None:
+    path = tmp_path / "workflow_state.json"
+    engine = WorkflowEngine(_two_step_spec())
+    engine.attach_journal(path, compact_every=2)
+    engine.mark_running("s1")
+    engine.mark_status("s1", StepStatus.SUCCEEDED)
+    journal = journal_path_for(path)
+    stale_records = journal.read_text()
+    engine.checkpoint()
+
+    assert journal.read_text() == ""
+    assert json.loads(path.read_text())["journal_seq"] == 2
+
+    # A crash between snapshot rename and journal truncation leaves stale records behind.
+    journal.write_text(stale_records)
+    engine.close_journal()
+    loaded = WorkflowEngine.load(path)
+    assert loaded.state.steps["s1"].status == StepStatus.SUCCEEDED
+    assert loaded.ready_steps() == ["s2"]
+
+
+def test_steps_running_at_a_crash_are_rerun_on_resume(tmp_path: Path) -> None:
+    path = tmp_path / "workflow_state.json"
+    spec = WorkflowSpec(
+        workflow_id="wf",
+        goal="goal",
+        steps=[
+            StepSpec(step_id="a", name="a", description="", worker="Implementer"),
+            StepSpec(step_id="b", name="b", description="", worker="Implementer"),
+            StepSpec(step_id="c", name="c", description="", worker="Implementer", depends_on=["b"]),
+        ],
+    )
+    engine = WorkflowEngine(spec)
+    engine.attach_journal(path)
+    engine.mark_running("a")
+    engine.mark_running("b")
+    engine.mark_status("a", StepStatus.SUCCEEDED)
+    engine.checkpoint()
+
+    loaded = WorkflowEngine.load(path)
+
+    assert loaded.state.steps["b"].status == StepStatus.READY
+    assert loaded.ready_steps() == ["b"]
+    loaded.mark_running("b")
+    loaded.mark_status("b", StepStatus.SUCCEEDED)
+    assert loaded.ready_steps() == ["c"]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+from flow_types import StepStatus
+from runners.hierarchical import HierarchicalRunner
+from workflow.engine import WorkflowEngine
+from workflow.models import StepSpec, WorkflowSpec
+
+
+def _spec(*steps: tuple[str, list[str]]) -> WorkflowSpec:
+    return WorkflowSpec(
+        workflow_id="wf",
+        goal="goal",
+        steps=[StepSpec(step_id=step_id, name=step_id, description="", worker="Implementer", depends_on=deps) for step_id, deps in steps],
+    )
+
+
+def test_ready_steps_follow_dependency_completion() -> None:
+    engine = WorkflowEngine(_spec(("a", []), ("b", []), ("c", ["a"]), ("d", ["a", "b"])))
+    assert engine.ready_steps() == ["a", "b"]
+
+    engine.mark_running("a")
+    engine.mark_running("b")
+    assert engine.ready_steps() == []
+
+    engine.mark_status("a", StepStatus.SUCCEEDED)
+    assert engine.ready_steps() == ["c"]
+    assert engine.state.steps["d"].status == StepStatus.NEW
+
+    engine.mark_status("b", StepStatus.PARTIAL)
+    assert engine.ready_steps() == ["c", "d"]
+
+
+def test_retry_pending_and_failed_dependencies() -> None:
+    engine = WorkflowEngine(_spec(("a", []), ("b", ["a"])))
+    engine.mark_running("a")
+    engine.mark_status("a", StepStatus.RETRY_PENDING)
+    assert engine.state.steps["a"].status == StepStatus.RETRY_PENDING
+    assert engine.ready_steps() == ["a"]
+    assert engine.state.steps["a"].status == StepStatus.READY
+
+    engine.mark_running("a")
+    engine.mark_status("a", StepStatus.FAILED, error="retry blocked")
+    assert engine.ready_steps() == []
+    assert engine.state.steps["b"].status == StepStatus.NEW
+
+
+def test_load_rebuilds_ready_index(tmp_path: Path) -> None:
+    engine = WorkflowEngine(_spec(("a", []), ("b", ["a"]), ("c", ["b"])))
+    engine.mark_status("a", StepStatus.SUCCEEDED)
+    path = tmp_path / "workflow_state.json"
+    engine.save(path)
+
+    loaded = WorkflowEngine.load(path)
+    assert loaded.ready_steps() == ["b"]
+    loaded.mark_status("b", StepStatus.SKIPPED)
+    assert loaded.ready_steps() == ["c"]
+
+
+class _StreamingLLMClient:
+    """`slow` blocks until `child` (which depends on `fast`) has started."""
+
+    def __init__(self) -> None:
+        self.child_started = threading.Event()
+        self.slow_saw_child = False
+
+    def send(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        response_schema: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        prompt = str(messages[1]["content"])
+        if "Step: child" in prompt:
+            self.child_started.set()
+        if "Step: slow" in prompt:
+            self.slow_saw_child = self.child_started.wait(timeout=10)
+        return {
+            "status": "SUCCESS",
+            "summary": "ok",
+            "artifacts": [],
+            "metrics": {},
+            "next_actions": [],
+            "failure_signature": "",
+        }
+
+
+def test_downstream_step_starts_before_slow_sibling_finishes(tmp_path: Path) -> None:
+    workspace = tmp_path / "workspace"
+    workspace.mkdir(parents=True, exist_ok=True)
+    llm = _StreamingLLMClient()
+    runner = HierarchicalRunner(workspace, llm, base_dir=tmp_path / "runs")
+    result = runner.run(
+        "goal",
+        task_steps=[
+            {"id": "slow", "worker": "Implementer"},
+            {"id": "fast", "worker": "Implementer"},
+            {"id": "child", "worker": "Implementer", "depends_on": ["fast"]},
+        ],
+        task_id="t",
+        test_args=None,
+        concurrency=2,
+    )
+
+    assert llm.slow_saw_child is True
+    payload = json.loads(result.workflow_state_path.read_text())
+    statuses = {step_id: step["status"] for step_id, step in payload["state"]["steps"].items()}
+    assert statuses == {"slow": "SUCCEEDED", "fast": "SUCCEEDED", "child": "SUCCEEDED"}
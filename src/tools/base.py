@@ -14,6 +14,10 @@ class ToolResult:
     data: dict[str, Any]
     elapsed_ms: float
     error: str | None = None
+    # True/False when the call consulted a read cache (hit/miss); None when no cache was used.
+    cache_hit: bool | None = None
+    # Set when a resource limit, not the work itself, ended the call (e.g. "pytest-timeout").
+    failure_signature: str | None = None
 
 
 class ToolError(Exception):
@@ -1,19 +1,44 @@
-"""FileTool for safe workspace read/write."""
+"""FileTool for safe workspace read/write.
+
+Reads never load more than ``max_bytes`` (``TOKIMON_FILE_READ_MAX_BYTES``,
+default 256 KiB) of a file. ``read`` pages through large files with
+``offset``/``limit`` in lines or bytes and reports ``truncated`` / ``next_offset``
+so the caller can continue; ``stat``, ``head`` and ``tail`` inspect a file
+without reading it whole. Binary files (a NUL byte in the first 8 KiB) are
+reported, not decoded.
+"""
 
 from __future__ import annotations
 
+import os
 import time
 from pathlib import Path
 from typing import Any
 
 from .base import ToolResult, elapsed_ms
+from .grep_index import WorkspaceTextIndex
+from .read_cache import WorkspaceReadCache
+
+
+_DEFAULT_MAX_BYTES = 256 * 1024
+_DEFAULT_HEAD_TAIL_LINES = 20
+_BINARY_SNIFF_BYTES = 8192
+_CHUNK_BYTES = 64 * 1024
 
 
 class FileTool:
     name = "file"
 
-    def __init__(self, root: Path) -> None:
+    def __init__(
+        self,
+        root: Path,
+        *,
+        read_cache: WorkspaceReadCache | None = None,
+        index: WorkspaceTextIndex | None = None,
+    ) -> None:
         self.root = root.resolve()
+        self.read_cache = read_cache
+        self.index = index
 
     def _resolve(self, path: str) -> Path:
         candidate = (self.root / path).resolve()
@@ -23,21 +48,233 @@ class FileTool:
             raise ValueError("Path traversal detected") from exc
         return candidate
 
-    def read(self, path: str) -> ToolResult:
+    def read(
+        self,
+        path: str,
+        offset: int | None = None,
+        limit: int | None = None,
+        unit: str = "lines",
+        max_bytes: int | None = None,
+    ) -> ToolResult:
+        """Read a file, or the ``offset``/``limit`` range of it in ``unit`` ("lines" or "bytes")."""
+
         start = time.perf_counter()
         try:
             file_path = self._resolve(path)
-            content = file_path.read_text()
-            return ToolResult(ok=True, summary="read ok", data={"path": str(file_path), "content": content}, elapsed_ms=elapsed_ms(start))
+            if unit not in ("lines", "bytes"):
+                raise ValueError("unit must be 'lines' or 'bytes'")
+            budget = _max_bytes(max_bytes)
+            stat = file_path.stat()
+            if _is_binary(file_path):
+                return _binary_result(file_path, stat.st_size, start)
+            if offset is None and limit is None and stat.st_size <= budget:
+                return self._read_whole(file_path, stat, start)
+            if unit == "bytes":
+                data = _read_byte_range(file_path, offset=offset or 0, limit=limit, max_bytes=budget)
+            else:
+                data = _read_line_range(file_path, offset=offset or 0, limit=limit, max_bytes=budget)
+            data["size"] = stat.st_size
+            summary = "read ok (truncated)" if data["truncated"] else "read ok"
+            return ToolResult(ok=True, summary=summary, data={"path": str(file_path), **data}, elapsed_ms=elapsed_ms(start))
         except Exception as exc:
             return ToolResult(ok=False, summary="read failed", data={"path": path}, elapsed_ms=elapsed_ms(start), error=str(exc))
 
+    def head(self, path: str, lines: int = _DEFAULT_HEAD_TAIL_LINES) -> ToolResult:
+        """The first ``lines`` lines of a file."""
+
+        return self.read(path, offset=0, limit=lines)
+
+    def tail(self, path: str, lines: int = _DEFAULT_HEAD_TAIL_LINES) -> ToolResult:
+        """The last ``lines`` lines of a file, read backwards from the end."""
+
+        start = time.perf_counter()
+        try:
+            file_path = self._resolve(path)
+            stat = file_path.stat()
+            if _is_binary(file_path):
+                return _binary_result(file_path, stat.st_size, start)
+            data = _read_tail(file_path, lines=max(0, int(lines)), max_bytes=_max_bytes(None))
+            data["size"] = stat.st_size
+            summary = "tail ok (truncated)" if data["truncated"] else "tail ok"
+            return ToolResult(ok=True, summary=summary, data={"path": str(file_path), **data}, elapsed_ms=elapsed_ms(start))
+        except Exception as exc:
+            return ToolResult(ok=False, summary="tail failed", data={"path": path}, elapsed_ms=elapsed_ms(start), error=str(exc))
+
+    def stat(self, path: str) -> ToolResult:
+        """Size, mtime, type, binary flag and line count, without returning content."""
+
+        start = time.perf_counter()
+        try:
+            file_path = self._resolve(path)
+            stat = file_path.stat()
+            data: dict[str, Any] = {
+                "path": str(file_path),
+                "type": "directory" if file_path.is_dir() else "file",
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+            }
+            if file_path.is_file():
+                data["binary"] = _is_binary(file_path)
+                if not data["binary"]:
+                    data["lines"] = _count_lines(file_path)
+            return ToolResult(ok=True, summary="stat ok", data=data, elapsed_ms=elapsed_ms(start))
+        except Exception as exc:
+            return ToolResult(ok=False, summary="stat failed", data={"path": path}, elapsed_ms=elapsed_ms(start), error=str(exc))
+
     def write(self, path: str, content: str) -> ToolResult:
         start = time.perf_counter()
         try:
             file_path = self._resolve(path)
             file_path.parent.mkdir(parents=True, exist_ok=True)
             file_path.write_text(content)
+            if self.read_cache is not None:
+                self.read_cache.invalidate(file_path)
+            if self.index is not None:
+                self.index.update(file_path)
             return ToolResult(ok=True, summary="write ok", data={"path": str(file_path)}, elapsed_ms=elapsed_ms(start))
         except Exception as exc:
             return ToolResult(ok=False, summary="write failed", data={"path": path}, elapsed_ms=elapsed_ms(start), error=str(exc))
+
+    def _read_whole(self, file_path: Path, stat: os.stat_result, start: float) -> ToolResult:
+        data = {"path": str(file_path), "size": stat.st_size, "truncated": False}
+        if self.read_cache is None:
+            content = file_path.read_text()
+            return ToolResult(ok=True, summary="read ok", data={**data, "content": content}, elapsed_ms=elapsed_ms(start))
+        content = self.read_cache.get_file(file_path, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        cache_hit = content is not None
+        if content is None:
+            content = file_path.read_text()
+            self.read_cache.put_file(file_path, content, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        return ToolResult(
+            ok=True,
+            summary="read ok",
+            data={**data, "content": content},
+            elapsed_ms=elapsed_ms(start),
+            cache_hit=cache_hit,
+        )
+
+
+def _max_bytes(requested: int | None) -> int:
+    """The caller's ``max_bytes``, never above the ``TOKIMON_FILE_READ_MAX_BYTES`` hard cap."""
+
+    cap = _read_env_int("TOKIMON_FILE_READ_MAX_BYTES", _DEFAULT_MAX_BYTES)
+    if requested is None or int(requested) <= 0:
+        return cap
+    return min(int(requested), cap)
+
+
+def _is_binary(file_path: Path) -> bool:
+    if not file_path.is_file():
+        return False
+    with file_path.open("rb") as handle:
+        return b"\0" in handle.read(_BINARY_SNIFF_BYTES)
+
+
+def _binary_result(file_path: Path, size: int, start: float) -> ToolResult:
+    return ToolResult(
+        ok=True,
+        summary="binary file",
+        data={"path": str(file_path), "binary": True, "size": size, "content": "", "truncated": False},
+        elapsed_ms=elapsed_ms(start),
+    )
+
+
+def _read_line_range(file_path: Path, *, offset: int, limit: int | None, max_bytes: int) -> dict[str, Any]:
+    offset = max(0, int(offset))
+    limit = None if limit is None else max(0, int(limit))
+    chunks: list[bytes] = []
+    used = 0
+    returned = 0
+    truncated = False
+    eof = True
+    with file_path.open("rb") as handle:
+        for line_index, line in enumerate(handle):
+            if line_index < offset:
+                continue
+            if limit is not None and returned >= limit:
+                eof = False
+                break
+            if used + len(line) > max_bytes:
+                truncated = True
+                eof = False
+                if returned == 0:
+                    # A single line longer than the budget: return its head rather than nothing.
+                    chunks.append(line[:max_bytes])
+                    returned = 1
+                break
+            chunks.append(line)
+            used += len(line)
+            returned += 1
+    return {
+        "content": b"".join(chunks).decode(errors="replace"),
+        "unit": "lines",
+        "offset": offset,
+        "returned": returned,
+        "truncated": truncated,
+        "next_offset": None if eof else offset + returned,
+    }
+
+
+def _read_byte_range(file_path: Path, *, offset: int, limit: int | None, max_bytes: int) -> dict[str, Any]:
+    offset = max(0, int(offset))
+    want = max_bytes if limit is None else min(max(0, int(limit)), max_bytes)
+    with file_path.open("rb") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        handle.seek(offset)
+        raw = handle.read(want)
+    end = offset + len(raw)
+    # Truncated when the byte cap, not the caller's limit, ended the range early.
+    truncated = (limit is None or int(limit) > max_bytes) and end < size
+    return {
+        "content": raw.decode(errors="replace"),
+        "unit": "bytes",
+        "offset": offset,
+        "returned": len(raw),
+        "truncated": truncated,
+        "next_offset": end if end < size else None,
+    }
+
+
+def _read_tail(file_path: Path, *, lines: int, max_bytes: int) -> dict[str, Any]:
+    with file_path.open("rb") as handle:
+        position = handle.seek(0, os.SEEK_END)
+        buffer = b""
+        # One extra newline is needed to find the start of the first requested line.
+        while position > 0 and buffer.count(b"\n") <= lines and len(buffer) <= max_bytes:
+            step = min(_CHUNK_BYTES, position)
+            position -= step
+            handle.seek(position)
+            buffer = handle.read(step) + buffer
+    body = buffer[:-1] if buffer.endswith(b"\n") else buffer
+    kept = body.split(b"\n")[-lines:] if lines and buffer else []
+    content = b"\n".join(kept) + (b"\n" if kept and buffer.endswith(b"\n") else b"")
+    truncated = len(content) > max_bytes
+    if truncated:
+        content = content[-max_bytes:]
+    return {
+        "content": content.decode(errors="replace"),
+        "unit": "lines",
+        "returned": len(kept),
+        "truncated": truncated,
+    }
+
+
+def _count_lines(file_path: Path) -> int:
+    count = 0
+    last = b""
+    with file_path.open("rb") as handle:
+        while chunk := handle.read(_CHUNK_BYTES):
+            count += chunk.count(b"\n")
+            last = chunk
+    return count + (1 if last and not last.endswith(b"\n") else 0)
+
+
+def _read_env_int(var_name: str, default: int) -> int:
+    raw = (os.environ.get(var_name) or "").strip()
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value > 0 else default
@@ -0,0 +1,337 @@
+"""Resident trigram index for GrepTool (opt-in via ``TOKIMON_GREP_INDEX``).
+
+`WorkspaceTextIndex` keeps the text of every searchable workspace file in memory
+together with a trigram posting list (trigram -> file ids). A search extracts
+the literal runs the regex requires, intersects their trigram postings to get
+candidate files, and only runs the regex over those files' lines, so repeated
+searches never rescan or re-read the tree.
+
+The index is built lazily on the first search, applies the same default
+excludes as the repo-wide GrepTool search, and skips binary files (a NUL byte in
+the first 8 KiB). Like rg it also skips hidden files and directories and, when
+the root is inside a git work tree, anything git ignores (the file list comes
+from ``git ls-files -co --exclude-standard``). Text files larger than the per-file cap are not indexed but
+are still streamed through the fallback scanner on every search, so results
+match the fallback scan. Writes
+made through `FileTool.write` / `PatchTool.apply` update the affected files;
+edits made outside the tools are not seen until the index is rebuilt.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import threading
+from pathlib import Path
+
+from .grep_scan import LineMatcher, scan_file
+
+try:
+    import re._parser as _sre_parse  # Python 3.11+
+    from re import _constants as _sre_constants
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_constants as _sre_constants  # type: ignore[no-redef]
+    import sre_parse as _sre_parse  # type: ignore[no-redef]
+
+
+_DEFAULT_MAX_FILE_BYTES = 2 * 1024 * 1024
+_BINARY_SNIFF_BYTES = 8192
+_GIT_TIMEOUT_S = 60
+
+
+class WorkspaceTextIndex:
+    def __init__(
+        self,
+        root: Path,
+        *,
+        excluded_dir_names: frozenset[str] = frozenset(),
+        excluded_suffixes: tuple[str, ...] = (),
+        max_file_bytes: int = _DEFAULT_MAX_FILE_BYTES,
+    ) -> None:
+        self.root = root
+        self._resolved_root = root.resolve()
+        self.excluded_dir_names = excluded_dir_names
+        self.excluded_suffixes = excluded_suffixes
+        self.max_file_bytes = max_file_bytes
+        self._lock = threading.Lock()
+        self._built = False
+        self._texts: dict[str, str] = {}
+        self._trigrams: dict[str, frozenset[str]] = {}
+        self._postings: dict[str, set[str]] = {}
+        self._oversized: set[str] = set()
+        self._excluded: set[str] = set()
+        # Hidden or gitignored directories pruned from the walk.
+        self._ignored_dirs: set[str] = set()
+        # Files git lists under the root, or None when the root is not in a git work tree.
+        self._git_files: set[str] | None = None
+        self._git_dirs: set[str] = set()
+
+    def covers(self, path: str | None) -> bool:
+        """Whether a search rooted at ``path`` can be answered from the index.
+
+        Path-scoped searches do not apply the default excludes, so they are only
+        served when nothing excluded from the index lives under ``path``.
+        """
+
+        if path is None:
+            return True
+        target = (self.root / path).resolve()
+        try:
+            rel = target.relative_to(self._resolved_root)
+        except ValueError:
+            return False
+        if not target.is_dir() or self._is_excluded(rel) or _is_hidden(rel):
+            return False
+        self.build()
+        prefix = _prefix(rel)
+        with self._lock:
+            if any(prefix.startswith(f"{name}/") for name in self._ignored_dirs):
+                return False
+            return not any(name.startswith(prefix) for name in self._excluded)
+
+    def search(
+        self,
+        matcher: LineMatcher,
+        *,
+        path: str | None = None,
+        max_bytes: int = 0,
+        max_scan_bytes: int = 0,
+    ) -> tuple[str, bool]:
+        """Return ``(output, truncated)`` in the fallback grep's ``path:line:text`` format.
+
+        Oversized files are scanned with the fallback's streaming scanner, capped at ``max_scan_bytes``.
+        """
+
+        self.build()
+        regex = matcher.text
+        prefix = "" if path is None else _prefix((self.root / path).resolve().relative_to(self._resolved_root))
+        with self._lock:
+            candidates = self._candidates(regex)
+            texts = {name: self._texts[name] for name in candidates if name.startswith(prefix)}
+            names = sorted({*texts, *(name for name in self._oversized if name.startswith(prefix))})
+
+        matches: list[str] = []
+        remaining = max_bytes
+        for name in names:
+            if name in texts:
+                entries = (
+                    f"{self.root / name}:{line_no}:{line}"
+                    for line_no, line in enumerate(_lines(texts[name]), start=1)
+                    if regex.search(line)
+                )
+            else:
+                budget = max(1, remaining) if max_bytes > 0 else 0
+                entries = iter(scan_file(self.root / name, matcher, max_file_bytes=max_scan_bytes, max_bytes=budget).entries)
+            for entry in entries:
+                if max_bytes > 0:
+                    cost = len((entry + "\n").encode())
+                    if cost > remaining:
+                        return "\n".join(matches), True
+                    remaining -= cost
+                matches.append(entry)
+        return "\n".join(matches), False
+
+    def update(self, path: Path) -> None:
+        """Re-index one file after it was written, created, or deleted."""
+
+        with self._lock:
+            if not self._built:
+                return
+            try:
+                rel = path.resolve().relative_to(self._resolved_root)
+            except ValueError:
+                return
+            self._remove(rel.as_posix())
+            if self._is_excluded(rel):
+                self._excluded.add(rel.as_posix())
+            elif path.is_file() and not self._is_ignored_file(rel, check_git=True):
+                self._add(path.resolve(), rel.as_posix())
+                for parent in rel.parents:
+                    self._ignored_dirs.discard(parent.as_posix())
+
+    def reset(self) -> None:
+        """Drop the index; the next search rebuilds it from disk."""
+
+        with self._lock:
+            self._built = False
+            self._texts.clear()
+            self._trigrams.clear()
+            self._postings.clear()
+            self._oversized.clear()
+            self._excluded.clear()
+            self._ignored_dirs.clear()
+            self._git_files = None
+            self._git_dirs.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "files": len(self._texts),
+                "oversized_files": len(self._oversized),
+                "trigrams": len(self._postings),
+                "bytes": sum(len(text) for text in self._texts.values()),
+            }
+
+    def build(self) -> None:
+        """Walk the workspace and index it; a no-op once built."""
+
+        with self._lock:
+            if self._built:
+                return
+            self._git_files = _git_listed_files(self._resolved_root)
+            if self._git_files is not None:
+                self._git_dirs = {parent.as_posix() for name in self._git_files for parent in Path(name).parents}
+            for dirpath, dirnames, filenames in os.walk(self._resolved_root):
+                base = Path(dirpath)
+                rel_dir = base.relative_to(self._resolved_root)
+                for dir_name in list(dirnames):
+                    rel = rel_dir / dir_name
+                    if dir_name in self.excluded_dir_names:
+                        dirnames.remove(dir_name)
+                        self._excluded.add(rel.as_posix())
+                    elif dir_name.startswith(".") or (self._git_files is not None and rel.as_posix() not in self._git_dirs):
+                        dirnames.remove(dir_name)
+                        self._ignored_dirs.add(rel.as_posix())
+                for file_name in filenames:
+                    rel = rel_dir / file_name
+                    if self._is_excluded(rel):
+                        self._excluded.add(rel.as_posix())
+                    elif not self._is_ignored_file(rel) and (base / file_name).is_file():
+                        self._add(base / file_name, rel.as_posix())
+            self._built = True
+
+    def _is_excluded(self, rel: Path) -> bool:
+        if rel.suffix in self.excluded_suffixes:
+            return True
+        return any(part in self.excluded_dir_names for part in rel.parts)
+
+    def _is_ignored_file(self, rel: Path, *, check_git: bool = False) -> bool:
+        """Hidden, or not among the files git lists; ``check_git`` asks git about files created since the build."""
+
+        if _is_hidden(rel):
+            return True
+        if self._git_files is None or rel.as_posix() in self._git_files:
+            return False
+        if not check_git or _git_ignores(self._resolved_root, rel):
+            return True
+        self._git_files.add(rel.as_posix())
+        return False
+
+    def _add(self, file_path: Path, name: str) -> None:
+        try:
+            size = file_path.stat().st_size
+            with file_path.open("rb") as handle:
+                head = handle.read(_BINARY_SNIFF_BYTES)
+                if b"\0" in head:
+                    return
+                if size > self.max_file_bytes:
+                    self._oversized.add(name)
+                    return
+                data = head + handle.read()
+        except OSError:
+            return
+        text = data.decode(errors="ignore")
+        trigrams = frozenset(text[index : index + 3] for index in range(len(text) - 2))
+        self._texts[name] = text
+        self._trigrams[name] = trigrams
+        for trigram in trigrams:
+            self._postings.setdefault(trigram, set()).add(name)
+
+    def _remove(self, name: str) -> None:
+        self._oversized.discard(name)
+        self._texts.pop(name, None)
+        for trigram in self._trigrams.pop(name, frozenset()):
+            posting = self._postings.get(trigram)
+            if posting is not None:
+                posting.discard(name)
+                if not posting:
+                    del self._postings[trigram]
+
+    def _candidates(self, regex: re.Pattern[str]) -> set[str]:
+        required = _required_trigrams(regex)
+        if not required:
+            return set(self._texts)
+        postings = sorted((self._postings.get(trigram, set()) for trigram in required), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+
+def _lines(text: str) -> list[str]:
+    """Split on ``\\n`` only, dropping a trailing ``\\r``, as rg and `grep_scan` count lines."""
+
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return [line[:-1] if line.endswith("\r") else line for line in lines]
+
+
+def _is_hidden(rel: Path) -> bool:
+    return any(part.startswith(".") for part in rel.parts)
+
+
+def _git_listed_files(root: Path) -> set[str] | None:
+    """Tracked plus untracked-but-not-ignored files under ``root``, or None outside a git work tree."""
+
+    try:
+        completed = subprocess.run(
+            ["git", "ls-files", "-co", "--exclude-standard", "-z"],
+            cwd=root,
+            capture_output=True,
+            check=False,
+            timeout=_GIT_TIMEOUT_S,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if completed.returncode != 0:
+        return None
+    return {os.fsdecode(name) for name in completed.stdout.split(b"\0") if name}
+
+
+def _git_ignores(root: Path, rel: Path) -> bool:
+    try:
+        completed = subprocess.run(
+            ["git", "check-ignore", "-q", "--", rel.as_posix()],
+            cwd=root,
+            capture_output=True,
+            check=False,
+            timeout=_GIT_TIMEOUT_S,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return completed.returncode == 0
+
+
+def _prefix(rel: Path) -> str:
+    posix = rel.as_posix()
+    return "" if posix == "." else f"{posix}/"
+
+
+def _required_trigrams(regex: re.Pattern[str]) -> set[str]:
+    """Trigrams every match must contain, from the pattern's top-level literal runs.
+
+    Anything the planner does not understand (case-insensitive matching,
+    alternation, escapes it cannot decode) yields no trigrams, which means
+    "scan every indexed file" rather than a wrong answer.
+    """
+
+    if regex.flags & re.IGNORECASE:
+        return set()
+    try:
+        parsed = _sre_parse.parse(regex.pattern, regex.flags)
+    except Exception:
+        return set()
+    runs: list[str] = []
+    current: list[str] = []
+    for op, value in parsed:
+        if op is _sre_constants.LITERAL:
+            current.append(chr(value))
+            continue
+        runs.append("".join(current))
+        current = []
+    runs.append("".join(current))
+    return {run[index : index + 3] for run in runs for index in range(len(run) - 2)}
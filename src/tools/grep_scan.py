@@ -0,0 +1,295 @@
+"""Streaming, memory-bounded file scanner behind GrepTool's no-ripgrep fallback.
+
+Files are never decoded whole. Each file is sniffed for a NUL byte (binary
+files are skipped), skipped when larger than the per-file cap, and otherwise
+searched as bytes: small files are read once, larger ones are mmapped, and a
+compiled bytes regex jumps from match to match so only matching lines are
+decoded. Patterns whose meaning differs between ``str`` and UTF-8 bytes (``.``,
+``\\w``/``\\d``/``\\s``, negated classes, ``$``, case-insensitivity, non-ASCII)
+are instead matched line by line on a streamed text file handle, which keeps
+Python ``re`` semantics exactly.
+
+`scan_files` spreads files across a thread pool but emits matches in input
+order, keeps only a bounded window of files in flight, and stops as soon as the
+output byte budget is spent.
+"""
+
+from __future__ import annotations
+
+import mmap
+import re
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+try:
+    import re._parser as _sre_parse  # Python 3.11+
+    from re import _constants as _sre_constants
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_constants as _sre_constants  # type: ignore[no-redef]
+    import sre_parse as _sre_parse  # type: ignore[no-redef]
+
+
+_BINARY_SNIFF_BYTES = 8192
+_MMAP_MIN_BYTES = 1024 * 1024
+_COUNT_CHUNK_BYTES = 1024 * 1024
+_FILES_IN_FLIGHT_PER_WORKER = 4
+
+_BYTES_UNSAFE_AT = frozenset(
+    {
+        _sre_constants.AT_BEGINNING_STRING,
+        _sre_constants.AT_END_STRING,
+        _sre_constants.AT_END,
+        _sre_constants.AT_BOUNDARY,
+        _sre_constants.AT_NON_BOUNDARY,
+    }
+)
+
+
+class LineMatcher:
+    """A pattern compiled for line-oriented search; raises ``re.error`` like ``re.compile``."""
+
+    def __init__(self, pattern: str) -> None:
+        self.pattern = pattern
+        self.text = re.compile(pattern)
+        self.bytes: re.Pattern[bytes] | None = None
+        if _bytes_equivalent(self.text):
+            try:
+                self.bytes = re.compile(pattern.encode("ascii"), re.MULTILINE)
+            except re.error:
+                self.bytes = None
+
+
+@dataclass
+class FileScan:
+    entries: list[str] = field(default_factory=list)
+    skipped: str | None = None
+
+
+@dataclass
+class ScanResult:
+    entries: list[str]
+    truncated: bool
+    files_scanned: int = 0
+    skipped_binary: int = 0
+    skipped_oversized: int = 0
+
+
+def scan_file(
+    file_path: Path,
+    matcher: LineMatcher,
+    *,
+    max_file_bytes: int,
+    max_bytes: int,
+    stop: threading.Event | None = None,
+) -> FileScan:
+    """Collect ``path:line:text`` entries for one file, up to roughly ``max_bytes`` of output."""
+
+    result = FileScan()
+    try:
+        with file_path.open("rb") as handle:
+            size = handle.seek(0, 2)
+            if max_file_bytes > 0 and size > max_file_bytes:
+                result.skipped = "oversized"
+                return result
+            handle.seek(0)
+            if b"\0" in handle.read(_BINARY_SNIFF_BYTES):
+                result.skipped = "binary"
+                return result
+            if size == 0:
+                return result
+            if matcher.bytes is None:
+                _scan_text(file_path, matcher.text, result.entries, max_bytes=max_bytes, stop=stop)
+            elif size < _MMAP_MIN_BYTES:
+                handle.seek(0)
+                _scan_buffer(file_path, matcher.bytes, handle.read(), result.entries, max_bytes=max_bytes, stop=stop)
+            else:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    _scan_buffer(file_path, matcher.bytes, mapped, result.entries, max_bytes=max_bytes, stop=stop)
+    except OSError:
+        pass
+    return result
+
+
+def scan_files(
+    paths: Iterable[Path],
+    matcher: LineMatcher,
+    *,
+    max_file_bytes: int,
+    max_bytes: int,
+    workers: int,
+) -> ScanResult:
+    """Scan ``paths`` in order with up to ``workers`` threads, stopping at the byte budget."""
+
+    result = ScanResult(entries=[], truncated=False)
+    remaining = max_bytes
+    stop = threading.Event()
+
+    def consume(scan: FileScan) -> bool:
+        nonlocal remaining
+        if scan.skipped == "binary":
+            result.skipped_binary += 1
+            return True
+        if scan.skipped == "oversized":
+            result.skipped_oversized += 1
+            return True
+        result.files_scanned += 1
+        for entry in scan.entries:
+            if max_bytes > 0:
+                cost = len((entry + "\n").encode())
+                if cost > remaining:
+                    result.truncated = True
+                    return False
+                remaining -= cost
+            result.entries.append(entry)
+        return True
+
+    def scan(path: Path) -> FileScan:
+        budget = max(1, remaining) if max_bytes > 0 else 0
+        return scan_file(path, matcher, max_file_bytes=max_file_bytes, max_bytes=budget, stop=stop)
+
+    path_iter = iter(paths)
+    if workers <= 1:
+        for path in path_iter:
+            if not consume(scan(path)):
+                break
+        return result
+
+    window = max(1, workers) * _FILES_IN_FLIGHT_PER_WORKER
+    pending: deque[Future[FileScan]] = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tokimon-grep") as pool:
+        try:
+            while True:
+                while len(pending) < window:
+                    path = next(path_iter, None)
+                    if path is None:
+                        break
+                    pending.append(pool.submit(scan, path))
+                if not pending:
+                    break
+                if not consume(pending.popleft().result()):
+                    break
+        finally:
+            stop.set()
+            for future in pending:
+                future.cancel()
+    return result
+
+
+def _scan_buffer(
+    file_path: Path,
+    regex: re.Pattern[bytes],
+    buffer: bytes | mmap.mmap,
+    entries: list[str],
+    *,
+    max_bytes: int,
+    stop: threading.Event | None,
+) -> None:
+    size = len(buffer)
+    pos = 0
+    line_no = 1
+    counted_to = 0
+    collected = 0
+    while pos <= size:
+        if stop is not None and stop.is_set():
+            return
+        match = regex.search(buffer, pos)
+        if match is None:
+            return
+        line_start = buffer.rfind(b"\n", 0, match.start()) + 1
+        line_end = buffer.find(b"\n", match.start())
+        if line_end < 0:
+            line_end = size
+        if match.start() == size and line_start == size:
+            # An empty match after the final newline is not a line.
+            return
+        line = bytes(buffer[line_start:line_end])
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        pos = line_end + 1
+        if match.end() > line_end and not regex.search(line):
+            # The match crossed a newline; the line on its own does not match.
+            continue
+        line_no += _count_newlines(buffer, counted_to, line_start)
+        counted_to = line_start
+        entry = f"{file_path}:{line_no}:{line.decode(errors='ignore')}"
+        entries.append(entry)
+        collected += len(entry) + 1
+        if max_bytes > 0 and collected > max_bytes:
+            return
+
+
+def _scan_text(
+    file_path: Path,
+    regex: re.Pattern[str],
+    entries: list[str],
+    *,
+    max_bytes: int,
+    stop: threading.Event | None,
+) -> None:
+    collected = 0
+    with file_path.open("r", errors="ignore", newline=None) as handle:
+        for line_no, raw_line in enumerate(handle, start=1):
+            if stop is not None and stop.is_set():
+                return
+            line = raw_line.rstrip("\n")
+            if not regex.search(line):
+                continue
+            entry = f"{file_path}:{line_no}:{line}"
+            entries.append(entry)
+            collected += len(entry) + 1
+            if max_bytes > 0 and collected > max_bytes:
+                return
+
+
+def _count_newlines(buffer: bytes | mmap.mmap, start: int, end: int) -> int:
+    count = 0
+    for chunk_start in range(start, end, _COUNT_CHUNK_BYTES):
+        count += buffer[chunk_start : min(end, chunk_start + _COUNT_CHUNK_BYTES)].count(b"\n")
+    return count
+
+
+def _bytes_equivalent(regex: re.Pattern[str]) -> bool:
+    """Whether ``regex`` matches a UTF-8 encoded line exactly when it matches the decoded line."""
+
+    if regex.flags & re.IGNORECASE or not regex.pattern.isascii():
+        return False
+    try:
+        parsed = _sre_parse.parse(regex.pattern, regex.flags)
+    except Exception:
+        return False
+    return _ascii_only(parsed)
+
+
+def _ascii_only(items: Iterable[tuple[object, object]]) -> bool:
+    for op, value in items:
+        if op in (_sre_constants.ANY, _sre_constants.NOT_LITERAL, _sre_constants.CATEGORY):
+            return False
+        if op is _sre_constants.LITERAL and isinstance(value, int) and value > 127:
+            return False
+        if op is _sre_constants.AT and value in _BYTES_UNSAFE_AT:
+            return False
+        if op is _sre_constants.IN:
+            for item_op, item_value in value:  # type: ignore[union-attr]
+                if item_op in (_sre_constants.NEGATE, _sre_constants.CATEGORY):
+                    return False
+                if item_op is _sre_constants.LITERAL and item_value > 127:
+                    return False
+                if item_op is _sre_constants.RANGE and item_value[1] > 127:
+                    return False
+            continue
+        for child in _subpatterns(value):
+            if not _ascii_only(child):
+                return False
+    return True
+
+
+def _subpatterns(value: object) -> Iterable[_sre_parse.SubPattern]:
+    if isinstance(value, _sre_parse.SubPattern):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _subpatterns(item)
@@ -8,8 +8,12 @@ import shutil
 import subprocess
 import time
 from pathlib import Path
+from typing import Iterator
 
 from .base import ToolResult, elapsed_ms
+from .grep_index import WorkspaceTextIndex
+from .grep_scan import LineMatcher, scan_files
+from .read_cache import WorkspaceReadCache
 
 
 _DEFAULT_EXCLUDED_DIR_NAMES: tuple[str, ...] = (
@@ -32,20 +36,51 @@ _DEFAULT_EXCLUDED_DIR_PARTS: frozenset[str] = frozenset(_DEFAULT_EXCLUDED_DIR_NA
 
 _DEFAULT_MAX_BYTES = 200_000
 
+_DEFAULT_MAX_FILE_BYTES = 8 * 1024 * 1024
+
+_DEFAULT_THREADS = min(8, os.cpu_count() or 1)
+
 
 class GrepTool:
     name = "grep"
 
-    def __init__(self, root: Path) -> None:
+    def __init__(
+        self,
+        root: Path,
+        *,
+        read_cache: WorkspaceReadCache | None = None,
+        index: WorkspaceTextIndex | None = None,
+    ) -> None:
         self.root = root
+        self.read_cache = read_cache
+        self.index = index
 
     def search(self, pattern: str, path: str | None = None) -> ToolResult:
         start = time.perf_counter()
         max_bytes = _read_env_int("TOKIMON_GREP_MAX_BYTES", _DEFAULT_MAX_BYTES)
+        if self.read_cache is None:
+            return self._search(pattern, path, max_bytes=max_bytes, start=start)
+        key = self.read_cache.grep_key(pattern, path, max_bytes)
+        cached = self.read_cache.get_grep(key)
+        if cached is not None:
+            summary = str(cached.pop("_summary", "grep search"))
+            return ToolResult(ok=True, summary=summary, data=cached, elapsed_ms=elapsed_ms(start), cache_hit=True)
+        result = self._search(pattern, path, max_bytes=max_bytes, start=start)
+        if result.ok:
+            self.read_cache.put_grep(key, {**result.data, "_summary": result.summary})
+        result.cache_hit = False
+        return result
+
+    def _search(self, pattern: str, path: str | None, *, max_bytes: int, start: float) -> ToolResult:
         apply_default_excludes = path is None
         target = self.root if path is None else (self.root / path)
+        if self.index is not None:
+            indexed = self._search_index(pattern, path, max_bytes=max_bytes, start=start)
+            if indexed is not None:
+                return indexed
         if shutil.which("rg"):
-            cmd = ["rg"]
+            # Same ``path:line:text`` lines as the index and the fallback scan, piped or not.
+            cmd = ["rg", "--line-number", "--with-filename"]
             if apply_default_excludes:
                 cmd.extend(_DEFAULT_EXCLUDE_GLOBS)
             cmd.extend(["--", pattern, str(target)])
@@ -60,50 +95,89 @@ class GrepTool:
                 error=None if ok else "rg error",
             )
         try:
-            matches: list[str] = []
-            truncated = False
-            budget = max_bytes
-            remaining = budget
-            regex = re.compile(pattern)
-            for file_path in target.rglob("*"):
-                if truncated:
-                    break
-                if not file_path.is_file():
-                    continue
-
-                if apply_default_excludes:
-                    if file_path.suffix in _DEFAULT_EXCLUDED_SUFFIXES:
-                        continue
-                    rel_parts = file_path.relative_to(target).parts
-                    if any(part in _DEFAULT_EXCLUDED_DIR_PARTS for part in rel_parts):
-                        continue
-
-                content = file_path.read_text(errors="ignore")
-                for line_no, line in enumerate(content.splitlines(), start=1):
-                    if not regex.search(line):
-                        continue
-
-                    entry = f"{file_path}:{line_no}:{line}"
-                    if budget > 0:
-                        cost = len((entry + "\n").encode())
-                        if cost > remaining:
-                            truncated = True
-                            break
-                        remaining -= cost
-                    matches.append(entry)
-            output = "\n".join(matches)
-            if budget > 0 and len(output.encode()) > budget:
-                output = output.encode()[:budget].decode(errors="replace")
-                truncated = True
+            scan = scan_files(
+                _iter_files(target, apply_default_excludes=apply_default_excludes),
+                LineMatcher(pattern),
+                max_file_bytes=_read_env_int("TOKIMON_GREP_MAX_FILE_BYTES", _DEFAULT_MAX_FILE_BYTES),
+                max_bytes=max_bytes,
+                workers=_read_env_int("TOKIMON_GREP_THREADS", _DEFAULT_THREADS),
+            )
+            truncated = scan.truncated
             return ToolResult(
                 ok=True,
                 summary="fallback grep (truncated)" if truncated else "fallback grep",
-                data={"output": output, "truncated": truncated},
+                data={
+                    "output": "\n".join(scan.entries),
+                    "truncated": truncated,
+                    "skipped_binary": scan.skipped_binary,
+                    "skipped_oversized": scan.skipped_oversized,
+                },
                 elapsed_ms=elapsed_ms(start),
             )
         except Exception as exc:
             return ToolResult(ok=False, summary="grep error", data={}, elapsed_ms=elapsed_ms(start), error=str(exc))
 
+    def _search_index(self, pattern: str, path: str | None, *, max_bytes: int, start: float) -> ToolResult | None:
+        """Answer from the resident index, or return None to use rg / the fallback scan."""
+
+        assert self.index is not None
+        try:
+            matcher = LineMatcher(pattern)
+        except re.error:
+            # rg's regex dialect may still accept the pattern.
+            return None
+        if not self.index.covers(path):
+            return None
+        output, truncated = self.index.search(
+            matcher,
+            path=path,
+            max_bytes=max_bytes,
+            max_scan_bytes=_read_env_int("TOKIMON_GREP_MAX_FILE_BYTES", _DEFAULT_MAX_FILE_BYTES),
+        )
+        return ToolResult(
+            ok=True,
+            summary="indexed grep (truncated)" if truncated else "indexed grep",
+            data={"output": output, "truncated": truncated},
+            elapsed_ms=elapsed_ms(start),
+        )
+
+
+def workspace_index_from_env(root: Path) -> WorkspaceTextIndex | None:
+    """Return a resident grep index for ``root`` when ``TOKIMON_GREP_INDEX`` is enabled."""
+
+    if os.environ.get("TOKIMON_GREP_INDEX", "").strip().lower() not in {"1", "true", "yes", "on"}:
+        return None
+    return default_workspace_index(root)
+
+
+def default_workspace_index(root: Path) -> WorkspaceTextIndex:
+    """A resident grep index using the default excludes of repo-wide searches (plus ``.git``, as rg does)."""
+
+    return WorkspaceTextIndex(
+        root,
+        excluded_dir_names=_DEFAULT_EXCLUDED_DIR_PARTS | {".git"},
+        excluded_suffixes=_DEFAULT_EXCLUDED_SUFFIXES,
+    )
+
+
+def _iter_files(target: Path, *, apply_default_excludes: bool) -> Iterator[Path]:
+    """Files under ``target`` in sorted walk order, pruning default-excluded directories."""
+
+    if target.is_file():
+        yield target
+        return
+    for dirpath, dirnames, filenames in os.walk(target):
+        dirnames.sort()
+        if apply_default_excludes:
+            dirnames[:] = [name for name in dirnames if name not in _DEFAULT_EXCLUDED_DIR_PARTS]
+        base = Path(dirpath)
+        for file_name in sorted(filenames):
+            if apply_default_excludes and Path(file_name).suffix in _DEFAULT_EXCLUDED_SUFFIXES:
+                continue
+            file_path = base / file_name
+            if file_path.is_file():
+                yield file_path
+
 
 def _read_env_int(var_name: str, default: int) -> int:
     raw = os.environ.get(var_name)
@@ -1,18 +1,45 @@
-"""PatchTool applies unified diffs with validation."""
+"""PatchTool applies unified diffs with validation.
+
+Both ``git apply`` calls run under `tools.process_limits` with a wall-clock
+timeout (``TOKIMON_PATCH_TIMEOUT_S``, default 60) and a capture cap
+(``TOKIMON_PATCH_MAX_OUTPUT_BYTES``, default 1 MiB); a run stopped by a limit
+fails with ``failure_signature`` ``patch-timeout`` (or ``patch-cpu-limit`` /
+``patch-memory-limit``).
+"""
 
 from __future__ import annotations
 
 import re
 import shutil
-import subprocess
 import time
 from pathlib import Path
 
+from . import process_limits
 from .base import ToolResult, elapsed_ms
+from .grep_index import WorkspaceTextIndex
+from .process_limits import LimitedResult, ProcessLimits
+from .read_cache import WorkspaceReadCache
+
+
+_DEFAULT_TIMEOUT_S = 60.0
+_DEFAULT_MAX_OUTPUT_BYTES = 1024 * 1024
 
 
 _HUNK_HEADER_RE = re.compile(r"^@@ -(?P<old_start>\d+)(?:,(?P<old_count>\d+))? \+(?P<new_start>\d+)(?:,(?P<new_count>\d+))? @@(?P<suffix>.*)$")
 
+_FILE_HEADER_RE = re.compile(r"^(?:---|\+\+\+) (?:[ab]/)?(?P<path>[^\t]+?)(?:\t.*)?$")
+
+
+def _patched_paths(patch_text: str) -> set[str]:
+    """Workspace-relative paths named by the ``---`` / ``+++`` headers of a unified diff."""
+
+    paths: set[str] = set()
+    for line in patch_text.splitlines():
+        match = _FILE_HEADER_RE.match(line)
+        if match and match.group("path") != "/dev/null":
+            paths.add(match.group("path"))
+    return paths
+
 
 def _coerce_hunk_count(raw: str | None) -> int:
     if raw is None:
@@ -85,8 +112,20 @@ def _normalize_unified_diff_hunk_headers(patch_text: str) -> tuple[str, bool]:
 class PatchTool:
     name = "patch"
 
-    def __init__(self, root: Path) -> None:
+    def __init__(
+        self,
+        root: Path,
+        *,
+        read_cache: WorkspaceReadCache | None = None,
+        index: WorkspaceTextIndex | None = None,
+        limits: ProcessLimits | None = None,
+    ) -> None:
         self.root = root
+        self.read_cache = read_cache
+        self.index = index
+        self.limits = limits or ProcessLimits.from_env(
+            "PATCH", timeout_s=_DEFAULT_TIMEOUT_S, max_output_bytes=_DEFAULT_MAX_OUTPUT_BYTES
+        )
 
     def apply(self, patch_text: str) -> ToolResult:
         start = time.perf_counter()
@@ -94,33 +133,32 @@ class PatchTool:
             return ToolResult(ok=False, summary="git not available", data={}, elapsed_ms=elapsed_ms(start), error="git is required")
         normalized_patch, normalized = _normalize_unified_diff_hunk_headers(patch_text)
         try:
-            check = subprocess.run(
-                ["git", "apply", "--check", "-"],
-                input=normalized_patch.encode(),
-                cwd=self.root,
-                capture_output=True,
-                check=False,
-            )
+            check = self._git_apply(["--check"], normalized_patch)
+            failure_signature = check.failure_signature("patch", self.limits)
+            if failure_signature:
+                return self._limit_failure("git apply --check", check, failure_signature, start)
             if check.returncode != 0:
                 return ToolResult(
                     ok=False,
                     summary="patch validation failed",
-                    data={"stdout": check.stdout.decode(), "stderr": check.stderr.decode()},
+                    data={"stdout": check.stdout, "stderr": check.stderr},
                     elapsed_ms=elapsed_ms(start),
                     error="patch check failed",
                 )
-            apply = subprocess.run(
-                ["git", "apply", "-"],
-                input=normalized_patch.encode(),
-                cwd=self.root,
-                capture_output=True,
-                check=False,
-            )
+            apply = self._git_apply([], normalized_patch)
+            if self.read_cache is not None:
+                # Even a failed apply may have touched files; drop every cached read.
+                self.read_cache.invalidate()
+            if self.index is not None:
+                self._update_index(normalized_patch)
+            failure_signature = apply.failure_signature("patch", self.limits)
+            if failure_signature:
+                return self._limit_failure("git apply", apply, failure_signature, start)
             if apply.returncode != 0:
                 return ToolResult(
                     ok=False,
                     summary="patch apply failed",
-                    data={"stdout": apply.stdout.decode(), "stderr": apply.stderr.decode()},
+                    data={"stdout": apply.stdout, "stderr": apply.stderr},
                     elapsed_ms=elapsed_ms(start),
                     error="patch apply failed",
                 )
@@ -130,3 +168,34 @@ class PatchTool:
             return ToolResult(ok=True, summary="patch applied", data=data, elapsed_ms=elapsed_ms(start))
         except Exception as exc:
             return ToolResult(ok=False, summary="patch error", data={}, elapsed_ms=elapsed_ms(start), error=str(exc))
+
+    def _git_apply(self, options: list[str], patch_text: str) -> LimitedResult:
+        return process_limits.run_limited(
+            ["git", "apply", *options, "-"],
+            cwd=self.root,
+            input=patch_text.encode(),
+            limits=self.limits,
+        )
+
+    def _limit_failure(self, command: str, result: LimitedResult, failure_signature: str, start: float) -> ToolResult:
+        if result.timed_out:
+            error = f"{command} timed out after {self.limits.timeout_s:g}s"
+        else:
+            error = f"{command} exceeded a resource limit"
+        return ToolResult(
+            ok=False,
+            summary="patch stopped by a resource limit",
+            data={"stdout": result.stdout, "stderr": result.stderr, "timed_out": result.timed_out},
+            elapsed_ms=elapsed_ms(start),
+            error=error,
+            failure_signature=failure_signature,
+        )
+
+    def _update_index(self, patch_text: str) -> None:
+        assert self.index is not None
+        paths = _patched_paths(patch_text)
+        if not paths:
+            self.index.reset()
+            return
+        for rel in paths:
+            self.index.update(self.root / rel)
@@ -0,0 +1,241 @@
+"""Wall-clock, CPU, memory and output limits for tool subprocesses.
+
+`run_limited` starts a command in its own process group, applies
+``RLIMIT_CPU`` / ``RLIMIT_AS`` through a small interpreter that sets them and
+then execs the command (callers are multi-threaded, so no ``preexec_fn``
+Python runs between fork and exec), keeps only the
+last ``max_output_bytes`` of each of stdout and stderr, and kills the whole
+group when ``timeout_s`` expires, so a hung test or a forked helper cannot
+hold the caller (or its pipes) open. `LimitedResult.failure_signature` names
+which limit ended the run (``<tool>-timeout``, ``<tool>-cpu-limit``,
+``<tool>-memory-limit``) so the retry gate can tell it apart from an ordinary
+failure.
+
+`ProcessLimits.from_env` reads ``TOKIMON_<PREFIX>_TIMEOUT_S``, ``_CPU_S``,
+``_MEMORY_MB`` and ``_MAX_OUTPUT_BYTES``; ``0`` disables a limit.
+"""
+
+from __future__ import annotations
+
+import errno
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+
+_READ_CHUNK_BYTES = 64 * 1024
+# How long to wait for pipes to drain after the main process has exited.
+_DRAIN_TIMEOUT_S = 5.0
+# argv: cpu seconds, address-space bytes (0 = unlimited), then the command to exec.
+_RLIMIT_EXEC = (
+    "import os, resource, sys\n"
+    "cpu, memory = int(sys.argv[1]), int(sys.argv[2])\n"
+    "if cpu:\n"
+    "    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))\n"
+    "if memory:\n"
+    "    resource.setrlimit(resource.RLIMIT_AS, (memory, memory))\n"
+    "os.execvp(sys.argv[3], sys.argv[3:])\n"
+)
+# SIGXCPU at the soft CPU limit. The hard limit's SIGKILL is not counted: it is
+# indistinguishable from the OOM killer or an operator's kill -9.
+_CPU_LIMIT_RETURNCODES = frozenset({-int(signal.SIGXCPU)}) if hasattr(signal, "SIGXCPU") else frozenset()
+
+
+@dataclass(frozen=True)
+class ProcessLimits:
+    timeout_s: float | None = None
+    cpu_s: int | None = None
+    memory_bytes: int | None = None
+    max_output_bytes: int | None = None
+
+    @classmethod
+    def from_env(
+        cls,
+        prefix: str,
+        *,
+        timeout_s: float | None = None,
+        max_output_bytes: int | None = None,
+    ) -> ProcessLimits:
+        memory_mb = _read_env_number(f"TOKIMON_{prefix}_MEMORY_MB", None)
+        cpu_s = _read_env_number(f"TOKIMON_{prefix}_CPU_S", None)
+        output_cap = _read_env_number(f"TOKIMON_{prefix}_MAX_OUTPUT_BYTES", max_output_bytes)
+        return cls(
+            timeout_s=_read_env_number(f"TOKIMON_{prefix}_TIMEOUT_S", timeout_s),
+            cpu_s=int(cpu_s) if cpu_s else None,
+            memory_bytes=int(memory_mb * 1024 * 1024) if memory_mb else None,
+            max_output_bytes=int(output_cap) if output_cap else None,
+        )
+
+    @property
+    def has_rlimits(self) -> bool:
+        return resource is not None and bool(self.cpu_s or self.memory_bytes)
+
+    def rlimited_command(self, cmd: list[str]) -> list[str]:
+        """``cmd`` behind an interpreter that sets the CPU/address-space rlimits and then execs it.
+
+        The soft CPU limit delivers SIGXCPU; the hard limit one second later is a SIGKILL backstop.
+        """
+
+        return [sys.executable, "-c", _RLIMIT_EXEC, str(self.cpu_s or 0), str(self.memory_bytes or 0), *cmd]
+
+
+@dataclass
+class LimitedResult:
+    returncode: int
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+    output_truncated: bool = False
+
+    def failure_signature(
+        self,
+        tool: str,
+        limits: ProcessLimits,
+        *,
+        crash_returncodes: frozenset[int] = frozenset(),
+        memory_error: bool = False,
+    ) -> str | None:
+        """``<tool>-timeout`` / ``-cpu-limit`` / ``-memory-limit`` when a limit ended the run, else None.
+
+        A ``MemoryError`` in the output only counts when the process itself died of it:
+        killed by a signal, exited with one of the tool's ``crash_returncodes``, or ended
+        on an uncaught ``MemoryError``. ``memory_error`` lets the caller report one it
+        found in structured results instead.
+        """
+
+        if self.timed_out:
+            return f"{tool}-timeout"
+        if limits.cpu_s and self.returncode in _CPU_LIMIT_RETURNCODES:
+            return f"{tool}-cpu-limit"
+        if limits.memory_bytes and (memory_error or self._died_of_memory_error(crash_returncodes)):
+            return f"{tool}-memory-limit"
+        return None
+
+    def _died_of_memory_error(self, crash_returncodes: frozenset[int]) -> bool:
+        if self.returncode < 0 or self.returncode in crash_returncodes:
+            return "MemoryError" in self.stderr + self.stdout
+        lines = self.stderr.rstrip().splitlines()
+        return self.returncode != 0 and bool(lines) and lines[-1].startswith("MemoryError")
+
+
+def run_limited(
+    cmd: list[str],
+    *,
+    cwd: Path,
+    env: dict[str, str] | None = None,
+    input: bytes | str | None = None,
+    limits: ProcessLimits,
+) -> LimitedResult:
+    """Run ``cmd`` to completion or until ``limits.timeout_s``; stdout/stderr are decoded text."""
+
+    if limits.has_rlimits:
+        if shutil.which(cmd[0], path=(env if env is not None else os.environ).get("PATH")) is None:
+            # Fail as Popen would, rather than with the exec wrapper's traceback.
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), cmd[0])
+        cmd = limits.rlimited_command(cmd)
+    proc = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        env=env,
+        stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=os.name == "posix",
+    )
+    stdout = _TailBuffer(limits.max_output_bytes)
+    stderr = _TailBuffer(limits.max_output_bytes)
+    threads = [
+        threading.Thread(target=stdout.drain, args=(proc.stdout,), daemon=True),
+        threading.Thread(target=stderr.drain, args=(proc.stderr,), daemon=True),
+    ]
+    if input is not None:
+        payload = input.encode() if isinstance(input, str) else input
+        threads.append(threading.Thread(target=_feed, args=(proc.stdin, payload), daemon=True))
+    for thread in threads:
+        thread.start()
+
+    timed_out = False
+    try:
+        proc.wait(timeout=limits.timeout_s)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        _kill_group(proc)
+        proc.wait()
+    for thread in threads:
+        thread.join(_DRAIN_TIMEOUT_S)
+    if any(thread.is_alive() for thread in threads):
+        # Something left in the group still holds the pipes open.
+        _kill_group(proc)
+        for thread in threads:
+            thread.join(_DRAIN_TIMEOUT_S)
+    return LimitedResult(
+        returncode=proc.returncode,
+        stdout=stdout.text(),
+        stderr=stderr.text(),
+        timed_out=timed_out,
+        output_truncated=stdout.truncated or stderr.truncated,
+    )
+
+
+class _TailBuffer:
+    """Keeps the last ``limit`` bytes written to it."""
+
+    def __init__(self, limit: int | None) -> None:
+        self.limit = limit
+        self.data = bytearray()
+        self.truncated = False
+
+    def drain(self, stream: IO[bytes] | None) -> None:
+        if stream is None:
+            return
+        with stream:
+            while chunk := stream.read1(_READ_CHUNK_BYTES):
+                self.data += chunk
+                if self.limit is not None and len(self.data) > self.limit:
+                    del self.data[: len(self.data) - self.limit]
+                    self.truncated = True
+
+    def text(self) -> str:
+        return self.data.decode(errors="replace")
+
+
+def _feed(stream: IO[bytes] | None, payload: bytes) -> None:
+    if stream is None:
+        return
+    try:
+        with stream:
+            stream.write(payload)
+    except (BrokenPipeError, OSError):
+        pass
+
+
+def _kill_group(proc: subprocess.Popen[bytes]) -> None:
+    try:
+        if os.name == "posix":
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _read_env_number(var_name: str, default: float | None) -> float | None:
+    raw = (os.environ.get(var_name) or "").strip()
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        return default
+    return value if value > 0 else None
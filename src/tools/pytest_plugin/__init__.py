@@ -0,0 +1 @@
+"""Pytest plugins that PytestTool loads into the runs it starts (this directory is put on PYTHONPATH)."""
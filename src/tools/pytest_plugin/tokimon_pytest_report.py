@@ -0,0 +1,127 @@
+"""Pytest plugin that streams one JSON line per test phase to ``$TOKIMON_PYTEST_REPORT``.
+
+PytestTool loads it with ``-p tokimon_pytest_report``; without the environment
+variable the plugin does nothing. Lines are flushed as they are written, so a
+run that is killed part-way still leaves the outcomes it reached.
+
+Line shapes::
+
+    {"nodeid", "when": "setup"|"call"|"teardown"|"collect", "outcome", "duration", "error_type", "message"}
+    {"event": "session", "exitstatus", "collected"}
+    {"event": "collected", "nodeid"}    (``--collect-only`` runs, one per selected item)
+
+``outcome`` is one of passed, failed, error, skipped, xfailed, xpassed.
+
+When ``$TOKIMON_PYTEST_SHARD`` names a file of node ids (one per line), only
+those items run and the rest are reported as deselected; PytestTool uses this
+to give each shard its part of the suite.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import IO, Any
+
+_STREAM: IO[str] | None = None
+_MAX_MESSAGE_CHARS = 500
+
+
+def pytest_configure(config: Any) -> None:
+    global _STREAM
+    path = os.environ.get("TOKIMON_PYTEST_REPORT")
+    # xdist workers report through the controller; only the controller writes.
+    if path and _STREAM is None and not hasattr(config, "workerinput"):
+        _STREAM = open(path, "a", encoding="utf-8", buffering=1)
+
+
+def pytest_unconfigure(config: Any) -> None:
+    global _STREAM
+    if _STREAM is not None:
+        _STREAM.close()
+        _STREAM = None
+
+
+def pytest_collection_modifyitems(config: Any, items: list[Any]) -> None:
+    path = os.environ.get("TOKIMON_PYTEST_SHARD")
+    if not path:
+        return
+    with open(path, encoding="utf-8") as handle:
+        wanted = {line.rstrip("\n") for line in handle if line.strip()}
+    selected = [item for item in items if item.nodeid in wanted]
+    deselected = [item for item in items if item.nodeid not in wanted]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+def pytest_collection_finish(session: Any) -> None:
+    if session.config.option.collectonly:
+        for item in session.items:
+            _write({"event": "collected", "nodeid": item.nodeid})
+
+
+def pytest_runtest_logreport(report: Any) -> None:
+    _write(_record(report, report.when))
+
+
+def pytest_collectreport(report: Any) -> None:
+    if report.failed:
+        _write(_record(report, "collect"))
+
+
+def pytest_sessionfinish(session: Any, exitstatus: int) -> None:
+    _write({"event": "session", "exitstatus": int(exitstatus), "collected": int(getattr(session, "testscollected", 0))})
+
+
+def _record(report: Any, when: str) -> dict[str, Any]:
+    record: dict[str, Any] = {
+        "nodeid": report.nodeid,
+        "when": when,
+        "outcome": _outcome(report, when),
+        "duration": round(float(getattr(report, "duration", 0.0) or 0.0), 6),
+    }
+    if report.failed:
+        message = _crash_message(report)
+        record["message"] = message[:_MAX_MESSAGE_CHARS]
+        record["error_type"] = _error_type(message)
+    return record
+
+
+def _outcome(report: Any, when: str) -> str:
+    if hasattr(report, "wasxfail"):
+        if report.skipped:
+            return "xfailed"
+        if report.passed:
+            return "xpassed"
+    if report.failed:
+        return "failed" if when == "call" else "error"
+    if report.skipped:
+        return "skipped"
+    return "passed"
+
+
+def _crash_message(report: Any) -> str:
+    longrepr = getattr(report, "longrepr", None)
+    crash = getattr(longrepr, "reprcrash", None)
+    if crash is not None and getattr(crash, "message", None):
+        return str(crash.message)
+    text = str(longrepr or "").strip()
+    lines = [line for line in text.splitlines() if line.strip()]
+    for line in reversed(lines):
+        # Collection errors end with "E   ModuleNotFoundError: ..." lines.
+        if line.startswith("E "):
+            return line[1:].strip()
+    return lines[-1].strip() if lines else ""
+
+
+def _error_type(message: str) -> str:
+    head = message.split(":", 1)[0].strip()
+    if head and " " not in head and (head[0].isupper() or "." in head):
+        return head.rsplit(".", 1)[-1]
+    return "AssertionError" if message.startswith("assert") else "Unknown"
+
+
+def _write(record: dict[str, Any]) -> None:
+    if _STREAM is not None:
+        _STREAM.write(json.dumps(record, sort_keys=True) + "\n")
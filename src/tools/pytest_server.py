@@ -0,0 +1,317 @@
+"""Persistent warm pytest server for PytestTool (opt-in via ``TOKIMON_PYTEST_SERVER``).
+
+Every ``python -m pytest`` pays interpreter startup, importing pytest and
+loading its plugins before collecting a single test. `WarmPytestServer` starts
+one long-lived interpreter that does that work once (plus any modules named in
+``TOKIMON_PYTEST_SERVER_PRELOAD``) and then serves runs over a JSON-lines pipe.
+
+Each run is executed in a fresh ``os.fork()`` child with the request's cwd and
+environment and its stdout/stderr redirected to files, so workspace modules,
+``sys.path`` and ``sys.modules`` changes never leak between runs and edited
+sources are always re-imported. The server itself never imports workspace
+code.
+
+Runs honour the caller's `ProcessLimits`: the child gets its own process
+group and the CPU/memory rlimits, the server kills the group when the
+timeout expires, and only the tail of each captured stream is returned.
+
+The server handles one run at a time; `run` returns None when it is busy,
+cannot fork on this platform, or has died, and the caller falls back to a
+plain subprocess. This file runs as a script and uses only the stdlib.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+if TYPE_CHECKING:
+    from .process_limits import LimitedResult, ProcessLimits
+
+
+class WarmPytestServer:
+    def __init__(self, *, python: str = sys.executable, preload: tuple[str, ...] = ()) -> None:
+        self.python = python
+        self.preload = preload
+        self._proc: subprocess.Popen[str] | None = None
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.restarts = 0
+
+    def run(
+        self,
+        args: list[str],
+        *,
+        cwd: Path,
+        env: dict[str, str],
+        limits: ProcessLimits | None = None,
+    ) -> LimitedResult | None:
+        """Run ``pytest args`` in a forked child; None means "use a subprocess instead"."""
+
+        # Imported here: this module also runs as a standalone script, where the package is not importable.
+        from .process_limits import LimitedResult, ProcessLimits
+
+        if not hasattr(os, "fork") or not self._lock.acquire(blocking=False):
+            return None
+        try:
+            proc = self._ensure_started()
+            if proc is None or proc.stdin is None or proc.stdout is None:
+                return None
+            limits = limits or ProcessLimits()
+            request = {
+                "args": list(args),
+                "cwd": str(cwd),
+                "env": dict(env),
+                "limits": {
+                    "timeout_s": limits.timeout_s,
+                    "cpu_s": limits.cpu_s,
+                    "memory_bytes": limits.memory_bytes,
+                    "max_output_bytes": limits.max_output_bytes,
+                },
+            }
+            try:
+                proc.stdin.write(json.dumps(request) + "\n")
+                proc.stdin.flush()
+                line = proc.stdout.readline()
+            except (OSError, ValueError):
+                line = ""
+            if not line:
+                self._stop()
+                return None
+            response = json.loads(line)
+            if "error" in response:
+                return None
+            self.runs += 1
+            return LimitedResult(
+                returncode=int(response["returncode"]),
+                stdout=str(response.get("stdout", "")),
+                stderr=str(response.get("stderr", "")),
+                timed_out=bool(response.get("timed_out")),
+                output_truncated=bool(response.get("output_truncated")),
+            )
+        finally:
+            self._lock.release()
+
+    def close(self) -> None:
+        with self._lock:
+            self._stop()
+
+    def _ensure_started(self) -> subprocess.Popen[str] | None:
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+        if self._proc is not None:
+            self.restarts += 1
+        try:
+            self._proc = subprocess.Popen(
+                [self.python, str(Path(__file__).resolve()), *self.preload],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                start_new_session=True,
+            )
+        except OSError:
+            self._proc = None
+            return None
+        ready = self._proc.stdout.readline() if self._proc.stdout is not None else ""
+        if not ready.strip():
+            self._stop()
+            return None
+        return self._proc
+
+    def _stop(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            if proc.stdin is not None:
+                proc.stdin.close()
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
+            proc.wait(timeout=5)
+
+
+_SERVER: WarmPytestServer | None = None
+_SERVER_LOCK = threading.Lock()
+
+
+def shared_server() -> WarmPytestServer:
+    """The process-wide warm server, created on first use."""
+
+    global _SERVER
+    with _SERVER_LOCK:
+        if _SERVER is None:
+            preload = tuple(
+                name.strip() for name in os.environ.get("TOKIMON_PYTEST_SERVER_PRELOAD", "").split(",") if name.strip()
+            )
+            _SERVER = WarmPytestServer(preload=preload)
+        return _SERVER
+
+
+def close_shared_server() -> None:
+    global _SERVER
+    with _SERVER_LOCK:
+        server, _SERVER = _SERVER, None
+    if server is not None:
+        server.close()
+
+
+atexit.register(close_shared_server)
+
+
+def _serve(preload: list[str]) -> int:
+    import importlib
+
+    # Running as a script put src/tools first on sys.path; its modules must not shadow workspace code.
+    if sys.path and Path(sys.path[0]).resolve() == Path(__file__).resolve().parent:
+        sys.path.pop(0)
+
+    # Keep the protocol on a private descriptor so nothing printed by pytest can corrupt it.
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), "w", buffering=1)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    import pytest  # noqa: F401 - the point of the server is to have this imported already
+
+    try:
+        from importlib.metadata import entry_points
+
+        for entry in entry_points(group="pytest11"):
+            try:
+                entry.load()
+            except Exception:
+                continue
+    except Exception:
+        pass
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            continue
+
+    protocol.write(json.dumps({"ready": True, "pid": os.getpid()}) + "\n")
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            response = _run_forked(json.loads(line), protocol)
+        except Exception as exc:
+            response = {"error": str(exc)}
+        protocol.write(json.dumps(response) + "\n")
+    return 0
+
+
+def _run_forked(request: dict[str, Any], protocol: TextIO) -> dict[str, Any]:
+    env = {str(key): str(value) for key, value in dict(request.get("env") or {}).items()}
+    limits = dict(request.get("limits") or {})
+    capture_dir = Path(tempfile.mkdtemp(prefix="tokimon-pytest-", dir=env.get("TMPDIR") or None))
+    stdout_path = capture_dir / "stdout"
+    stderr_path = capture_dir / "stderr"
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            os.setpgid(0, 0)
+            _apply_rlimits(limits)
+            protocol.close()
+            out_fd = os.open(stdout_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            err_fd = os.open(stderr_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.dup2(out_fd, 1)
+            os.dup2(err_fd, 2)
+            devnull = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(devnull, 0)
+            os.environ.clear()
+            os.environ.update(env)
+            tempfile.tempdir = None
+            os.chdir(str(request["cwd"]))
+            # The interpreter read PYTHONPATH at startup; apply the request's entries as a fresh one would.
+            python_path = [entry for entry in env.get("PYTHONPATH", "").split(os.pathsep) if entry]
+            sys.path[0:0] = [os.getcwd(), *python_path]
+            import pytest
+
+            code = int(pytest.main([str(arg) for arg in request.get("args") or []]))
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+        except BaseException:
+            import traceback
+
+            traceback.print_exc()
+        finally:
+            for stream in (sys.stdout, sys.stderr):
+                try:
+                    stream.flush()
+                except Exception:
+                    pass
+            os._exit(code)
+    try:
+        # Also set from the parent so a kill cannot race the child's own setpgid.
+        os.setpgid(pid, pid)
+    except OSError:
+        pass
+    expired = threading.Event()
+    timer = None
+    if limits.get("timeout_s"):
+        timer = threading.Timer(float(limits["timeout_s"]), _kill_group, (pid, expired))
+        timer.start()
+    _, status = os.waitpid(pid, 0)
+    if timer is not None:
+        timer.cancel()
+    returncode = os.waitstatus_to_exitcode(status)
+    cap = limits.get("max_output_bytes")
+    try:
+        stdout, stdout_truncated = _read_tail(stdout_path, cap)
+        stderr, stderr_truncated = _read_tail(stderr_path, cap)
+    finally:
+        for path in (stdout_path, stderr_path):
+            path.unlink(missing_ok=True)
+        capture_dir.rmdir()
+    return {
+        "returncode": returncode,
+        "stdout": stdout,
+        "stderr": stderr,
+        "timed_out": expired.is_set(),
+        "output_truncated": stdout_truncated or stderr_truncated,
+    }
+
+
+def _apply_rlimits(limits: dict[str, Any]) -> None:
+    try:
+        import resource
+    except ImportError:
+        return
+    if limits.get("cpu_s"):
+        cpu_s = int(limits["cpu_s"])
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_s, cpu_s + 1))
+    if limits.get("memory_bytes"):
+        memory = int(limits["memory_bytes"])
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+
+
+def _kill_group(pid: int, expired: threading.Event) -> None:
+    expired.set()
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _read_tail(path: Path, max_bytes: int | None) -> tuple[str, bool]:
+    with path.open("rb") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        truncated = max_bytes is not None and size > max_bytes
+        handle.seek(size - int(max_bytes) if truncated else 0)
+        return handle.read().decode(errors="replace"), truncated
+
+
+if __name__ == "__main__":
+    sys.exit(_serve(sys.argv[1:]))
@@ -1,24 +1,130 @@
-"""PytestTool runs pytest and parses results."""
+"""PytestTool runs pytest and parses results.
+
+With test-impact selection enabled (``TOKIMON_PYTEST_IMPACT=1``), ``run`` accepts
+the files changed since the last run and, when the import graph can account
+for every change, runs only the test files that depend on them plus the test
+files that failed last time (see `tools.test_impact`). Otherwise it runs the
+requested target in full. The affected tests only run *first*: when they pass,
+the full target runs too and its result is the one returned (with
+``selection["confirmed"]`` set), so a passing result always covers the whole
+suite. ``data["selection"]`` records the mode and the selected/total test-file
+counts.
+
+With ``TOKIMON_PYTEST_SERVER=1`` runs go through the shared warm pytest server
+(`tools.pytest_server`), which forks an already-initialized interpreter per run
+instead of starting ``python -m pytest`` from scratch.
+
+Every run loads the bundled ``tokimon_pytest_report`` plugin
+(`tools/pytest_plugin`), which streams one JSON line per test phase to a side
+file. Counts, ``failing_tests``, per-test ``durations``, the ``slowest`` tests
+and ``error_categories`` come from that report; the regex parse of the terminal
+output is only a fallback for when the report is missing. ``data["output"]``
+keeps just the last ``TOKIMON_PYTEST_OUTPUT_TAIL_BYTES`` (default 8000) bytes
+of stdout+stderr.
+
+With ``TOKIMON_PYTEST_SHARDS=N`` (N > 1) a run first collects node ids, then
+splits them over up to N concurrent pytest processes balanced by historical
+per-test durations (see `tools.test_shards`), and merges the shard reports
+into one result. ``data["sharding"]`` says how many shards ran and why, and
+``data["shards"]`` holds each shard's test count, predicted and actual time.
+Sharding is skipped for runs it cannot split safely (explicit ``--basetemp``,
+``-n``, ``--collect-only``, collection errors).
+
+Every pytest process runs under `tools.process_limits`: a wall-clock timeout
+(``TOKIMON_PYTEST_TIMEOUT_S``, default 1800), optional ``TOKIMON_PYTEST_CPU_S``
+and ``TOKIMON_PYTEST_MEMORY_MB`` rlimits, and a per-stream capture cap
+(``TOKIMON_PYTEST_MAX_OUTPUT_BYTES``, default 16 MiB). On expiry the whole
+process group is killed and the result carries ``failure_signature``
+``pytest-timeout`` (or ``pytest-cpu-limit`` / ``pytest-memory-limit``), along
+with whatever the report plugin recorded before the kill.
+"""
 
 from __future__ import annotations
 
+import json
 import os
 import re
-import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
+from . import process_limits
 from .base import ToolResult, elapsed_ms
+from .process_limits import ProcessLimits
+from .pytest_server import WarmPytestServer, shared_server
+from .test_impact import TestImpactIndex, is_test_file
+from .test_shards import TestDurationHistory, partition_lpt
+
+
+# Options whose value is a separate argument that must not be mistaken for a test path.
+_OPTIONS_WITH_VALUES = frozenset(
+    {
+        "-k", "-m", "-c", "-p", "-o", "-r", "-W",
+        "--basetemp", "--rootdir", "--confcutdir", "--deselect", "--ignore", "--ignore-glob",
+        "--maxfail", "--tb", "--durations", "--import-mode",
+    }
+)
+_EXCLUDED_TEST_DIR_NAMES = frozenset({".tokimon-tmp", ".venv", "node_modules", "runs", "__pycache__"})
+_PLUGIN_DIR = Path(__file__).resolve().parent / "pytest_plugin"
+_PLUGIN_NAME = "tokimon_pytest_report"
+_DEFAULT_OUTPUT_TAIL_BYTES = 8000
+_SLOWEST_COUNT = 5
+_MAX_DURATIONS = 200
+_DEFAULT_TIMEOUT_S = 1800.0
+_DEFAULT_MAX_OUTPUT_BYTES = 16 * 1024 * 1024
+# pytest's INTERNAL_ERROR exit status: the session itself crashed.
+_PYTEST_CRASH_RETURNCODES = frozenset({3})
+_COUNT_KEYS = ("passed", "failed", "errors", "skipped", "xfailed", "xpassed")
+# Options that make a run unsafe or pointless to split across shard processes.
+_UNSHARDABLE_OPTIONS = frozenset({"--basetemp", "-n", "--numprocesses", "--collect-only", "--co", "--pdb", "--lf", "--last-failed"})
+
+
+@dataclass
+class _Invocation:
+    returncode: int
+    output: str
+    records: list[dict[str, Any]] | None
+    runner: str
+    failure_signature: str | None = None
 
 
 class PytestTool:
     name = "pytest"
 
-    def __init__(self, root: Path) -> None:
+    def __init__(
+        self,
+        root: Path,
+        *,
+        impact_selection: bool | None = None,
+        warm_server: WarmPytestServer | bool | None = None,
+        shards: int | None = None,
+        limits: ProcessLimits | None = None,
+    ) -> None:
         self.root = root
+        if impact_selection is None:
+            impact_selection = _env_flag("TOKIMON_PYTEST_IMPACT")
+        self.impact_selection = impact_selection
+        if warm_server is None:
+            warm_server = _env_flag("TOKIMON_PYTEST_SERVER")
+        self.warm_server: WarmPytestServer | None = shared_server() if warm_server is True else warm_server or None
+        self.limits = limits or ProcessLimits.from_env(
+            "PYTEST", timeout_s=_DEFAULT_TIMEOUT_S, max_output_bytes=_DEFAULT_MAX_OUTPUT_BYTES
+        )
+        self.shards = shards if shards is not None else _read_env_int("TOKIMON_PYTEST_SHARDS", 1)
+        self._impact_index: TestImpactIndex | None = None
+        self._last_failed: set[str] = set()
+        self._lock = threading.Lock()
 
-    def run(self, args: list[str] | None = None, pytest_args: list[str] | None = None) -> ToolResult:
+    def run(
+        self,
+        args: list[str] | None = None,
+        pytest_args: list[str] | None = None,
+        changed_files: list[str] | None = None,
+    ) -> ToolResult:
         start = time.perf_counter()
         normalized_args = args if args is not None else pytest_args
         if normalized_args is None:
@@ -29,41 +135,322 @@ class PytestTool:
                 elapsed_ms=elapsed_ms(start),
                 error="expected args: list[str]",
             )
-        cmd = [sys.executable, "-m", "pytest", *normalized_args]
+        requested_args = list(normalized_args)
+        selection: dict[str, Any] | None = None
+        if self.impact_selection and changed_files is not None:
+            normalized_args, selection = self._select(requested_args, changed_files)
         env = os.environ.copy()
         tmp_root = _ensure_tmp_root(self.root)
         if tmp_root is not None:
             env.update({"TMPDIR": str(tmp_root), "TEMP": str(tmp_root), "TMP": str(tmp_root)})
-            if "--basetemp" not in normalized_args:
-                cmd.extend(["--basetemp", str(tmp_root / f"pytest-{int(time.time() * 1000)}")])
         try:
-            result = subprocess.run(
-                cmd,
-                cwd=_safe_cwd(self.root),
-                env=env,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-            output = result.stdout + "\n" + result.stderr
-            passed, failed = _parse_counts(output)
-            failing_tests = _parse_failures(output)
+            returncode, data = self._run_target(list(normalized_args), env, tmp_root)
+            self._record_failures(data["failing_tests"], selection)
+            if selection is not None and selection["mode"] == "impact" and returncode == 0 and not data.get("failure_signature"):
+                # The affected tests ran first and passed; only the full target can say the suite is green.
+                returncode, data = self._run_target(requested_args, env, tmp_root)
+                self._record_failures(data["failing_tests"], None)
+                selection["confirmed"] = True
+            if selection is not None:
+                data["selection"] = selection
+            failure_signature = data.get("failure_signature")
+            if failure_signature:
+                return ToolResult(
+                    ok=False,
+                    summary="pytest stopped by a resource limit",
+                    data=data,
+                    elapsed_ms=elapsed_ms(start),
+                    error=_limit_error(failure_signature, self.limits),
+                    failure_signature=failure_signature,
+                )
             return ToolResult(
-                ok=result.returncode == 0,
-                summary="pytest run",
-                data={
-                    "returncode": result.returncode,
-                    "passed": passed,
-                    "failed": failed,
-                    "failing_tests": failing_tests,
-                    "output": output,
-                },
+                ok=returncode == 0,
+                summary=_run_summary(selection),
+                data=data,
                 elapsed_ms=elapsed_ms(start),
-                error=None if result.returncode == 0 else "pytest failed",
+                error=None if returncode == 0 else "pytest failed",
             )
         except Exception as exc:
             return ToolResult(ok=False, summary="pytest error", data={}, elapsed_ms=elapsed_ms(start), error=str(exc))
 
+    def _run_target(self, args: list[str], env: dict[str, str], tmp_root: Path | None) -> tuple[int, dict[str, Any]]:
+        if self.shards > 1:
+            return self._run_sharded(args, env, tmp_root)
+        return self._run_single(args, env, tmp_root)
+
+    def _run_single(
+        self,
+        args: list[str],
+        env: dict[str, str],
+        tmp_root: Path | None,
+        *,
+        history: TestDurationHistory | None = None,
+    ) -> tuple[int, dict[str, Any]]:
+        return self._single_result(self._invoke(args, env, tmp_root), history=history)
+
+    def _single_result(
+        self, invocation: _Invocation, *, history: TestDurationHistory | None = None
+    ) -> tuple[int, dict[str, Any]]:
+        data: dict[str, Any] = {"returncode": invocation.returncode}
+        if invocation.records is not None:
+            data.update(_summarize_report(invocation.records))
+            if history is not None:
+                # Keep the durations fresh so the shard count is revisited as the suite grows.
+                with self._lock:
+                    history.record(_test_durations(invocation.records))
+        else:
+            passed, failed = _parse_counts(invocation.output)
+            data.update(
+                passed=passed,
+                failed=failed,
+                errors=_parse_errors(invocation.output),
+                failing_tests=_parse_failures(invocation.output),
+                report="output",
+            )
+        data.update(_output_tail(invocation.output, _output_tail_bytes()))
+        if self.warm_server is not None:
+            data["runner"] = invocation.runner
+        if invocation.failure_signature:
+            data["failure_signature"] = invocation.failure_signature
+        return invocation.returncode, data
+
+    def _run_sharded(self, args: list[str], env: dict[str, str], tmp_root: Path | None) -> tuple[int, dict[str, Any]]:
+        """Split the collected node ids over duration-balanced shards, or fall back to one process."""
+
+        def unsharded(reason: str, history: TestDurationHistory | None = None) -> tuple[int, dict[str, Any]]:
+            returncode, data = self._run_single(args, env, tmp_root, history=history)
+            data["sharding"] = {"shards": 1, "requested": self.shards, "reason": reason}
+            return returncode, data
+
+        if tmp_root is None or _UNSHARDABLE_OPTIONS.intersection(args) or f"no:{_PLUGIN_NAME}" in args:
+            return unsharded("arguments cannot be sharded")
+        collected = self._invoke([*args, "--collect-only"], env, tmp_root)
+        nodeids = [
+            str(record["nodeid"])
+            for record in collected.records or []
+            if record.get("event") == "collected" and record.get("nodeid")
+        ]
+        if collected.failure_signature:
+            # Running the suite unsharded would only hit the same limit again.
+            returncode, data = self._single_result(collected)
+            data["sharding"] = {"shards": 1, "requested": self.shards, "reason": "collection hit a resource limit"}
+            return returncode, data
+        if collected.returncode != 0 or not nodeids:
+            return unsharded("collection failed or found no tests")
+        with self._lock:
+            history = TestDurationHistory(self.root)
+        estimates = history.estimate(nodeids)
+        count = history.shard_count(self.shards, estimates)
+        if count < 2:
+            return unsharded("suite too small to shard", history)
+
+        buckets = partition_lpt(nodeids, estimates, count)
+        with ThreadPoolExecutor(max_workers=count, thread_name_prefix="tokimon-pytest-shard") as pool:
+            futures = [
+                pool.submit(self._invoke_shard, args, env, tmp_root, index, bucket) for index, bucket in enumerate(buckets)
+            ]
+            results = [future.result() for future in futures]
+
+        records: list[dict[str, Any]] = []
+        outputs: list[str] = []
+        shards: list[dict[str, Any]] = []
+        overheads: list[float] = []
+        for index, (bucket, (invocation, elapsed)) in enumerate(zip(buckets, results)):
+            shard_records = invocation.records or [_crashed_shard_record(index, invocation.returncode)]
+            records.extend(record for record in shard_records if record.get("event") != "session")
+            outputs.append(f"=== shard {index + 1}/{count} ===\n{invocation.output}")
+            measured = sum(_test_durations(shard_records).values())
+            overheads.append(max(0.0, elapsed - measured))
+            shards.append(
+                {
+                    "shard": index,
+                    "tests": len(bucket),
+                    "predicted_s": round(sum(estimates[nodeid] for nodeid in bucket), 4),
+                    "elapsed_s": round(elapsed, 4),
+                    "returncode": invocation.returncode,
+                    "runner": invocation.runner,
+                    "failure_signature": invocation.failure_signature,
+                }
+            )
+        records.append({"event": "session", "collected": len(nodeids)})
+        with self._lock:
+            history.record(_test_durations(records), shard_overheads=overheads)
+
+        returncode = _merge_returncodes([shard["returncode"] for shard in shards])
+        data: dict[str, Any] = {"returncode": returncode, **_summarize_report(records)}
+        data.update(_output_tail("\n".join(outputs), _output_tail_bytes()))
+        data["sharding"] = {"shards": count, "requested": self.shards, "reason": "duration-balanced"}
+        data["shards"] = shards
+        signatures = [invocation.failure_signature for invocation, _ in results if invocation.failure_signature]
+        if signatures:
+            data["failure_signature"] = signatures[0]
+        return returncode, data
+
+    def _invoke_shard(
+        self, args: list[str], env: dict[str, str], tmp_root: Path, index: int, nodeids: list[str]
+    ) -> tuple[_Invocation, float]:
+        shard_file = tmp_root / f"pytest-shard-{os.getpid()}-{time.time_ns()}-{index}.txt"
+        shard_file.write_text("".join(f"{nodeid}\n" for nodeid in nodeids))
+        started = time.perf_counter()
+        try:
+            invocation = self._invoke(args, {**env, "TOKIMON_PYTEST_SHARD": str(shard_file)}, tmp_root, label=f"shard{index}")
+        finally:
+            shard_file.unlink(missing_ok=True)
+        return invocation, time.perf_counter() - started
+
+    def _invoke(self, args: list[str], env: dict[str, str], tmp_root: Path | None, *, label: str = "") -> _Invocation:
+        """One pytest process (warm-server fork or subprocess) with the report plugin attached."""
+
+        cmd = [sys.executable, "-m", "pytest", *args]
+        env = dict(env)
+        if tmp_root is not None and "--basetemp" not in args:
+            # Unique per call: concurrent runs must not share it, since pytest clears basetemp on start.
+            suffix = f"-{label}" if label else ""
+            unique = f"{os.getpid()}-{threading.get_ident()}-{time.time_ns()}"
+            cmd.extend(["--basetemp", str(tmp_root / f"pytest-{unique}{suffix}")])
+        report_path = _attach_report_plugin(cmd, env, tmp_root)
+        try:
+            result = None
+            if self.warm_server is not None:
+                result = self.warm_server.run(cmd[3:], cwd=_safe_cwd(self.root), env=env, limits=self.limits)
+            runner = "warm-server" if result is not None else "subprocess"
+            if result is None:
+                result = process_limits.run_limited(cmd, cwd=_safe_cwd(self.root), env=env, limits=self.limits)
+            records = _read_report(report_path)
+            return _Invocation(
+                returncode=result.returncode,
+                output=result.stdout + "\n" + result.stderr,
+                records=records,
+                runner=runner,
+                failure_signature=result.failure_signature(
+                    "pytest",
+                    self.limits,
+                    crash_returncodes=_PYTEST_CRASH_RETURNCODES,
+                    memory_error=any(record.get("error_type") == "MemoryError" for record in records or ()),
+                ),
+            )
+        finally:
+            if report_path is not None:
+                report_path.unlink(missing_ok=True)
+
+    def _select(self, args: list[str], changed_files: list[str]) -> tuple[list[str], dict[str, Any]]:
+        """Narrow ``args`` to the affected test files, or return them unchanged with the reason."""
+
+        cwd = _safe_cwd(self.root)
+        root = self.root.resolve()
+        options, targets = _split_targets(args, cwd)
+        if any("::" in arg for arg in args if not arg.startswith("-")):
+            return args, {"mode": "full", "selected": None, "total": None, "reason": "explicit node ids"}
+        test_files: list[str] = []
+        for target in targets or [cwd]:
+            test_files.extend(_test_files_under(target.resolve(), root))
+        test_files = sorted(set(test_files))
+        with self._lock:
+            if self._impact_index is None:
+                self._impact_index = TestImpactIndex(root)
+            selection = self._impact_index.select(changed_files, test_files=test_files)
+            last_failed = sorted(self._last_failed & set(test_files))
+        payload: dict[str, Any] = selection.to_dict()
+        if not selection.confident:
+            return args, payload
+        selected = sorted({*selection.tests, *last_failed})
+        if len(selected) >= len(test_files):
+            payload.update(mode="full", selected=len(test_files), reason="every test file is affected")
+            return args, payload
+        payload.update(selected=len(selected), last_failed=len(last_failed))
+        return [*options, *(os.path.relpath(root / rel, cwd) for rel in selected)], payload
+
+    def _record_failures(self, failing_tests: list[str], selection: dict[str, Any] | None) -> None:
+        """Remember failing test files so impact-selected runs keep re-running them until they pass."""
+
+        cwd = _safe_cwd(self.root)
+        root = self.root.resolve()
+        failed: set[str] = set()
+        for node_id in failing_tests:
+            path = (cwd / node_id.split("::", 1)[0].split(" ", 1)[0]).resolve()
+            try:
+                failed.add(path.relative_to(root).as_posix())
+            except ValueError:
+                continue
+        with self._lock:
+            if selection is not None and selection.get("mode") == "impact":
+                self._last_failed |= failed
+            else:
+                self._last_failed = failed
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _run_summary(selection: dict[str, Any] | None) -> str:
+    if not selection or selection["mode"] != "impact":
+        return "pytest run"
+    return "pytest run (impact-selected, confirmed by full run)" if selection.get("confirmed") else "pytest run (impact-selected)"
+
+
+def _limit_error(failure_signature: str, limits: ProcessLimits) -> str:
+    if failure_signature == "pytest-timeout":
+        return f"pytest timed out after {limits.timeout_s:g}s"
+    if failure_signature == "pytest-cpu-limit":
+        return f"pytest exceeded the {limits.cpu_s}s CPU limit"
+    return f"pytest exceeded the {limits.memory_bytes} byte memory limit"
+
+
+def _output_tail_bytes() -> int:
+    return _read_env_int("TOKIMON_PYTEST_OUTPUT_TAIL_BYTES", _DEFAULT_OUTPUT_TAIL_BYTES)
+
+
+def _read_env_int(var_name: str, default: int) -> int:
+    raw = (os.environ.get(var_name) or "").strip()
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def _split_targets(args: list[str], cwd: Path) -> tuple[list[str], list[Path]]:
+    """Separate pytest options from positional file/directory targets."""
+
+    options: list[str] = []
+    targets: list[Path] = []
+    expects_value = False
+    for arg in args:
+        if expects_value:
+            options.append(arg)
+            expects_value = False
+            continue
+        if arg.startswith("-"):
+            options.append(arg)
+            expects_value = arg in _OPTIONS_WITH_VALUES
+            continue
+        candidate = cwd / arg
+        if "::" not in arg and candidate.exists():
+            targets.append(candidate)
+        else:
+            options.append(arg)
+    return options, targets
+
+
+def _test_files_under(target: Path, root: Path) -> list[str]:
+    if target.is_file():
+        paths = [target] if is_test_file(target.name) else []
+    else:
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(target):
+            dirnames[:] = [name for name in dirnames if name not in _EXCLUDED_TEST_DIR_NAMES and not name.startswith(".")]
+            paths.extend(Path(dirpath) / name for name in filenames if is_test_file(name))
+    files: list[str] = []
+    for path in paths:
+        try:
+            files.append(path.resolve().relative_to(root).as_posix())
+        except ValueError:
+            continue
+    return files
+
 
 def _safe_cwd(root: Path) -> Path:
     """Avoid stdlib shadowing when running from directories containing stdlib-like module names."""
@@ -72,6 +459,124 @@ def _safe_cwd(root: Path) -> Path:
     return root
 
 
+def _attach_report_plugin(cmd: list[str], env: dict[str, str], tmp_root: Path | None) -> Path | None:
+    """Load the JSON-lines report plugin into the run; returns the report path, or None without a tmp root."""
+
+    if tmp_root is None or f"no:{_PLUGIN_NAME}" in cmd:
+        return None
+    report_path = tmp_root / f"pytest-report-{os.getpid()}-{threading.get_ident()}-{time.time_ns()}.jsonl"
+    env["TOKIMON_PYTEST_REPORT"] = str(report_path)
+    env["PYTHONPATH"] = os.pathsep.join(part for part in (str(_PLUGIN_DIR), env.get("PYTHONPATH", "")) if part)
+    cmd.extend(["-p", _PLUGIN_NAME])
+    return report_path
+
+
+def _read_report(report_path: Path | None) -> list[dict[str, Any]] | None:
+    """Records written by the plugin, or None when it never ran (e.g. pytest failed to start)."""
+
+    if report_path is None:
+        return None
+    try:
+        lines = report_path.read_text(errors="replace").splitlines()
+    except OSError:
+        return None
+    records: list[dict[str, Any]] = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # A run killed mid-write leaves a partial last line.
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+    return records or None
+
+
+def _test_durations(records: list[dict[str, Any]]) -> dict[str, float]:
+    """Seconds per node id, summed over its setup/call/teardown phases."""
+
+    durations: dict[str, float] = {}
+    for record in records:
+        if "nodeid" in record and record.get("when") != "collect":
+            nodeid = str(record["nodeid"])
+            durations[nodeid] = durations.get(nodeid, 0.0) + float(record.get("duration") or 0.0)
+    return durations
+
+
+def _crashed_shard_record(index: int, returncode: int) -> dict[str, Any]:
+    return {
+        "nodeid": f"<shard {index}>",
+        "when": "collect",
+        "outcome": "error",
+        "error_type": "ShardCrashed",
+        "message": f"shard exited with {returncode} without writing a report",
+    }
+
+
+def _merge_returncodes(codes: list[int]) -> int:
+    """pytest's exit code for the union of the shards: 5 (no tests) only if every shard had none."""
+
+    meaningful = [code for code in codes if code != 5]
+    if not meaningful:
+        return 5
+    failures = [code for code in meaningful if code != 0]
+    return max(failures) if failures else 0
+
+
+def _summarize_report(records: list[dict[str, Any]]) -> dict[str, Any]:
+    """Counts as pytest's terminal summary reports them, plus per-test durations and failure categories."""
+
+    counts = dict.fromkeys(_COUNT_KEYS, 0)
+    failing_tests: list[str] = []
+    error_categories: dict[str, int] = {}
+    outcomes: dict[str, str] = {}
+    summary: dict[str, Any] = {}
+    for record in records:
+        if record.get("event") == "session":
+            summary["collected"] = record.get("collected")
+            continue
+        if "nodeid" not in record:
+            continue
+        nodeid = str(record["nodeid"])
+        outcome = str(record.get("outcome") or "")
+        when = record.get("when")
+        if outcome == "passed":
+            if when == "call":
+                counts["passed"] += 1
+                outcomes.setdefault(nodeid, "passed")
+            continue
+        key = "errors" if outcome == "error" else outcome
+        if key in counts:
+            counts[key] += 1
+        outcomes[nodeid] = outcome
+        if outcome in ("failed", "error"):
+            message = str(record.get("message") or "").splitlines()
+            failing_tests.append(f"{nodeid} - {message[0]}" if message and message[0] else nodeid)
+            category = str(record.get("error_type") or "Unknown")
+            error_categories[category] = error_categories.get(category, 0) + 1
+    ranked = sorted(_test_durations(records).items(), key=lambda item: item[1], reverse=True)
+    summary.update(counts)
+    summary.update(
+        failing_tests=failing_tests,
+        error_categories=error_categories,
+        slowest=[
+            {"nodeid": nodeid, "duration": round(seconds, 4), "outcome": outcomes.get(nodeid, "passed")}
+            for nodeid, seconds in ranked[:_SLOWEST_COUNT]
+        ],
+        durations={nodeid: round(seconds, 4) for nodeid, seconds in ranked[:_MAX_DURATIONS]},
+        durations_truncated=len(ranked) > _MAX_DURATIONS,
+        report="plugin",
+    )
+    return summary
+
+
+def _output_tail(output: str, max_bytes: int) -> dict[str, Any]:
+    raw = output.encode(errors="replace")
+    if len(raw) <= max_bytes:
+        return {"output": output, "output_bytes": len(raw), "output_truncated": False}
+    return {"output": raw[-max_bytes:].decode(errors="ignore"), "output_bytes": len(raw), "output_truncated": True}
+
+
 def _parse_counts(output: str) -> tuple[int | None, int | None]:
     match = re.search(r"(\d+)\s+passed", output)
     passed = int(match.group(1)) if match else None
@@ -80,11 +585,17 @@ def _parse_counts(output: str) -> tuple[int | None, int | None]:
     return passed, failed
 
 
+def _parse_errors(output: str) -> int | None:
+    match = re.search(r"(\d+)\s+errors?\b", output)
+    return int(match.group(1)) if match else None
+
+
 def _parse_failures(output: str) -> list[str]:
     failures = []
     for line in output.splitlines():
-        if line.startswith("FAILED "):
-            failures.append(line.split("FAILED ", 1)[1].strip())
+        for prefix in ("FAILED ", "ERROR "):
+            if line.startswith(prefix):
+                failures.append(line.split(prefix, 1)[1].strip())
     return failures
 
 
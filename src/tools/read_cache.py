@@ -0,0 +1,94 @@
+"""Workspace-scoped cache for read-only tool results.
+
+One `WorkspaceReadCache` is shared by the tools built for a run, so repeated
+``file.read`` and ``grep.search`` calls are answered from memory across worker
+iterations and steps.
+
+- File entries are keyed by resolved path, ``st_mtime_ns`` and ``st_size``, so an
+  edit made outside the tools is picked up by the next read.
+- Grep entries are keyed by pattern, path and byte budget plus the cache's tree
+  *generation*. ``FileTool.write`` and ``PatchTool.apply`` bump the generation
+  (and drop affected file entries), so searches never see pre-write results.
+
+Entries are evicted least-recently-used once the byte budget is exceeded.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable
+
+
+_DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class WorkspaceReadCache:
+    def __init__(self, *, max_bytes: int = _DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max(1, int(max_bytes))
+        self.generation = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"file_hits": 0, "file_misses": 0, "grep_hits": 0, "grep_misses": 0, "invalidations": 0}
+
+    def get_file(self, path: Path, *, mtime_ns: int, size: int) -> str | None:
+        return self._get(("file", str(path), mtime_ns, size), "file")
+
+    def put_file(self, path: Path, content: str, *, mtime_ns: int, size: int) -> None:
+        self._put(("file", str(path), mtime_ns, size), content, len(content))
+
+    def grep_key(self, pattern: str, path: str | None, max_bytes: int) -> Hashable:
+        with self._lock:
+            return ("grep", pattern, path, max_bytes, self.generation)
+
+    def get_grep(self, key: Hashable) -> dict[str, Any] | None:
+        data = self._get(key, "grep")
+        return dict(data) if data is not None else None
+
+    def put_grep(self, key: Hashable, data: dict[str, Any]) -> None:
+        with self._lock:
+            if key[-1] != self.generation:
+                # The tree changed while the search ran; its result may already be stale.
+                return
+        self._put(key, dict(data), len(str(data.get("output", ""))))
+
+    def invalidate(self, path: Path | None = None) -> None:
+        """Start a new tree generation and drop cached reads of ``path`` (or of every file)."""
+
+        with self._lock:
+            self.generation += 1
+            self._stats["invalidations"] += 1
+            target = str(path) if path is not None else None
+            for key in list(self._entries):
+                if key[0] == "grep" or target is None or key[1] == target:
+                    _, size = self._entries.pop(key)
+                    self._bytes -= size
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), bytes=self._bytes)
+
+    def _get(self, key: Hashable, kind: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats[f"{kind}_misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats[f"{kind}_hits"] += 1
+            return entry[0]
+
+    def _put(self, key: Hashable, value: Any, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
@@ -0,0 +1,218 @@
+"""Test-impact selection for PytestTool.
+
+`TestImpactIndex` maps changed workspace files to the test files that import
+them, directly or transitively. It parses each Python file's imports with
+`ast` and caches them under ``.tokimon-tmp/test-impact/imports.json`` keyed by
+``st_mtime_ns``/``st_size``, so only edited files are re-parsed between runs.
+
+Module names are resolved by path suffix (``src/tools/file_tool.py`` answers to
+``src.tools.file_tool``, ``tools.file_tool`` and ``file_tool``), which works for
+flat and ``src/`` layouts without reading pytest or packaging config; ambiguous
+names only ever widen the selection. A ``conftest.py`` that depends on a change
+selects every test file under its directory, since its fixtures reach them
+without an import.
+
+`select` reports ``confident=False`` (run everything) when a change cannot be
+traced through imports: non-Python files other than docs, ``conftest.py`` and
+pytest config, deleted modules, or changes no test depends on.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+_CACHE_VERSION = 1
+_EXCLUDED_DIR_NAMES = frozenset({".git", ".tokimon-tmp", ".venv", "node_modules", "runs", "dist", "build", "__pycache__"})
+_DOC_SUFFIXES = (".md", ".rst")
+_CONFIG_NAMES = frozenset({"conftest.py", "pytest.ini", "pyproject.toml", "setup.cfg", "tox.ini"})
+
+
+@dataclass
+class TestSelection:
+    __test__ = False  # not a pytest test class
+
+    tests: list[str]
+    total: int
+    confident: bool
+    reason: str
+    changed: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "mode": "impact" if self.confident else "full",
+            "selected": len(self.tests) if self.confident else self.total,
+            "total": self.total,
+            "reason": self.reason,
+        }
+
+
+class TestImpactIndex:
+    __test__ = False  # not a pytest test class
+
+    def __init__(self, root: Path, *, cache_path: Path | None = None) -> None:
+        self.root = root.resolve()
+        self.cache_path = cache_path or self.root / ".tokimon-tmp" / "test-impact" / "imports.json"
+        self._imports: dict[str, list[str]] = {}
+
+    def select(self, changed_files: list[str], *, test_files: list[str]) -> TestSelection:
+        """Tests among ``test_files`` (workspace-relative) affected by ``changed_files``."""
+
+        total = len(test_files)
+        changed = sorted({_normalize(path) for path in changed_files if str(path).strip()})
+
+        def full(reason: str) -> TestSelection:
+            return TestSelection(tests=list(test_files), total=total, confident=False, reason=reason, changed=changed)
+
+        if not changed:
+            return full("no changed files")
+        python_changed: list[str] = []
+        for rel in changed:
+            name = Path(rel).name
+            if name in _CONFIG_NAMES:
+                return full(f"config changed: {rel}")
+            if rel.endswith(_DOC_SUFFIXES):
+                continue
+            if not rel.endswith(".py"):
+                return full(f"non-python change: {rel}")
+            if not (self.root / rel).is_file():
+                return full(f"python file removed: {rel}")
+            python_changed.append(rel)
+
+        self.refresh()
+        affected = self._dependents(python_changed)
+        scopes = [_prefix(Path(rel).parent) for rel in affected if Path(rel).name == "conftest.py"]
+        selected = sorted(
+            test for test in test_files if test in affected or any(test.startswith(scope) for scope in scopes)
+        )
+        if not selected:
+            return full("no tests depend on the changed files" if python_changed else "only docs changed")
+        return TestSelection(tests=selected, total=total, confident=True, reason="import graph", changed=changed)
+
+    def refresh(self) -> None:
+        """Re-parse Python files whose size or mtime changed since the cached graph."""
+
+        cached = self._load_cache()
+        entries: dict[str, dict[str, object]] = {}
+        dirty = False
+        for rel in _python_files(self.root):
+            try:
+                stat = (self.root / rel).stat()
+            except OSError:
+                continue
+            entry = cached.get(rel)
+            if entry is None or entry.get("mtime_ns") != stat.st_mtime_ns or entry.get("size") != stat.st_size:
+                entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "imports": _parse_imports(self.root, rel)}
+                dirty = True
+            entries[rel] = entry
+        if dirty or entries.keys() != cached.keys():
+            self._save_cache(entries)
+        self._imports = {rel: list(entry.get("imports") or []) for rel, entry in entries.items()}
+
+    def _dependents(self, changed: list[str]) -> set[str]:
+        modules: dict[str, set[str]] = {}
+        for rel in self._imports:
+            for name in _module_names(rel):
+                modules.setdefault(name, set()).add(rel)
+        importers: dict[str, set[str]] = {}
+        for rel, imports in self._imports.items():
+            for name in imports:
+                for target in modules.get(name, ()):
+                    if target != rel:
+                        importers.setdefault(target, set()).add(rel)
+        affected = set(changed)
+        frontier = list(changed)
+        while frontier:
+            for importer in importers.get(frontier.pop(), ()):
+                if importer not in affected:
+                    affected.add(importer)
+                    frontier.append(importer)
+        return affected
+
+    def _load_cache(self) -> dict[str, dict[str, object]]:
+        try:
+            payload = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(payload, dict) or payload.get("version") != _CACHE_VERSION:
+            return {}
+        files = payload.get("files")
+        return files if isinstance(files, dict) else {}
+
+    def _save_cache(self, entries: dict[str, dict[str, object]]) -> None:
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({"version": _CACHE_VERSION, "files": entries}, sort_keys=True))
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+
+def is_test_file(rel: str) -> bool:
+    name = Path(rel).name
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def _normalize(path: str) -> str:
+    return Path(str(path).strip()).as_posix().removeprefix("./")
+
+
+def _prefix(rel: Path) -> str:
+    posix = rel.as_posix()
+    return "" if posix == "." else f"{posix}/"
+
+
+def _python_files(root: Path) -> list[str]:
+    files: list[str] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in _EXCLUDED_DIR_NAMES and not name.startswith("."))
+        base = Path(dirpath).relative_to(root)
+        files.extend((base / name).as_posix() for name in sorted(filenames) if name.endswith(".py"))
+    return files
+
+
+def _module_names(rel: str) -> list[str]:
+    """Every dotted suffix a file could be imported as (``a/b/c.py`` -> ``a.b.c``, ``b.c``, ``c``)."""
+
+    parts = list(Path(rel).with_suffix("").parts)
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    return [".".join(parts[index:]) for index in range(len(parts))]
+
+
+def _parse_imports(root: Path, rel: str) -> list[str]:
+    try:
+        tree = ast.parse((root / rel).read_bytes(), filename=rel)
+    except (OSError, SyntaxError, ValueError):
+        return []
+    package = list(Path(rel).parent.parts)
+    names: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                names.update(_with_parents(alias.name))
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                anchor = package[: len(package) - (node.level - 1)] if node.level > 1 else package
+                base = ".".join([*anchor, *(node.module.split(".") if node.module else [])])
+            else:
+                base = node.module or ""
+            if not base:
+                continue
+            names.update(_with_parents(base))
+            for alias in node.names:
+                if alias.name != "*":
+                    names.add(f"{base}.{alias.name}")
+    return sorted(names)
+
+
+def _with_parents(name: str) -> list[str]:
+    """``a.b.c`` also imports packages ``a`` and ``a.b``."""
+
+    parts = name.split(".")
+    return [".".join(parts[: index + 1]) for index in range(len(parts))]
@@ -0,0 +1,119 @@
+"""Duration-balanced test sharding for PytestTool.
+
+`TestDurationHistory` keeps a moving average of each test node id's duration
+and of the fixed per-shard overhead (interpreter start, collection) under
+``.tokimon-tmp/test-shards/durations.json``. `partition_lpt` spreads node ids
+over shards longest-processing-time-first using those estimates, and
+`TestDurationHistory.shard_count` only adds a shard while there is at least one
+overhead's worth of test time to give it, so tiny suites stop paying for
+shards they cannot use once their timings are known. The history holds at
+most ``_MAX_ENTRIES`` node ids; past that, the ones measured longest ago are
+dropped.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import os
+from pathlib import Path
+
+
+_HISTORY_VERSION = 2
+_DEFAULT_ESTIMATE_S = 1.0
+_SMOOTHING = 0.5
+_MAX_ENTRIES = 50_000
+
+
+class TestDurationHistory:
+    __test__ = False  # not a pytest test class
+
+    def __init__(self, root: Path, *, path: Path | None = None) -> None:
+        self.path = path or root.resolve() / ".tokimon-tmp" / "test-shards" / "durations.json"
+        payload = self._load()
+        self.durations: dict[str, float] = dict(payload.get("tests") or {})
+        self.shard_overhead: float | None = payload.get("shard_overhead")
+        # Run number at which each node id was last measured, for evicting the stalest first.
+        self.last_seen: dict[str, int] = dict(payload.get("last_seen") or {})
+        self.runs = int(payload.get("runs") or 0)
+
+    def estimate(self, nodeids: list[str]) -> dict[str, float]:
+        """Expected seconds per node id; unknown tests get the mean of the known ones."""
+
+        known = [self.durations[nodeid] for nodeid in nodeids if nodeid in self.durations]
+        fallback = sum(known) / len(known) if known else _DEFAULT_ESTIMATE_S
+        return {nodeid: self.durations.get(nodeid, fallback) for nodeid in nodeids}
+
+    def shard_count(self, requested: int, estimates: dict[str, float]) -> int:
+        count = min(requested, len(estimates))
+        if self.shard_overhead and self.shard_overhead > 0:
+            count = min(count, int(sum(estimates.values()) / self.shard_overhead))
+        return max(1, count)
+
+    def record(self, durations: dict[str, float], *, shard_overheads: list[float] | None = None) -> None:
+        """Fold one run's measured test durations and per-shard overheads into the history and save it."""
+
+        self.runs += 1
+        for nodeid, seconds in durations.items():
+            previous = self.durations.get(nodeid)
+            self.durations[nodeid] = seconds if previous is None else _smooth(previous, seconds)
+            self.last_seen[nodeid] = self.runs
+        if shard_overheads:
+            measured = sum(shard_overheads) / len(shard_overheads)
+            self.shard_overhead = measured if self.shard_overhead is None else _smooth(self.shard_overhead, measured)
+        if len(self.durations) > _MAX_ENTRIES:
+            stale = heapq.nsmallest(
+                len(self.durations) - _MAX_ENTRIES,
+                self.durations,
+                key=lambda nodeid: (self.last_seen.get(nodeid, 0), nodeid),
+            )
+            for nodeid in stale:
+                del self.durations[nodeid]
+                self.last_seen.pop(nodeid, None)
+        self._save()
+
+    def _load(self) -> dict[str, object]:
+        try:
+            payload = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(payload, dict) or payload.get("version") != _HISTORY_VERSION:
+            return {}
+        return payload
+
+    def _save(self) -> None:
+        payload = {
+            "version": _HISTORY_VERSION,
+            "runs": self.runs,
+            "shard_overhead": self.shard_overhead,
+            "tests": self.durations,
+            "last_seen": self.last_seen,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(payload, sort_keys=True))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+
+def partition_lpt(nodeids: list[str], estimates: dict[str, float], shards: int) -> list[list[str]]:
+    """Longest-processing-time-first: each test, slowest first, goes to the least-loaded shard.
+
+    Each shard keeps its tests in collection order so module and class fixtures are still shared.
+    """
+
+    shards = max(1, min(shards, len(nodeids)))
+    position = {nodeid: index for index, nodeid in enumerate(nodeids)}
+    loads = [(0.0, index) for index in range(shards)]
+    buckets: list[list[str]] = [[] for _ in range(shards)]
+    for nodeid in sorted(nodeids, key=lambda item: (-estimates.get(item, 0.0), position[item])):
+        load, index = heapq.heappop(loads)
+        buckets[index].append(nodeid)
+        heapq.heappush(loads, (load + estimates.get(nodeid, 0.0), index))
+    return [sorted(bucket, key=position.__getitem__) for bucket in buckets]
+
+
+def _smooth(previous: float, measured: float) -> float:
+    return round(previous * (1 - _SMOOTHING) + measured * _SMOOTHING, 6)
@@ -1,17 +1,70 @@
-"""Trace logger for run events."""
+"""Trace logger for run events.
+
+Events are serialized on the calling thread and handed to a single background
+writer through a bounded queue, so callers never touch the file and lines from
+concurrent steps are never interleaved. The writer keeps the file open and
+flushes once enough bytes are buffered or the oldest buffered line is older
+than the flush interval. Owners call ``flush()`` to make everything logged so
+far visible on disk and ``close()`` at the end of a run.
+
+With ``rotate_bytes`` set, a full ``trace.jsonl`` is renamed to
+``trace.jsonl.<n>`` (``trace.jsonl.<n>.gz`` with ``compress="gzip"``) and a new
+file is started; ``read_trace_lines`` yields segments and the live file in order.
+"""
 
 from __future__ import annotations
 
+import gzip
 import json
-from dataclasses import asdict
+import os
+import queue
+import shutil
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+
+_DEFAULT_MAX_QUEUE = 10_000
+_DEFAULT_FLUSH_BYTES = 64 * 1024
+_DEFAULT_FLUSH_INTERVAL_S = 0.5
+_COMPRESSIONS = {"gzip": ".gz"}
+
+
+class _Barrier:
+    def __init__(self, *, stop: bool = False) -> None:
+        self.stop = stop
+        self.done = threading.Event()
 
 
 class TraceLogger:
-    def __init__(self, path: Path) -> None:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_queue: int = _DEFAULT_MAX_QUEUE,
+        flush_bytes: int = _DEFAULT_FLUSH_BYTES,
+        flush_interval_s: float = _DEFAULT_FLUSH_INTERVAL_S,
+        rotate_bytes: int | None = None,
+        compress: str | None = None,
+    ) -> None:
+        if rotate_bytes is None:
+            rotate_bytes = _read_env_int("TOKIMON_TRACE_ROTATE_BYTES", 0) or None
+        if compress is None:
+            compress = (os.environ.get("TOKIMON_TRACE_COMPRESS") or "").strip().lower() or None
+        if compress is not None and compress not in _COMPRESSIONS:
+            raise ValueError(f"Unsupported trace compression: {compress}")
         self.path = path
+        self.flush_bytes = max(1, int(flush_bytes))
+        self.flush_interval_s = max(0.0, float(flush_interval_s))
+        self.rotate_bytes = int(rotate_bytes) if rotate_bytes else None
+        self.compress = compress
+        self._queue: queue.Queue[str | _Barrier] = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._error: BaseException | None = None
 
     def log(self, event_type: str, payload: dict[str, Any]) -> None:
         record = {
@@ -19,5 +72,133 @@ class TraceLogger:
             "event_type": event_type,
             "payload": payload,
         }
-        with self.path.open("a") as handle:
-            handle.write(json.dumps(record) + "\n")
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            if self._closed:
+                # Late events after close() are rare; append them directly.
+                with self.path.open("a") as handle:
+                    handle.write(line)
+                return
+            self._ensure_writer()
+            # Blocks when the writer falls behind (bounded memory, no dropped events).
+            self._queue.put(line)
+
+    def flush(self) -> None:
+        """Block until every event logged before this call is written to disk."""
+
+        barrier = _Barrier()
+        with self._lock:
+            if self._thread is None or self._closed:
+                return
+            self._queue.put(barrier)
+        self._wait(barrier)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread is None:
+                return
+            barrier = _Barrier(stop=True)
+            self._queue.put(barrier)
+            # Hold the lock until the writer exits so late direct appends cannot interleave with it.
+            self._thread.join()
+        self._wait(barrier)
+
+    def _wait(self, barrier: _Barrier) -> None:
+        barrier.done.wait()
+        if self._error is not None:
+            raise RuntimeError(f"Trace writer failed for {self.path}") from self._error
+
+    def _ensure_writer(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer_loop, name="tokimon-trace", daemon=True)
+            self._thread.start()
+
+    def _writer_loop(self) -> None:
+        handle = None
+        buffer: list[str] = []
+        buffered = 0
+        oldest = 0.0
+        while True:
+            timeout = None
+            if buffer:
+                timeout = max(0.0, oldest + self.flush_interval_s - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if isinstance(item, str):
+                if not buffer:
+                    oldest = time.monotonic()
+                buffer.append(item)
+                buffered += len(item)
+                if buffered < self.flush_bytes:
+                    continue
+            try:
+                if buffer:
+                    if handle is None:
+                        self.path.parent.mkdir(parents=True, exist_ok=True)
+                        handle = self.path.open("a")
+                    handle.write("".join(buffer))
+                    handle.flush()
+                    buffer, buffered = [], 0
+                    if self.rotate_bytes and handle.tell() >= self.rotate_bytes:
+                        handle.close()
+                        handle = None
+                        self._rotate()
+            except BaseException as exc:  # noqa: BLE001 - reported to the next flush()/close() caller.
+                self._error = exc
+                buffer, buffered = [], 0
+            if isinstance(item, _Barrier):
+                if item.stop and handle is not None:
+                    handle.close()
+                item.done.set()
+                if item.stop:
+                    return
+
+    def _rotate(self) -> None:
+        index = 1 + max((_segment_index(self.path, candidate) for candidate in _segments(self.path)), default=0)
+        segment = self.path.with_name(f"{self.path.name}.{index}")
+        os.replace(self.path, segment)
+        if self.compress == "gzip":
+            with segment.open("rb") as source, gzip.open(f"{segment}.gz", "wb") as target:
+                shutil.copyfileobj(source, target)
+            segment.unlink()
+
+
+def read_trace_lines(path: Path) -> Iterator[str]:
+    """Yield trace lines from rotated segments (oldest first) followed by the live file."""
+
+    for segment in sorted(_segments(path), key=lambda candidate: _segment_index(path, candidate)):
+        opener = gzip.open if segment.name.endswith(".gz") else open
+        with opener(segment, "rt") as handle:
+            yield from handle
+    if path.exists():
+        with path.open() as handle:
+            yield from handle
+
+
+def _segments(path: Path) -> list[Path]:
+    if not path.parent.exists():
+        return []
+    return [candidate for candidate in path.parent.glob(f"{path.name}.*") if _segment_index(path, candidate) > 0]
+
+
+def _segment_index(path: Path, segment: Path) -> int:
+    suffix = segment.name[len(path.name) + 1 :]
+    for extension in _COMPRESSIONS.values():
+        if suffix.endswith(extension):
+            suffix = suffix[: -len(extension)]
+    return int(suffix) if suffix.isdigit() else 0
+
+
+def _read_env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw.strip())
+    except ValueError:
+        return default
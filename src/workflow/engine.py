@@ -9,10 +9,15 @@ from typing import Any
 
 from flow_types import StepStatus
 
+from .journal import StateJournal, atomic_write_text, journal_path_for, read_journal
 from .models import StepAttempt, StepSpec, StepState, WorkflowSpec, WorkflowState
 from .schema import validate_schema
 
 
+_SATISFIED_STATUSES = frozenset({StepStatus.SUCCEEDED, StepStatus.PARTIAL, StepStatus.SKIPPED})
+_SCHEDULABLE_STATUSES = frozenset({StepStatus.NEW, StepStatus.READY, StepStatus.RETRY_PENDING})
+
+
 class WorkflowEngine:
     def __init__(self, spec: WorkflowSpec) -> None:
         self.spec = spec
@@ -24,7 +29,18 @@ class WorkflowEngine:
             metadata=dict(spec.metadata),
         )
         self._validate_dag()
-        self._refresh_ready()
+        self._order = {step.step_id: index for index, step in enumerate(spec.steps)}
+        self._dependents: dict[str, list[str]] = {step_id: [] for step_id in self._step_map}
+        for step in spec.steps:
+            for dep in step.depends_on:
+                self._dependents[dep].append(step.step_id)
+        self._pending_deps: dict[str, int] = {}
+        self._ready: set[str] = set()
+        self._journal: StateJournal | None = None
+        self._snapshot_path: Path | None = None
+        self._journal_seq = 0
+        self._compact_every = 256
+        self._rebuild_index()
 
     def _validate_dag(self) -> None:
         visited: set[str] = set()
@@ -46,43 +62,81 @@ class WorkflowEngine:
         for step_id in self._step_map:
             dfs(step_id)
 
-    def _refresh_ready(self) -> None:
+    def _rebuild_index(self) -> None:
+        """Recompute in-degree counters and the ready set from the current state.
+
+        Only needed when ``state`` is replaced wholesale (construction, load);
+        ``_set_status`` keeps both up to date incrementally afterwards.
+        """
+
+        self._pending_deps = {
+            step_id: sum(1 for dep in step.depends_on if self.state.steps[dep].status not in _SATISFIED_STATUSES)
+            for step_id, step in self._step_map.items()
+        }
+        self._ready = set()
         for step_id, state in self.state.steps.items():
-            if state.status in {
-                StepStatus.SUCCEEDED,
-                StepStatus.SKIPPED,
-                StepStatus.RUNNING,
-                StepStatus.FAILED,
-                StepStatus.PARTIAL,
-                StepStatus.BLOCKED,
-            }:
+            if state.status not in _SCHEDULABLE_STATUSES:
                 continue
-            deps = self._step_map[step_id].depends_on
-            if all(self.state.steps[dep].status in {StepStatus.SUCCEEDED, StepStatus.PARTIAL, StepStatus.SKIPPED} for dep in deps):
+            if self._pending_deps[step_id] == 0:
                 state.status = StepStatus.READY
+                self._ready.add(step_id)
             else:
                 state.status = StepStatus.NEW
 
+    def _set_status(self, step_id: str, status: StepStatus) -> None:
+        state = self.state.steps[step_id]
+        was_satisfied = state.status in _SATISFIED_STATUSES
+        state.status = status
+        if status in _SCHEDULABLE_STATUSES and self._pending_deps[step_id] == 0:
+            self._ready.add(step_id)
+        else:
+            self._ready.discard(step_id)
+        is_satisfied = status in _SATISFIED_STATUSES
+        if was_satisfied == is_satisfied:
+            return
+        delta = -1 if is_satisfied else 1
+        for dependent in self._dependents[step_id]:
+            self._pending_deps[dependent] += delta
+            dependent_state = self.state.steps[dependent]
+            if dependent_state.status not in _SCHEDULABLE_STATUSES:
+                continue
+            if self._pending_deps[dependent] == 0:
+                self._ready.add(dependent)
+            else:
+                self._ready.discard(dependent)
+                dependent_state.status = StepStatus.NEW
+
     def ready_steps(self) -> list[str]:
-        self._refresh_ready()
-        return [step_id for step_id, state in self.state.steps.items() if state.status == StepStatus.READY]
+        """Return schedulable steps whose dependencies are all terminal, in spec order.
+
+        Readiness is maintained incrementally by status transitions, so this is
+        O(ready) rather than a rescan of every step's dependencies.
+        """
+
+        ready = sorted(self._ready, key=self._order.__getitem__)
+        for step_id in ready:
+            self.state.steps[step_id].status = StepStatus.READY
+        return ready
 
     def mark_running(self, step_id: str) -> None:
-        self.state.steps[step_id].status = StepStatus.RUNNING
+        self._set_status(step_id, StepStatus.RUNNING)
+        self._journal_append({"op": "running", "step_id": step_id})
 
     def record_attempt(self, step_id: str, attempt: StepAttempt) -> None:
         self.state.steps[step_id].attempts.append(attempt)
+        self._journal_append({"op": "attempt", "step_id": step_id, "attempt": _serialize_attempt(attempt)})
 
     def mark_outputs(self, step_id: str, outputs: dict[str, Any]) -> None:
         step_spec = self._step_map[step_id]
         if step_spec.outputs_schema:
             validate_schema(outputs, step_spec.outputs_schema)
         self.state.steps[step_id].outputs = outputs
+        self._journal_append({"op": "outputs", "step_id": step_id, "outputs": outputs})
 
     def mark_status(self, step_id: str, status: StepStatus, error: str | None = None) -> None:
-        state = self.state.steps[step_id]
-        state.status = status
-        state.error = error
+        self._set_status(step_id, status)
+        self.state.steps[step_id].error = error
+        self._journal_append({"op": "status", "step_id": step_id, "status": status.value, "error": error})
 
     def skip_remaining(self, *, reason: str, triggered_by: str) -> list[str]:
         """Mark all non-terminal steps as SKIPPED.
@@ -97,7 +151,7 @@ class WorkflowEngine:
                 continue
             if state.status in {StepStatus.FAILED, StepStatus.BLOCKED, StepStatus.RUNNING}:
                 continue
-            state.status = StepStatus.SKIPPED
+            self._set_status(step_id, StepStatus.SKIPPED)
             if not state.outputs:
                 state.outputs = {"summary": f"skipped: {reason}"}
             skipped.append(step_id)
@@ -107,6 +161,7 @@ class WorkflowEngine:
             termination = {}
         termination.update({"triggered_by": triggered_by, "reason": reason, "skipped_steps": skipped})
         self.state.metadata["termination"] = termination
+        self._journal_append({"op": "skip_remaining", "reason": reason, "triggered_by": triggered_by})
         return skipped
 
     def set_inputs(self, step_id: str, inputs: dict[str, Any]) -> None:
@@ -114,13 +169,67 @@ class WorkflowEngine:
         if step_spec.inputs_schema:
             validate_schema(inputs, step_spec.inputs_schema)
         self.state.steps[step_id].inputs = inputs
+        self._journal_append({"op": "inputs", "step_id": step_id, "inputs": inputs})
+
+    def attach_journal(self, path: Path, *, compact_every: int = 256) -> None:
+        """Persist subsequent mutations incrementally next to the snapshot at ``path``.
+
+        Writes a fresh snapshot first so the journal always extends a known
+        base; ``checkpoint`` then fsyncs the journal and compacts it into the
+        snapshot every ``compact_every`` records.
+        """
+
+        self.close_journal()
+        self._journal = StateJournal(journal_path_for(path))
+        self._snapshot_path = path
+        self._compact_every = max(1, int(compact_every))
+        self.save(path)
+
+    def checkpoint(self) -> None:
+        if self._journal is None or self._snapshot_path is None:
+            return
+        if self._journal.pending >= self._compact_every:
+            self.save(self._snapshot_path)
+            return
+        self._journal.sync()
+
+    def close_journal(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = None
+        self._snapshot_path = None
 
     def save(self, path: Path) -> None:
-        payload = {
-            "spec": _serialize_spec(self.spec),
-            "state": _serialize_state(self.state),
-        }
-        path.write_text(json.dumps(payload, indent=2))
+        atomic_write_text(path, json.dumps(self.to_payload(), indent=2))
+        if self._journal is not None and path == self._snapshot_path:
+            self._journal.reset()
+
+    def _journal_append(self, record: dict[str, Any]) -> None:
+        if self._journal is None:
+            return
+        self._journal_seq += 1
+        self._journal.append({"seq": self._journal_seq, **record})
+
+    def _replay(self, records: list[dict[str, Any]]) -> None:
+        for record in records:
+            seq = int(record.get("seq") or 0)
+            if seq <= self._journal_seq:
+                continue
+            op = record.get("op")
+            step_id = str(record.get("step_id") or "")
+            if op == "running":
+                self.mark_running(step_id)
+            elif op == "status":
+                self.mark_status(step_id, StepStatus(record["status"]), error=record.get("error"))
+            elif op == "attempt":
+                self.record_attempt(step_id, _deserialize_attempt(record["attempt"]))
+            elif op == "outputs":
+                self.mark_outputs(step_id, record.get("outputs") or {})
+            elif op == "inputs":
+                self.set_inputs(step_id, record.get("inputs") or {})
+            elif op == "skip_remaining":
+                self.skip_remaining(reason=str(record.get("reason") or ""), triggered_by=str(record.get("triggered_by") or ""))
+            self._journal_seq = seq
 
     @classmethod
     def load(cls, path: Path) -> "WorkflowEngine":
@@ -128,8 +237,26 @@ class WorkflowEngine:
         spec = _deserialize_spec(payload["spec"])
         engine = cls(spec)
         engine.state = _deserialize_state(payload["state"])
+        engine._journal_seq = int(payload.get("journal_seq") or 0)
+        engine._rebuild_index()
+        engine._replay(read_journal(journal_path_for(path)))
+        engine._requeue_interrupted()
         return engine
 
+    def _requeue_interrupted(self) -> None:
+        """Make steps a crash left RUNNING schedulable again, so resuming re-runs them."""
+
+        for step_id, state in self.state.steps.items():
+            if state.status == StepStatus.RUNNING:
+                self._set_status(step_id, StepStatus.RETRY_PENDING if state.attempts else StepStatus.READY)
+
+    def to_payload(self) -> dict[str, Any]:
+        return {
+            "spec": _serialize_spec(self.spec),
+            "state": _serialize_state(self.state),
+            "journal_seq": self._journal_seq,
+        }
+
 
 def _serialize_spec(spec: WorkflowSpec) -> dict[str, Any]:
     return {
@@ -157,45 +284,47 @@ def _serialize_state(state: WorkflowState) -> dict[str, Any]:
                 "inputs": step.inputs,
                 "outputs": step.outputs,
                 "error": step.error,
-                "attempts": [
-                    {
-                        "attempt_id": attempt.attempt_id,
-                        "status": attempt.status.value,
-                        "call_signature": attempt.call_signature,
-                        "worker_type": attempt.worker_type,
-                        "strategy_id": attempt.strategy_id,
-                        "retrieval_stage": attempt.retrieval_stage,
-                        "summary": attempt.summary,
-                        "failure_signature": attempt.failure_signature,
-                        "progress_metrics": attempt.progress_metrics,
-                        "artifacts": attempt.artifacts,
-                    }
-                    for attempt in step.attempts
-                ],
+                "attempts": [_serialize_attempt(attempt) for attempt in step.attempts],
             }
             for step_id, step in state.steps.items()
         },
     }
 
 
+def _serialize_attempt(attempt: StepAttempt) -> dict[str, Any]:
+    return {
+        "attempt_id": attempt.attempt_id,
+        "status": attempt.status.value,
+        "call_signature": attempt.call_signature,
+        "worker_type": attempt.worker_type,
+        "strategy_id": attempt.strategy_id,
+        "retrieval_stage": attempt.retrieval_stage,
+        "summary": attempt.summary,
+        "failure_signature": attempt.failure_signature,
+        "progress_metrics": attempt.progress_metrics,
+        "artifacts": attempt.artifacts,
+    }
+
+
+def _deserialize_attempt(attempt: dict[str, Any]) -> StepAttempt:
+    return StepAttempt(
+        attempt_id=attempt["attempt_id"],
+        status=StepStatus(attempt["status"]),
+        call_signature=attempt["call_signature"],
+        worker_type=attempt["worker_type"],
+        strategy_id=attempt["strategy_id"],
+        retrieval_stage=attempt["retrieval_stage"],
+        summary=attempt.get("summary"),
+        failure_signature=attempt.get("failure_signature"),
+        progress_metrics=attempt.get("progress_metrics", {}),
+        artifacts=attempt.get("artifacts", []),
+    )
+
+
 def _deserialize_state(data: dict[str, Any]) -> WorkflowState:
     steps: dict[str, StepState] = {}
     for step_id, step_data in data["steps"].items():
-        attempts = [
-            StepAttempt(
-                attempt_id=attempt["attempt_id"],
-                status=StepStatus(attempt["status"]),
-                call_signature=attempt["call_signature"],
-                worker_type=attempt["worker_type"],
-                strategy_id=attempt["strategy_id"],
-                retrieval_stage=attempt["retrieval_stage"],
-                summary=attempt.get("summary"),
-                failure_signature=attempt.get("failure_signature"),
-                progress_metrics=attempt.get("progress_metrics", {}),
-                artifacts=attempt.get("artifacts", []),
-            )
-            for attempt in step_data.get("attempts", [])
-        ]
+        attempts = [_deserialize_attempt(attempt) for attempt in step_data.get("attempts", [])]
         steps[step_id] = StepState(
             step_id=step_id,
             status=StepStatus(step_data["status"]),
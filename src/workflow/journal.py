@@ -0,0 +1,96 @@
+"""Append-only journal of workflow state mutations with atomic snapshot helpers."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, IO
+
+
+def journal_path_for(snapshot_path: Path) -> Path:
+    """Return the journal file that accompanies a workflow state snapshot."""
+
+    return snapshot_path.with_name(f"{snapshot_path.stem}.journal.jsonl")
+
+
+class StateJournal:
+    """JSONL journal: one record per engine mutation, fsynced at checkpoints.
+
+    Records carry a monotonically increasing ``seq`` so replay on top of a
+    snapshot can skip entries the snapshot already contains (a crash between
+    writing a snapshot and truncating the journal must not double-apply).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.pending = 0
+        self._handle: IO[str] | None = None
+
+    def append(self, record: dict[str, Any]) -> None:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self.path.open("a", encoding="utf-8")
+        self._handle.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.pending += 1
+
+    def sync(self) -> None:
+        if self._handle is None:
+            return
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+
+    def reset(self) -> None:
+        """Truncate the journal once its records are folded into a snapshot."""
+
+        self.close()
+        with self.path.open("w", encoding="utf-8") as handle:
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.pending = 0
+
+    def close(self) -> None:
+        if self._handle is None:
+            return
+        self.sync()
+        self._handle.close()
+        self._handle = None
+
+
+def read_journal(path: Path) -> list[dict[str, Any]]:
+    """Read journal records, ignoring a torn trailing line from an interrupted write."""
+
+    if not path.exists():
+        return []
+    records: list[dict[str, Any]] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            break
+        if isinstance(record, dict):
+            records.append(record)
+    return records
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write ``text`` to ``path`` via fsynced temp file + rename."""
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        handle.write(text)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+    try:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)